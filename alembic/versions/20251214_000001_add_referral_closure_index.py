@@ -0,0 +1,30 @@
+"""Add closure-table index on referrals (referral_id, level).
+
+Revision ID: 20251214_000001
+Revises: 20251213_030000
+Create Date: 2025-12-14
+
+Referral chains and reward batches read all ancestors of a user from the
+referrals closure table; this composite index serves those lookups
+without touching rows of other users.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251214_000001"
+down_revision = "20251213_030000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_referrals_referral_level
+        ON referrals (referral_id, level)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_referrals_referral_level")
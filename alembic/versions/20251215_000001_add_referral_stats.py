@@ -0,0 +1,231 @@
+"""Add pre-aggregated referral_stats maintained by triggers.
+
+Revision ID: 20251215_000001
+Revises: 20251214_000001
+Create Date: 2025-12-15
+
+One row per referrer with referral counts per level and earnings split
+into paid / pending. Statement-level triggers on referrals and
+referral_earnings apply the delta of every write (transition tables, so
+a bulk insert costs one upsert per affected referrer) inside the writing
+transaction. Leaderboards and ranks read referral_stats through the two
+composite indexes instead of aggregating the whole referral tree.
+
+referrals rows are never re-parented (referrer_id / level are written
+once), so only INSERT and DELETE are tracked there; total_earned updates
+do not touch the counters.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251215_000001"
+down_revision = "20251214_000001"
+branch_labels = None
+depends_on = None
+
+
+# Upsert of per-referrer count deltas from a transition table
+_REFERRALS_DELTA = """
+        INSERT INTO referral_stats AS s (
+            referrer_id, direct_count, level2_count, level3_count,
+            total_count, updated_at
+        )
+        SELECT
+            referrer_id,
+            {sign} * COUNT(*) FILTER (WHERE level = 1),
+            {sign} * COUNT(*) FILTER (WHERE level = 2),
+            {sign} * COUNT(*) FILTER (WHERE level = 3),
+            {sign} * COUNT(*),
+            now()
+        FROM {rows}
+        GROUP BY referrer_id
+        ON CONFLICT (referrer_id) DO UPDATE SET
+            direct_count = s.direct_count + EXCLUDED.direct_count,
+            level2_count = s.level2_count + EXCLUDED.level2_count,
+            level3_count = s.level3_count + EXCLUDED.level3_count,
+            total_count = s.total_count + EXCLUDED.total_count,
+            updated_at = now();
+"""
+
+# Upsert of per-referrer earning deltas from signed earning rows
+_EARNINGS_DELTA = """
+        INSERT INTO referral_stats AS s (
+            referrer_id, total_earned, paid_earned, pending_earned,
+            updated_at
+        )
+        SELECT
+            r.referrer_id,
+            SUM(d.sign * d.amount),
+            COALESCE(SUM(d.sign * d.amount) FILTER (WHERE d.paid), 0),
+            COALESCE(SUM(d.sign * d.amount) FILTER (WHERE NOT d.paid), 0),
+            now()
+        FROM ({rows}) d
+        JOIN referrals r ON r.id = d.referral_id
+        GROUP BY r.referrer_id
+        HAVING
+            COALESCE(SUM(d.sign * d.amount) FILTER (WHERE d.paid), 0) <> 0
+            OR COALESCE(SUM(d.sign * d.amount) FILTER (WHERE NOT d.paid), 0) <> 0
+        ON CONFLICT (referrer_id) DO UPDATE SET
+            total_earned = s.total_earned + EXCLUDED.total_earned,
+            paid_earned = s.paid_earned + EXCLUDED.paid_earned,
+            pending_earned = s.pending_earned + EXCLUDED.pending_earned,
+            updated_at = now();
+"""
+
+_NEW_EARNINGS = "SELECT referral_id, amount, paid, 1 AS sign FROM new_rows"
+_OLD_EARNINGS = "SELECT referral_id, amount, paid, -1 AS sign FROM old_rows"
+_CHANGED_EARNINGS = f"{_NEW_EARNINGS} UNION ALL {_OLD_EARNINGS}"
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS referral_stats (
+            referrer_id INTEGER PRIMARY KEY
+                REFERENCES users(id) ON DELETE CASCADE,
+            direct_count INTEGER NOT NULL DEFAULT 0,
+            level2_count INTEGER NOT NULL DEFAULT 0,
+            level3_count INTEGER NOT NULL DEFAULT 0,
+            total_count INTEGER NOT NULL DEFAULT 0,
+            total_earned DECIMAL(18, 8) NOT NULL DEFAULT 0,
+            paid_earned DECIMAL(18, 8) NOT NULL DEFAULT 0,
+            pending_earned DECIMAL(18, 8) NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_referral_stats_by_referrals
+        ON referral_stats (total_count, total_earned)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_referral_stats_by_earnings
+        ON referral_stats (total_earned, total_count)
+    """)
+
+    # Block writers until triggers and backfill are in place
+    op.execute(
+        "LOCK TABLE referrals, referral_earnings IN SHARE ROW EXCLUSIVE MODE"
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION referral_stats_on_referrals()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_REFERRALS_DELTA.format(sign=1, rows="new_rows")}
+            ELSE
+                {_REFERRALS_DELTA.format(sign=-1, rows="old_rows")}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION referral_stats_on_earnings()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_EARNINGS_DELTA.format(rows=_NEW_EARNINGS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_EARNINGS_DELTA.format(rows=_OLD_EARNINGS)}
+            ELSE
+                {_EARNINGS_DELTA.format(rows=_CHANGED_EARNINGS)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_referral_stats_referrals_insert
+        AFTER INSERT ON referrals
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION referral_stats_on_referrals()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_referral_stats_referrals_delete
+        AFTER DELETE ON referrals
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION referral_stats_on_referrals()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_referral_stats_earnings_insert
+        AFTER INSERT ON referral_earnings
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION referral_stats_on_earnings()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_referral_stats_earnings_update
+        AFTER UPDATE ON referral_earnings
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION referral_stats_on_earnings()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_referral_stats_earnings_delete
+        AFTER DELETE ON referral_earnings
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION referral_stats_on_earnings()
+    """)
+
+    # Backfill from existing rows
+    op.execute("TRUNCATE referral_stats")
+    op.execute("""
+        INSERT INTO referral_stats (
+            referrer_id, direct_count, level2_count, level3_count,
+            total_count
+        )
+        SELECT
+            referrer_id,
+            COUNT(*) FILTER (WHERE level = 1),
+            COUNT(*) FILTER (WHERE level = 2),
+            COUNT(*) FILTER (WHERE level = 3),
+            COUNT(*)
+        FROM referrals
+        GROUP BY referrer_id
+    """)
+    op.execute("""
+        UPDATE referral_stats s SET
+            total_earned = e.total_earned,
+            paid_earned = e.paid_earned,
+            pending_earned = e.pending_earned
+        FROM (
+            SELECT
+                r.referrer_id,
+                SUM(re.amount) AS total_earned,
+                COALESCE(SUM(re.amount) FILTER (WHERE re.paid), 0)
+                    AS paid_earned,
+                COALESCE(SUM(re.amount) FILTER (WHERE NOT re.paid), 0)
+                    AS pending_earned
+            FROM referral_earnings re
+            JOIN referrals r ON r.id = re.referral_id
+            GROUP BY r.referrer_id
+        ) e
+        WHERE s.referrer_id = e.referrer_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_referral_stats_earnings_delete "
+        "ON referral_earnings"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_referral_stats_earnings_update "
+        "ON referral_earnings"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_referral_stats_earnings_insert "
+        "ON referral_earnings"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_referral_stats_referrals_delete "
+        "ON referrals"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_referral_stats_referrals_insert "
+        "ON referrals"
+    )
+    op.execute("DROP FUNCTION IF EXISTS referral_stats_on_earnings()")
+    op.execute("DROP FUNCTION IF EXISTS referral_stats_on_referrals()")
+    op.execute("DROP TABLE IF EXISTS referral_stats")
@@ -0,0 +1,33 @@
+"""Add distributed_lock_fences for fenced PostgreSQL locks.
+
+Revision ID: 20251216_000001
+Revises: 20251215_000001
+Create Date: 2025-12-16
+
+Fencing counter per lock key for the PostgreSQL fallback of
+DistributedLock: every advisory lock acquisition increments the row
+while holding the lock, so holders get monotonically increasing tokens.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251216_000001"
+down_revision = "20251215_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS distributed_lock_fences (
+            lock_key VARCHAR(255) PRIMARY KEY,
+            fence BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS distributed_lock_fences")
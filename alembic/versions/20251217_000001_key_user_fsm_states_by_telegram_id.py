@@ -0,0 +1,53 @@
+"""Key user_fsm_states by telegram_id.
+
+Revision ID: 20251217_000001
+Revises: 20251216_000001
+Create Date: 2025-12-17
+
+The PostgreSQL FSM storage caches states in memory and bulk-upserts
+changes by telegram_id, without resolving users. Existing rows are
+backfilled from users (keeping the newest row per user), user_id becomes
+optional so users that are still registering can keep their state.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251217_000001"
+down_revision = "20251216_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE user_fsm_states ADD COLUMN IF NOT EXISTS telegram_id BIGINT"
+    )
+    op.execute("""
+        UPDATE user_fsm_states s
+        SET telegram_id = u.telegram_id
+        FROM users u
+        WHERE u.id = s.user_id AND s.telegram_id IS NULL
+    """)
+    op.execute("""
+        DELETE FROM user_fsm_states s
+        USING user_fsm_states newer
+        WHERE s.telegram_id = newer.telegram_id AND s.id < newer.id
+    """)
+    op.execute("DELETE FROM user_fsm_states WHERE telegram_id IS NULL")
+    op.execute(
+        "ALTER TABLE user_fsm_states ALTER COLUMN telegram_id SET NOT NULL"
+    )
+    op.execute("ALTER TABLE user_fsm_states ALTER COLUMN user_id DROP NOT NULL")
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_user_fsm_states_telegram_id
+        ON user_fsm_states (telegram_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_user_fsm_states_telegram_id")
+    op.execute("DELETE FROM user_fsm_states WHERE user_id IS NULL")
+    op.execute("ALTER TABLE user_fsm_states ALTER COLUMN user_id SET NOT NULL")
+    op.execute("ALTER TABLE user_fsm_states DROP COLUMN IF EXISTS telegram_id")
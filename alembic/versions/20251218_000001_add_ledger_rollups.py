@@ -0,0 +1,171 @@
+"""Add ledger rollups for incremental reconciliation.
+
+Revision ID: 20251218_000001
+Revises: 20251217_000001
+Create Date: 2025-12-18
+
+Statement-level triggers on deposits, transactions, referral_earnings
+and users add the change of every reconciliation component (confirmed
+deposits / withdrawals, paid referral earnings, user balances, pending
+earnings, pending withdrawals) to ledger_rollups under the current UTC
+day, in the writing transaction. Rows are striped over 16 slots by
+backend PID so concurrent writers do not serialize on one row.
+
+ReconciliationService moves closed days into ledger_day_totals (day
+delta + running total), so reconciliation reads the last closed totals
+plus the open deltas instead of summing whole tables.
+
+The existing totals are backfilled as an opening entry on the migration
+day; history before it is not split by day.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251218_000001"
+down_revision = "20251217_000001"
+branch_labels = None
+depends_on = None
+
+
+# Per table: (entry type, amount column, row condition)
+_COMPONENTS = {
+    "deposits": [
+        ("deposit_confirmed", "amount", "status = 'confirmed'"),
+    ],
+    "transactions": [
+        (
+            "withdrawal_confirmed", "amount",
+            "type = 'withdrawal' AND status = 'confirmed'",
+        ),
+        (
+            "withdrawal_pending", "amount",
+            "type = 'withdrawal' AND status IN ('pending', 'processing')",
+        ),
+    ],
+    "referral_earnings": [
+        ("referral_paid", "amount", "paid"),
+    ],
+    "users": [
+        ("user_balance", "balance", "TRUE"),
+        ("user_pending_earnings", "pending_earnings", "TRUE"),
+    ],
+}
+
+
+def _entries(table: str, rows: str, sign: int) -> str:
+    """SELECTs of signed component rows from a transition table."""
+    return "\nUNION ALL\n".join(
+        f"SELECT '{entry_type}' AS entry_type, "
+        f"{sign} * COALESCE({column}, 0) AS amount, {sign} AS entry_count "
+        f"FROM {rows} WHERE {condition}"
+        for entry_type, column, condition in _COMPONENTS[table]
+    )
+
+
+def _apply(selects: str) -> str:
+    """Add grouped deltas to today's striped rollup rows."""
+    return f"""
+        INSERT INTO ledger_rollups (day, entry_type, slot, amount, entry_count)
+        SELECT
+            (now() AT TIME ZONE 'UTC')::date,
+            entry_type,
+            pg_backend_pid() % 16,
+            SUM(amount),
+            SUM(entry_count)
+        FROM ({selects}) AS delta
+        GROUP BY entry_type
+        HAVING SUM(amount) <> 0 OR SUM(entry_count) <> 0
+        ON CONFLICT (day, entry_type, slot) DO UPDATE SET
+            amount = ledger_rollups.amount + EXCLUDED.amount,
+            entry_count = ledger_rollups.entry_count + EXCLUDED.entry_count;
+    """
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_rollups (
+            day DATE NOT NULL,
+            entry_type VARCHAR(32) NOT NULL,
+            slot SMALLINT NOT NULL,
+            amount DECIMAL(20, 8) NOT NULL DEFAULT 0,
+            entry_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, entry_type, slot)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_day_totals (
+            day DATE NOT NULL,
+            entry_type VARCHAR(32) NOT NULL,
+            amount DECIMAL(20, 8) NOT NULL DEFAULT 0,
+            entry_count BIGINT NOT NULL DEFAULT 0,
+            cumulative_amount DECIMAL(20, 8) NOT NULL DEFAULT 0,
+            cumulative_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, entry_type)
+        )
+    """)
+
+    # Block writers until triggers and opening balances are in place
+    op.execute(
+        "LOCK TABLE deposits, transactions, referral_earnings, users "
+        "IN SHARE ROW EXCLUSIVE MODE"
+    )
+
+    for table in _COMPONENTS:
+        new_entries = _entries(table, "new_rows", 1)
+        old_entries = _entries(table, "old_rows", -1)
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION ledger_rollup_on_{table}()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    {_apply(new_entries)}
+                ELSIF TG_OP = 'DELETE' THEN
+                    {_apply(old_entries)}
+                ELSE
+                    {_apply(new_entries + " UNION ALL " + old_entries)}
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_ledger_rollup_{table}_insert
+            AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ledger_rollup_on_{table}()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_ledger_rollup_{table}_update
+            AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ledger_rollup_on_{table}()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_ledger_rollup_{table}_delete
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ledger_rollup_on_{table}()
+        """)
+
+    # Opening balances
+    op.execute("TRUNCATE ledger_rollups, ledger_day_totals")
+    for table in _COMPONENTS:
+        op.execute(
+            _apply(_entries(table, table, 1)).replace(
+                "pg_backend_pid() % 16", "0"
+            )
+        )
+
+
+def downgrade() -> None:
+    for table in _COMPONENTS:
+        for event in ("insert", "update", "delete"):
+            op.execute(
+                f"DROP TRIGGER IF EXISTS trg_ledger_rollup_{table}_{event} "
+                f"ON {table}"
+            )
+        op.execute(f"DROP FUNCTION IF EXISTS ledger_rollup_on_{table}()")
+    op.execute("DROP TABLE IF EXISTS ledger_day_totals")
+    op.execute("DROP TABLE IF EXISTS ledger_rollups")
@@ -0,0 +1,153 @@
+"""Partition append-only log tables by month.
+
+Revision ID: 20251219_000001
+Revises: 20251218_000001
+Create Date: 2025-12-19
+
+user_message_logs, user_actions, user_activities and admin_actions become
+range-partitioned by created_at with one partition per month (UTC), named
+<table>_pYYYYMM, plus a default partition as a safety net. The primary
+key becomes (id, created_at); the id sequence, indexes, foreign keys and
+triggers of the old table are carried over. Existing rows are copied.
+
+Retention and creation of future partitions are done by
+PartitionMaintenanceService from the cleanup task.
+
+transactions and blockchain_tx_cache are not partitioned: transactions
+is referenced by referral_earnings and carries the ledger rollup
+triggers, and blockchain_tx_cache relies on a unique tx_hash, neither of
+which a partitioned table supports without the partition key.
+"""
+
+import re
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251219_000001"
+down_revision = "20251218_000001"
+branch_labels = None
+depends_on = None
+
+
+_TABLES = ("user_message_logs", "user_actions", "user_activities", "admin_actions")
+
+# Future months created here; later ones come from the cleanup task
+_MONTHS_AHEAD = 3
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _retarget(definition: str, old: str, new: str) -> str:
+    """Point an index/trigger definition of table old at table new."""
+    return re.sub(rf" ON (ONLY )?(\S+\.)?{old} ", f" ON {new} ", definition)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate table (partitioned or plain) with its data and objects."""
+    bind = op.get_bind()
+    relkind = bind.execute(
+        sa.text(
+            "SELECT relkind FROM pg_class "
+            "WHERE oid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).scalar()
+    if relkind is None or (relkind == "p") == partitioned:
+        return
+
+    old = f"{table}_old"
+    op.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+
+    params = {"table": old}
+    indexes = bind.execute(
+        sa.text(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary"
+        ),
+        params,
+    ).scalars().all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        params,
+    ).all()
+    triggers = bind.execute(
+        sa.text(
+            "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+            "WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal"
+        ),
+        params,
+    ).scalars().all()
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), params
+    ).scalar()
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS "
+            f"INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)"
+        )
+        oldest = bind.execute(
+            sa.text(f"SELECT min(created_at) FROM {old}")
+        ).scalar()
+        now = datetime.now(UTC)
+        month = (oldest or now).astimezone(UTC).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        last = _add_months(
+            now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+            _MONTHS_AHEAD,
+        )
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS "
+            f"INCLUDING CONSTRAINTS)"
+        )
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    op.execute(f"DROP TABLE {old}")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+
+    primary_key = "id, created_at" if partitioned else "id"
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+        f"PRIMARY KEY ({primary_key})"
+    )
+    for definition in indexes:
+        op.execute(_retarget(definition, old, table))
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for definition in triggers:
+        op.execute(_retarget(definition, old, table))
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        _rebuild(table, partitioned=False)
@@ -0,0 +1,36 @@
+"""Add trigram indexes for user search.
+
+Revision ID: 20251220_000001
+Revises: 20251219_000001
+Create Date: 2025-12-20
+
+GIN pg_trgm indexes on users.username, wallet_address and referral_code
+serve the ILIKE matches of UserRepository.search (exact, prefix, suffix
+and substring) without scanning the table.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251220_000001"
+down_revision = "20251219_000001"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = ("username", "wallet_address", "referral_code")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in _COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_users_{column}_trgm "
+            f"ON users USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for column in _COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_users_{column}_trgm")
@@ -0,0 +1,35 @@
+"""Add telegram_media for cached Telegram file_ids.
+
+Revision ID: 20251221_000001
+Revises: 20251220_000001
+Create Date: 2025-12-21
+
+Durable fallback of the Redis media cache: file_id of every uploaded
+generated or static asset by the hash of its inputs, so payment QR codes
+and similar images are uploaded once and resent by id.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251221_000001"
+down_revision = "20251220_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS telegram_media (
+            media_key VARCHAR(64) PRIMARY KEY,
+            media_type VARCHAR(16) NOT NULL,
+            file_id VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS telegram_media")
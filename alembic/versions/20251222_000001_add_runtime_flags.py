@@ -0,0 +1,71 @@
+"""Add runtime_flags and runtime_flag_changes.
+
+Revision ID: 20251222_000001
+Revises: 20251221_000001
+Create Date: 2025-12-22
+
+Cluster-wide operational switches (blockchain maintenance mode, emergency
+stops) with an audit trail of every flip. The emergency stops previously
+kept in global_settings are carried over.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251222_000001"
+down_revision = "20251221_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS runtime_flags (
+            name VARCHAR(64) PRIMARY KEY,
+            enabled BOOLEAN NOT NULL DEFAULT false,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_by VARCHAR(64),
+            reason TEXT
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS runtime_flag_changes (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(64) NOT NULL,
+            old_value BOOLEAN NOT NULL,
+            new_value BOOLEAN NOT NULL,
+            changed_by VARCHAR(64),
+            reason TEXT,
+            source VARCHAR(128),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_runtime_flag_changes_name_created
+        ON runtime_flag_changes (name, created_at)
+    """)
+
+    # Carry over emergency stops from global_settings
+    op.execute("""
+        INSERT INTO runtime_flags (name, enabled, updated_by, reason)
+        SELECT flag.name, flag.enabled, 'migration', 'From global_settings'
+        FROM (
+            SELECT emergency_stop_deposits, emergency_stop_withdrawals,
+                   emergency_stop_roi
+            FROM global_settings
+            ORDER BY id
+            LIMIT 1
+        ) gs
+        CROSS JOIN LATERAL (VALUES
+            ('emergency_stop_deposits', gs.emergency_stop_deposits),
+            ('emergency_stop_withdrawals', gs.emergency_stop_withdrawals),
+            ('emergency_stop_roi', gs.emergency_stop_roi)
+        ) AS flag(name, enabled)
+        ON CONFLICT (name) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS runtime_flag_changes")
+    op.execute("DROP TABLE IF EXISTS runtime_flags")
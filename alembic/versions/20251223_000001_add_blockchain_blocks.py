@@ -0,0 +1,45 @@
+"""Add blockchain_blocks and blockchain_tx_cache.block_hash.
+
+Revision ID: 20251223_000001
+Revises: 20251222_000001
+Create Date: 2025-12-23
+
+Hashes of recently ingested blocks for reorg detection. Cached
+transfers keep the hash of their block and stay "pending" until they
+are below the confirmation watermark.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251223_000001"
+down_revision = "20251222_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS blockchain_blocks (
+            number BIGINT PRIMARY KEY,
+            hash VARCHAR(66) NOT NULL,
+            parent_hash VARCHAR(66),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        ALTER TABLE blockchain_tx_cache
+        ADD COLUMN IF NOT EXISTS block_hash VARCHAR(66)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_blockchain_tx_cache_pending
+        ON blockchain_tx_cache (block_number)
+        WHERE status = 'pending'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_blockchain_tx_cache_pending")
+    op.execute("ALTER TABLE blockchain_tx_cache DROP COLUMN IF EXISTS block_hash")
+    op.execute("DROP TABLE IF EXISTS blockchain_blocks")
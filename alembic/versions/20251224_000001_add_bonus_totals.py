@@ -0,0 +1,131 @@
+"""Add bonus_totals maintained by a trigger on bonus_credits.
+
+Revision ID: 20251224_000001
+Revises: 20251223_000001
+Create Date: 2025-12-24
+
+One row with all-time bonus counters (granted count and amount, active
+count). A statement-level trigger on bonus_credits applies the delta of
+every write (transition tables, so a bulk ROI accrual costs one update)
+inside the writing transaction; statements that change none of the
+counters do not touch the row. bonus_credits.amount is written once.
+
+Also indexes bonus_credits.created_at for the last-24h grant sum.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251224_000001"
+down_revision = "20251223_000001"
+branch_labels = None
+depends_on = None
+
+
+# Apply counter deltas of signed bonus rows
+_TOTALS_DELTA = """
+        UPDATE bonus_totals t SET
+            total_count = t.total_count + d.total_count,
+            total_granted = t.total_granted + d.total_granted,
+            active_count = t.active_count + d.active_count,
+            updated_at = now()
+        FROM (
+            SELECT
+                COALESCE(SUM(sign), 0) AS total_count,
+                COALESCE(SUM(sign * amount), 0) AS total_granted,
+                COALESCE(SUM(sign) FILTER (WHERE is_active), 0)
+                    AS active_count
+            FROM ({rows}) r
+        ) d
+        WHERE t.id = 1
+          AND (d.total_count <> 0 OR d.total_granted <> 0
+               OR d.active_count <> 0);
+"""
+
+_NEW_ROWS = "SELECT amount, is_active, 1 AS sign FROM new_rows"
+_OLD_ROWS = "SELECT amount, is_active, -1 AS sign FROM old_rows"
+_CHANGED_ROWS = f"{_NEW_ROWS} UNION ALL {_OLD_ROWS}"
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bonus_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_count BIGINT NOT NULL DEFAULT 0,
+            total_granted DECIMAL(24, 8) NOT NULL DEFAULT 0,
+            active_count BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bonus_credits_created_at
+        ON bonus_credits (created_at)
+    """)
+
+    # Block writers until the trigger and backfill are in place
+    op.execute("LOCK TABLE bonus_credits IN SHARE ROW EXCLUSIVE MODE")
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bonus_totals_on_credits()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_TOTALS_DELTA.format(rows=_NEW_ROWS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_TOTALS_DELTA.format(rows=_OLD_ROWS)}
+            ELSE
+                {_TOTALS_DELTA.format(rows=_CHANGED_ROWS)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_bonus_totals_insert
+        AFTER INSERT ON bonus_credits
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bonus_totals_on_credits()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_bonus_totals_update
+        AFTER UPDATE ON bonus_credits
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bonus_totals_on_credits()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_bonus_totals_delete
+        AFTER DELETE ON bonus_credits
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bonus_totals_on_credits()
+    """)
+
+    # Backfill from existing rows
+    op.execute("DELETE FROM bonus_totals")
+    op.execute("""
+        INSERT INTO bonus_totals (
+            id, total_count, total_granted, active_count
+        )
+        SELECT
+            1,
+            COUNT(*),
+            COALESCE(SUM(amount), 0),
+            COUNT(*) FILTER (WHERE is_active)
+        FROM bonus_credits
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_bonus_totals_delete ON bonus_credits"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_bonus_totals_update ON bonus_credits"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_bonus_totals_insert ON bonus_credits"
+    )
+    op.execute("DROP FUNCTION IF EXISTS bonus_totals_on_credits()")
+    op.execute("DROP INDEX IF EXISTS idx_bonus_credits_created_at")
+    op.execute("DROP TABLE IF EXISTS bonus_totals")
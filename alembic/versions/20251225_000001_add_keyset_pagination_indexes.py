@@ -0,0 +1,35 @@
+"""Add keyset pagination indexes.
+
+Revision ID: 20251225_000001
+Revises: 20251224_000001
+Create Date: 2025-12-25
+
+BaseRepository.find_keyset pages by (created_at, id) descending. Without
+a composite index every page sorts the whole table; with it a page is an
+index range scan (read backwards) of `limit` rows, at any depth.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251225_000001"
+down_revision = "20251224_000001"
+branch_labels = None
+depends_on = None
+
+
+_TABLES = ("users", "transactions")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at_id "
+            f"ON {table} (created_at, id)"
+        )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_created_at_id")
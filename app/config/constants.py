@@ -29,10 +29,62 @@ BLOCKCHAIN_WS_MAX_RECONNECT_ATTEMPTS = 10  # Maximum WebSocket reconnection atte
 RPC_MAX_CONCURRENT = 10  # Maximum concurrent RPC calls
 RPC_MAX_RPS = 25  # Maximum requests per second
 
+# RPC provider routing (rolling latency / error scoring, hedged reads)
+RPC_HEALTH_WINDOW = 50  # Recent calls per provider in the rolling score
+RPC_HEDGE_DELAY = 0.75  # Read also sent to the next provider when slower (seconds)
+RPC_ERROR_PENALTY = 10  # Score multiplier per error rate (10% errors doubles it)
+RPC_BREAKER_FAILURES = 5  # Consecutive failures opening a provider's circuit
+RPC_BREAKER_RECOVERY_SECONDS = 30  # Open circuit probed again after (seconds)
+RPC_MANUAL_ONLY_PROVIDERS = ("nodereal2",)  # Routed to automatically only as last resort
+RPC_BROADCAST_DEDUP_TTL = 300  # Same signed transaction not re-broadcast within (seconds)
+
 # Blockchain scanning limits
 BLOCKCHAIN_MAX_SEARCH_BLOCKS = 100000  # Maximum blocks to search in deposit operations
 BLOCKCHAIN_SCAN_MAX_BLOCKS = 50000  # Maximum blocks per deposit scan (reduced to avoid RPC limits)
 
+# Payout batch sending (consecutive nonces)
+BSC_BLOCK_TIME_SECONDS = 3.0  # Average BSC block time
+PAYOUT_NONCE_RECONCILE_INTERVAL = 60.0  # Full pending/latest nonce check interval (seconds)
+PAYOUT_GAS_PRICE_CACHE_TTL = BSC_BLOCK_TIME_SECONDS  # Gas price is reused within one block
+PAYOUT_BATCH_MAX_SIZE = 50  # Maximum withdrawal payouts coalesced into one batch
+PAYOUT_BATCH_WINDOW = 0.5  # Seconds concurrent payouts are collected before sending
+PAYOUT_RECEIPT_TIMEOUT = 90.0  # Receipts of a batch are tracked this long
+PAYOUT_RECEIPT_POLL_INTERVAL = BSC_BLOCK_TIME_SECONDS  # One receipt poll per block
+PAYOUT_STUCK_AFTER = 30.0  # Unmined this long: replace with a higher gas price
+PAYOUT_REPLACEMENT_GAS_BUMP_PERCENT = 15  # Nodes require >= 10% bump to replace a pending tx
+
+# Multisend payouts (one contract call per batch)
+PAYOUT_MULTISEND_RECEIPT_TIMEOUT = 120.0  # Wait for the batch receipt before verifying legs
+PAYOUT_MULTISEND_LOOKBACK_BLOCKS = 28800  # ~1 day on BSC: search window for already paid legs
+
+# Wallet view snapshots (balances and token history cached in Redis)
+WALLET_SNAPSHOT_BLOCK_BUCKET = 20  # ~1 min on BSC: blocks sharing one balance snapshot
+WALLET_SNAPSHOT_HEAD_TTL = BSC_BLOCK_TIME_SECONDS  # Chain head is reused within one block
+WALLET_HISTORY_REORG_DEPTH = 15  # Recent blocks re-fetched when extending cached history
+WALLET_HISTORY_KEEP = 100  # Transfers kept per token and direction
+WALLET_HISTORY_TTL = 86400  # Cached history of inactive wallets expires after 1 day
+
+# Chain head tracker (one process publishes new blocks to a Redis stream)
+CHAIN_HEAD_POLL_INTERVAL = 1.0  # eth_getBlockByNumber polling without websocket
+CHAIN_HEAD_STREAM_MAXLEN = 10000  # ~8 hours of BSC blocks kept in the stream
+CHAIN_HEAD_LATEST_TTL = 30  # Published head expires if the tracker stops
+CHAIN_HEAD_MAX_BACKFILL = 100  # Missed heights fetched after a gap
+CHAIN_HEAD_LEADER_TTL = 15  # Leader lease of the tracker (seconds)
+CHAIN_HEAD_WS_RETRY_SECONDS = 60  # Polling period before retrying the websocket
+CHAIN_HEAD_LOCAL_CACHE_SECONDS = 1.0  # In-process reuse of the published head
+
+# Reorg protection of ingested transfers (confirmation depth is
+# settings.blockchain_confirmation_depth)
+CHAIN_REORG_WINDOW = 200  # Recent ingested block hashes kept and rechecked
+
+# Gas price oracle (fee history sampled once per block, shared via Redis)
+GAS_ORACLE_WINDOW_BLOCKS = 20  # ~1 min of BSC blocks per fee history sample
+GAS_ORACLE_PERCENTILES = (10, 50, 90)  # Slow / standard / fast tip percentiles
+GAS_ORACLE_TTL = BSC_BLOCK_TIME_SECONDS  # Sample reused within one block (without the tracker)
+GAS_ORACLE_STALE_TTL = 60  # Last sample served while another process resamples
+GAS_ORACLE_SAMPLE_LOCK_TTL = 10  # One process samples per block
+GAS_LIMIT_MEMO_TTL = 21600  # Standard USDT transfer gas limit re-probed every 6 hours
+
 # Distributed lock settings
 DISTRIBUTED_LOCK_TIMEOUT = 30  # Lock timeout in seconds
 DISTRIBUTED_LOCK_BLOCKING_TIMEOUT = 5.0  # Time to wait for lock acquisition
@@ -51,6 +103,17 @@ TELEGRAM_MESSAGE_DELAY = 0.1  # 100ms between messages (10 msg/sec)
 TELEGRAM_BATCH_DELAY = 1.0    # 1 second between batches
 TELEGRAM_BATCH_SIZE = 20      # Messages per batch before additional delay
 
+# Bulk delivery queue (hourly balance notifications)
+TELEGRAM_DELIVERY_RATE = 25  # Messages per second (Telegram allows ~30 per bot)
+TELEGRAM_DELIVERY_WORKERS = 8  # Concurrent sends, hide API latency under the rate
+TELEGRAM_DELIVERY_MAX_ATTEMPTS = 3  # Sends per message when flood control hits
+TELEGRAM_MAX_RETRY_AFTER = 60  # Cap on one flood control pause (seconds)
+TELEGRAM_DELIVERY_RUN_TTL = 7200  # Delivered set lifetime per run (resume window)
+
+# PostgreSQL FSM storage (fallback when Redis is down)
+FSM_CACHE_SIZE = 10000  # Users with state/data kept in memory
+FSM_FLUSH_INTERVAL = 1.0  # Seconds between bulk upserts of changed states
+
 # ========================================================================
 # RETRY SERVICE CONSTANTS
 # ========================================================================
@@ -88,12 +151,71 @@ ADMIN_LOGIN_WINDOW_SECONDS = 3600  # Rate limiting window (1 hour)
 # ========================================================================
 
 # User message logging
-USER_MESSAGE_LOG_MAX_MESSAGES = 500  # Maximum messages to store per user
+USER_MESSAGE_LOG_MAX_MESSAGES = 500  # Maximum messages shown per user
+
+# Admin user search (pg_trgm indexes on username, wallet, referral code)
+USER_SEARCH_LIMIT = 10  # Results returned by a search
+USER_SEARCH_MIN_PARTIAL_LENGTH = 3  # Shorter terms only match exactly
+
+# ARIA tool quotas (sliding windows shared by all processes via Redis)
+ARIA_TOOL_HOURLY_BUDGET = 1000  # Weighted tool cost per admin per hour
+ARIA_TOOL_DAILY_BUDGET = 5000  # Weighted tool cost per admin per day
+
+# Append-only tables range-partitioned by month on created_at (database
+# primary key is (id, created_at)), with retention in days: a partition is
+# removed once its whole month is older, see PartitionMaintenanceService
+PARTITIONED_TABLES = {
+    "user_message_logs": 90,
+    "user_actions": 7,
+    "user_activities": 30,
+    "admin_actions": 30,
+}
+# Tables whose expired partitions are detached (kept as standalone tables
+# for archiving) instead of dropped, with the days a detached partition is
+# kept past the table's retention before it is dropped as well
+PARTITION_ARCHIVED_TABLES = {
+    "admin_actions": 365,
+}
+PARTITION_MONTHS_AHEAD = 3  # Future monthly partitions kept created
+
+# Admin data exports (/export)
+EXPORT_CHUNK_ROWS = 1000  # Rows fetched per server-side cursor batch
+EXPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Kept in memory below this size
+EXPORT_PROGRESS_INTERVAL_SECONDS = 3  # Min interval between progress edits
+EXPORT_MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # Telegram Bot API upload limit
+
+# Telegram media cache (file_ids of uploaded QR codes / images)
+MEDIA_CACHE_REDIS_TTL = 30 * 86400  # Redis copy; telegram_media keeps it
+
+# CPU offload pool (bcrypt, Fernet, QR, XLSX/CSV off the event loop)
+CPU_OFFLOAD_MAX_WORKERS = 4  # Worker threads
+CPU_OFFLOAD_MAX_PENDING = 64  # Calls queued or running before callers wait
+CPU_OFFLOAD_QUEUE_TIMEOUT = 10.0  # Max seconds to wait for admission
+CPU_OFFLOAD_SLOW_WAIT_SECONDS = 1.0  # Queue wait logged as a warning
+CPU_OFFLOAD_DEFAULT_KIND_LIMIT = 2  # Concurrency cap of unlisted kinds
+CPU_OFFLOAD_KIND_LIMITS = {
+    "bcrypt": 2,  # Password checks must not starve behind reports
+    "fernet": 4,
+    "qr": 2,
+    "xlsx": 1,  # User reports
+    "export": 1,  # Admin exports (one chunk at a time per export)
+}
+
+# Runtime operational flags (runtime_flags table, shared by all processes)
+RUNTIME_FLAGS = {
+    "blockchain_maintenance_mode": "Blockchain operations paused (nodes down)",
+    "emergency_stop_deposits": "Emergency stop for all new deposits",
+    "emergency_stop_withdrawals": "Emergency stop for all withdrawals",
+    "emergency_stop_roi": "Emergency stop for all ROI accruals",
+}
+RUNTIME_FLAGS_MAX_AGE_SECONDS = 5.0  # Snapshot reloaded when older (bounds staleness)
+RUNTIME_FLAGS_CHANNEL = "runtime_flags:changed"  # Redis pub/sub push invalidation
 
 # Balance notifications (arbitrage operations display)
 BALANCE_NOTIF_MIN_OPERATIONS = 181  # Minimum operations per hour (avoid round 180)
 BALANCE_NOTIF_MAX_OPERATIONS = 299  # Maximum operations per hour (avoid round 300)
 BALANCE_NOTIF_OPERATIONS_MEAN_SHIFT = 0.7  # Shift distribution towards max (0.5=center, 1.0=max)
+BALANCE_NOTIF_STATS_CHUNK = 5000  # Users per grouped partner statistics query
 
 # ========================================================================
 # ERROR MONITORING & LOGGING CONSTANTS
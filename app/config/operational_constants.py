@@ -32,6 +32,15 @@ BLOCKING_TIMEOUT_SHORT = 3.0
 BLOCKING_TIMEOUT_DEFAULT = 5.0
 BLOCKING_TIMEOUT_LONG = 10.0
 
+# Longest wait between acquisition attempts of a blocked Redis lock.
+# Waiters are woken by the release notification; this only bounds the
+# delay if a notification is lost (e.g. Redis failover).
+LOCK_WAKEUP_MAX_WAIT = 1.0
+
+# Idle lifetime of a lock's fencing counter (30 days). The counter only
+# restarts after a key was unused this long, when no old holder is alive.
+LOCK_FENCE_TTL = 30 * 24 * 3600
+
 
 # =============================================================================
 # RETRY CONFIGURATIONS
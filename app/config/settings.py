@@ -103,8 +103,20 @@ class Settings(BaseSettings):
     blockchain_poll_interval: int = Field(
         default=3, ge=1, description="Blockchain event polling interval in seconds"
     )
+    # Blocks on top of a transfer before deposits and PLEX payments
+    # based on it are finalized (reorg protection)
+    blockchain_confirmation_depth: int = Field(
+        default=15, ge=1, description="Confirmations required for finality"
+    )
     # Payout wallet (optional, defaults to wallet_address)
     payout_wallet_address: str | None = None
+    # Multisend payouts: batch withdrawals into one contract call
+    # (contracts/MultiTransfer.vy, payout wallet must approve it for USDT)
+    payout_multisend_enabled: bool = Field(
+        default=False,
+        description="Pay batched withdrawals via the multisend contract"
+    )
+    payout_multisend_contract_address: str | None = None
 
     # NOTE: Deposit levels configuration moved to app/config/business_constants.py
     # This is the single source of truth for deposit corridors and amounts.
@@ -141,7 +153,9 @@ class Settings(BaseSettings):
         default=5.0, gt=0, le=10.0, description="ROI cap multiplier"
     )
 
-    # Blockchain maintenance mode (R7-5)
+    # Blockchain maintenance mode (R7-5). Emergency stops and maintenance
+    # mode are switched at runtime via app/services/runtime_flags.py; these
+    # environment values only force a flag on
     blockchain_maintenance_mode: bool = Field(
         default=False,
         description="Blockchain maintenance mode flag"
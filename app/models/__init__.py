@@ -14,6 +14,7 @@ from app.models.base import Base
 
 # Security Models
 from app.models.blacklist import Blacklist
+from app.models.blockchain_block import BlockchainBlock
 from app.models.blockchain_sync_state import BlockchainSyncState
 
 # Blockchain Cache
@@ -21,11 +22,13 @@ from app.models.blockchain_tx_cache import BlockchainTxCache
 
 # Bonus Credits
 from app.models.bonus_credit import BonusCredit
+from app.models.bonus_totals import BonusTotals
 from app.models.deposit import Deposit
 from app.models.deposit_corridor_history import DepositCorridorHistory
 from app.models.deposit_level_config import DepositLevelConfig
 from app.models.deposit_level_version import DepositLevelVersion
 from app.models.deposit_reward import DepositReward
+from app.models.distributed_lock_fence import DistributedLockFence
 from app.models.enums import (
     SupportCategory,
     SupportSender,
@@ -43,6 +46,7 @@ from app.models.financial_password_recovery import (
 
 # System Models
 from app.models.global_settings import GlobalSettings
+from app.models.ledger_rollup import LedgerDayTotal, LedgerRollup
 from app.models.notification_queue_fallback import NotificationQueueFallback
 
 # КРИТИЧНЫЕ модели из PART5
@@ -50,9 +54,11 @@ from app.models.payment_retry import PaymentRetry, PaymentType
 from app.models.plex_payment import PlexPaymentRequirement, PlexPaymentStatus
 from app.models.referral import Referral
 from app.models.referral_earning import ReferralEarning
+from app.models.referral_stats import ReferralStats
 
 # Reward Models
 from app.models.reward_session import RewardSession
+from app.models.runtime_flag import RuntimeFlag, RuntimeFlagChange
 
 # Sponsor Inquiry Models
 from app.models.sponsor_inquiry import (
@@ -64,6 +70,7 @@ from app.models.support_message import SupportMessage
 
 # Support Models
 from app.models.support_ticket import SupportTicket
+from app.models.telegram_media import TelegramMedia
 from app.models.transaction import Transaction
 
 # Core Models
@@ -105,8 +112,10 @@ __all__ = [
     # Blockchain Cache
     "BlockchainTxCache",
     "BlockchainSyncState",
+    "BlockchainBlock",
     # Bonus Credits
     "BonusCredit",
+    "BonusTotals",
     # Admin Models
     "Admin",
     "AdminAction",
@@ -121,6 +130,7 @@ __all__ = [
     "RewardSession",
     "DepositReward",
     "ReferralEarning",
+    "ReferralStats",
     # PART5 Critical Models
     "PaymentRetry",
     "PlexPaymentRequirement",
@@ -139,7 +149,13 @@ __all__ = [
     "SponsorInquiryMessage",
     "SponsorInquiryStatus",
     # System Models
+    "DistributedLockFence",
     "GlobalSettings",
+    "LedgerRollup",
+    "LedgerDayTotal",
+    "RuntimeFlag",
+    "RuntimeFlagChange",
+    "TelegramMedia",
     "UserAction",
     "UserActivity",
     "ActivityType",
@@ -0,0 +1,49 @@
+"""
+Blockchain Block model.
+
+Hashes of recently ingested blocks, used to detect chain
+reorganizations under the transaction cache.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class BlockchainBlock(Base):
+    """
+    Ingested block.
+
+    Recorded for every block whose transfers were cached and for the
+    last block of every sync range. Rechecked against the chain by
+    ChainReorgGuard (app/services/blockchain/reorg_guard.py); only the
+    last CHAIN_REORG_WINDOW blocks are kept.
+
+    Attributes:
+        number: Block number (primary key)
+        hash: Block hash at ingestion
+        parent_hash: Parent hash (None if only known from a log)
+        created_at: Ingestion time
+    """
+
+    __tablename__ = "blockchain_blocks"
+
+    number: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=False
+    )
+    hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    parent_hash: Mapped[str | None] = mapped_column(
+        String(66), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<BlockchainBlock(number={self.number}, hash={self.hash[:10]})>"
@@ -47,6 +47,9 @@ class BlockchainTxCache(Base):
     block_number: Mapped[int] = mapped_column(
         BigInteger, nullable=False, index=True
     )
+    block_hash: Mapped[str | None] = mapped_column(
+        String(66), nullable=True
+    )
     block_timestamp: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
@@ -83,7 +86,7 @@ class BlockchainTxCache(Base):
     # Status
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, default="confirmed"
-    )  # pending, confirmed, failed
+    )  # pending (above the confirmation watermark), confirmed, failed
     confirmations: Mapped[int | None] = mapped_column(
         Integer, nullable=True
     )
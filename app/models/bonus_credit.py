@@ -62,6 +62,7 @@ class BonusCredit(Base):
     __table_args__ = (
         Index("idx_bonus_credits_user_active", "user_id", "is_active"),
         Index("idx_bonus_credits_admin", "admin_id"),
+        Index("idx_bonus_credits_created_at", "created_at"),
     )
 
     # Primary key
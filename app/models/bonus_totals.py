@@ -0,0 +1,57 @@
+"""
+BonusTotals model.
+
+Maintained all-time bonus credit counters for the admin panel.
+"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, BigInteger, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class BonusTotals(Base):
+    """
+    BonusTotals entity - a single row (id = 1).
+
+    Maintained by a statement-level trigger on bonus_credits (see
+    migration 20251224_000001) in the same transaction as the write, so
+    global bonus statistics are a primary-key lookup instead of loading
+    every bonus ever granted. The application only reads it.
+
+    Attributes:
+        id: Always 1
+        total_count: Bonus credits ever granted
+        total_granted: Sum of granted amounts
+        active_count: Bonus credits still active
+        updated_at: Last counter change
+    """
+
+    __tablename__ = "bonus_totals"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    total_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    total_granted: Mapped[Decimal] = mapped_column(
+        DECIMAL(24, 8), nullable=False, default=Decimal("0")
+    )
+    active_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<BonusTotals(total_count={self.total_count}, "
+            f"total_granted={self.total_granted}, "
+            f"active_count={self.active_count})>"
+        )
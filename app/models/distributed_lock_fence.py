@@ -0,0 +1,44 @@
+"""
+DistributedLockFence model.
+
+Fencing counters of PostgreSQL-backed distributed locks.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class DistributedLockFence(Base):
+    """
+    DistributedLockFence entity - one row per lock key.
+
+    Incremented by app/utils/distributed_lock.py on every PostgreSQL
+    advisory lock acquisition, while the lock is held, so each holder
+    gets a fencing token one higher than the previous one.
+
+    Attributes:
+        lock_key: Lock key (primary key)
+        fence: Fencing token of the latest holder
+        updated_at: Last acquisition
+    """
+
+    __tablename__ = "distributed_lock_fences"
+
+    lock_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fence: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<DistributedLockFence(lock_key={self.lock_key!r}, "
+            f"fence={self.fence})>"
+        )
@@ -110,3 +110,16 @@ class FinancialRecoveryStatus(StrEnum):
     APPROVED = "approved"
     REJECTED = "rejected"
     SENT = "sent"
+
+
+class LedgerEntryType(StrEnum):
+    """Ledger rollup entry types (maintained by ledger_rollups triggers)."""
+
+    # Expected side (money flows)
+    DEPOSIT_CONFIRMED = "deposit_confirmed"
+    WITHDRAWAL_CONFIRMED = "withdrawal_confirmed"
+    REFERRAL_PAID = "referral_paid"
+    # Actual side (liabilities)
+    USER_BALANCE = "user_balance"
+    USER_PENDING_EARNINGS = "user_pending_earnings"
+    WITHDRAWAL_PENDING = "withdrawal_pending"
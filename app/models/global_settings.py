@@ -63,7 +63,8 @@ class GlobalSettings(Base):
         JSONB, default=dict, nullable=False
     )
 
-    # Emergency stop flags (R17-3)
+    # Emergency stop flags (R17-3). Superseded by the runtime_flags table
+    # (app/services/runtime_flags.py); kept for rollback only
     emergency_stop_withdrawals: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )
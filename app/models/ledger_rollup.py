@@ -0,0 +1,94 @@
+"""
+Ledger rollup models.
+
+Per-day, per-type ledger deltas for financial reconciliation.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, BigInteger, Date, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LedgerRollup(Base):
+    """
+    LedgerRollup entity - open (not yet closed) daily deltas.
+
+    Maintained by statement-level triggers on deposits, transactions,
+    referral_earnings and users (see migration 20251218_000001): every
+    write adds the change of each reconciliation component to the row
+    of the current UTC day. Rows are striped over slots by backend PID
+    so concurrent writers do not queue on one hot row. Closed days are
+    moved into LedgerDayTotal.
+
+    Attributes:
+        day: UTC day the change was written
+        entry_type: LedgerEntryType value
+        slot: Stripe (pg_backend_pid() % 16)
+        amount: Net amount change
+        entry_count: Net row count change
+    """
+
+    __tablename__ = "ledger_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    entry_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    slot: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    amount: Mapped[Decimal] = mapped_column(
+        DECIMAL(20, 8), nullable=False, default=Decimal("0")
+    )
+    entry_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<LedgerRollup(day={self.day}, entry_type={self.entry_type}, "
+            f"slot={self.slot}, amount={self.amount})>"
+        )
+
+
+class LedgerDayTotal(Base):
+    """
+    LedgerDayTotal entity - one row per closed day and entry type.
+
+    Holds the day's delta and the running total at the end of the day,
+    so totals at any closed day and changes over any range of closed
+    days are primary key lookups.
+
+    Attributes:
+        day: Closed UTC day
+        entry_type: LedgerEntryType value
+        amount: Net amount change during the day
+        entry_count: Net row count change during the day
+        cumulative_amount: Total at the end of the day
+        cumulative_count: Row count at the end of the day
+    """
+
+    __tablename__ = "ledger_day_totals"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    entry_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    amount: Mapped[Decimal] = mapped_column(
+        DECIMAL(20, 8), nullable=False, default=Decimal("0")
+    )
+    entry_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    cumulative_amount: Mapped[Decimal] = mapped_column(
+        DECIMAL(20, 8), nullable=False, default=Decimal("0")
+    )
+    cumulative_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<LedgerDayTotal(day={self.day}, entry_type={self.entry_type}, "
+            f"cumulative_amount={self.cumulative_amount})>"
+        )
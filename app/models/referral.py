@@ -8,7 +8,7 @@ from datetime import UTC, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DECIMAL, DateTime, ForeignKey, Integer
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -19,9 +19,18 @@ if TYPE_CHECKING:
 
 
 class Referral(Base):
-    """Referral model - multi-level referral relationships."""
+    """
+    Referral model - multi-level referral relationships.
+
+    Closure table of the referral tree: one row per (ancestor, user)
+    pair up to REFERRAL_DEPTH levels, written once at registration.
+    """
 
     __tablename__ = "referrals"
+    __table_args__ = (
+        # Closure-table lookup: all ancestors of a user, ordered by level
+        Index("ix_referrals_referral_level", "referral_id", "level"),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
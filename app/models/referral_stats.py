@@ -0,0 +1,92 @@
+"""
+ReferralStats model.
+
+Pre-aggregated per-referrer referral counters.
+"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ReferralStats(Base):
+    """
+    ReferralStats entity - one row per referrer.
+
+    Maintained by database triggers on referrals and referral_earnings
+    (see migration 20251215_000001) in the same transaction as the write,
+    so every code path - including bulk inserts - keeps it exact. The
+    application only reads it; leaderboards and ranks become index scans
+    instead of aggregating the whole referral tree.
+
+    Attributes:
+        referrer_id: Referrer user ID (primary key)
+        direct_count: Level 1 referrals
+        level2_count: Level 2 referrals
+        level3_count: Level 3 referrals
+        total_count: Referrals on all levels
+        total_earned: Sum of all referral earnings
+        paid_earned: Sum of paid earnings
+        pending_earned: Sum of unpaid earnings
+        updated_at: Last counter change
+    """
+
+    __tablename__ = "referral_stats"
+    __table_args__ = (
+        # Top-k leaderboards and rank counting
+        Index(
+            "ix_referral_stats_by_referrals",
+            "total_count", "total_earned",
+        ),
+        Index(
+            "ix_referral_stats_by_earnings",
+            "total_earned", "total_count",
+        ),
+    )
+
+    referrer_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Referral counts
+    direct_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    level2_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    level3_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    total_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    # Earnings
+    total_earned: Mapped[Decimal] = mapped_column(
+        DECIMAL(18, 8), nullable=False, default=Decimal("0")
+    )
+    paid_earned: Mapped[Decimal] = mapped_column(
+        DECIMAL(18, 8), nullable=False, default=Decimal("0")
+    )
+    pending_earned: Mapped[Decimal] = mapped_column(
+        DECIMAL(18, 8), nullable=False, default=Decimal("0")
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<ReferralStats(referrer_id={self.referrer_id}, "
+            f"total_count={self.total_count}, "
+            f"total_earned={self.total_earned})>"
+        )
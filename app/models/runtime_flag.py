@@ -0,0 +1,91 @@
+"""
+RuntimeFlag models.
+
+Cluster-wide operational switches (maintenance mode, emergency stops)
+and the audit trail of their changes.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RuntimeFlag(Base):
+    """
+    RuntimeFlag entity - current state of one operational switch.
+
+    Shared by the bot, worker and scheduler processes; every process
+    reads it from a local snapshot (app/services/runtime_flags.py).
+
+    Attributes:
+        name: Flag name (see RUNTIME_FLAGS, primary key)
+        enabled: Current state
+        updated_at: Last change
+        updated_by: Who changed it (admin id or "system:<component>")
+        reason: Reason of the last change
+    """
+
+    __tablename__ = "runtime_flags"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    enabled: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    updated_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<RuntimeFlag(name={self.name!r}, enabled={self.enabled})>"
+
+
+class RuntimeFlagChange(Base):
+    """
+    RuntimeFlagChange entity - audit record of one flag flip.
+
+    Attributes:
+        id: Primary key
+        name: Flag name
+        old_value: State before the change
+        new_value: State after the change
+        changed_by: Who changed it (admin id or "system:<component>")
+        reason: Reason of the change
+        source: Process that made the change (host:pid)
+        created_at: Change timestamp
+    """
+
+    __tablename__ = "runtime_flag_changes"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True
+    )
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    old_value: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    new_value: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    changed_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    source: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_runtime_flag_changes_name_created", "name", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<RuntimeFlagChange(name={self.name!r}, "
+            f"{self.old_value} -> {self.new_value})>"
+        )
@@ -0,0 +1,51 @@
+"""
+TelegramMedia model.
+
+Telegram file_ids of uploaded generated and static media.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class TelegramMedia(Base):
+    """
+    TelegramMedia entity - one row per uploaded asset.
+
+    Durable fallback of the Redis media cache (bot/utils/media_cache.py):
+    an asset is uploaded once and later sent by its file_id.
+
+    Attributes:
+        media_key: Hash of the asset inputs or content (primary key)
+        media_type: Telegram media type (photo, document)
+        file_id: Telegram file_id of the upload
+        created_at: First upload
+        updated_at: Last upload (file_id refreshed)
+    """
+
+    __tablename__ = "telegram_media"
+
+    media_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    media_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    file_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<TelegramMedia(media_key={self.media_key!r}, "
+            f"media_type={self.media_type!r})>"
+        )
@@ -13,6 +13,7 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Text,
 )
@@ -49,6 +50,8 @@ class Transaction(Base):
             'fee >= 0',
             name='check_transaction_fee_non_negative'
         ),
+        # Keyset pagination order (BaseRepository.find_keyset)
+        Index('ix_transactions_created_at_id', 'created_at', 'id'),
     )
 
     # Primary key
@@ -16,6 +16,7 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
@@ -42,6 +43,8 @@ class User(Base):
         CheckConstraint("balance >= 0", name="check_user_balance_non_negative"),
         CheckConstraint("total_earned >= 0", name="check_user_total_earned_non_negative"),
         CheckConstraint("pending_earnings >= 0", name="check_user_pending_earnings_non_negative"),
+        # Keyset pagination order (BaseRepository.find_keyset)
+        Index("ix_users_created_at_id", "created_at", "id"),
     )
 
     # Primary key
@@ -25,7 +25,7 @@ class UserAction(Base):
     Audit log for user actions:
     - Action tracking
     - IP address logging
-    - TTL: 7 days (auto-deleted by cleanup job)
+    - TTL: 7 days (expired monthly partitions dropped by cleanup job)
 
     Attributes:
         id: Primary key
@@ -7,7 +7,7 @@ R11-2: Fallback storage for FSM states in PostgreSQL when Redis is unavailable.
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -22,13 +22,19 @@ class UserFsmState(Base):
     User FSM state storage.
 
     R11-2: Stores FSM states in PostgreSQL as fallback when Redis is unavailable.
+    One row per Telegram user, upserted by telegram_id (user_id is not
+    set by the FSM storage; users may not be registered yet).
     """
 
     __tablename__ = "user_fsm_states"
+    __table_args__ = (
+        Index("uq_user_fsm_states_telegram_id", "telegram_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False, index=True
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=True, index=True
     )
     state: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -43,4 +49,4 @@ class UserFsmState(Base):
     )
 
     # Relationship
-    user: Mapped["User"] = relationship("User", back_populates="fsm_states")
+    user: Mapped["User | None"] = relationship("User", back_populates="fsm_states")
@@ -23,10 +23,9 @@ class UserMessageLog(Base):
     UserMessageLog entity.
 
     Stores user text messages for admin monitoring:
-    - Last 500 messages per user (auto-cleanup)
+    - Kept for the partition retention window (auto-cleanup)
     - Text content only (no buttons/callbacks)
     - Timestamp for ordering
-    - Auto-cleanup by service
 
     Attributes:
         id: Primary key
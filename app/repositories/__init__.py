@@ -37,6 +37,10 @@ from app.repositories.financial_password_recovery_repository import (
 from app.repositories.global_settings_repository import (
     GlobalSettingsRepository,
 )
+from app.repositories.ledger_rollup_repository import (
+    LedgerRollupRepository,
+)
+from app.repositories.partition_repository import PartitionRepository
 
 # PART5 Critical Repositories
 from app.repositories.payment_retry_repository import (
@@ -46,11 +50,17 @@ from app.repositories.referral_earning_repository import (
     ReferralEarningRepository,
 )
 from app.repositories.referral_repository import ReferralRepository
+from app.repositories.referral_stats_repository import (
+    ReferralStatsRepository,
+)
 
 # Reward Repositories
 from app.repositories.reward_session_repository import (
     RewardSessionRepository,
 )
+from app.repositories.runtime_flag_repository import (
+    RuntimeFlagRepository,
+)
 from app.repositories.support_message_repository import (
     SupportMessageRepository,
 )
@@ -59,6 +69,9 @@ from app.repositories.support_message_repository import (
 from app.repositories.support_ticket_repository import (
     SupportTicketRepository,
 )
+from app.repositories.telegram_media_repository import (
+    TelegramMediaRepository,
+)
 from app.repositories.transaction_repository import (
     TransactionRepository,
 )
@@ -86,6 +99,11 @@ __all__ = [
     "DepositLevelVersionRepository",
     "TransactionRepository",
     "ReferralRepository",
+    "ReferralStatsRepository",
+    "LedgerRollupRepository",
+    "PartitionRepository",
+    "RuntimeFlagRepository",
+    "TelegramMediaRepository",
     "UserNotificationSettingsRepository",
     # Admin
     "AdminRepository",
@@ -4,9 +4,12 @@ Base repository.
 Generic CRUD operations for all repositories.
 """
 
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import Select, delete, func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import Base
@@ -14,6 +17,145 @@ from app.models.base import Base
 
 # Generic type for model
 ModelType = TypeVar("ModelType", bound=Base)
+ItemType = TypeVar("ItemType")
+
+# Below this estimated size an exact COUNT(*) is cheap enough
+EXACT_COUNT_THRESHOLD = 10_000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+@dataclass
+class KeysetPage(Generic[ItemType]):
+    """
+    One page of a keyset-paginated listing.
+
+    Attributes:
+        items: Page items in listing order
+        first_cursor: Cursor of the first item (load previous page before it)
+        last_cursor: Cursor of the last item (load next page after it)
+        has_prev: Whether a previous page exists
+        has_next: Whether a next page exists
+    """
+
+    items: list[ItemType]
+    first_cursor: str | None
+    last_cursor: str | None
+    has_prev: bool
+    has_next: bool
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode sort key values as a short cursor string.
+
+    Fits Telegram callback_data (64 bytes) for (created_at, id) keys.
+
+    Args:
+        values: Sort key values (datetimes and ints)
+
+    Returns:
+        Cursor string
+    """
+    parts = []
+    for value in values:
+        if isinstance(value, datetime):
+            aware = value.tzinfo is not None
+            moment = value if aware else value.replace(tzinfo=UTC)
+            micros = (moment - _EPOCH) // timedelta(microseconds=1)
+            parts.append(f"{'t' if aware else 'n'}{micros}")
+        elif isinstance(value, int):
+            parts.append(f"i{value}")
+        else:
+            raise TypeError(f"Unsupported cursor value: {value!r}")
+    return "_".join(parts)
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    values: list[Any] = []
+    for part in cursor.split("_"):
+        kind, number = part[:1], int(part[1:])
+        if kind == "i":
+            values.append(number)
+        elif kind in ("t", "n"):
+            moment = _EPOCH + timedelta(microseconds=number)
+            values.append(moment if kind == "t" else moment.replace(tzinfo=None))
+        else:
+            raise ValueError(f"Malformed cursor: {cursor!r}")
+    return values
+
+
+async def keyset_paginate(
+    session: AsyncSession,
+    stmt: Select,
+    keys: Sequence[Any],
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = 10,
+) -> KeysetPage:
+    """
+    Load one page of a listing ordered by keys, newest first.
+
+    Pages continue from the cursor of the neighbouring page's edge item
+    (WHERE (keys) < cursor), so every page costs the same index range
+    scan regardless of depth, unlike OFFSET.
+
+    Args:
+        session: Database session
+        stmt: Select of one entity, or of columns including the keys
+        keys: Sort columns, descending; the last one must be unique
+        after: Load the page after this cursor (next page)
+        before: Load the page before this cursor (previous page)
+        limit: Page size
+
+    Returns:
+        KeysetPage with entities (or rows) and edge cursors
+    """
+    if after and before:
+        raise ValueError("Pass either after or before, not both")
+
+    cursor = after or before
+    if cursor:
+        bound = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(
+            tuple_(*keys) < bound if after else tuple_(*keys) > bound
+        )
+    order = [key.asc() if before else key.desc() for key in keys]
+    stmt = stmt.order_by(None).order_by(*order).limit(limit + 1)
+
+    result = await session.execute(stmt)
+    if len(stmt.column_descriptions) == 1:
+        items = list(result.scalars().all())
+    else:
+        items = list(result.all())
+
+    more = len(items) > limit
+    items = items[:limit]
+    if before:
+        items.reverse()
+
+    def item_cursor(item: Any) -> str:
+        return encode_cursor([getattr(item, key.key) for key in keys])
+
+    return KeysetPage(
+        items=items,
+        first_cursor=item_cursor(items[0]) if items else None,
+        last_cursor=item_cursor(items[-1]) if items else None,
+        has_prev=more if before else bool(after),
+        has_next=True if before else more,
+    )
 
 
 class BaseRepository(Generic[ModelType]):
@@ -264,3 +406,57 @@ class BaseRepository(Generic[ModelType]):
         items = list(result.scalars().all())
 
         return items, total
+
+    async def find_keyset(
+        self,
+        after: str | None = None,
+        before: str | None = None,
+        limit: int = 10,
+        order_by: Sequence[Any] | None = None,
+        **filters: Any,
+    ) -> KeysetPage[ModelType]:
+        """
+        Find entities page by page with keyset pagination.
+
+        Args:
+            after: Load the page after this cursor (next page)
+            before: Load the page before this cursor (previous page)
+            limit: Page size
+            order_by: Sort columns, descending (default: created_at, id)
+            **filters: Column filters
+
+        Returns:
+            KeysetPage of entities
+        """
+        keys = order_by or (self.model.created_at, self.model.id)
+        return await keyset_paginate(
+            self.session,
+            select(self.model).filter_by(**filters),
+            keys,
+            after=after,
+            before=before,
+            limit=limit,
+        )
+
+    async def estimate_count(self) -> int:
+        """
+        Estimate the number of rows from planner statistics.
+
+        Reads pg_class.reltuples (kept current by autovacuum) instead of
+        scanning the table; small or never analyzed tables are counted
+        exactly.
+
+        Returns:
+            Approximate row count
+        """
+        result = await self.session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": self.model.__tablename__},
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate < EXACT_COUNT_THRESHOLD:
+            return await self.count()
+        return estimate
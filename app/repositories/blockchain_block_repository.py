@@ -0,0 +1,100 @@
+"""
+Blockchain Block repository.
+
+Data access layer for hashes of ingested blocks.
+"""
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blockchain_block import BlockchainBlock
+from app.repositories.base import BaseRepository
+
+
+class BlockchainBlockRepository(BaseRepository[BlockchainBlock]):
+    """Repository for ingested block hashes."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository."""
+        super().__init__(BlockchainBlock, session)
+
+    async def get_recent(self, limit: int) -> list[BlockchainBlock]:
+        """
+        Get the most recently ingested blocks.
+
+        Args:
+            limit: Max blocks
+
+        Returns:
+            Blocks, highest number first
+        """
+        result = await self.session.execute(
+            select(BlockchainBlock)
+            .order_by(BlockchainBlock.number.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def record(
+        self,
+        number: int,
+        block_hash: str,
+        parent_hash: str | None = None,
+    ) -> None:
+        """
+        Record the hash of an ingested block.
+
+        A block already recorded keeps its hash (a different hash at the
+        same height is a reorg, found when the block is rechecked); a
+        missing parent hash is filled in.
+
+        Args:
+            number: Block number
+            block_hash: Block hash
+            parent_hash: Parent hash, if known
+        """
+        stmt = pg_insert(BlockchainBlock).values(
+            number=number, hash=block_hash, parent_hash=parent_hash
+        )
+        if parent_hash is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[BlockchainBlock.number],
+                set_={"parent_hash": parent_hash},
+                where=BlockchainBlock.hash == block_hash,
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[BlockchainBlock.number]
+            )
+        await self.session.execute(stmt)
+
+    async def delete_from(self, number: int) -> int:
+        """
+        Delete blocks at or above a height (orphaned by a reorg).
+
+        Args:
+            number: First orphaned block
+
+        Returns:
+            Number of blocks deleted
+        """
+        result = await self.session.execute(
+            delete(BlockchainBlock).where(BlockchainBlock.number >= number)
+        )
+        return result.rowcount or 0
+
+    async def prune_below(self, number: int) -> int:
+        """
+        Delete blocks below a height (too deep to be rechecked).
+
+        Args:
+            number: Lowest block kept
+
+        Returns:
+            Number of blocks deleted
+        """
+        result = await self.session.execute(
+            delete(BlockchainBlock).where(BlockchainBlock.number < number)
+        )
+        return result.rowcount or 0
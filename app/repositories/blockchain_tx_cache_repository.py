@@ -8,7 +8,7 @@ from datetime import UTC, datetime
 from decimal import Decimal
 
 from loguru import logger
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.blockchain_tx_cache import BlockchainTxCache
@@ -264,6 +264,8 @@ class BlockchainTxCacheRepository(BaseRepository[BlockchainTxCache]):
         amount_raw: str | None = None,
         block_timestamp: datetime | None = None,
         user_id: int | None = None,
+        block_hash: str | None = None,
+        status: str = "confirmed",
     ) -> BlockchainTxCache | None:
         """
         Cache a new transaction (or return existing if duplicate).
@@ -280,6 +282,8 @@ class BlockchainTxCacheRepository(BaseRepository[BlockchainTxCache]):
             amount_raw: Raw wei amount
             block_timestamp: Block timestamp
             user_id: Optional user ID
+            block_hash: Hash of the block (for reorg detection)
+            status: "pending" until below the confirmation watermark
 
         Returns:
             Cached transaction or None if duplicate
@@ -291,6 +295,7 @@ class BlockchainTxCacheRepository(BaseRepository[BlockchainTxCache]):
         values = {
             "tx_hash": normalized_hash,
             "block_number": block_number,
+            "block_hash": block_hash,
             "from_address": from_address.lower(),
             "to_address": to_address.lower(),
             "token_type": token_type.upper(),
@@ -300,7 +305,7 @@ class BlockchainTxCacheRepository(BaseRepository[BlockchainTxCache]):
             "direction": direction,
             "block_timestamp": block_timestamp,
             "user_id": user_id,
-            "status": "confirmed",
+            "status": status,
             "is_processed": False,
         }
 
@@ -401,3 +406,42 @@ class BlockchainTxCacheRepository(BaseRepository[BlockchainTxCache]):
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def delete_from_block(
+        self, block_number: int
+    ) -> list[tuple[str, str]]:
+        """
+        Delete transactions at or above a block (orphaned by a reorg).
+
+        Args:
+            block_number: First orphaned block
+
+        Returns:
+            (tx_hash, status) of the deleted transactions
+        """
+        result = await self.session.execute(
+            delete(BlockchainTxCache)
+            .where(BlockchainTxCache.block_number >= block_number)
+            .returning(BlockchainTxCache.tx_hash, BlockchainTxCache.status)
+        )
+        return [(tx_hash, status) for tx_hash, status in result.all()]
+
+    async def confirm_up_to(self, block_number: int) -> int:
+        """
+        Mark pending transactions at or below a block as confirmed.
+
+        Args:
+            block_number: Confirmation watermark
+
+        Returns:
+            Number of transactions confirmed
+        """
+        result = await self.session.execute(
+            update(BlockchainTxCache)
+            .where(
+                BlockchainTxCache.status == "pending",
+                BlockchainTxCache.block_number <= block_number,
+            )
+            .values(status="confirmed", updated_at=datetime.now(UTC))
+        )
+        return result.rowcount or 0
@@ -6,12 +6,25 @@ Data access layer for BonusCredit model.
 
 from datetime import datetime
 from decimal import Decimal
-
-from sqlalchemy import and_, func, select, update
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    and_,
+    case,
+    column,
+    func,
+    literal,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.bonus_credit import BonusCredit
+from app.models.bonus_totals import BonusTotals
 from app.repositories.base import BaseRepository
 
 
@@ -84,29 +97,159 @@ class BonusCreditRepository(BaseRepository[BonusCredit]):
         result = await self.session.execute(query)
         return result.scalar() or Decimal("0")
 
-    async def get_due_for_accrual(self, now: datetime) -> list[BonusCredit]:
+    async def get_due_ids(self, now: datetime) -> list[int]:
         """
-        Get bonus credits due for ROI accrual.
+        Get IDs of bonus credits due for ROI accrual.
 
         Args:
             now: Current datetime
 
         Returns:
-            List of bonus credits ready for accrual
+            Bonus credit IDs (not locked; accrue_roi rechecks them)
         """
-        query = (
-            select(BonusCredit)
-            .where(
-                and_(
-                    BonusCredit.is_active == True,  # noqa: E712
-                    BonusCredit.is_roi_completed == False,  # noqa: E712
-                    BonusCredit.next_accrual_at <= now,
-                )
+        query = select(BonusCredit.id).where(*self._due_conditions(now))
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _due_conditions(now: datetime) -> list[Any]:
+        return [
+            BonusCredit.is_active == True,  # noqa: E712
+            BonusCredit.is_roi_completed == False,  # noqa: E712
+            BonusCredit.next_accrual_at <= now,
+            BonusCredit.roi_cap_amount > BonusCredit.roi_paid_amount,
+        ]
+
+    async def accrue_roi(
+        self,
+        now: datetime,
+        next_accrual_at: datetime,
+        rate: Decimal | None = None,
+        rates: dict[int, Decimal] | None = None,
+    ) -> list[Any]:
+        """
+        Accrue one period of ROI on all due bonus credits in one statement.
+
+        Reward is amount * rate / 100 capped to the remaining ROI. A
+        credit reaching its cap is completed and deactivated, the others
+        move to next_accrual_at. Only credits with next_accrual_at <= now
+        are touched and they leave that set, so re-running in the same
+        accrual window accrues nothing; a concurrent run waits on the row
+        locks and then skips the rows already moved.
+
+        Args:
+            now: Current datetime
+            next_accrual_at: Next accrual time of credits not completed
+            rate: Rate in percent for every due credit
+            rates: Per-credit rates (bonus_id -> percent) instead of rate
+
+        Returns:
+            Rows of (id, user_id, reward, roi_paid_amount, is_roi_completed)
+        """
+        conditions = self._due_conditions(now)
+        if rates is not None:
+            if not rates:
+                return []
+            bonus_rates = values(
+                column("id", Integer),
+                column("rate", Numeric()),
+                name="bonus_rates",
+            ).data(list(rates.items()))
+            rate_expr = bonus_rates.c.rate
+            conditions.append(BonusCredit.id == bonus_rates.c.id)
+        else:
+            rate_expr = literal(rate, Numeric())
+
+        reward = func.least(
+            func.round(BonusCredit.amount * rate_expr / 100, 8),
+            BonusCredit.roi_cap_amount - BonusCredit.roi_paid_amount,
+        )
+        due = (
+            select(BonusCredit.id, reward.label("reward"))
+            .where(*conditions)
+            .with_for_update(of=BonusCredit)
+            .cte("due_bonuses")
+        )
+
+        roi_paid = BonusCredit.roi_paid_amount + due.c.reward
+        completed = roi_paid >= BonusCredit.roi_cap_amount
+        stmt = (
+            update(BonusCredit)
+            .where(BonusCredit.id == due.c.id, due.c.reward > 0)
+            .values(
+                roi_paid_amount=roi_paid,
+                is_roi_completed=completed,
+                is_active=roi_paid < BonusCredit.roi_cap_amount,
+                completed_at=case(
+                    (completed, now), else_=BonusCredit.completed_at
+                ),
+                next_accrual_at=case(
+                    (completed, BonusCredit.next_accrual_at),
+                    else_=next_accrual_at,
+                ),
+            )
+            .returning(
+                BonusCredit.id,
+                BonusCredit.user_id,
+                due.c.reward,
+                BonusCredit.roi_paid_amount,
+                BonusCredit.is_roi_completed,
             )
-            .with_for_update()  # Lock for concurrent processing
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def get_user_stats(self, user_id: int) -> dict[str, Any]:
+        """
+        Get bonus counters of a user with one aggregate query.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dict with total_count, active_count, roi_earned
+        """
+        query = select(
+            func.count(BonusCredit.id),
+            func.count(BonusCredit.id).filter(
+                BonusCredit.is_active == True  # noqa: E712
+            ),
+            func.coalesce(func.sum(BonusCredit.roi_paid_amount), 0),
+        ).where(BonusCredit.user_id == user_id)
+        total_count, active_count, roi_earned = (
+            await self.session.execute(query)
+        ).one()
+        return {
+            "total_count": total_count or 0,
+            "active_count": active_count or 0,
+            "roi_earned": Decimal(roi_earned or 0),
+        }
+
+    async def get_totals(self) -> BonusTotals | None:
+        """
+        Get maintained all-time bonus counters.
+
+        Returns:
+            BonusTotals row (None before the migration backfill)
+        """
+        return await self.session.get(BonusTotals, 1)
+
+    async def get_granted_since(self, since: datetime) -> Decimal:
+        """
+        Get the sum of bonus amounts granted since a time.
+
+        Args:
+            since: Start of the period
+
+        Returns:
+            Sum of granted amounts
+        """
+        query = select(func.coalesce(func.sum(BonusCredit.amount), 0)).where(
+            BonusCredit.created_at >= since
         )
         result = await self.session.execute(query)
-        return list(result.scalars().all())
+        return Decimal(result.scalar() or 0)
 
     async def get_with_user(self, bonus_id: int) -> BonusCredit | None:
         """
@@ -126,42 +269,6 @@ class BonusCreditRepository(BaseRepository[BonusCredit]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def update_roi(
-        self,
-        bonus_id: int,
-        roi_paid_amount: Decimal,
-        next_accrual_at: datetime | None = None,
-        is_completed: bool = False,
-        completed_at: datetime | None = None,
-    ) -> None:
-        """
-        Update ROI tracking fields.
-
-        Args:
-            bonus_id: Bonus credit ID
-            roi_paid_amount: New ROI paid amount
-            next_accrual_at: Next accrual time
-            is_completed: Whether ROI is completed
-            completed_at: Completion timestamp
-        """
-        values = {
-            "roi_paid_amount": roi_paid_amount,
-        }
-        if next_accrual_at is not None:
-            values["next_accrual_at"] = next_accrual_at
-        if is_completed:
-            values["is_roi_completed"] = True
-            values["is_active"] = False
-            if completed_at:
-                values["completed_at"] = completed_at
-
-        stmt = (
-            update(BonusCredit)
-            .where(BonusCredit.id == bonus_id)
-            .values(**values)
-        )
-        await self.session.execute(stmt)
-
     async def cancel(
         self,
         bonus_id: int,
@@ -4,14 +4,18 @@ Deposit repository.
 Data access layer for Deposit model.
 """
 
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.deposit import Deposit
+from app.models.deposit_amount_discrepancy import DepositAmountDiscrepancy
+from app.models.deposit_reward import DepositReward
 from app.models.enums import TransactionStatus
+from app.models.plex_payment import PlexPaymentRequirement
 from app.repositories.base import BaseRepository
 
 
@@ -78,6 +82,30 @@ class DepositRepository(BaseRepository[Deposit]):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_active_roi_book(
+        self,
+    ) -> list[tuple[Decimal, int, Decimal, Decimal]]:
+        """
+        Get ROI state of all active deposits (for liability projection).
+
+        Returns:
+            List of (amount, level, roi_paid_amount, roi_cap_amount)
+        """
+        stmt = (
+            select(
+                Deposit.amount,
+                Deposit.level,
+                Deposit.roi_paid_amount,
+                Deposit.roi_cap_amount,
+            )
+            .where(Deposit.is_roi_completed == False)  # noqa: E712
+            .where(
+                Deposit.status == TransactionStatus.CONFIRMED.value
+            )
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def get_by_level(
         self, user_id: int, level: int
     ) -> list[Deposit]:
@@ -104,6 +132,32 @@ class DepositRepository(BaseRepository[Deposit]):
             status=TransactionStatus.PENDING.value
         )
 
+    async def delete_abandoned_pending(self, cutoff: datetime) -> int:
+        """
+        Delete pending deposits abandoned before payment.
+
+        Only deposits created before cutoff, without a transaction hash
+        and without rewards, PLEX requirements or amount discrepancies
+        are deleted, so nothing else is cascaded.
+
+        Args:
+            cutoff: Pending deposits created before this are abandoned
+
+        Returns:
+            Number of deleted deposits
+        """
+        result = await self.session.execute(
+            delete(Deposit).where(
+                Deposit.status == TransactionStatus.PENDING.value,
+                Deposit.created_at < cutoff,
+                Deposit.tx_hash.is_(None),
+                ~exists().where(DepositReward.deposit_id == Deposit.id),
+                ~exists().where(PlexPaymentRequirement.deposit_id == Deposit.id),
+                ~exists().where(DepositAmountDiscrepancy.deposit_id == Deposit.id),
+            )
+        )
+        return result.rowcount or 0
+
     async def get_total_deposited(
         self, user_id: int
     ) -> Decimal:
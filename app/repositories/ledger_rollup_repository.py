@@ -0,0 +1,160 @@
+"""
+LedgerRollup repository.
+
+Data access layer for ledger rollups and closed day totals.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import LedgerEntryType
+from app.models.ledger_rollup import LedgerDayTotal, LedgerRollup
+from app.repositories.base import BaseRepository
+
+
+# Totals per entry type: (amount, row count)
+LedgerTotals = dict[LedgerEntryType, tuple[Decimal, int]]
+
+# Moves open rollups up to :day into the day's totals. Rows left behind
+# by transactions that committed after their day was closed are folded
+# into the next closed day.
+_CLOSE_DAY_SQL = text("""
+    WITH moved AS (
+        DELETE FROM ledger_rollups
+        WHERE day <= :day
+        RETURNING entry_type, amount, entry_count
+    ),
+    day_sums AS (
+        SELECT entry_type, SUM(amount) AS amount, SUM(entry_count) AS entry_count
+        FROM moved
+        GROUP BY entry_type
+    ),
+    previous AS (
+        SELECT entry_type, cumulative_amount, cumulative_count
+        FROM ledger_day_totals
+        WHERE day = CAST(:day AS date) - 1
+    )
+    INSERT INTO ledger_day_totals (
+        day, entry_type, amount, entry_count,
+        cumulative_amount, cumulative_count
+    )
+    SELECT
+        :day,
+        t.entry_type,
+        COALESCE(s.amount, 0),
+        COALESCE(s.entry_count, 0),
+        COALESCE(p.cumulative_amount, 0) + COALESCE(s.amount, 0),
+        COALESCE(p.cumulative_count, 0) + COALESCE(s.entry_count, 0)
+    FROM unnest(CAST(:entry_types AS varchar[])) AS t(entry_type)
+    LEFT JOIN day_sums s USING (entry_type)
+    LEFT JOIN previous p USING (entry_type)
+""")
+
+
+def _totals(rows) -> LedgerTotals:
+    """Totals dict with every entry type (zero if missing)."""
+    totals: LedgerTotals = {
+        entry_type: (Decimal("0"), 0) for entry_type in LedgerEntryType
+    }
+    for entry_type, amount, count in rows:
+        if entry_type in totals:
+            totals[LedgerEntryType(entry_type)] = (
+                amount or Decimal("0"), int(count or 0)
+            )
+    return totals
+
+
+class LedgerRollupRepository(BaseRepository[LedgerDayTotal]):
+    """Ledger rollup queries for reconciliation."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize ledger rollup repository."""
+        super().__init__(LedgerDayTotal, session)
+
+    async def get_last_closed_day(self) -> date | None:
+        """Get the latest closed day (None if nothing closed yet)."""
+        result = await self.session.execute(select(func.max(LedgerDayTotal.day)))
+        return result.scalar()
+
+    async def close_days(self, through: date) -> int:
+        """
+        Close all open days up to a day.
+
+        Each day gets one LedgerDayTotal row per entry type (also for
+        days without changes), so running totals are direct lookups.
+
+        Args:
+            through: Last day to close
+
+        Returns:
+            Number of days closed
+        """
+        last_closed = await self.get_last_closed_day()
+        if last_closed is not None:
+            first = last_closed + timedelta(days=1)
+        else:
+            result = await self.session.execute(select(func.min(LedgerRollup.day)))
+            first = result.scalar()
+        if first is None or first > through:
+            return 0
+
+        entry_types = [entry_type.value for entry_type in LedgerEntryType]
+        day = first
+        while day <= through:
+            await self.session.execute(
+                _CLOSE_DAY_SQL, {"day": day, "entry_types": entry_types}
+            )
+            day += timedelta(days=1)
+        return (through - first).days + 1
+
+    async def get_closed_totals(self, day: date) -> LedgerTotals:
+        """
+        Get running totals at the end of a closed day.
+
+        Args:
+            day: Closed day (days before the ledger start give zeros)
+
+        Returns:
+            Totals per entry type
+        """
+        stmt = select(
+            LedgerDayTotal.entry_type,
+            LedgerDayTotal.cumulative_amount,
+            LedgerDayTotal.cumulative_count,
+        ).where(LedgerDayTotal.day == day)
+        result = await self.session.execute(stmt)
+        return _totals(result.all())
+
+    async def get_open_totals(self) -> LedgerTotals:
+        """Get the sum of all not yet closed deltas."""
+        stmt = select(
+            LedgerRollup.entry_type,
+            func.sum(LedgerRollup.amount),
+            func.sum(LedgerRollup.entry_count),
+        ).group_by(LedgerRollup.entry_type)
+        result = await self.session.execute(stmt)
+        return _totals(result.all())
+
+    async def get_day_totals(
+        self, start: date, end: date
+    ) -> list[LedgerDayTotal]:
+        """
+        Get closed day rows of a range.
+
+        Args:
+            start: First day
+            end: Last day
+
+        Returns:
+            Rows ordered by day
+        """
+        stmt = (
+            select(LedgerDayTotal)
+            .where(LedgerDayTotal.day >= start, LedgerDayTotal.day <= end)
+            .order_by(LedgerDayTotal.day, LedgerDayTotal.entry_type)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -0,0 +1,196 @@
+"""
+Partition repository.
+
+Maintenance of monthly range partitions of append-only tables
+(PARTITIONED_TABLES): pre-creating upcoming months, dropping or
+detaching expired ones and dropping detached ones past their archive
+retention. Partitions are named <table>_pYYYYMM and cover
+[month start, next month start) in UTC.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.constants import PARTITIONED_TABLES
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing moment."""
+    moment = moment.astimezone(UTC)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the partition of table holding month."""
+    return f"{table}_p{month:%Y%m}"
+
+
+def retention_cutoff(table: str, now: datetime | None = None) -> datetime:
+    """
+    Oldest created_at guaranteed to be retained for table.
+
+    Hot queries filter on it so the planner only touches live partitions.
+    """
+    return (now or datetime.now(UTC)) - timedelta(days=PARTITIONED_TABLES[table])
+
+
+class PartitionRepository:
+    """Repository for partition maintenance."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize repository.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    async def get_partitions(self, table: str) -> dict[datetime, str]:
+        """
+        Get monthly partitions of a table.
+
+        Args:
+            table: Partitioned table name
+
+        Returns:
+            Partition names by month start (default partition excluded)
+        """
+        self._check_table(table)
+        result = await self.session.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+        return self._by_month(table, result.scalars().all())
+
+    async def get_detached_partitions(self, table: str) -> dict[datetime, str]:
+        """
+        Get monthly partitions detached from a table.
+
+        Args:
+            table: Partitioned table name
+
+        Returns:
+            Standalone <table>_pYYYYMM tables by month start
+        """
+        self._check_table(table)
+        result = await self.session.execute(
+            text(
+                "SELECT c.relname FROM pg_class c "
+                "WHERE c.relkind = 'r' AND NOT c.relispartition "
+                "AND c.relnamespace = CAST(current_schema() AS regnamespace) "
+                "AND starts_with(c.relname, :prefix)"
+            ),
+            {"prefix": f"{table}_p"},
+        )
+        return self._by_month(table, result.scalars().all())
+
+    async def create_partitions(
+        self, table: str, first: datetime, months: int
+    ) -> list[str]:
+        """
+        Create missing monthly partitions.
+
+        Args:
+            table: Partitioned table name
+            first: First month to cover
+            months: Number of months from first
+
+        Returns:
+            Names of created partitions
+        """
+        existing = await self.get_partitions(table)
+        created = []
+        for offset in range(months):
+            month = add_months(month_start(first), offset)
+            if month in existing:
+                continue
+            name = partition_name(table, month)
+            await self.session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+            created.append(name)
+        return created
+
+    async def remove_partitions_before(
+        self, table: str, cutoff: datetime, detach: bool = False
+    ) -> list[str]:
+        """
+        Remove partitions whose whole month is older than cutoff.
+
+        Args:
+            table: Partitioned table name
+            cutoff: Rows older than this may be removed
+            detach: Detach (keep as standalone table) instead of drop
+
+        Returns:
+            Names of removed partitions
+        """
+        removed = []
+        for month, name in sorted((await self.get_partitions(table)).items()):
+            if add_months(month, 1) > cutoff:
+                break
+            if detach:
+                await self.session.execute(
+                    text(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                )
+            else:
+                await self.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            removed.append(name)
+        return removed
+
+    async def drop_detached_before(
+        self, table: str, cutoff: datetime
+    ) -> list[str]:
+        """
+        Drop detached partitions whose whole month is older than cutoff.
+
+        Args:
+            table: Partitioned table name
+            cutoff: Archived rows older than this may be dropped
+
+        Returns:
+            Names of dropped tables
+        """
+        dropped = []
+        for month, name in sorted((await self.get_detached_partitions(table)).items()):
+            if add_months(month, 1) > cutoff:
+                break
+            await self.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+        return dropped
+
+    @staticmethod
+    def _by_month(table: str, names: list[str]) -> dict[datetime, str]:
+        """Map <table>_pYYYYMM names to their month start, skipping others."""
+        pattern = re.compile(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})")
+        partitions = {}
+        for name in names:
+            match = pattern.fullmatch(name)
+            if match:
+                month = datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC)
+                partitions[month] = name
+        return partitions
+
+    @staticmethod
+    def _check_table(table: str) -> None:
+        """Only configured tables may be used in generated DDL."""
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"Table {table!r} is not partitioned")
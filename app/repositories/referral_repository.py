@@ -218,3 +218,51 @@ class ReferralRepository(BaseRepository[Referral]):
 
         result = await self.session.execute(stmt)
         return [row[0] for row in result.all()]
+
+    async def get_ancestor_rows(
+        self,
+        user_ids: list[int] | None = None,
+        max_level: int = 3,
+        chunk_size: int = 10000,
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Get closure rows (user -> every referrer up to max_level).
+
+        The referrals table stores one row per (ancestor, descendant)
+        pair with its level, so a user's whole chain is an index lookup
+        on (referral_id, level) instead of a recursive query.
+
+        Args:
+            user_ids: Users to load (all users if None)
+            max_level: Maximum referral level
+            chunk_size: Max user IDs per query (bind parameter limit)
+
+        Returns:
+            List of (user_id, referrer_id, level, relationship_id),
+            ordered by user_id and level
+        """
+        base = (
+            select(
+                Referral.referral_id,
+                Referral.referrer_id,
+                Referral.level,
+                Referral.id,
+            )
+            .where(Referral.level <= max_level)
+            .order_by(Referral.referral_id, Referral.level)
+        )
+
+        if user_ids is None:
+            result = await self.session.execute(base)
+            return [tuple(row) for row in result.all()]
+
+        unique_ids = sorted(set(user_ids))
+        rows: list[tuple[int, int, int, int]] = []
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start:start + chunk_size]
+            result = await self.session.execute(
+                base.where(Referral.referral_id.in_(chunk))
+            )
+            rows.extend(tuple(row) for row in result.all())
+
+        return rows
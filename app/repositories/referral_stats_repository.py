@@ -0,0 +1,138 @@
+"""
+ReferralStats repository.
+
+Data access layer for ReferralStats model.
+"""
+
+from typing import Any
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.referral_stats import ReferralStats
+from app.models.user import User
+from app.repositories.base import BaseRepository
+
+
+# Leaderboard orderings: (primary, tie-breaker)
+_BY_REFERRALS = (ReferralStats.total_count, ReferralStats.total_earned)
+_BY_EARNINGS = (ReferralStats.total_earned, ReferralStats.total_count)
+
+
+class ReferralStatsRepository(BaseRepository[ReferralStats]):
+    """ReferralStats repository with leaderboard queries."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize referral stats repository."""
+        super().__init__(ReferralStats, session)
+
+    async def get_by_referrer(
+        self, referrer_id: int
+    ) -> ReferralStats | None:
+        """
+        Get counters of a referrer.
+
+        Args:
+            referrer_id: Referrer user ID
+
+        Returns:
+            ReferralStats or None if user never had referrals
+        """
+        # Counters change behind the ORM (triggers): always re-read
+        stmt = (
+            select(ReferralStats)
+            .where(ReferralStats.referrer_id == referrer_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_top_by_referrals(self, limit: int = 10) -> list[Any]:
+        """
+        Get top referrers by referral count, then earnings.
+
+        Args:
+            limit: Number of rows
+
+        Returns:
+            Rows with user_id, telegram_id, username, referral_count,
+            total_earnings
+        """
+        return await self._get_top(_BY_REFERRALS, limit)
+
+    async def get_top_by_earnings(self, limit: int = 10) -> list[Any]:
+        """
+        Get top referrers by earnings, then referral count.
+
+        Args:
+            limit: Number of rows
+
+        Returns:
+            Rows with user_id, telegram_id, username, referral_count,
+            total_earnings
+        """
+        return await self._get_top(_BY_EARNINGS, limit)
+
+    async def get_ranks(
+        self, referrer_id: int
+    ) -> tuple[int | None, int | None, int]:
+        """
+        Get leaderboard ranks of a referrer.
+
+        Rank is 1 + number of referrers strictly ahead (SQL RANK()
+        semantics); each count is a range scan on the leaderboard index.
+
+        Args:
+            referrer_id: Referrer user ID
+
+        Returns:
+            Tuple of (referral_rank, earnings_rank, total_users);
+            ranks are None if the user has no referrals
+        """
+        total_users = await self.session.scalar(
+            select(func.count())
+            .select_from(ReferralStats)
+            .where(ReferralStats.total_count > 0)
+        )
+
+        stats = await self.get_by_referrer(referrer_id)
+        if stats is None or stats.total_count <= 0:
+            return None, None, total_users or 0
+
+        referral_rank = await self._count_ahead(
+            _BY_REFERRALS, (stats.total_count, stats.total_earned)
+        )
+        earnings_rank = await self._count_ahead(
+            _BY_EARNINGS, (stats.total_earned, stats.total_count)
+        )
+        return referral_rank + 1, earnings_rank + 1, total_users or 0
+
+    async def _get_top(self, order: tuple, limit: int) -> list[Any]:
+        """Read the first rows of a leaderboard ordering."""
+        stmt = (
+            select(
+                User.id.label("user_id"),
+                User.telegram_id,
+                User.username,
+                ReferralStats.total_count.label("referral_count"),
+                ReferralStats.total_earned.label("total_earnings"),
+            )
+            .join(User, User.id == ReferralStats.referrer_id)
+            .where(ReferralStats.total_count > 0)
+            .order_by(*(column.desc() for column in order))
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def _count_ahead(self, order: tuple, values: tuple) -> int:
+        """Count referrers sorting strictly before the given key."""
+        stmt = (
+            select(func.count())
+            .select_from(ReferralStats)
+            .where(
+                ReferralStats.total_count > 0,
+                tuple_(*order) > tuple_(*values),
+            )
+        )
+        return await self.session.scalar(stmt) or 0
@@ -0,0 +1,119 @@
+"""
+RuntimeFlag repository.
+
+Data access layer for runtime operational flags and their audit trail.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.runtime_flag import RuntimeFlag, RuntimeFlagChange
+from app.repositories.base import BaseRepository
+
+
+class RuntimeFlagRepository(BaseRepository[RuntimeFlag]):
+    """RuntimeFlag repository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize RuntimeFlag repository."""
+        super().__init__(RuntimeFlag, session)
+
+    async def get_states(self) -> dict[str, bool]:
+        """
+        Get the state of every stored flag.
+
+        Returns:
+            Dict of flag name -> enabled
+        """
+        result = await self.session.execute(
+            select(RuntimeFlag.name, RuntimeFlag.enabled)
+        )
+        return {name: enabled for name, enabled in result.all()}
+
+    async def set_flag(
+        self,
+        name: str,
+        enabled: bool,
+        changed_by: str | None = None,
+        reason: str | None = None,
+        source: str | None = None,
+    ) -> bool:
+        """
+        Set a flag, recording an audit entry if its state changes.
+
+        The current row is locked so concurrent flips of the same flag
+        are serialized and each one is audited with the right old value.
+
+        Args:
+            name: Flag name
+            enabled: New state
+            changed_by: Who changes it
+            reason: Reason of the change
+            source: Process making the change
+
+        Returns:
+            True if the state changed
+        """
+        result = await self.session.execute(
+            select(RuntimeFlag.enabled)
+            .where(RuntimeFlag.name == name)
+            .with_for_update()
+        )
+        old_value = bool(result.scalar_one_or_none())
+        if old_value == enabled:
+            return False
+
+        now = datetime.now(UTC)
+        stmt = pg_insert(RuntimeFlag).values(
+            name=name,
+            enabled=enabled,
+            updated_at=now,
+            updated_by=changed_by,
+            reason=reason,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RuntimeFlag.name],
+            set_={
+                "enabled": stmt.excluded.enabled,
+                "updated_at": stmt.excluded.updated_at,
+                "updated_by": stmt.excluded.updated_by,
+                "reason": stmt.excluded.reason,
+            },
+        )
+        await self.session.execute(stmt)
+        self.session.add(
+            RuntimeFlagChange(
+                name=name,
+                old_value=old_value,
+                new_value=enabled,
+                changed_by=changed_by,
+                reason=reason,
+                source=source,
+                created_at=now,
+            )
+        )
+        await self.session.flush()
+        return True
+
+    async def get_changes(
+        self, name: str | None = None, limit: int = 50
+    ) -> list[RuntimeFlagChange]:
+        """
+        Get recent flag changes, newest first.
+
+        Args:
+            name: Optional flag name filter
+            limit: Maximum records
+
+        Returns:
+            List of changes
+        """
+        stmt = select(RuntimeFlagChange)
+        if name:
+            stmt = stmt.where(RuntimeFlagChange.name == name)
+        stmt = stmt.order_by(RuntimeFlagChange.created_at.desc()).limit(limit)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -0,0 +1,79 @@
+"""
+TelegramMedia repository.
+
+Data access layer for cached Telegram file_ids.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.telegram_media import TelegramMedia
+from app.repositories.base import BaseRepository
+
+
+class TelegramMediaRepository(BaseRepository[TelegramMedia]):
+    """TelegramMedia repository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize TelegramMedia repository."""
+        super().__init__(TelegramMedia, session)
+
+    async def get_file_id(self, media_key: str) -> str | None:
+        """
+        Get the file_id of an uploaded asset.
+
+        Args:
+            media_key: Asset key
+
+        Returns:
+            Telegram file_id or None if not uploaded yet
+        """
+        result = await self.session.execute(
+            select(TelegramMedia.file_id).where(
+                TelegramMedia.media_key == media_key
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def save_file_id(
+        self, media_key: str, media_type: str, file_id: str
+    ) -> None:
+        """
+        Store (or refresh) the file_id of an asset.
+
+        Args:
+            media_key: Asset key
+            media_type: Telegram media type
+            file_id: Telegram file_id
+        """
+        now = datetime.now(UTC)
+        stmt = pg_insert(TelegramMedia).values(
+            media_key=media_key,
+            media_type=media_type,
+            file_id=file_id,
+            created_at=now,
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TelegramMedia.media_key],
+            set_={
+                "media_type": stmt.excluded.media_type,
+                "file_id": stmt.excluded.file_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def delete_file_id(self, media_key: str) -> None:
+        """
+        Forget the file_id of an asset (e.g. rejected by Telegram).
+
+        Args:
+            media_key: Asset key
+        """
+        await self.session.execute(
+            delete(TelegramMedia).where(TelegramMedia.media_key == media_key)
+        )
@@ -2,6 +2,9 @@
 UserMessageLog repository.
 
 Handles database operations for user message logs.
+
+The table is range-partitioned by month on created_at; per-user reads
+are bounded by the retention window so only live partitions are scanned.
 """
 
 from datetime import UTC, datetime
@@ -10,6 +13,7 @@ from sqlalchemy import delete, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_message_log import UserMessageLog
+from app.repositories.partition_repository import retention_cutoff
 
 
 class UserMessageLogRepository:
@@ -70,7 +74,12 @@ class UserMessageLogRepository:
         """
         stmt = (
             select(UserMessageLog)
-            .where(UserMessageLog.telegram_id == telegram_id)
+            .where(
+                UserMessageLog.telegram_id == telegram_id,
+                UserMessageLog.created_at >= retention_cutoff(
+                    UserMessageLog.__tablename__
+                ),
+            )
             .order_by(desc(UserMessageLog.created_at))
             .limit(limit)
             .offset(offset)
@@ -91,7 +100,10 @@ class UserMessageLogRepository:
         from sqlalchemy import func
 
         stmt = select(func.count(UserMessageLog.id)).where(
-            UserMessageLog.telegram_id == telegram_id
+            UserMessageLog.telegram_id == telegram_id,
+            UserMessageLog.created_at >= retention_cutoff(
+                UserMessageLog.__tablename__
+            ),
         )
         result = await self.session.execute(stmt)
         return result.scalar() or 0
@@ -154,6 +166,9 @@ class UserMessageLogRepository:
             select(UserMessageLog)
             .where(
                 UserMessageLog.telegram_id == telegram_id,
+                UserMessageLog.created_at >= retention_cutoff(
+                    UserMessageLog.__tablename__
+                ),
                 UserMessageLog.message_text.ilike(f"%{search_text}%"),
             )
             .order_by(desc(UserMessageLog.created_at))
@@ -7,7 +7,7 @@ Data access layer for User model.
 from typing import Any
 
 from loguru import logger
-from sqlalchemy import func, or_, select
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,10 +17,21 @@ except ImportError:
     import redis.asyncio as redis
     Redis = redis.Redis
 
+from app.config.constants import (
+    USER_SEARCH_LIMIT,
+    USER_SEARCH_MIN_PARTIAL_LENGTH,
+)
 from app.models.user import User
 from app.repositories.base import BaseRepository
 
 
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards (usernames often contain "_")."""
+    return (
+        value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+
+
 class UserRepository(BaseRepository[User]):
     """User repository with specific queries."""
 
@@ -103,9 +114,7 @@ class UserRepository(BaseRepository[User]):
         """
         Get user by Telegram username (case-insensitive).
 
-        Note: Uses ILIKE which requires a full table scan. For better performance
-        with large datasets, consider adding a functional index:
-        CREATE INDEX idx_users_username_lower ON users (LOWER(username));
+        Uses ILIKE, served by the pg_trgm index on username.
 
         Args:
             username: Telegram username (without @)
@@ -124,6 +133,95 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def search(
+        self,
+        query: str,
+        limit: int = USER_SEARCH_LIMIT,
+        exact: bool = False,
+    ) -> list[User]:
+        """
+        Search users by id, telegram_id, username, wallet or referral code.
+
+        One ranked query: telegram_id, then other exact matches (id,
+        username, wallet, referral code, case-insensitive), then wallet
+        prefix/suffix matches, then partial username/referral code matches
+        by trigram similarity. Text matching uses the pg_trgm GIN indexes.
+        A wallet may be given shortened as "0x1234...abcd". Terms shorter
+        than USER_SEARCH_MIN_PARTIAL_LENGTH only match ids.
+
+        Args:
+            query: Search text (leading @ is ignored)
+            limit: Max results
+            exact: Only return exact matches
+
+        Returns:
+            Users, best match first
+        """
+        term = query.strip().lstrip("@")
+        if not term:
+            return []
+
+        pattern = _escape_like(term)
+        # Trigram indexes cannot serve terms shorter than a trigram
+        indexable = len(term.replace(".", "")) >= USER_SEARCH_MIN_PARTIAL_LENGTH
+        exact_matches = []
+        whens = []
+        if term.isdigit() and len(term) <= 18:
+            number = int(term)
+            exact_matches.append(User.telegram_id == number)
+            whens.append((User.telegram_id == number, 0))
+            if number < 2**31:
+                exact_matches.append(User.id == number)
+        if indexable:
+            exact_matches += [
+                User.username.ilike(pattern, escape="\\"),
+                User.wallet_address.ilike(pattern, escape="\\"),
+                User.referral_code.ilike(pattern, escape="\\"),
+            ]
+        if not exact_matches:
+            return []
+
+        exact_match = or_(*exact_matches)
+        whens.append((exact_match, 1))
+        conditions = [exact_match]
+        similarity_order = []
+
+        if indexable and not exact:
+            prefix, ellipsis, suffix = (
+                term.replace("\u2026", "...").partition("...")
+            )
+            if ellipsis:
+                wallet_match = User.wallet_address.ilike(
+                    f"{_escape_like(prefix)}%{_escape_like(suffix)}",
+                    escape="\\",
+                )
+            else:
+                wallet_match = or_(
+                    User.wallet_address.ilike(f"{pattern}%", escape="\\"),
+                    User.wallet_address.ilike(f"%{pattern}", escape="\\"),
+                )
+            whens.append((wallet_match, 2))
+            conditions += [
+                wallet_match,
+                User.username.ilike(f"%{pattern}%", escape="\\"),
+                User.referral_code.ilike(f"%{pattern}%", escape="\\"),
+            ]
+            similarity_order.append(
+                func.greatest(
+                    func.similarity(func.coalesce(User.username, ""), term),
+                    func.similarity(func.coalesce(User.referral_code, ""), term),
+                ).desc()
+            )
+
+        stmt = (
+            select(User)
+            .where(or_(*conditions))
+            .order_by(case(*whens, else_=3), *similarity_order, User.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_with_referrals(
         self, user_id: int
     ) -> User | None:
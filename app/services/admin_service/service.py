@@ -16,6 +16,7 @@ from app.repositories.admin_repository import AdminRepository
 from app.repositories.admin_session_repository import (
     AdminSessionRepository,
 )
+from app.utils.cpu_offload import offload
 
 from .admin_manager import AdminManager
 from .crypto import (
@@ -173,7 +174,9 @@ class AdminService:
             return None, None, "Мастер-ключ не установлен"
 
         # Verify master key
-        if not verify_master_key(master_key, admin.master_key):
+        if not await offload(
+            "bcrypt", verify_master_key, master_key, admin.master_key
+        ):
             # Track failed login attempt
             await self.rate_limiter.track_failed_login(telegram_id)
 
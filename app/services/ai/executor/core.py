@@ -217,8 +217,9 @@ class ToolExecutor(
             if block_type != "tool_use":
                 continue
 
-            # Check rate limit BEFORE execution to prevent abuse
-            allowed, limit_msg = self._rate_limiter.check_limit(
+            # Check and record usage BEFORE execution to prevent abuse
+            # (if user retries failed request, it still counts)
+            allowed, limit_msg = await self._rate_limiter.consume(
                 self.admin_id, tool_name
             )
             if not allowed:
@@ -231,9 +232,6 @@ class ToolExecutor(
                 )
                 continue
 
-            # Record usage BEFORE execution to prevent retry-abuse
-            # (if user retries failed request, it still counts)
-            self._rate_limiter.record_usage(self.admin_id, tool_name)
             logger.info(
                 f"ARIA tool execution started: admin={self.admin_id} "
                 f"tool='{tool_name}'"
@@ -250,7 +248,6 @@ class ToolExecutor(
                         "content": str(result),
                     }
                 )
-                self._rate_limiter.record_usage(self.admin_id, tool_name)
                 logger.info(
                     f"ARIA tool executed: admin={self.admin_id} "
                     f"tool='{tool_name}'"
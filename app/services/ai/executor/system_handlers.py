@@ -49,6 +49,8 @@ class SystemHandlersMixin:
             return await system_service.get_platform_health()
         elif name == "get_global_settings":
             return await system_service.get_global_settings()
+        elif name == "get_tool_quota_usage":
+            return await self._rate_limiter.get_usage(self.admin_id)
         return {"error": "Unknown system tool"}
 
     async def _execute_stats_tool(self, name: str, inp: dict) -> Any:
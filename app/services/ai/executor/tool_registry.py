@@ -86,6 +86,7 @@ class ToolRegistryMixin:
             "toggle_rpc_auto_switch",
             "get_platform_health",
             "get_global_settings",
+            "get_tool_quota_usage",
         }
 
     def _get_admin_mgmt_tool_names(self) -> set[str]:
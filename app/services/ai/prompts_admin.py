@@ -195,7 +195,7 @@ approve_withdrawal, reject_withdrawal
 - get_blockchain_status, switch_rpc_provider, toggle_rpc_auto_switch
 
 МОНИТОРИНГ:
-- get_platform_health, get_global_settings
+- get_platform_health, get_global_settings, get_tool_quota_usage
 
 === УПРАВЛЕНИЕ АДМИНАМИ ===
 
@@ -135,6 +135,18 @@ def get_system_admin_tools() -> list[dict[str, Any]]:
                 "required": [],
             },
         },
+        {
+            "name": "get_tool_quota_usage",
+            "description": (
+                "Получить расход квот инструментов ARIA текущего админа: "
+                "бюджет за час и за сутки, вызовы по инструментам за сегодня."
+            ),
+            "input_schema": {
+                "type": "object",
+                "properties": {},
+                "required": [],
+            },
+        },
     ]
 
 
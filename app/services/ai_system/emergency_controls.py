@@ -6,8 +6,17 @@ SECURITY: SUPER_ADMIN only for write operations.
 """
 from typing import Any
 from loguru import logger
-from app.repositories.global_settings_repository import (
-    GlobalSettingsRepository,
+from app.services.runtime_flags import (
+    EMERGENCY_STOP_DEPOSITS,
+    EMERGENCY_STOP_ROI,
+    EMERGENCY_STOP_WITHDRAWALS,
+    get_runtime_flags,
+)
+
+_EMERGENCY_STOPS = (
+    EMERGENCY_STOP_DEPOSITS,
+    EMERGENCY_STOP_WITHDRAWALS,
+    EMERGENCY_STOP_ROI,
 )
 
 
@@ -37,29 +46,41 @@ class EmergencyControlsMixin:
             }
         return None
 
+    async def _set_emergency_stops(
+        self, enable_stop: bool, *names: str
+    ) -> None:
+        """Set emergency stop flags on behalf of the current admin."""
+        flags = get_runtime_flags()
+        for name in names:
+            await flags.set(
+                name, enable_stop,
+                changed_by=f"admin:{self.admin_telegram_id}",
+                reason="AI system command",
+            )
+
     async def get_emergency_status(self) -> dict[str, Any]:
         """Get current emergency stop status."""
         if err := await self._check_emergency_access():
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        settings = await repo.get_settings()
+        flags = await get_runtime_flags().get_all()
+        deposits_stopped = flags[EMERGENCY_STOP_DEPOSITS]
+        withdrawals_stopped = flags[EMERGENCY_STOP_WITHDRAWALS]
+        roi_stopped = flags[EMERGENCY_STOP_ROI]
         return {
             "success": True,
             "emergency_status": {
-                "deposits_stopped": settings.emergency_stop_deposits,
-                "withdrawals_stopped": (
-                    settings.emergency_stop_withdrawals
-                ),
-                "roi_stopped": settings.emergency_stop_roi,
+                "deposits_stopped": deposits_stopped,
+                "withdrawals_stopped": withdrawals_stopped,
+                "roi_stopped": roi_stopped,
             },
             "status_text": (
                 f"💰 Депозиты: "
-                f"{'⏸ СТОП' if settings.emergency_stop_deposits else '▶️ Активны'}\n"
+                f"{'⏸ СТОП' if deposits_stopped else '▶️ Активны'}\n"
                 f"💸 Выводы: "
-                f"{'⏸ СТОП' if settings.emergency_stop_withdrawals else '▶️ Активны'}\n"
+                f"{'⏸ СТОП' if withdrawals_stopped else '▶️ Активны'}\n"
                 f"📈 ROI: "
-                f"{'⏸ СТОП' if settings.emergency_stop_roi else '▶️ Активны'}"
+                f"{'⏸ СТОП' if roi_stopped else '▶️ Активны'}"
             ),
             "message": "🚨 Статус аварийных стопов"
         }
@@ -71,9 +92,7 @@ class EmergencyControlsMixin:
         if err := await self._check_emergency_access(require_super=True):
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        await repo.update_settings(emergency_stop_deposits=enable_stop)
-        await self.session.commit()
+        await self._set_emergency_stops(enable_stop, EMERGENCY_STOP_DEPOSITS)
         action = "ОСТАНОВЛЕНЫ" if enable_stop else "ЗАПУЩЕНЫ"
         logger.warning(
             f"AI SYSTEM: EMERGENCY - Deposits {action} "
@@ -94,11 +113,9 @@ class EmergencyControlsMixin:
         if err := await self._check_emergency_access(require_super=True):
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        await repo.update_settings(
-            emergency_stop_withdrawals=enable_stop
+        await self._set_emergency_stops(
+            enable_stop, EMERGENCY_STOP_WITHDRAWALS
         )
-        await self.session.commit()
         action = "ОСТАНОВЛЕНЫ" if enable_stop else "ЗАПУЩЕНЫ"
         logger.warning(
             f"AI SYSTEM: EMERGENCY - Withdrawals {action} "
@@ -119,9 +136,7 @@ class EmergencyControlsMixin:
         if err := await self._check_emergency_access(require_super=True):
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        await repo.update_settings(emergency_stop_roi=enable_stop)
-        await self.session.commit()
+        await self._set_emergency_stops(enable_stop, EMERGENCY_STOP_ROI)
         action = "ОСТАНОВЛЕНО" if enable_stop else "ЗАПУЩЕНО"
         logger.warning(
             f"AI SYSTEM: EMERGENCY - ROI {action} "
@@ -140,13 +155,7 @@ class EmergencyControlsMixin:
         if err := await self._check_emergency_access(require_super=True):
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        await repo.update_settings(
-            emergency_stop_deposits=True,
-            emergency_stop_withdrawals=True,
-            emergency_stop_roi=True,
-        )
-        await self.session.commit()
+        await self._set_emergency_stops(True, *_EMERGENCY_STOPS)
         logger.critical(
             f"AI SYSTEM: FULL EMERGENCY STOP activated "
             f"by super_admin {self.admin_telegram_id} "
@@ -168,13 +177,7 @@ class EmergencyControlsMixin:
         if err := await self._check_emergency_access(require_super=True):
             return err
 
-        repo = GlobalSettingsRepository(self.session)
-        await repo.update_settings(
-            emergency_stop_deposits=False,
-            emergency_stop_withdrawals=False,
-            emergency_stop_roi=False,
-        )
-        await self.session.commit()
+        await self._set_emergency_stops(False, *_EMERGENCY_STOPS)
         logger.warning(
             f"AI SYSTEM: All operations RESUMED "
             f"by super_admin {self.admin_telegram_id} "
@@ -8,6 +8,7 @@ from typing import Any
 from app.repositories.global_settings_repository import (
     GlobalSettingsRepository,
 )
+from app.services.runtime_flags import get_runtime_flags
 
 
 class PlatformMonitoringMixin:
@@ -32,6 +33,7 @@ class PlatformMonitoringMixin:
 
         repo = GlobalSettingsRepository(self.session)
         settings = await repo.get_settings()
+        flags = await get_runtime_flags().get_all()
         min_withdrawal = float(
             getattr(settings, 'min_withdrawal_amount', 0.5)
         )
@@ -41,13 +43,14 @@ class PlatformMonitoringMixin:
         return {
             "success": True,
             "settings": {
-                "emergency_stop_deposits": (
-                    settings.emergency_stop_deposits
-                ),
+                "emergency_stop_deposits": flags["emergency_stop_deposits"],
                 "emergency_stop_withdrawals": (
-                    settings.emergency_stop_withdrawals
+                    flags["emergency_stop_withdrawals"]
+                ),
+                "emergency_stop_roi": flags["emergency_stop_roi"],
+                "blockchain_maintenance_mode": (
+                    flags["blockchain_maintenance_mode"]
                 ),
-                "emergency_stop_roi": settings.emergency_stop_roi,
                 "active_rpc_provider": settings.active_rpc_provider,
                 "rpc_auto_switch": settings.rpc_auto_switch,
                 "min_withdrawal_amount": min_withdrawal,
@@ -46,6 +46,14 @@ class RPCManagementMixin:
                     f"{icon} {name.upper()}{active_mark}: "
                     f"Block {block}\n"
                 )
+                health = data.get("health")
+                if health:
+                    latency = health["latency_ms"]
+                    providers_text += (
+                        f"    ⏱ {'—' if latency is None else f'{latency} мс'}, "
+                        f"ошибки {health['error_rate']:.0%}"
+                        f"{'' if health['circuit'] == 'closed' else ', ⛔ отключён'}\n"
+                    )
             return {
                 "success": True,
                 "blockchain": {
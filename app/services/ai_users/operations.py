@@ -32,24 +32,13 @@ class OperationsMixin:
         return await find_user_by_identifier(self.session, identifier, self.user_repo)
 
     async def search_users(self, query: str, limit: int = 20) -> dict[str, Any]:
-        """Search users by username, telegram_id, or wallet."""
+        """Search users by username, id, telegram_id, wallet or referral code."""
         admin, error = await self._verify_admin()
         if error:
             return {"success": False, "error": error}
 
         query = query.strip()
-
-        if query.startswith("@"):
-            stmt = select(User).where(User.username.ilike(f"%{query[1:]}%")).limit(limit)
-        elif query.isdigit():
-            stmt = select(User).where(User.telegram_id == int(query)).limit(limit)
-        elif query.startswith("0x"):
-            stmt = select(User).where(User.wallet_address.ilike(f"%{query}%")).limit(limit)
-        else:
-            stmt = select(User).where(User.username.ilike(f"%{query}%")).limit(limit)
-
-        result = await self.session.execute(stmt)
-        users = list(result.scalars().all())
+        users = await self.user_repo.search(query, limit=limit)
 
         if not users:
             return {
@@ -38,7 +38,7 @@ from .validators import (
 from .core import ARIASecurityGuard, get_security_guard
 
 # Rate limiter
-from .rate_limiter import ToolRateLimiter, get_rate_limiter
+from .rate_limiter import ToolRateLimiter, get_rate_limiter, set_rate_limiter_redis
 
 __all__ = [
     # Patterns
@@ -64,4 +64,5 @@ __all__ = [
     # Rate Limiter
     "ToolRateLimiter",
     "get_rate_limiter",
+    "set_rate_limiter_redis",
 ]
@@ -2,12 +2,76 @@
 Rate Limiter for Tool Execution.
 
 Prevents abuse by limiting operations per admin.
+
+Usage is counted in Redis, so limits survive restarts and are shared by
+all processes. Each limit is a sliding window approximated by two fixed
+buckets (the previous bucket weighted by the part of it still inside
+the window), so a check reads a constant number of counters:
+
+- per tool: calls per hour (_limits);
+- per admin: weighted cost per hour and per day (_costs against
+  ARIA_TOOL_HOURLY_BUDGET / ARIA_TOOL_DAILY_BUDGET).
+
+The check and the increments run in one Lua script, registered once and
+called by its SHA (EVALSHA). The bot shares its Redis client with the
+limiter at startup (set_rate_limiter_redis). Without Redis the same
+counters are kept in process memory.
 """
 
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
 
 from loguru import logger
 
+from app.config.constants import ARIA_TOOL_DAILY_BUDGET, ARIA_TOOL_HOURLY_BUDGET
+from app.utils.redis_utils import redis_or_short_lived
+
+
+QUOTA_KEY_PREFIX = "aria_quota:"
+HOUR = 3600
+DAY = 86400
+
+# KEYS: current and previous bucket of each counter, then the daily
+# per-tool stats hash. ARGV: weight of the previous bucket, limit, cost
+# and TTL of each counter, then the tool name and the stats TTL.
+# Returns {allowed, index of the exceeded counter, its usage}.
+CONSUME_SCRIPT = """
+local n = (#KEYS - 1) / 2
+for i = 1, n do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local used = previous * tonumber(ARGV[4 * i - 3]) + current
+    if used + tonumber(ARGV[4 * i - 1]) > tonumber(ARGV[4 * i - 2]) then
+        return {0, i, tostring(used)}
+    end
+end
+for i = 1, n do
+    redis.call('INCRBY', KEYS[2 * i - 1], ARGV[4 * i - 1])
+    redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[4 * i])
+end
+redis.call('HINCRBY', KEYS[#KEYS], ARGV[4 * n + 1], 1)
+redis.call('EXPIRE', KEYS[#KEYS], ARGV[4 * n + 2])
+return {1, 0, '0'}
+"""
+
+
+@dataclass(frozen=True)
+class _Window:
+    """One sliding-window counter at the current time."""
+
+    base: str  # Key without the bucket number
+    bucket: int
+    weight: float  # Share of the previous bucket still inside the window
+    seconds: int
+    limit: int
+    cost: int
+
+    @property
+    def keys(self) -> tuple[str, str]:
+        return f"{self.base}{self.bucket}", f"{self.base}{self.bucket - 1}"
+
 
 # ========================================================================
 # RATE LIMITER FOR TOOL EXECUTION
@@ -19,9 +83,23 @@ class ToolRateLimiter:
     Prevents abuse by limiting operations per admin.
     """
 
-    def __init__(self):
-        # Structure: {admin_id: {tool_name: [(timestamp, count), ...]}}
-        self._usage: dict[int, dict[str, list[tuple[datetime, int]]]] = {}
+    def __init__(self, redis_client: Any | None = None):
+        """
+        Initialize rate limiter.
+
+        Args:
+            redis_client: Redis client (a short-lived one is used per
+                check if None)
+        """
+        self.redis_client: Any | None = None
+        self._consume_script: Any | None = None
+        self.set_redis(redis_client)
+
+        # In-process counters when Redis is unavailable:
+        # {key base: (bucket, current count, previous count)}
+        self._local: dict[str, tuple[int, int, int]] = {}
+        # {(admin_id, day): {tool_name: calls}}
+        self._local_stats: dict[tuple[int, str], dict[str, int]] = {}
 
         # Limits per tool per hour
         self._limits = {
@@ -39,72 +117,239 @@ class ToolRateLimiter:
             "default": 400,  # Default for unlisted tools
         }
 
-    def check_limit(
+        # Cost per call against the admin's hourly and daily budgets
+        self._costs = {
+            "grant_bonus": 5,
+            "broadcast_to_group": 20,
+            "mass_invite_to_dialog": 10,
+            "send_message_to_user": 2,
+            "approve_withdrawal": 2,
+            "create_manual_deposit": 10,
+            "add_to_blacklist": 3,
+            "emergency_full_stop": 20,
+            "emergency_full_resume": 20,
+            "block_admin": 10,
+            "change_admin_role": 10,
+            "default": 1,  # Default for unlisted tools (mostly reads)
+        }
+
+    def set_redis(self, redis_client: Any | None) -> None:
+        """
+        Use a (shared) Redis client for the quota counters.
+
+        Args:
+            redis_client: Redis client (None: short-lived client per check)
+        """
+        self.redis_client = redis_client
+        self._consume_script = (
+            redis_client.register_script(CONSUME_SCRIPT)
+            if redis_client
+            else None
+        )
+
+    def _windows(
+        self, admin_id: int, tool_name: str, now: float
+    ) -> list[_Window]:
+        """Counters checked for one call of a tool."""
+        cost = self._costs.get(tool_name, self._costs["default"])
+        windows = []
+        for scope, seconds, limit, window_cost in (
+            (
+                f"tool:{tool_name}", HOUR,
+                self._limits.get(tool_name, self._limits["default"]), 1,
+            ),
+            ("budget", HOUR, ARIA_TOOL_HOURLY_BUDGET, cost),
+            ("budget", DAY, ARIA_TOOL_DAILY_BUDGET, cost),
+        ):
+            windows.append(
+                _Window(
+                    base=f"{QUOTA_KEY_PREFIX}{admin_id}:{scope}:{seconds}:",
+                    bucket=int(now // seconds),
+                    weight=1 - (now % seconds) / seconds,
+                    seconds=seconds,
+                    limit=limit,
+                    cost=window_cost,
+                )
+            )
+        return windows
+
+    @staticmethod
+    def _stats_key(admin_id: int, now: float) -> tuple[str, str]:
+        day = datetime.fromtimestamp(now, UTC).strftime("%Y%m%d")
+        return f"{QUOTA_KEY_PREFIX}{admin_id}:tools:{day}", day
+
+    async def consume(
         self,
         admin_id: int,
-        tool_name: str
+        tool_name: str,
     ) -> tuple[bool, str]:
         """
-        Check if admin can execute tool.
+        Check and record one tool call.
+
+        Usage is recorded only if the call is within every limit.
+
+        Args:
+            admin_id: Admin ID
+            tool_name: Tool name
 
         Returns:
             (allowed, message) - allowed=True if within limits
         """
-        now = datetime.now(UTC)
-        hour_ago = now.replace(minute=0, second=0, microsecond=0)
-
-        # Get limit for this tool
-        limit = self._limits.get(tool_name, self._limits["default"])
-
-        # Initialize if needed
-        if admin_id not in self._usage:
-            self._usage[admin_id] = {}
-        if tool_name not in self._usage[admin_id]:
-            self._usage[admin_id][tool_name] = []
-
-        # Clean old entries (older than 1 hour)
-        self._usage[admin_id][tool_name] = [
-            (ts, cnt) for ts, cnt in self._usage[admin_id][tool_name]
-            if ts >= hour_ago
-        ]
+        now = time.time()
+        windows = self._windows(admin_id, tool_name, now)
+        stats_key, day = self._stats_key(admin_id, now)
 
-        # Count current usage
-        current_usage = sum(
-            cnt for _, cnt in self._usage[admin_id][tool_name]
-        )
+        result = None
+        async with redis_or_short_lived(self.redis_client, "Tool quotas") as client:
+            if client is not None:
+                keys = [key for window in windows for key in window.keys]
+                args = [
+                    value
+                    for window in windows
+                    for value in (
+                        window.weight, window.limit, window.cost,
+                        2 * window.seconds,
+                    )
+                ]
+                script = (
+                    self._consume_script
+                    if client is self.redis_client
+                    else client.register_script(CONSUME_SCRIPT)
+                )
+                try:
+                    result = await script(
+                        keys=[*keys, stats_key],
+                        args=[*args, tool_name, 2 * DAY],
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Tool quota store unavailable, counting locally: {e}"
+                    )
+        if result is None:
+            result = self._consume_local(admin_id, tool_name, day, windows)
 
-        if current_usage >= limit:
-            logger.warning(
-                f"RATE LIMIT: Admin {admin_id} exceeded {tool_name} "
-                f"limit ({current_usage}/{limit})"
-            )
+        allowed, index, used = result
+        if int(allowed):
+            logger.debug(f"Tool usage recorded: {admin_id} -> {tool_name}")
+            return True, ""
+
+        window = windows[int(index) - 1]
+        logger.warning(
+            f"RATE LIMIT: Admin {admin_id} exceeded "
+            f"{window.base.split(':')[2]} limit for {tool_name} "
+            f"({float(used):.0f}/{window.limit} per {window.seconds}s)"
+        )
+        if int(index) == 1:
             return (
                 False,
                 f"❌ Превышен лимит операций '{tool_name}' "
-                f"({limit}/час)"
+                f"({window.limit}/час)"
             )
+        period = "час" if window.seconds == HOUR else "сутки"
+        return (
+            False,
+            f"❌ Превышен бюджет операций ARIA "
+            f"({window.limit} ед./{period})"
+        )
 
-        return True, ""
+    def _local_counts(self, window: _Window) -> tuple[int, int]:
+        """Current and previous bucket counts of an in-process counter."""
+        bucket, current, previous = self._local.get(window.base, (0, 0, 0))
+        if bucket == window.bucket:
+            return current, previous
+        if bucket == window.bucket - 1:
+            return 0, current
+        return 0, 0
 
-    def record_usage(
+    def _consume_local(
         self,
         admin_id: int,
         tool_name: str,
-        count: int = 1
-    ) -> None:
-        """Record tool usage."""
-        now = datetime.now(UTC)
+        day: str,
+        windows: list[_Window],
+    ) -> tuple[int, int, float]:
+        """In-process equivalent of CONSUME_SCRIPT."""
+        for index, window in enumerate(windows, start=1):
+            current, previous = self._local_counts(window)
+            used = previous * window.weight + current
+            if used + window.cost > window.limit:
+                return 0, index, used
 
-        if admin_id not in self._usage:
-            self._usage[admin_id] = {}
-        if tool_name not in self._usage[admin_id]:
-            self._usage[admin_id][tool_name] = []
+        for window in windows:
+            current, previous = self._local_counts(window)
+            self._local[window.base] = (
+                window.bucket, current + window.cost, previous
+            )
+        for stats_admin, stats_day in [
+            k for k in self._local_stats if k[1] != day
+        ]:
+            del self._local_stats[(stats_admin, stats_day)]
+        tools = self._local_stats.setdefault((admin_id, day), {})
+        tools[tool_name] = tools.get(tool_name, 0) + 1
+        return 1, 0, 0.0
 
-        self._usage[admin_id][tool_name].append((now, count))
+    async def get_usage(self, admin_id: int) -> dict[str, Any]:
+        """
+        Get an admin's quota usage.
 
-        logger.debug(
-            f"Tool usage recorded: {admin_id} -> {tool_name} x{count}"
-        )
+        Args:
+            admin_id: Admin ID
+
+        Returns:
+            Dict with hourly and daily budget usage, today's calls per
+            tool and a formatted message
+        """
+        now = time.time()
+        _, hourly, daily = self._windows(admin_id, "default", now)
+        stats_key, day = self._stats_key(admin_id, now)
+
+        counts = None
+        async with redis_or_short_lived(self.redis_client, "Tool quotas") as client:
+            if client is not None:
+                try:
+                    values = await client.mget(*hourly.keys, *daily.keys)
+                    tools = await client.hgetall(stats_key)
+                    counts = [int(value or 0) for value in values]
+                    tools = {name: int(calls) for name, calls in tools.items()}
+                except Exception as e:
+                    logger.warning(f"Tool quota store unavailable: {e}")
+        if counts is None:
+            counts = [*self._local_counts(hourly), *self._local_counts(daily)]
+            tools = dict(self._local_stats.get((admin_id, day), {}))
+
+        hourly_used = round(counts[1] * hourly.weight + counts[0])
+        daily_used = round(counts[3] * daily.weight + counts[2])
+        tool_usage = {
+            name: {
+                "calls": calls,
+                "cost": calls * self._costs.get(name, self._costs["default"]),
+                "hourly_limit": self._limits.get(name, self._limits["default"]),
+            }
+            for name, calls in sorted(
+                tools.items(), key=lambda item: -item[1]
+            )
+        }
+
+        lines = [
+            "📊 *Квоты инструментов ARIA*\n",
+            f"За час: *{hourly_used}/{hourly.limit}* ед.",
+            f"За сутки: *{daily_used}/{daily.limit}* ед.\n",
+        ]
+        if tool_usage:
+            lines.append("*Сегодня по инструментам:*")
+            lines.extend(
+                f"• {name.replace('_', ' ')}: {usage['calls']} "
+                f"(стоимость {usage['cost']})"
+                for name, usage in tool_usage.items()
+            )
+
+        return {
+            "success": True,
+            "hourly": {"used": hourly_used, "limit": hourly.limit},
+            "daily": {"used": daily_used, "limit": daily.limit},
+            "tools": tool_usage,
+            "message": "\n".join(lines),
+        }
 
 
 # Singleton rate limiter
@@ -117,3 +362,8 @@ def get_rate_limiter() -> ToolRateLimiter:
     if _rate_limiter is None:
         _rate_limiter = ToolRateLimiter()
     return _rate_limiter
+
+
+def set_rate_limiter_redis(redis_client: Any | None) -> None:
+    """Set the Redis client of the rate limiter singleton. Called at bot startup."""
+    get_rate_limiter().set_redis(redis_client)
@@ -7,24 +7,31 @@ Users receive notifications if they have:
 - Work status = "active" (PLEX payments are up to date)
 - Balance > 0
 - Not blocked the bot
+
+Statistics for the whole eligible cohort are computed up front (partner
+figures in grouped queries, BALANCE_NOTIF_STATS_CHUNK users each) and the
+messages go through the rate-shaped DeliveryQueue. The run is keyed by
+hour, so a retried run only sends to users not reached yet.
 """
 
 import secrets
+from datetime import UTC, datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.referral import Referral
 from app.models.user import User
 from app.services.base_service import BaseService
+from app.services.notification.delivery_queue import Delivery, DeliveryQueue
 from app.config.constants import (
     BALANCE_NOTIF_MIN_OPERATIONS,
     BALANCE_NOTIF_MAX_OPERATIONS,
     BALANCE_NOTIF_OPERATIONS_MEAN_SHIFT,
+    BALANCE_NOTIF_STATS_CHUNK,
 )
 
 
@@ -98,7 +105,7 @@ class BalanceNotificationService(BaseService):
         - is_active = True
 
         Returns:
-            List of eligible users with deposits loaded
+            List of eligible users
         """
         from app.config.business_constants import WorkStatus
 
@@ -116,7 +123,7 @@ class BalanceNotificationService(BaseService):
                     User.is_active == True,  # noqa: E712
                 )
             )
-            .options(selectinload(User.deposits))
+            .order_by(User.id)
         )
 
         result = await self.session.execute(stmt)
@@ -125,12 +132,18 @@ class BalanceNotificationService(BaseService):
         logger.info(f"Found {len(users)} eligible users for balance notifications")
         return users
 
-    async def get_user_statistics(self, user: User) -> dict:
+    async def get_user_statistics(
+        self,
+        user: User,
+        partners_stats: dict | None = None,
+    ) -> dict:
         """
         Get statistics for a user's notification.
 
         Args:
             user: User to get statistics for
+            partners_stats: Precomputed partner statistics
+                (see get_partners_statistics; queried if None)
 
         Returns:
             Dict with:
@@ -158,7 +171,8 @@ class BalanceNotificationService(BaseService):
         user_earnings = user_earnings.quantize(Decimal("0.0001"))
 
         # Get partner statistics
-        partners_stats = await self._get_partners_statistics(user.id)
+        if partners_stats is None:
+            partners_stats = await self._get_partners_statistics(user.id)
 
         # PLEX statistics
         plex_balance = user.last_plex_balance or Decimal("0")
@@ -189,43 +203,59 @@ class BalanceNotificationService(BaseService):
         Returns:
             Dict with partners_earnings and income_from_partners
         """
-        # Get total earned from direct referrals (level 1)
-        stmt = select(func.coalesce(func.sum(Referral.total_earned), Decimal("0"))).where(
-            and_(
-                Referral.referrer_id == user_id,
-                Referral.level == 1,  # Only direct referrals
-            )
-        )
-        result = await self.session.execute(stmt)
-        income_from_partners = result.scalar() or Decimal("0")
+        stats = await self.get_partners_statistics([user_id])
+        return stats[user_id]
 
-        # Get IDs of direct referrals
-        referral_ids_stmt = select(Referral.referral_id).where(
-            and_(
-                Referral.referrer_id == user_id,
-                Referral.level == 1,
-            )
-        )
-        referral_ids_result = await self.session.execute(referral_ids_stmt)
-        referral_ids = list(referral_ids_result.scalars().all())
-
-        # Calculate total earnings of partners
-        partners_earnings = Decimal("0")
-        if referral_ids:
-            total_earned_sum = func.coalesce(
-                func.sum(User.total_earned), Decimal("0")
-            )
-            partners_stmt = select(total_earned_sum).where(
-                User.id.in_(referral_ids)
-            )
-            partners_result = await self.session.execute(partners_stmt)
-            partners_earnings = partners_result.scalar() or Decimal("0")
+    async def get_partners_statistics(
+        self, user_ids: list[int]
+    ) -> dict[int, dict]:
+        """
+        Get partner statistics for many users in grouped queries.
 
-        return {
-            "partners_earnings": partners_earnings,
-            "income_from_partners": income_from_partners,
+        For each user, sums over direct referrals (level 1):
+        - income_from_partners: referral rewards earned from them
+        - partners_earnings: their own total earnings
+
+        Args:
+            user_ids: User IDs (queried BALANCE_NOTIF_STATS_CHUNK at a time)
+
+        Returns:
+            Dict of user ID to partner statistics (zeros if no partners)
+        """
+        stats = {
+            user_id: {
+                "partners_earnings": Decimal("0"),
+                "income_from_partners": Decimal("0"),
+            }
+            for user_id in user_ids
         }
 
+        for i in range(0, len(user_ids), BALANCE_NOTIF_STATS_CHUNK):
+            chunk = user_ids[i:i + BALANCE_NOTIF_STATS_CHUNK]
+            stmt = (
+                select(
+                    Referral.referrer_id,
+                    func.coalesce(func.sum(Referral.total_earned), Decimal("0")),
+                    func.coalesce(func.sum(User.total_earned), Decimal("0")),
+                )
+                .join(User, User.id == Referral.referral_id)
+                .where(
+                    and_(
+                        Referral.referrer_id.in_(chunk),
+                        Referral.level == 1,  # Only direct referrals
+                    )
+                )
+                .group_by(Referral.referrer_id)
+            )
+            result = await self.session.execute(stmt)
+            for referrer_id, income, earnings in result.all():
+                stats[referrer_id] = {
+                    "partners_earnings": earnings,
+                    "income_from_partners": income,
+                }
+
+        return stats
+
     def format_notification_message(self, stats: dict) -> str:
         """
         Format the notification message with statistics.
@@ -330,8 +360,6 @@ class BalanceNotificationService(BaseService):
                 logger.warning(f"Bot blocked by user {user.telegram_id}, skipping notification")
                 # Mark user as bot_blocked
                 try:
-                    from datetime import UTC, datetime
-
                     user.bot_blocked = True
                     user.bot_blocked_at = datetime.now(UTC)
                     await self.session.flush()
@@ -349,16 +377,22 @@ class BalanceNotificationService(BaseService):
     async def send_notifications_to_all_eligible(
         self,
         bot: "Bot",
+        run_id: str | None = None,
+        redis_client: Any | None = None,
     ) -> dict:
         """
         Send balance notifications to all eligible users.
 
-        Implements rate limiting to respect Telegram API limits:
-        - Max 30 messages per second
-        - We use 25/sec to be safe with batches of 25 + 1.1 sec delay
+        Statistics are computed for the whole cohort first; messages are
+        sent through DeliveryQueue (rate-shaped, honours flood control).
+        Users already reached by the same run are skipped, so a retried
+        run resumes instead of sending twice.
 
         Args:
             bot: Telegram bot instance
+            run_id: Run identifier (current UTC hour if None)
+            redis_client: Redis client for the run's progress
+                (a short-lived one if None)
 
         Returns:
             Dict with statistics:
@@ -366,63 +400,66 @@ class BalanceNotificationService(BaseService):
             - sent: Successfully sent
             - failed: Failed to send
             - blocked: Users who blocked the bot
+            - skipped: Already sent by this run before a restart
         """
-        import asyncio
-
-        # Telegram rate limit safety: 25 messages per second
-        BATCH_SIZE = 25
-        BATCH_DELAY = 1.1  # seconds between batches
-
         stats = {
             "total": 0,
             "sent": 0,
             "failed": 0,
             "blocked": 0,
+            "skipped": 0,
         }
 
         try:
             users = await self.get_eligible_users()
             stats["total"] = len(users)
 
-            info_msg = (
+            run_id = run_id or datetime.now(UTC).strftime("%Y%m%d%H")
+            queue = DeliveryQueue(
+                bot, f"balance:{run_id}", redis_client=redis_client
+            )
+            pending = set(await queue.pending(user.id for user in users))
+            users = [user for user in users if user.id in pending]
+            stats["skipped"] = stats["total"] - len(users)
+
+            logger.info(
                 f"Starting balance notifications for {len(users)} users "
-                f"with rate limiting"
+                f"(run {run_id}, {stats['skipped']} already sent)"
             )
-            logger.info(info_msg)
 
-            # Process in batches to respect rate limits
-            for i, user in enumerate(users):
-                try:
-                    success = await self.send_notification_to_user(bot, user)
-                    if success:
-                        stats["sent"] += 1
-                    else:
-                        # Check if it was a block
-                        if user.bot_blocked:
-                            stats["blocked"] += 1
-                        else:
-                            stats["failed"] += 1
-
-                    # Rate limiting: pause after each batch
-                    if (i + 1) % BATCH_SIZE == 0:
-                        debug_msg = (
-                            f"Rate limit pause after {i + 1} messages, "
-                            f"sleeping {BATCH_DELAY}s"
-                        )
-                        logger.debug(debug_msg)
-                        await asyncio.sleep(BATCH_DELAY)
-
-                except Exception as e:
-                    logger.error(f"Error processing user {user.id}: {e}")
-                    stats["failed"] += 1
-
-            # Commit any changes (bot_blocked flags)
-            await self.session.commit()
+            partners = await self.get_partners_statistics(
+                [user.id for user in users]
+            )
+            deliveries = []
+            for user in users:
+                user_stats = await self.get_user_statistics(user, partners[user.id])
+                deliveries.append(
+                    Delivery(
+                        key=user.id,
+                        chat_id=user.telegram_id,
+                        text=self.format_notification_message(user_stats),
+                    )
+                )
+
+            result = await queue.run(deliveries)
+            stats["sent"] = len(result.sent)
+            stats["failed"] = len(result.failed)
+            stats["blocked"] = len(result.blocked)
+
+            if result.blocked:
+                await self.session.execute(
+                    update(User)
+                    .where(User.id.in_(result.blocked))
+                    .values(bot_blocked=True, bot_blocked_at=datetime.now(UTC))
+                    .execution_options(synchronize_session=False)
+                )
+                await self.session.commit()
 
             logger.info(
                 f"Balance notifications complete: "
                 f"total={stats['total']}, sent={stats['sent']}, "
-                f"failed={stats['failed']}, blocked={stats['blocked']}"
+                f"failed={stats['failed']}, blocked={stats['blocked']}, "
+                f"skipped={stats['skipped']}"
             )
 
         except Exception as e:
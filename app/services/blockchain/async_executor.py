@@ -1,8 +1,13 @@
 """
 Async executor for blockchain operations with failover support.
 
-Provides async execution of synchronous Web3 operations with automatic
-failover between multiple RPC providers.
+Provides async execution of synchronous Web3 operations routed by the
+provider manager's ProviderRouter: reads go to the best-scored provider
+(hedged, with failover), writes stay pinned to one provider.
+
+Every provider has its own bounded thread pool: a hedged read abandoned
+on a slow provider keeps its thread until the call returns, and must not
+take the threads the other providers need to answer.
 """
 
 import asyncio
@@ -15,28 +20,13 @@ from loguru import logger
 from app.config.constants import BLOCKCHAIN_EXECUTOR_TIMEOUT
 
 
-def _handle_task_exception(task: asyncio.Task) -> None:
-    """Handle exceptions from background tasks to prevent silent failures."""
-    try:
-        if task.cancelled():
-            return
-        exception = task.exception()
-        if exception:
-            logger.error(
-                f"Background task failed: {exception}",
-                exc_info=exception
-            )
-    except asyncio.CancelledError:
-        pass
-
-
 class AsyncBlockchainExecutor:
     """
     Async executor for blockchain operations.
 
     Handles:
-    - Thread pool execution of sync Web3 calls
-    - Automatic failover between providers
+    - Thread pool execution of sync Web3 calls (one pool per provider)
+    - Latency-scored routing, hedged reads and failover between providers
     - RPC rate limiting
     - Timeout handling
     """
@@ -53,119 +43,92 @@ class AsyncBlockchainExecutor:
         Args:
             provider_manager: SyncProviderManager instance
             rpc_limiter: RPCRateLimiter instance
-            max_workers: Maximum thread pool workers
+            max_workers: Maximum workers of each thread pool
         """
         self.provider_manager = provider_manager
         self.rpc_limiter = rpc_limiter
+        self.max_workers = max_workers
         self._executor = ThreadPoolExecutor(
             max_workers=max_workers,
             thread_name_prefix="web3"
         )
+        self._provider_executors: dict[str, ThreadPoolExecutor] = {}
 
     async def run_with_failover(self, sync_func: Callable[[Any], Any]) -> Any:
         """
-        Run a synchronous Web3 function with failover logic.
+        Run a synchronous Web3 read with routing, hedging and failover.
 
         Args:
             sync_func: Synchronous function that takes Web3 instance as argument
 
         Returns:
-            Result from the function
+            Result from the first provider that answered
 
         Raises:
             Exception: If all providers fail
         """
-        try:
-            await self.provider_manager._update_settings_from_db()
-            loop = asyncio.get_running_loop()
+        await self.provider_manager._update_settings_from_db()
+        return await self.provider_manager.router.read(
+            lambda name: self._run_on(name, sync_func),
+            self.provider_manager.active_provider_name,
+            self.provider_manager.is_auto_switch_enabled,
+        )
 
-            current_name = self.provider_manager.active_provider_name
+    async def run_pinned(self, sync_func: Callable[[Any], Any]) -> Any:
+        """
+        Run a synchronous Web3 write on one provider.
+
+        The write is never hedged or retried on another provider: the
+        first one may have broadcast the transaction already.
+
+        Args:
+            sync_func: Synchronous function that takes Web3 instance as argument
 
-            # Try primary provider
+        Returns:
+            Result from the function
+        """
+        await self.provider_manager._update_settings_from_db()
+        return await self.provider_manager.router.write(
+            lambda name: self._run_on(name, sync_func),
+            self.provider_manager.active_provider_name,
+            self.provider_manager.is_auto_switch_enabled,
+        )
+
+    def _provider_executor(self, name: str) -> ThreadPoolExecutor:
+        """Thread pool of one provider, created on first use."""
+        executor = self._provider_executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"web3-{name}"
+            )
+            self._provider_executors[name] = executor
+        return executor
+
+    async def _run_on(self, name: str, sync_func: Callable[[Any], Any]) -> Any:
+        """Run a synchronous Web3 function on one provider in its pool."""
+        w3 = self.provider_manager.providers[name]
+        loop = asyncio.get_running_loop()
+        executor = self._provider_executor(name)
+
+        async with self.rpc_limiter:
             try:
-                # Check primary provider exists
-                if (current_name not in self.provider_manager.providers
-                    and self.provider_manager.providers):
-                    current_name = next(iter(self.provider_manager.providers))
-
-                if current_name not in self.provider_manager.providers:
-                    raise ConnectionError("No providers available")
-
-                w3 = self.provider_manager.providers[current_name]
-
-                async with self.rpc_limiter:
-                    try:
-                        return await asyncio.wait_for(
-                            loop.run_in_executor(
-                                self._executor,
-                                lambda: sync_func(w3)
-                            ),
-                            timeout=BLOCKCHAIN_EXECUTOR_TIMEOUT,
-                        )
-                    except TimeoutError:
-                        logger.error(
-                            f"Timeout in blockchain operation "
-                            f"on provider '{current_name}'"
-                        )
-                        raise TimeoutError(
-                            f"Blockchain operation timeout on {current_name}"
-                        )
-            except Exception as e:
-                if not self.provider_manager.is_auto_switch_enabled:
-                    raise e
-
-                logger.warning(f"Primary provider '{current_name}' failed: {e}. Trying failover...")
-
-                # Find backup provider
-                backup_name = next(
-                    (n for n in self.provider_manager.providers if n != current_name), None
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, lambda: sync_func(w3)),
+                    timeout=BLOCKCHAIN_EXECUTOR_TIMEOUT,
+                )
+            except TimeoutError:
+                logger.error(
+                    f"Timeout in blockchain operation on provider '{name}'"
+                )
+                raise TimeoutError(
+                    f"Blockchain operation timeout on {name}"
                 )
-                if not backup_name:
-                    raise e
-
-                # Try backup provider
-                try:
-                    logger.info(f"Switching to backup: {backup_name}")
-                    w3_backup = self.provider_manager.providers[backup_name]
-
-                    async with self.rpc_limiter:
-                        try:
-                            result = await asyncio.wait_for(
-                                loop.run_in_executor(
-                                    self._executor,
-                                    lambda: sync_func(w3_backup)
-                                ),
-                                timeout=BLOCKCHAIN_EXECUTOR_TIMEOUT,
-                            )
-                        except TimeoutError:
-                            logger.error(
-                                f"Timeout in blockchain operation "
-                                f"on backup provider '{backup_name}'"
-                            )
-                            raise TimeoutError(
-                                f"Blockchain operation timeout on backup "
-                                f"{backup_name}"
-                            )
-
-                    # If success, switch permanent
-                    self.provider_manager.active_provider_name = backup_name
-                    if self.provider_manager.session_factory:
-                        task = asyncio.create_task(
-                            self.provider_manager._safe_persist_provider_switch(
-                                backup_name
-                            )
-                        )
-                        task.add_done_callback(_handle_task_exception)
-
-                    return result
-                except Exception as e2:
-                    logger.error(f"Backup provider failed: {e2}")
-                    raise e
-        except asyncio.CancelledError:
-            logger.warning("Blockchain operation cancelled, performing cleanup")
-            raise  # Always re-raise CancelledError
 
     def cleanup(self) -> None:
-        """Clean up thread pool executor."""
+        """Clean up thread pool executors."""
         if self._executor:
             self._executor.shutdown(wait=True)
+        for executor in self._provider_executors.values():
+            executor.shutdown(wait=True)
+        self._provider_executors.clear()
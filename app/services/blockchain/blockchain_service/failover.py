@@ -4,6 +4,8 @@ Failover Module.
 Contains failover logic for the BlockchainService.
 """
 
+from __future__ import annotations
+
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
@@ -51,10 +53,15 @@ class Failover:
         Raises:
             RuntimeError: If all providers fail and maintenance mode not set
         """
-        from app.config.settings import settings
+        from app.services.runtime_flags import (
+            MAINTENANCE_MODE,
+            get_runtime_flags,
+        )
+
+        flags = get_runtime_flags()
 
         # Check maintenance mode
-        if settings.blockchain_maintenance_mode:
+        if await flags.get(MAINTENANCE_MODE):
             raise RuntimeError(
                 "Blockchain is in maintenance mode. "
                 "Operations are temporarily unavailable."
@@ -81,7 +88,15 @@ class Failover:
                 )
 
                 # If all providers fail, set maintenance mode
-                settings.blockchain_maintenance_mode = True
+                try:
+                    await flags.set(
+                        MAINTENANCE_MODE, True, "system:failover",
+                        reason=f"All providers failed: {failover_error}",
+                    )
+                except Exception as flag_error:
+                    logger.error(
+                        f"Failed to activate maintenance mode: {flag_error}"
+                    )
                 logger.critical(
                     "All blockchain providers failed. "
                     "Maintenance mode activated."
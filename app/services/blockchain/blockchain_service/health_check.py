@@ -4,6 +4,8 @@ Health Check Module.
 Contains health check functionality for the BlockchainService.
 """
 
+from __future__ import annotations
+
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
@@ -193,6 +193,7 @@ class BlockchainService:
         self,
         event_callback: Callable | None = None,
         from_block: int | str = "latest",
+        redis_client: Any | None = None,
     ) -> None:
         """
         Start monitoring USDT deposits to system wallet.
@@ -200,6 +201,8 @@ class BlockchainService:
         Args:
             event_callback: Async callback for new deposits
             from_block: Starting block number or 'latest'
+            redis_client: Optional Redis client to follow the chain head
+                stream
         """
         self._ensure_initialized()
 
@@ -207,6 +210,7 @@ class BlockchainService:
             watch_address=self.system_wallet_address,
             from_block=from_block,
             event_callback=event_callback,
+            redis_client=redis_client,
         )
 
     async def stop_deposit_monitoring(self) -> None:
@@ -0,0 +1,423 @@
+"""
+Shared chain head tracker.
+
+One tracker process (jobs/chain_head_tracker.py) follows new blocks - by
+a newHeads websocket subscription when a websocket endpoint is
+configured, otherwise by polling - and publishes every height with its
+hash to an ordered Redis stream. Missed heights are backfilled, so the
+stream has no gaps; a head that does not extend the previous one (reorg)
+is published as well and logged.
+
+Consumers either read the latest head (get_head_number) instead of
+calling eth_blockNumber themselves, or follow the stream with their own
+HeadCursor and only do work when a new block actually arrives (periodic
+jobs use follow_head: the deposit monitor, the blockchain indexer and
+the cache sync). When the tracker is down the published head expires and
+callers fall back to querying the node.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.providers import AsyncHTTPProvider
+
+from app.config.constants import (
+    BLOCKCHAIN_TIMEOUT,
+    CHAIN_HEAD_LATEST_TTL,
+    CHAIN_HEAD_LEADER_TTL,
+    CHAIN_HEAD_LOCAL_CACHE_SECONDS,
+    CHAIN_HEAD_MAX_BACKFILL,
+    CHAIN_HEAD_POLL_INTERVAL,
+    CHAIN_HEAD_STREAM_MAXLEN,
+    CHAIN_HEAD_WS_RETRY_SECONDS,
+)
+
+
+CHAIN_HEAD_STREAM = "chain:heads"
+CHAIN_HEAD_LATEST_KEY = "chain:head:latest"
+CHAIN_HEAD_LEADER_KEY = "chain:head:leader"
+CHAIN_HEAD_CURSOR_PREFIX = "chain:head:cursor:"
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value)
+    return int(value)
+
+
+def _to_hex(value: Any) -> str:
+    if isinstance(value, bytes | bytearray):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+@dataclass(frozen=True)
+class ChainHead:
+    """One published block."""
+
+    number: int
+    hash: str
+    parent_hash: str
+    timestamp: int = 0
+
+    @classmethod
+    def from_block(cls, block: Any) -> "ChainHead":
+        """Build from a web3 block or newHeads header."""
+        return cls(
+            number=_to_int(block["number"]),
+            hash=_to_hex(block["hash"]),
+            parent_hash=_to_hex(block["parentHash"]),
+            timestamp=_to_int(block.get("timestamp", 0)),
+        )
+
+    @classmethod
+    def from_fields(cls, fields: dict[str, Any]) -> "ChainHead":
+        """Build from a stream entry or the latest-head record."""
+        return cls(
+            number=int(fields["number"]),
+            hash=fields["hash"],
+            parent_hash=fields["parent_hash"],
+            timestamp=int(fields.get("timestamp", 0)),
+        )
+
+    def to_fields(self) -> dict[str, Any]:
+        """Stream entry fields."""
+        return asdict(self)
+
+
+async def get_latest_head(redis_client: Any) -> ChainHead | None:
+    """
+    Get the head last published by the tracker.
+
+    Args:
+        redis_client: Redis client
+
+    Returns:
+        Latest head, or None if the tracker is not running
+    """
+    data = await redis_client.get(CHAIN_HEAD_LATEST_KEY)
+    if not data:
+        return None
+    return ChainHead.from_fields(json.loads(data))
+
+
+_cached_head: tuple[float, int] | None = None
+
+
+async def get_head_number(redis_client: Any | None = None) -> int | None:
+    """
+    Get the current block number published by the tracker.
+
+    Reused within the process for CHAIN_HEAD_LOCAL_CACHE_SECONDS.
+
+    Args:
+        redis_client: Optional Redis client (a short-lived one is used
+            if None)
+
+    Returns:
+        Block number, or None if the tracker is not running (callers
+        then query the node themselves)
+    """
+    global _cached_head
+    now = time.monotonic()
+    if _cached_head and now - _cached_head[0] < CHAIN_HEAD_LOCAL_CACHE_SECONDS:
+        return _cached_head[1]
+
+    try:
+        if redis_client is None:
+            from app.utils.redis_utils import get_redis_client
+
+            client = await get_redis_client()
+            try:
+                head = await get_latest_head(client)
+            finally:
+                await client.aclose()
+        else:
+            head = await get_latest_head(redis_client)
+    except Exception as e:
+        logger.debug(f"Chain head unavailable: {e}")
+        return None
+
+    if head is None:
+        return None
+    _cached_head = (now, head.number)
+    return head.number
+
+
+class HeadCursor:
+    """
+    A consumer's position in the chain head stream.
+
+    read() returns the heads published since the last read; commit()
+    persists the position so the next run (e.g. the next actor call)
+    continues from there. A consumer without a stored position starts at
+    the current head.
+    """
+
+    def __init__(self, redis_client: Any, consumer: str) -> None:
+        """
+        Initialize cursor.
+
+        Args:
+            redis_client: Redis client
+            consumer: Consumer name (one position per name)
+        """
+        self.redis_client = redis_client
+        self.consumer = consumer
+        self._key = CHAIN_HEAD_CURSOR_PREFIX + consumer
+        self._position: str | None = None
+        self._loaded = False
+
+    async def read(
+        self,
+        block: float | None = None,
+        count: int = CHAIN_HEAD_MAX_BACKFILL,
+    ) -> list[ChainHead]:
+        """
+        Read heads published after the current position.
+
+        Args:
+            block: Seconds to wait for a new head (None: do not wait)
+            count: Maximum heads returned
+
+        Returns:
+            Heads in publication order (empty if none arrived)
+        """
+        if not self._loaded:
+            self._position = await self.redis_client.get(self._key)
+            self._loaded = True
+
+        if self._position is None:
+            entries = await self.redis_client.xrevrange(
+                CHAIN_HEAD_STREAM, count=1
+            )
+            if entries:
+                entry_id, fields = entries[0]
+                self._position = entry_id
+                return [ChainHead.from_fields(fields)]
+            if not block:
+                return []
+            self._position = "$"
+
+        response = await self.redis_client.xread(
+            {CHAIN_HEAD_STREAM: self._position},
+            count=count,
+            block=int(block * 1000) if block else None,
+        )
+        heads = []
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                self._position = entry_id
+                heads.append(ChainHead.from_fields(fields))
+        return heads
+
+    async def commit(self) -> None:
+        """Persist the position reached by read()."""
+        if self._position and self._position != "$":
+            await self.redis_client.set(self._key, self._position)
+
+
+async def follow_head(
+    redis_client: Any | None, consumer: str
+) -> tuple[HeadCursor | None, int | None]:
+    """
+    Position a periodic job on the chain head stream.
+
+    The job skips its run when no block arrived since the last one, and
+    commits the cursor once the work for the head is done (an
+    uncommitted run is triggered again by the same heads).
+
+    Args:
+        redis_client: Redis client (None: no stream, query the node)
+        consumer: Consumer name of the job
+
+    Returns:
+        (cursor, highest new head). The head is None with a cursor if no
+        block arrived (skip the run); both are None if the tracker is not
+        running (query the node)
+    """
+    if redis_client is None:
+        return None, None
+    try:
+        if await get_latest_head(redis_client) is None:
+            return None, None
+        cursor = HeadCursor(redis_client, consumer)
+        heads = await cursor.read()
+    except Exception as e:
+        logger.debug(f"Chain head stream unavailable for {consumer}: {e}")
+        return None, None
+    return cursor, max((head.number for head in heads), default=None)
+
+
+class ChainHeadTracker:
+    """Follows new blocks and publishes them to the chain head stream."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        http_url: str,
+        wss_url: str | None = None,
+        poll_interval: float = CHAIN_HEAD_POLL_INTERVAL,
+    ) -> None:
+        """
+        Initialize tracker.
+
+        Args:
+            redis_client: Redis client
+            http_url: HTTP RPC endpoint (polling, backfill)
+            wss_url: Optional websocket endpoint for newHeads
+            poll_interval: Seconds between polls without websocket
+        """
+        self.redis_client = redis_client
+        self.http_url = http_url
+        self.wss_url = wss_url
+        self.poll_interval = poll_interval
+
+        self._http: AsyncWeb3 | None = None
+        self._last: ChainHead | None = None
+        self._token = uuid.uuid4().hex
+        self._ws_retry_at = 0.0
+
+    def _web3(self) -> AsyncWeb3:
+        if self._http is None:
+            self._http = AsyncWeb3(
+                AsyncHTTPProvider(
+                    self.http_url,
+                    request_kwargs={"timeout": BLOCKCHAIN_TIMEOUT},
+                )
+            )
+        return self._http
+
+    async def run(self) -> None:
+        """Track the chain until cancelled (only while holding leadership)."""
+        logger.info("Chain head tracker started")
+        while True:
+            try:
+                if not await self.hold_leadership():
+                    await asyncio.sleep(CHAIN_HEAD_LEADER_TTL / 3)
+                    continue
+                if self.wss_url and time.monotonic() >= self._ws_retry_at:
+                    await self._follow_subscription()
+                else:
+                    await self.poll_once()
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Chain head tracker error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def hold_leadership(self) -> bool:
+        """Acquire or renew the tracker lease; one tracker publishes."""
+        if await self.redis_client.set(
+            CHAIN_HEAD_LEADER_KEY, self._token,
+            nx=True, ex=CHAIN_HEAD_LEADER_TTL,
+        ):
+            logger.info("Chain head tracker is the leader")
+            return True
+        if await self.redis_client.get(CHAIN_HEAD_LEADER_KEY) == self._token:
+            await self.redis_client.expire(
+                CHAIN_HEAD_LEADER_KEY, CHAIN_HEAD_LEADER_TTL
+            )
+            return True
+        return False
+
+    async def poll_once(self) -> int:
+        """
+        Fetch the latest block and publish it.
+
+        Returns:
+            Number of heads published
+        """
+        block = await self._web3().eth.get_block("latest")
+        return await self.publish(ChainHead.from_block(block))
+
+    async def _follow_subscription(self) -> None:
+        """Publish newHeads until the websocket fails or leadership is lost."""
+        from web3.providers.websocket import WebsocketProviderV2
+
+        try:
+            async with AsyncWeb3.persistent_websocket(
+                WebsocketProviderV2(self.wss_url)
+            ) as w3:
+                await w3.eth.subscribe("newHeads")
+                logger.info("Chain head tracker subscribed to newHeads")
+                messages = w3.ws.process_subscriptions().__aiter__()
+                while True:
+                    try:
+                        message = await asyncio.wait_for(
+                            messages.__anext__(), CHAIN_HEAD_LEADER_TTL / 3
+                        )
+                    except TimeoutError:
+                        # No head for a while: check via HTTP, keep lease
+                        await self.poll_once()
+                    else:
+                        await self.publish(
+                            ChainHead.from_block(message["result"])
+                        )
+                    if not await self.hold_leadership():
+                        return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._ws_retry_at = time.monotonic() + CHAIN_HEAD_WS_RETRY_SECONDS
+            logger.warning(
+                f"Chain head websocket failed, polling for "
+                f"{CHAIN_HEAD_WS_RETRY_SECONDS}s: {e}"
+            )
+
+    async def publish(self, head: ChainHead) -> int:
+        """
+        Publish a head, backfilling heights missed since the last one.
+
+        Args:
+            head: New head
+
+        Returns:
+            Number of heads appended to the stream
+        """
+        last = self._last or await get_latest_head(self.redis_client)
+        if last and head.number == last.number and head.hash == last.hash:
+            await self.redis_client.expire(
+                CHAIN_HEAD_LATEST_KEY, CHAIN_HEAD_LATEST_TTL
+            )
+            return 0
+
+        heads = [head]
+        if last and head.number > last.number + 1:
+            start = max(last.number + 1, head.number - CHAIN_HEAD_MAX_BACKFILL)
+            missed = [
+                ChainHead.from_block(await self._web3().eth.get_block(number))
+                for number in range(start, head.number)
+            ]
+            heads = missed + heads
+        elif last and (
+            head.number <= last.number or head.parent_hash != last.hash
+        ):
+            logger.warning(
+                f"Chain reorg: head {head.number} ({head.hash[:10]}) does not "
+                f"extend {last.number} ({last.hash[:10]})"
+            )
+
+        for item in heads:
+            await self._append(item)
+        self._last = head
+        return len(heads)
+
+    async def _append(self, head: ChainHead) -> None:
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                CHAIN_HEAD_STREAM, head.to_fields(),
+                maxlen=CHAIN_HEAD_STREAM_MAXLEN, approximate=True,
+            )
+            pipe.set(
+                CHAIN_HEAD_LATEST_KEY, json.dumps(head.to_fields()),
+                ex=CHAIN_HEAD_LATEST_TTL,
+            )
+            await pipe.execute()
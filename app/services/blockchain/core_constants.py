@@ -3,6 +3,7 @@ Core blockchain constants and configurations.
 
 This module contains all blockchain-related constants including:
 - USDT contract ABI
+- Multisend (batched payout) contract ABI
 - Gas price settings
 - Token decimals
 - Type definitions
@@ -33,6 +34,16 @@ USDT_ABI = [
         "outputs": [{"name": "", "type": "bool"}],
         "type": "function",
     },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function",
+    },
     {
         "anonymous": False,
         "inputs": [
@@ -45,6 +56,44 @@ USDT_ABI = [
     },
 ]
 
+# Multisend contract ABI (contracts/MultiTransfer.vy)
+# Fans out USDT from the payout wallet via transferFrom, one leg id per payout
+MULTISEND_ABI = [
+    {
+        "inputs": [
+            {"name": "sender", "type": "address"},
+            {"name": "legIds", "type": "bytes32[]"},
+        ],
+        "name": "paidMany",
+        "outputs": [{"name": "", "type": "bool[]"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "token", "type": "address"},
+            {"name": "legIds", "type": "bytes32[]"},
+            {"name": "recipients", "type": "address[]"},
+            {"name": "amounts", "type": "uint256[]"},
+        ],
+        "name": "multiTransfer",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "legId", "type": "bytes32"},
+            {"indexed": True, "name": "sender", "type": "address"},
+            {"indexed": False, "name": "recipient", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"},
+        ],
+        "name": "LegPaid",
+        "type": "event",
+    },
+]
+
 # PLEX ABI (ERC-20 compatible)
 # PLEX token follows standard ERC-20 interface with 9 decimals
 PLEX_ABI = [
@@ -88,6 +137,9 @@ DEFAULT_USDT_GAS_LIMIT = 100000  # Standard USDT transfer
 DEFAULT_NATIVE_GAS_LIMIT = 21000  # Standard native BNB transfer
 GAS_LIMIT_MULTIPLIER = 1.2  # Safety buffer for gas estimation
 
+# Multisend limits
+MULTISEND_MAX_LEGS = 200  # Must match MAX_LEGS in contracts/MultiTransfer.vy
+
 # Nonce management
 NONCE_STUCK_THRESHOLD = 5  # Max pending transactions before warning
 
@@ -7,12 +7,14 @@ Monitors blockchain for incoming USDT transfers to system wallet.
 import asyncio
 from collections.abc import Callable
 from decimal import Decimal
+from typing import Any
 
 from loguru import logger
 from web3 import AsyncWeb3
 
-from app.config.constants import BLOCKCHAIN_LONG_TIMEOUT
+from app.config.constants import BLOCKCHAIN_LONG_TIMEOUT, CHAIN_HEAD_LATEST_TTL
 
+from .chain_head import HeadCursor
 from .constants import USDT_ABI, USDT_DECIMALS
 
 
@@ -21,6 +23,8 @@ class EventMonitor:
     Monitors USDT Transfer events on BSC blockchain.
 
     Uses polling mechanism to detect incoming transfers to monitored addresses.
+    With a Redis client, polls only when the chain head tracker publishes
+    a new block.
     """
 
     def __init__(
@@ -64,6 +68,7 @@ class EventMonitor:
         watch_address: str,
         from_block: int | str = "latest",
         event_callback: Callable | None = None,
+        redis_client: Any | None = None,
     ) -> None:
         """
         Start monitoring USDT transfers to address.
@@ -72,6 +77,8 @@ class EventMonitor:
             watch_address: Address to monitor for incoming transfers
             from_block: Starting block number or 'latest'
             event_callback: Async callback function for new transfers
+            redis_client: Optional Redis client to follow the chain head
+                stream instead of polling eth_blockNumber
         """
         self._monitoring = True
         self._event_callback = event_callback
@@ -89,26 +96,41 @@ class EventMonitor:
             f"from block {self._last_processed_block}"
         )
 
+        cursor = HeadCursor(redis_client, "event_monitor") if redis_client else None
+
         # Start polling loop
         while self._monitoring:
             try:
-                await self._poll_events(watch_address_checksum)
-                await asyncio.sleep(self.poll_interval)
+                if cursor is None:
+                    await self._poll_events(watch_address_checksum)
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                heads = await cursor.read(block=CHAIN_HEAD_LATEST_TTL)
+                # No head for a whole TTL: tracker down, query the node
+                await self._poll_events(
+                    watch_address_checksum,
+                    heads[-1].number if heads else None,
+                )
 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(self.poll_interval * 2)
 
-    async def _poll_events(self, watch_address: str) -> None:
+    async def _poll_events(
+        self, watch_address: str, current_block: int | None = None
+    ) -> None:
         """
         Poll for new Transfer events.
 
         Args:
             watch_address: Address to watch
+            current_block: Chain head (queried from the node if None)
         """
         try:
             # Get current block
-            current_block = await self.web3.eth.block_number
+            if current_block is None:
+                current_block = await self.web3.eth.block_number
 
             if current_block <= self._last_processed_block:
                 return  # No new blocks
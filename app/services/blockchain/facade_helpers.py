@@ -5,7 +5,7 @@ This module provides BlockchainServiceMixin with delegating methods for:
 - Wallet operations (validation)
 - Balance operations (USDT, PLEX, BNB)
 - Gas operations (estimation)
-- Transaction operations (send, status, details)
+- Transaction operations (send, batch, multisend, status, details)
 - Payment verification (PLEX, USDT deposits)
 - Block operations (current block number)
 """
@@ -18,6 +18,8 @@ from loguru import logger
 from web3 import Web3
 from web3.exceptions import Web3Exception
 
+from app.services.blockchain.chain_head import get_head_number
+
 
 class BlockchainServiceMixin:
     """
@@ -124,9 +126,13 @@ class BlockchainServiceMixin:
             Estimated gas fee in BNB or None
         """
         try:
+            gas_price = await self.transaction_manager.get_oracle_gas_price()
+            gas_limit = await self.transaction_manager.get_oracle_transfer_gas()
+
             def _est_gas(w3: Web3):
                 return self.gas_manager.estimate_gas_fee(
-                    w3, to_address, amount, self.wallet_address
+                    w3, to_address, amount, self.wallet_address,
+                    gas_price=gas_price, gas_limit=gas_limit,
                 )
 
             return await self.async_executor.run_with_failover(_est_gas)
@@ -144,6 +150,8 @@ class BlockchainServiceMixin:
         """
         Send USDT payment.
 
+        Pinned to one provider (see AsyncBlockchainExecutor.run_pinned).
+
         Args:
             to_address: Recipient wallet address
             amount: Amount in USDT (Decimal for precision)
@@ -157,19 +165,144 @@ class BlockchainServiceMixin:
                 "error": f"Invalid address: {to_address}"
             }
 
+        # Gas oracle quotes are resolved here, on the main loop: _send
+        # runs its own event loop on an executor thread
+        oracle_gas_price = await self.transaction_manager.get_oracle_gas_price()
+        transfer_gas = await self.transaction_manager.get_oracle_transfer_gas()
+
         def _send(w3: Web3):
             return asyncio.run(
                 self.transaction_manager.send_usdt_payment(
-                    w3, to_address, amount, self.async_executor._executor
+                    w3, to_address, amount, self.async_executor._executor,
+                    oracle_gas_price=oracle_gas_price,
+                    transfer_gas=transfer_gas,
                 )
             )
 
         try:
-            return await self.async_executor.run_with_failover(_send)
+            return await self.async_executor.run_pinned(_send)
         except (Web3Exception, ValueError, TimeoutError, ConnectionError, OSError) as error:
             logger.error(f"Failed to send payment to {to_address} amount {amount}: {error}")
             return {"success": False, "error": str(error)}
 
+    async def send_payment_batch(
+        self,
+        payments: list[tuple[str, Decimal]],
+    ) -> list[dict[str, Any]]:
+        """
+        Send a batch of USDT payments with pipelined nonces.
+
+        Waits for the receipts (see send_usdt_payment_batch). Runs on
+        the active provider only: a partially broadcast batch must not
+        be replayed on a backup provider with fresh nonces.
+
+        Args:
+            payments: List of (recipient address, amount in USDT)
+
+        Returns:
+            One dict per payment (success, tx_hash, error), in order
+        """
+        if not payments:
+            return []
+
+        try:
+            await self.provider_manager._update_settings_from_db()
+            w3 = self.get_active_web3()
+
+            async with self.rpc_limiter:
+                return await self.transaction_manager.send_usdt_payment_batch(
+                    w3, payments, self.async_executor._executor
+                )
+        except (Web3Exception, ValueError, TimeoutError, ConnectionError, OSError) as error:
+            logger.error(f"Failed to send payment batch of {len(payments)}: {error}")
+            return [{"success": False, "error": str(error)} for _ in payments]
+
+    async def send_withdrawal_payout(
+        self,
+        to_address: str,
+        amount: Decimal,
+        leg_ref: str,
+    ) -> dict[str, Any]:
+        """
+        Pay a withdrawal, batched with payouts submitted at the same time.
+
+        Concurrent approvals and auto-payouts share one batch (see
+        PayoutBatcher); the result is only reported once the transfer is
+        mined or its receipt timed out.
+
+        Args:
+            to_address: Recipient wallet address
+            amount: Amount in USDT (Decimal for precision)
+            leg_ref: Stable payout reference, e.g. "withdrawal:123"
+
+        Returns:
+            Dict with success, tx_hash, error and status ("pending" with
+            a tx_hash: broadcast, receipt not available yet)
+        """
+        if not await self.validate_wallet_address(to_address):
+            return {
+                "success": False,
+                "error": f"Invalid address: {to_address}"
+            }
+
+        return await self.payout_batcher.submit(to_address, amount, leg_ref)
+
+    async def _send_payout_batch(
+        self,
+        payments: list[tuple[str, Decimal]],
+        leg_refs: list[str],
+    ) -> list[dict[str, Any]]:
+        """
+        Send one batch collected by the payout batcher.
+
+        Uses one multisend contract call when multisend payouts are
+        enabled (legs are idempotent per withdrawal), else a batch of
+        plain transfers.
+        """
+        if self.multisend_enabled:
+            return await self.send_payment_multisend(payments, leg_refs)
+        return await self.send_payment_batch(payments)
+
+    async def send_payment_multisend(
+        self,
+        payments: list[tuple[str, Decimal]],
+        leg_refs: list[str],
+    ) -> list[dict[str, Any]]:
+        """
+        Send a batch of USDT payments in one multisend contract call.
+
+        Runs on the active provider only, like send_payment_batch. Each
+        leg is verified from the receipt's Transfer logs; legs whose ref
+        was already paid on-chain are reported, not resent.
+
+        Args:
+            payments: List of (recipient address, amount in USDT)
+            leg_refs: Stable reference per payment, e.g. "withdrawal:123"
+
+        Returns:
+            One dict per payment (success, tx_hash, error, log_index), in order
+        """
+        if not payments:
+            return []
+
+        if self.multisend_manager is None:
+            return [
+                {"success": False, "error": "Multisend payouts not configured"}
+                for _ in payments
+            ]
+
+        try:
+            await self.provider_manager._update_settings_from_db()
+            w3 = self.get_active_web3()
+
+            async with self.rpc_limiter:
+                return await self.multisend_manager.send_usdt_multisend(
+                    w3, payments, leg_refs, self.async_executor._executor
+                )
+        except (Web3Exception, ValueError, TimeoutError, ConnectionError, OSError) as error:
+            logger.error(f"Failed to send multisend batch of {len(payments)}: {error}")
+            return [{"success": False, "error": str(error)} for _ in payments]
+
     async def send_native_token(
         self,
         to_address: str,
@@ -178,6 +311,8 @@ class BlockchainServiceMixin:
         """
         Send native token (BNB) to address.
 
+        Pinned to one provider (see AsyncBlockchainExecutor.run_pinned).
+
         Args:
             to_address: Recipient wallet address
             amount: Amount in BNB (Decimal for precision)
@@ -191,15 +326,19 @@ class BlockchainServiceMixin:
                 "error": f"Invalid address: {to_address}"
             }
 
+        # Resolved on the main loop, see send_payment
+        oracle_gas_price = await self.transaction_manager.get_oracle_gas_price()
+
         def _send(w3: Web3):
             return asyncio.run(
                 self.transaction_manager.send_native_token(
-                    w3, to_address, amount, self.async_executor._executor
+                    w3, to_address, amount, self.async_executor._executor,
+                    oracle_gas_price=oracle_gas_price,
                 )
             )
 
         try:
-            return await self.async_executor.run_with_failover(_send)
+            return await self.async_executor.run_pinned(_send)
         except (Web3Exception, ValueError, TimeoutError, ConnectionError, OSError) as error:
             logger.error(f"Failed to send BNB to {to_address} amount {amount}: {error}")
             return {"success": False, "error": str(error)}
@@ -217,10 +356,11 @@ class BlockchainServiceMixin:
         Returns:
             Dict with status, confirmations, block_number
         """
+        current_block = await get_head_number()
         try:
             def _check(w3: Web3):
                 return self.transaction_manager.check_transaction_status_sync(
-                    w3, tx_hash
+                    w3, tx_hash, current_block
                 )
 
             return await self.async_executor.run_with_failover(_check)
@@ -311,9 +451,11 @@ class BlockchainServiceMixin:
         Returns:
             Dict with total_amount, tx_count, transactions, success, error
         """
+        latest_block = await get_head_number()
+
         def _scan(w3: Web3):
             return self.payment_verifier.scan_usdt_deposits_sync(
-                w3, user_wallet, max_blocks
+                w3, user_wallet, max_blocks, latest_block=latest_block
             )
 
         try:
@@ -379,9 +521,12 @@ class BlockchainServiceMixin:
         Returns:
             List of payment dictionaries with tx_hash, amount, block
         """
+        latest_block = await get_head_number()
+
         def _scan(w3: Web3):
             return self.payment_verifier.scan_plex_payments(
-                w3, from_address, since_block, max_blocks
+                w3, from_address, since_block, max_blocks,
+                latest_block=latest_block,
             )
 
         try:
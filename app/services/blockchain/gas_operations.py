@@ -39,22 +39,23 @@ class GasManager:
         """
         self.usdt_contract_address = to_checksum_address(usdt_contract_address)
 
-    def get_optimal_gas_price(self, w3: Web3) -> int:
+    def get_optimal_gas_price(self, w3: Web3, gas_price: int | None = None) -> int:
         """
         Calculate optimal gas price with Smart Gas strategy.
 
         Logic:
-        1. Get current RPC gas price.
+        1. Get current gas price (gas oracle quote or RPC).
         2. Clamp between MIN (0.01 Gwei) and MAX (0.1 Gwei).
 
         Args:
             w3: Web3 instance
+            gas_price: Gas oracle quote in wei (RPC is queried if None)
 
         Returns:
             Gas price in Wei
         """
         try:
-            rpc_gas = w3.eth.gas_price
+            rpc_gas = w3.eth.gas_price if gas_price is None else gas_price
 
             # Clamp logic
             final_gas = max(MIN_GAS_PRICE_WEI, min(MAX_GAS_PRICE_WEI, rpc_gas))
@@ -77,6 +78,8 @@ class GasManager:
         to_address: str,
         amount: Decimal,
         from_address: str,
+        gas_price: int | None = None,
+        gas_limit: int | None = None,
     ) -> Decimal | None:
         """
         Estimate gas fee for USDT transfer.
@@ -89,6 +92,8 @@ class GasManager:
             to_address: Recipient wallet address
             amount: Amount in USDT (Decimal)
             from_address: Sender wallet address
+            gas_price: Gas oracle quote in wei (RPC is queried if None)
+            gas_limit: Memoized transfer gas (estimated if None)
 
         Returns:
             Estimated gas fee in BNB or None on error
@@ -105,13 +110,16 @@ class GasManager:
             contract = w3.eth.contract(address=self.usdt_contract_address, abi=USDT_ABI)
             func = contract.functions.transfer(to_address, amount_wei)
 
-            try:
-                func_gas = func.estimate_gas({"from": from_address})
-            except (Web3Exception, ContractLogicError) as e:
-                logger.warning(f"Gas estimation failed: {e}")
-                func_gas = DEFAULT_USDT_GAS_LIMIT  # Fallback
+            if gas_limit is not None:
+                func_gas = gas_limit
+            else:
+                try:
+                    func_gas = func.estimate_gas({"from": from_address})
+                except (Web3Exception, ContractLogicError) as e:
+                    logger.warning(f"Gas estimation failed: {e}")
+                    func_gas = DEFAULT_USDT_GAS_LIMIT  # Fallback
 
-            price = self.get_optimal_gas_price(w3)
+            price = self.get_optimal_gas_price(w3, gas_price)
             total_wei = func_gas * price
             return Decimal(total_wei) / Decimal(10 ** 18)
         except (ValueError, Web3Exception) as e:
@@ -0,0 +1,348 @@
+"""
+Shared gas price oracle.
+
+Withdrawals, fee previews, payout batches and stuck-transaction checks
+used to call eth_gasPrice and estimate_gas for every transfer. The
+oracle samples eth_feeHistory once per block over a short rolling
+window and publishes slow / standard / fast prices to Redis, so every
+process quotes from the same sample:
+
+- a tier price is the base fee of the next block plus the median, over
+  the non-empty blocks of the window, of that tier's tip percentile
+  (GAS_ORACLE_PERCENTILES), floored at the node's eth_gasPrice;
+- a sample is fresh while no newer head was published by the chain
+  head tracker (GAS_ORACLE_TTL without the tracker); a stale sample is
+  still served while one process resamples;
+- the gas limit of a standard USDT transfer is memoized per token and
+  sender. It is probed with a 1-wei transfer to an address that holds
+  no tokens, i.e. the worst case of a new holder.
+
+Without Redis the sample is shared within the process only. When the
+node cannot be sampled the oracle returns None and callers query the
+node themselves.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+from web3.providers import AsyncHTTPProvider
+
+from app.config.constants import (
+    BLOCKCHAIN_TIMEOUT,
+    GAS_LIMIT_MEMO_TTL,
+    GAS_ORACLE_PERCENTILES,
+    GAS_ORACLE_SAMPLE_LOCK_TTL,
+    GAS_ORACLE_STALE_TTL,
+    GAS_ORACLE_TTL,
+    GAS_ORACLE_WINDOW_BLOCKS,
+)
+from app.services.wallet_snapshot_cache import single_flight
+from app.utils.redis_utils import redis_or_short_lived
+
+from .chain_head import get_head_number
+from .core_constants import USDT_ABI
+
+
+GAS_ORACLE_KEY = "gas:oracle"
+GAS_ORACLE_LOCK_KEY = "gas:oracle:sampling"
+GAS_LIMIT_KEY_PREFIX = "gas:limit:transfer:"
+
+GAS_TIER_SLOW = "slow"
+GAS_TIER_STANDARD = "standard"
+GAS_TIER_FAST = "fast"
+
+# Recipient of the gas limit probe: derived, so it never holds tokens
+GAS_PROBE_ADDRESS = Web3.to_checksum_address(
+    Web3.keccak(text="gas-oracle-transfer-probe")[-20:]
+)
+
+
+@dataclass(frozen=True)
+class GasQuote:
+    """Gas prices (wei) sampled at one block."""
+
+    block: int
+    slow: int
+    standard: int
+    fast: int
+    sampled_at: float
+
+    def price(self, tier: str = GAS_TIER_STANDARD) -> int:
+        """Gas price of a tier (slow, standard or fast)."""
+        return getattr(self, tier)
+
+    def is_fresh(self, head: int | None, now: float | None = None) -> bool:
+        """
+        Check whether the quote is for the current block.
+
+        Args:
+            head: Head published by the chain head tracker (None if the
+                tracker is not running: GAS_ORACLE_TTL applies)
+            now: Unix timestamp (defaults to time.time())
+
+        Returns:
+            True if no newer block is known
+        """
+        if head is not None:
+            return self.block >= head
+        now = time.time() if now is None else now
+        return now - self.sampled_at < GAS_ORACLE_TTL
+
+
+class GasOracle:
+    """Samples gas prices once per block and shares them via Redis."""
+
+    def __init__(
+        self,
+        redis_client: Any | None = None,
+        http_url: str | None = None,
+        web3: AsyncWeb3 | None = None,
+        window: int = GAS_ORACLE_WINDOW_BLOCKS,
+        percentiles: tuple[int, int, int] = GAS_ORACLE_PERCENTILES,
+    ) -> None:
+        """
+        Initialize oracle.
+
+        Args:
+            redis_client: Redis client (a short-lived one is used per
+                lookup if None)
+            http_url: HTTP RPC endpoint (settings RPC URL if None)
+            web3: AsyncWeb3 instance (built from http_url if None)
+            window: Blocks per fee history sample
+            percentiles: Slow, standard and fast tip percentiles
+        """
+        self.redis_client = redis_client
+        self.http_url = http_url
+        self.window = window
+        self.percentiles = percentiles
+
+        self._web3_instance = web3
+        self._quote: GasQuote | None = None
+        self._gas_limits: dict[str, tuple[float, int]] = {}
+
+    def _web3(self) -> AsyncWeb3:
+        if self._web3_instance is None:
+            from app.config.settings import settings
+
+            self._web3_instance = AsyncWeb3(
+                AsyncHTTPProvider(
+                    self.http_url or settings.rpc_url,
+                    request_kwargs={"timeout": BLOCKCHAIN_TIMEOUT},
+                )
+            )
+        return self._web3_instance
+
+    async def get_gas_price(self, tier: str = GAS_TIER_STANDARD) -> int | None:
+        """
+        Get the gas price of a tier for the current block.
+
+        Args:
+            tier: slow, standard or fast
+
+        Returns:
+            Gas price in wei, or None if the node could not be sampled
+        """
+        quote = await self.get_quote()
+        return quote.price(tier) if quote else None
+
+    async def get_quote(self) -> GasQuote | None:
+        """
+        Get the gas quote for the current block.
+
+        Returns:
+            Quote, or None if the node could not be sampled
+        """
+        head = await get_head_number(self.redis_client)
+        if self._quote and self._quote.is_fresh(head):
+            return self._quote
+        return await single_flight(GAS_ORACLE_KEY, lambda: self._refresh(head))
+
+    async def _refresh(self, head: int | None) -> GasQuote | None:
+        """Load the shared quote, resampling it if stale."""
+        async with redis_or_short_lived(self.redis_client, "Gas oracle") as client:
+            shared = None
+            if client is not None:
+                try:
+                    shared = await self._load(client)
+                    if shared and shared.is_fresh(head):
+                        self._quote = shared
+                        return shared
+                    if shared and not await client.set(
+                        GAS_ORACLE_LOCK_KEY, "1",
+                        nx=True, ex=GAS_ORACLE_SAMPLE_LOCK_TTL,
+                    ):
+                        # Another process is resampling this block
+                        self._quote = shared
+                        return shared
+                except Exception as e:
+                    logger.debug(f"Gas oracle Redis lookup failed: {e}")
+                    client = None
+
+            try:
+                quote = await self.sample()
+            except Exception as e:
+                logger.warning(f"Gas oracle sampling failed: {e}")
+                return shared or self._quote
+
+            self._quote = quote
+            if client is not None:
+                try:
+                    await client.set(
+                        GAS_ORACLE_KEY, json.dumps(asdict(quote)),
+                        ex=GAS_ORACLE_STALE_TTL,
+                    )
+                    await client.delete(GAS_ORACLE_LOCK_KEY)
+                except Exception as e:
+                    logger.debug(f"Gas oracle Redis publish failed: {e}")
+            return quote
+
+    @staticmethod
+    async def _load(client: Any) -> GasQuote | None:
+        data = await client.get(GAS_ORACLE_KEY)
+        if not data:
+            return None
+        return GasQuote(**json.loads(data))
+
+    async def sample(self) -> GasQuote:
+        """
+        Sample gas prices from the node.
+
+        Falls back to eth_gasPrice for every tier when fee history is
+        unsupported or the window has no transactions.
+
+        Returns:
+            Fresh quote
+        """
+        w3 = self._web3()
+        node_price = await asyncio.wait_for(
+            w3.eth.gas_price, timeout=BLOCKCHAIN_TIMEOUT
+        )
+        try:
+            history = await asyncio.wait_for(
+                w3.eth.fee_history(
+                    self.window, "latest", list(self.percentiles)
+                ),
+                timeout=BLOCKCHAIN_TIMEOUT,
+            )
+        except Exception as e:
+            logger.debug(f"Fee history unavailable, using eth_gasPrice: {e}")
+            history = None
+
+        tiers = [node_price] * 3
+        block = None
+        if history:
+            ratios = history.get("gasUsedRatio") or []
+            block = int(history["oldestBlock"]) + len(ratios) - 1
+            rewards = [
+                reward
+                for reward, ratio in zip(
+                    history.get("reward") or [], ratios, strict=False
+                )
+                if ratio > 0
+            ]
+            if rewards:
+                base_fee = int(history["baseFeePerGas"][-1])
+                tiers = [
+                    max(
+                        node_price,
+                        base_fee + int(statistics.median(r[i] for r in rewards)),
+                    )
+                    for i in range(3)
+                ]
+        if block is None:
+            block = await asyncio.wait_for(
+                w3.eth.block_number, timeout=BLOCKCHAIN_TIMEOUT
+            )
+
+        slow, standard, fast = tiers
+        standard = max(standard, slow)
+        return GasQuote(
+            block=block,
+            slow=slow,
+            standard=standard,
+            fast=max(fast, standard),
+            sampled_at=time.time(),
+        )
+
+    async def get_transfer_gas(
+        self, token_address: str, sender: str
+    ) -> int | None:
+        """
+        Get the gas used by a standard token transfer from a sender.
+
+        Memoized (in the process and in Redis) for GAS_LIMIT_MEMO_TTL;
+        callers add their safety multiplier.
+
+        Args:
+            token_address: Token contract address
+            sender: Sender address
+
+        Returns:
+            Gas used by a transfer to a new holder, or None if the probe
+            failed (e.g. the sender holds no tokens)
+        """
+        key = f"{GAS_LIMIT_KEY_PREFIX}{token_address.lower()}:{sender.lower()}"
+        now = time.monotonic()
+        memo = self._gas_limits.get(key)
+        if memo and memo[0] > now:
+            return memo[1]
+
+        async with redis_or_short_lived(self.redis_client, "Gas oracle") as client:
+            gas = None
+            if client is not None:
+                try:
+                    data = await client.get(key)
+                    gas = int(data) if data else None
+                except Exception as e:
+                    logger.debug(f"Gas limit memo lookup failed: {e}")
+                    client = None
+
+            if gas is None:
+                try:
+                    gas = await self._probe_transfer_gas(token_address, sender)
+                except Exception as e:
+                    logger.warning(f"Transfer gas probe failed: {e}")
+                    return None
+                if client is not None:
+                    try:
+                        await client.set(key, gas, ex=GAS_LIMIT_MEMO_TTL)
+                    except Exception as e:
+                        logger.debug(f"Gas limit memo store failed: {e}")
+
+        self._gas_limits[key] = (now + GAS_LIMIT_MEMO_TTL, gas)
+        return gas
+
+    async def _probe_transfer_gas(self, token_address: str, sender: str) -> int:
+        w3 = self._web3()
+        contract = w3.eth.contract(
+            address=Web3.to_checksum_address(token_address), abi=USDT_ABI
+        )
+        return await asyncio.wait_for(
+            contract.functions.transfer(GAS_PROBE_ADDRESS, 1).estimate_gas(
+                {"from": Web3.to_checksum_address(sender)}
+            ),
+            timeout=BLOCKCHAIN_TIMEOUT,
+        )
+
+
+# Global oracle instance
+_gas_oracle: GasOracle | None = None
+
+
+def get_gas_oracle() -> GasOracle:
+    """
+    Get global gas oracle instance.
+
+    Returns:
+        GasOracle instance
+    """
+    global _gas_oracle
+    if _gas_oracle is None:
+        _gas_oracle = GasOracle()
+    return _gas_oracle
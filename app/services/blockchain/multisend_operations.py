@@ -0,0 +1,487 @@
+"""
+Multisend operations for blockchain service.
+
+This module handles:
+- Contract-level batched USDT payouts (one multiTransfer call per batch)
+- Per-leg idempotency via leg ids (paid legs are never sent again)
+- Per-leg verification from the receipt's Transfer logs
+- Replacement of stuck multisend transactions (same nonce, higher gas)
+"""
+
+import asyncio
+from decimal import ROUND_DOWN, Decimal
+from typing import Any
+
+from eth_utils import to_checksum_address
+from loguru import logger
+from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3Exception
+
+from app.config.constants import (
+    PAYOUT_MULTISEND_LOOKBACK_BLOCKS,
+    PAYOUT_MULTISEND_RECEIPT_TIMEOUT,
+)
+from app.utils.distributed_lock import LockLease, LockLostError
+from app.utils.security import mask_tx_hash
+
+from .core_constants import (
+    GAS_LIMIT_MULTIPLIER,
+    MULTISEND_ABI,
+    MULTISEND_MAX_LEGS,
+    USDT_ABI,
+    USDT_DECIMALS,
+)
+from .receipt_tracking import TrackedTx
+from .rpc_wrapper import send_raw_transaction_once
+from .transaction_operations import TransactionManager
+
+
+TRANSFER_EVENT_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+LEG_PAID_EVENT_TOPIC = Web3.keccak(text="LegPaid(bytes32,address,address,uint256)")
+
+
+def multisend_leg_id(leg_ref: str) -> bytes:
+    """
+    Derive the on-chain leg id for a payout reference.
+
+    Args:
+        leg_ref: Stable payout reference, e.g. "withdrawal:123"
+
+    Returns:
+        32-byte leg id
+    """
+    return bytes(Web3.keccak(text=leg_ref))
+
+
+def _topic_to_address(topic: bytes) -> str:
+    """Decode an indexed address topic."""
+    return to_checksum_address(bytes(topic)[-20:])
+
+
+def verify_multisend_legs(
+    receipt: Any,
+    token_address: str,
+    sender: str,
+    legs: list[tuple[str, int]],
+) -> list[int | None]:
+    """
+    Match every leg to the Transfer log it produced.
+
+    The contract pays legs in order and the token emits one Transfer per
+    transferFrom, so the n-th Transfer from the sender belongs to leg n.
+
+    Args:
+        receipt: Transaction receipt of the multiTransfer call
+        token_address: Token contract address
+        sender: Payout wallet address
+        legs: List of (recipient, amount in wei), in call order
+
+    Returns:
+        Log index of the matching Transfer per leg, or None if not verified
+    """
+    token_address = to_checksum_address(token_address)
+    sender = to_checksum_address(sender)
+    transfers: list[tuple[str, int, int]] = []
+
+    for log in receipt["logs"]:
+        topics = log["topics"]
+        if (
+            to_checksum_address(log["address"]) != token_address
+            or len(topics) != 3
+            or bytes(topics[0]) != bytes(TRANSFER_EVENT_TOPIC)
+            or _topic_to_address(topics[1]) != sender
+        ):
+            continue
+        transfers.append((
+            _topic_to_address(topics[2]),
+            int.from_bytes(bytes(log["data"]), "big"),
+            log["logIndex"],
+        ))
+
+    matched: list[int | None] = []
+    for position, (to_address, amount_wei) in enumerate(legs):
+        if (
+            position < len(transfers)
+            and transfers[position][:2] == (to_checksum_address(to_address), amount_wei)
+        ):
+            matched.append(transfers[position][2])
+        else:
+            matched.append(None)
+    return matched
+
+
+class MultisendManager:
+    """
+    Sends batched USDT payouts through the multisend contract.
+
+    One transaction pays up to MULTISEND_MAX_LEGS recipients via
+    transferFrom from the payout wallet. Nonce and gas state are shared
+    with TransactionManager so both senders can use the same wallet.
+    """
+
+    def __init__(
+        self,
+        multisend_contract_address: str,
+        transaction_manager: TransactionManager,
+    ) -> None:
+        """
+        Initialize multisend manager.
+
+        Args:
+            multisend_contract_address: Deployed MultiTransfer contract
+            transaction_manager: Transaction manager (wallet, nonce, gas)
+        """
+        self.multisend_contract_address = to_checksum_address(
+            multisend_contract_address
+        )
+        self.transaction_manager = transaction_manager
+
+    async def send_usdt_multisend(
+        self,
+        w3: Web3,
+        payments: list[tuple[str, Decimal]],
+        leg_refs: list[str],
+        executor: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Pay a batch of USDT payments with one contract call per chunk.
+
+        Legs already paid on-chain (same leg ref) are not sent again and
+        are reported with the transaction that paid them. Unlike
+        send_usdt_payment, the receipt is awaited: every leg is verified
+        from its Transfer log before it is reported successful.
+
+        Args:
+            w3: Web3 instance
+            payments: List of (recipient address, amount in USDT)
+            leg_refs: Stable reference per payment, e.g. "withdrawal:123"
+            executor: Thread pool executor
+
+        Returns:
+            One dict per payment (success, tx_hash, error, leg_id,
+            log_index, already_paid), in order
+        """
+        if len(payments) != len(leg_refs):
+            raise ValueError("payments and leg_refs must have the same length")
+
+        if not self.transaction_manager.wallet_account:
+            return [
+                {"success": False, "error": "Wallet not configured"}
+                for _ in payments
+            ]
+
+        results: list[dict[str, Any] | None] = [None] * len(payments)
+        legs: list[tuple[int, bytes, str, int]] = []
+
+        for index, ((to_address, amount), leg_ref) in enumerate(
+            zip(payments, leg_refs, strict=True)
+        ):
+            try:
+                legs.append((
+                    index,
+                    multisend_leg_id(leg_ref),
+                    to_checksum_address(to_address),
+                    int(
+                        (Decimal(str(amount)) * Decimal(10 ** USDT_DECIMALS))
+                        .to_integral_value(ROUND_DOWN)
+                    ),
+                ))
+            except ValueError as e:
+                logger.error(f"Invalid address or amount for multisend leg {leg_ref}: {e}")
+                results[index] = {"success": False, "error": str(e)}
+
+        for start in range(0, len(legs), MULTISEND_MAX_LEGS):
+            chunk = legs[start:start + MULTISEND_MAX_LEGS]
+            chunk_results = await self._send_chunk(
+                w3, [leg[1:] for leg in chunk], executor
+            )
+            for (index, *_), result in zip(chunk, chunk_results, strict=True):
+                results[index] = result
+
+        return results
+
+    async def _send_chunk(
+        self,
+        w3: Web3,
+        legs: list[tuple[bytes, str, int]],
+        executor: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Broadcast one multiTransfer call and verify its legs.
+
+        The nonce lock covers only the broadcast; the receipt is tracked
+        after it is released, replacing the transaction if it gets stuck.
+
+        Args:
+            w3: Web3 instance
+            legs: List of (leg_id, recipient, amount in wei)
+            executor: Thread pool executor
+
+        Returns:
+            One dict per leg, in order
+        """
+        loop = asyncio.get_running_loop()
+        oracle_gas_price = await self.transaction_manager.get_oracle_gas_price()
+
+        try:
+            async with self.transaction_manager.batch_send_lock() as lease:
+                results, tracked, sent = await loop.run_in_executor(
+                    executor,
+                    lambda: self._broadcast_sync(
+                        w3, legs, oracle_gas_price, lease
+                    ),
+                )
+        except TimeoutError as e:
+            logger.error(f"Timeout acquiring nonce lock for multisend: {e}")
+            return [
+                {"success": False, "error": "Timeout acquiring transaction lock"}
+                for _ in legs
+            ]
+        except (Web3Exception, ValueError, ConnectionError) as e:
+            logger.error(f"Multisend preparation failed: {e}")
+            self.transaction_manager.nonce_tracker.invalidate()
+            return [{"success": False, "error": str(e)} for _ in legs]
+
+        if tracked is None:
+            return results
+
+        await self.transaction_manager.receipt_tracker.track(
+            w3, [tracked], executor, timeout=PAYOUT_MULTISEND_RECEIPT_TIMEOUT
+        )
+        tx_hash = tracked.tx_hash
+        receipt = tracked.receipt
+
+        if receipt is None:
+            # Broadcast happened: the legs are paid or pending, never resend
+            # them blindly. Re-sending the same leg refs is safe (paid legs
+            # are detected on-chain).
+            logger.warning(f"Multisend receipt not available for {mask_tx_hash(tx_hash)}")
+            for position in sent:
+                results[position] = self._leg_result(
+                    legs[position], tx_hash, status="pending",
+                    error="Multisend receipt not available before timeout",
+                )
+            return results
+
+        if receipt["status"] != 1:
+            logger.error(f"Multisend transaction reverted: {mask_tx_hash(tx_hash)}")
+            for position in sent:
+                results[position] = self._leg_result(
+                    legs[position], tx_hash, status="failed",
+                    error="Multisend transaction reverted",
+                )
+            return results
+
+        log_indexes = verify_multisend_legs(
+            receipt,
+            self.transaction_manager.usdt_contract_address,
+            self.transaction_manager.wallet_address,
+            [legs[position][1:] for position in sent],
+        )
+
+        for position, log_index in zip(sent, log_indexes, strict=True):
+            if log_index is None:
+                logger.error(
+                    f"Multisend leg {legs[position][0].hex()} has no matching "
+                    f"Transfer log in {mask_tx_hash(tx_hash)}"
+                )
+                results[position] = self._leg_result(
+                    legs[position], tx_hash, status="unverified",
+                    error="Transfer log not found for leg",
+                )
+            else:
+                results[position] = self._leg_result(
+                    legs[position], tx_hash, status="confirmed",
+                    log_index=log_index,
+                )
+
+        logger.info(
+            f"Multisend confirmed: {mask_tx_hash(tx_hash)}, "
+            f"{sum(1 for i in log_indexes if i is not None)}/{len(sent)} legs "
+            f"verified, gas used {receipt['gasUsed']}"
+        )
+        return results
+
+    def _broadcast_sync(
+        self,
+        w3: Web3,
+        legs: list[tuple[bytes, str, int]],
+        oracle_gas_price: int | None = None,
+        lease: LockLease | None = None,
+    ) -> tuple[list[dict[str, Any] | None], TrackedTx | None, list[int]]:
+        """
+        Resolve paid legs and broadcast the rest in one transaction.
+
+        SYNC method - runs in executor, under the batch send lock.
+
+        Args:
+            w3: Web3 instance
+            legs: List of (leg_id, recipient, amount in wei)
+            oracle_gas_price: Gas oracle quote in wei (RPC is queried if None)
+            lease: Wallet lock lease, checked right before the broadcast
+
+        Returns:
+            Tuple of (per-leg results, None for sent legs; broadcast
+            transaction or None; positions of sent legs)
+        """
+        manager = self.transaction_manager
+        sender = manager.wallet_address
+        results: list[dict[str, Any] | None] = [None] * len(legs)
+
+        multisend = w3.eth.contract(
+            address=self.multisend_contract_address, abi=MULTISEND_ABI
+        )
+        paid_flags = multisend.functions.paidMany(
+            sender, [leg_id for leg_id, _, _ in legs]
+        ).call()
+
+        paid = [position for position, flag in enumerate(paid_flags) if flag]
+        fresh = [position for position, flag in enumerate(paid_flags) if not flag]
+
+        if paid:
+            paid_logs = self._find_paid_legs(w3, [legs[p][0] for p in paid])
+            for position in paid:
+                log = paid_logs.get(legs[position][0])
+                if log is None:
+                    results[position] = self._leg_result(
+                        legs[position], None, status="unverified",
+                        error=(
+                            "Leg already paid on-chain, "
+                            "payment transaction not found"
+                        ),
+                    )
+                else:
+                    results[position] = self._leg_result(
+                        legs[position], log["transactionHash"].hex(),
+                        status="confirmed", log_index=log["logIndex"],
+                        already_paid=True,
+                    )
+            logger.warning(f"Multisend: {len(paid)} legs already paid, not resending")
+
+        if not fresh:
+            return results, None, []
+
+        recipients = [legs[p][1] for p in fresh]
+        amounts = [legs[p][2] for p in fresh]
+        total = sum(amounts)
+
+        usdt = w3.eth.contract(address=manager.usdt_contract_address, abi=USDT_ABI)
+        allowance = usdt.functions.allowance(
+            sender, self.multisend_contract_address
+        ).call()
+        if allowance < total:
+            error = (
+                f"Multisend allowance too low: {allowance} < {total} "
+                "(approve the multisend contract from the payout wallet)"
+            )
+            logger.error(error)
+            for position in fresh:
+                results[position] = {"success": False, "error": error}
+            return results, None, []
+
+        func = multisend.functions.multiTransfer(
+            manager.usdt_contract_address,
+            [legs[p][0] for p in fresh],
+            recipients,
+            amounts,
+        )
+        try:
+            gas_est = func.estimate_gas({"from": sender})
+        except ContractLogicError as e:
+            # Would revert (e.g. insufficient balance): nothing is sent
+            logger.error(f"Multisend would revert: {e}")
+            for position in fresh:
+                results[position] = {"success": False, "error": str(e)}
+            return results, None, []
+
+        manager.sync_nonce_tracker(w3)
+        gas_price = manager.get_cached_gas_price(w3, oracle_gas_price)
+        nonce = manager.nonce_tracker.reserve(1)[0]
+
+        try:
+            txn = func.build_transaction({
+                "from": sender,
+                "gas": int(gas_est * GAS_LIMIT_MULTIPLIER),
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": w3.eth.chain_id,
+            })
+            signed = manager.wallet_account.sign_transaction(txn)
+            manager.ensure_lease_held(lease)
+            tx_hash = send_raw_transaction_once(w3, signed.rawTransaction).hex()
+        except LockLostError as e:
+            logger.error(f"Multisend stopped before nonce {nonce}: {e}")
+            manager.nonce_tracker.invalidate()
+            for position in fresh:
+                results[position] = {"success": False, "error": str(e)}
+            return results, None, []
+        except (Web3Exception, ValueError, TimeoutError, ConnectionError) as e:
+            logger.error(f"Multisend broadcast of nonce {nonce} failed: {e}")
+            error = str(e).lower()
+            if "nonce too low" in error or isinstance(e, TimeoutError | ConnectionError):
+                manager.nonce_tracker.invalidate()
+            else:
+                manager.nonce_tracker.release_unused([nonce])
+            if "underpriced" in error:
+                manager.gas_price_cache.invalidate()
+            for position in fresh:
+                results[position] = {"success": False, "error": str(e)}
+            return results, None, []
+
+        logger.info(
+            f"Multisend sent: {len(fresh)} legs, "
+            f"total={Decimal(total) / Decimal(10 ** USDT_DECIMALS)} USDT, "
+            f"nonce={nonce}, gas_limit={int(gas_est * GAS_LIMIT_MULTIPLIER)}, "
+            f"hash: {mask_tx_hash(tx_hash)}"
+        )
+        return results, TrackedTx(nonce, txn, [tx_hash]), fresh
+
+    def _find_paid_legs(
+        self, w3: Web3, leg_ids: list[bytes]
+    ) -> dict[bytes, Any]:
+        """
+        Find the LegPaid logs of already paid legs.
+
+        SYNC method - runs in executor.
+
+        Args:
+            w3: Web3 instance
+            leg_ids: Leg ids reported as paid by the contract
+
+        Returns:
+            Dict leg_id -> LegPaid log (legs outside the lookback window
+            are missing)
+        """
+        latest = w3.eth.block_number
+        sender_topic = "0x" + "0" * 24 + self.transaction_manager.wallet_address[2:].lower()
+        logs = w3.eth.get_logs({
+            "address": self.multisend_contract_address,
+            "fromBlock": max(0, latest - PAYOUT_MULTISEND_LOOKBACK_BLOCKS),
+            "toBlock": latest,
+            "topics": [
+                LEG_PAID_EVENT_TOPIC.hex(),
+                ["0x" + leg_id.hex() for leg_id in leg_ids],
+                sender_topic,
+            ],
+        })
+        return {bytes(log["topics"][1]): log for log in logs}
+
+    @staticmethod
+    def _leg_result(
+        leg: tuple[bytes, str, int],
+        tx_hash: str | None,
+        status: str,
+        error: str | None = None,
+        log_index: int | None = None,
+        already_paid: bool = False,
+    ) -> dict[str, Any]:
+        """Build the result dict of one leg."""
+        return {
+            "success": status == "confirmed",
+            "tx_hash": tx_hash,
+            "error": error,
+            "status": status,
+            "leg_id": "0x" + leg[0].hex(),
+            "log_index": log_index,
+            "already_paid": already_paid,
+        }
@@ -22,6 +22,7 @@ from loguru import logger
 from web3 import AsyncWeb3
 
 from ..constants import MAX_RETRIES, USDT_ABI
+from ..gas_oracle import get_gas_oracle
 from .balance_checker import BalanceChecker
 from .gas_estimator import GasEstimator
 from .nonce_manager import NonceManager
@@ -105,10 +106,12 @@ class PaymentSender:
             web3=web3,
             usdt_contract=self.usdt_contract,
         )
+        gas_oracle = get_gas_oracle()
         self._gas_estimator = GasEstimator(
             web3=web3,
             usdt_contract=self.usdt_contract,
             payout_address=self._payout_address,
+            gas_oracle=gas_oracle,
         )
         self._transaction_sender = TransactionSender(
             web3=web3,
@@ -119,6 +122,7 @@ class PaymentSender:
             status_checker=self._status_checker,
             nonce_lock=self._nonce_lock,
             session_factory=self._session_factory,
+            gas_oracle=gas_oracle,
         )
 
     async def send_payment(
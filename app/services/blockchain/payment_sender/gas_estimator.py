@@ -5,6 +5,7 @@ Provides gas cost estimation functionality for USDT transfers.
 """
 
 import asyncio
+import time
 from decimal import ROUND_DOWN, Decimal
 from typing import Any
 
@@ -13,9 +14,62 @@ from web3 import AsyncWeb3
 from web3.contract import AsyncContract
 from web3.exceptions import ContractLogicError, Web3Exception
 
-from app.config.constants import BLOCKCHAIN_TIMEOUT
+from app.config.constants import BLOCKCHAIN_TIMEOUT, PAYOUT_GAS_PRICE_CACHE_TTL
 
 from ..constants import USDT_DECIMALS
+from ..gas_oracle import GasOracle
+
+
+class BlockGasPriceCache:
+    """
+    Reuses one gas price quote for about one block.
+
+    Every transfer in a batch (and back-to-back single sends) shares the
+    same quote instead of calling eth_gasPrice per transaction.
+    """
+
+    def __init__(self, ttl: float = PAYOUT_GAS_PRICE_CACHE_TTL) -> None:
+        """
+        Initialize gas price cache.
+
+        Args:
+            ttl: Seconds a quote stays valid (one block by default)
+        """
+        self.ttl = ttl
+        self._gas_price_wei: int | None = None
+        self._fetched_at: float = 0.0
+
+    def get(self, now: float | None = None) -> int | None:
+        """
+        Get cached gas price if still fresh.
+
+        Args:
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            Gas price in wei or None if expired/empty
+        """
+        if self._gas_price_wei is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - self._fetched_at >= self.ttl:
+            return None
+        return self._gas_price_wei
+
+    def put(self, gas_price_wei: int, now: float | None = None) -> None:
+        """
+        Store a fresh gas price quote.
+
+        Args:
+            gas_price_wei: Gas price in wei
+            now: Monotonic timestamp (defaults to time.monotonic())
+        """
+        self._gas_price_wei = int(gas_price_wei)
+        self._fetched_at = time.monotonic() if now is None else now
+
+    def invalidate(self) -> None:
+        """Drop cached quote (e.g. after an underpriced rejection)."""
+        self._gas_price_wei = None
 
 
 class GasEstimator:
@@ -23,8 +77,8 @@ class GasEstimator:
     Estimates gas costs for USDT transfers.
 
     Features:
-    - Gas limit estimation
-    - Gas price queries
+    - Gas limit estimation (memoized by the gas oracle)
+    - Gas price queries (shared gas oracle quote)
     - Total cost calculation in BNB
     """
 
@@ -33,6 +87,7 @@ class GasEstimator:
         web3: AsyncWeb3,
         usdt_contract: AsyncContract,
         payout_address: str,
+        gas_oracle: GasOracle | None = None,
     ):
         """
         Initialize gas estimator.
@@ -41,10 +96,13 @@ class GasEstimator:
             web3: AsyncWeb3 instance
             usdt_contract: USDT contract instance
             payout_address: Payout wallet address
+            gas_oracle: Optional shared gas oracle (the node is queried
+                per estimate without it)
         """
         self.web3 = web3
         self.usdt_contract = usdt_contract
         self.payout_address = payout_address
+        self.gas_oracle = gas_oracle
 
     async def estimate_gas_cost(
         self,
@@ -69,32 +127,41 @@ class GasEstimator:
                 .to_integral_value(ROUND_DOWN)
             )
 
+            gas_estimate = gas_price_wei = None
+            if self.gas_oracle:
+                gas_estimate = await self.gas_oracle.get_transfer_gas(
+                    self.usdt_contract.address, self.payout_address
+                )
+                gas_price_wei = await self.gas_oracle.get_gas_price()
+
             # Estimate gas with timeout
             transfer_function = self.usdt_contract.functions.transfer(
                 to_address_checksum,
                 amount_wei,
             )
 
-            try:
-                gas_estimate = await asyncio.wait_for(
-                    transfer_function.estimate_gas(
-                        {"from": self.payout_address}
-                    ),
-                    timeout=BLOCKCHAIN_TIMEOUT,
-                )
-            except TimeoutError:
-                logger.error("Timeout estimating gas cost")
-                return None
+            if gas_estimate is None:
+                try:
+                    gas_estimate = await asyncio.wait_for(
+                        transfer_function.estimate_gas(
+                            {"from": self.payout_address}
+                        ),
+                        timeout=BLOCKCHAIN_TIMEOUT,
+                    )
+                except TimeoutError:
+                    logger.error("Timeout estimating gas cost")
+                    return None
 
             # Get gas price with timeout
-            try:
-                gas_price_wei = await asyncio.wait_for(
-                    self.web3.eth.gas_price,
-                    timeout=BLOCKCHAIN_TIMEOUT,
-                )
-            except TimeoutError:
-                logger.error("Timeout getting gas price for cost estimation")
-                return None
+            if gas_price_wei is None:
+                try:
+                    gas_price_wei = await asyncio.wait_for(
+                        self.web3.eth.gas_price,
+                        timeout=BLOCKCHAIN_TIMEOUT,
+                    )
+                except TimeoutError:
+                    logger.error("Timeout getting gas price for cost estimation")
+                    return None
 
             # Calculate total cost in BNB
             total_cost_wei = gas_estimate * gas_price_wei
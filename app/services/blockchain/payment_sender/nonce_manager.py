@@ -5,15 +5,187 @@ Handles nonce acquisition with stuck transaction detection and distributed locki
 to prevent race conditions in multi-instance deployments.
 """
 
+import time
 from typing import Any
 
 from loguru import logger
 from web3 import AsyncWeb3
 from web3.exceptions import Web3Exception
 
+from app.config.constants import PAYOUT_NONCE_RECONCILE_INTERVAL
 from app.config.operational_constants import BLOCKING_TIMEOUT_LONG, LOCK_TIMEOUT_SHORT
 
 
+class LocalNonceTracker:
+    """
+    Process-local nonce counter for batch sending.
+
+    Hands out consecutive nonces without an RPC round-trip per
+    transaction. The counter is synced with the chain's pending nonce
+    once per batch and fully re-checked (pending vs latest, stuck
+    detection) every ``reconcile_interval`` seconds.
+
+    Pure state: callers fetch chain nonces and feed them via sync(),
+    so one tracker is shared by the executor-based batch and multisend
+    senders (see TransactionManager.sync_nonce_tracker).
+    """
+
+    def __init__(
+        self,
+        reconcile_interval: float = PAYOUT_NONCE_RECONCILE_INTERVAL,
+    ) -> None:
+        """
+        Initialize nonce tracker.
+
+        Args:
+            reconcile_interval: Seconds between full chain reconciliations
+        """
+        self.reconcile_interval = reconcile_interval
+        self._next_nonce: int | None = None
+        self._last_full_check: float | None = None
+        self._fence: int | None = None
+        self._last_reserved_at: float | None = None
+
+    @property
+    def next_nonce(self) -> int | None:
+        """Next nonce to hand out, or None if not synced."""
+        return self._next_nonce
+
+    def needs_full_check(self, now: float | None = None) -> bool:
+        """
+        Check whether a full pending/latest reconciliation is due.
+
+        Args:
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            True if tracker is unsynced or the interval has elapsed
+        """
+        if self._next_nonce is None or self._last_full_check is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self._last_full_check >= self.reconcile_interval
+
+    def observe_fence(self, fence: int | None) -> None:
+        """
+        Record the fencing token of the wallet lock held for this batch.
+
+        Tokens grow by one per lock acquisition, so a gap means another
+        sender held the wallet since our last batch; the next sync then
+        runs the full pending/latest check.
+
+        Args:
+            fence: Fencing token of the current lease (None if unknown)
+        """
+        if fence is None:
+            return
+        if self._fence is not None and fence != self._fence + 1:
+            self._last_full_check = None
+        self._fence = fence
+
+    def sync(
+        self,
+        chain_pending_nonce: int,
+        chain_latest_nonce: int | None = None,
+        now: float | None = None,
+    ) -> int:
+        """
+        Reconcile local counter with the chain's nonces.
+
+        A higher chain value means another sender used the wallet and we
+        must skip past it. A lower one is normally our own broadcasts not
+        yet visible on the queried node, so the counter is kept - unless
+        a full check finds the mempool empty (pending == latest) and our
+        last reservation is older than the reconcile interval: the
+        transactions above the chain nonce were dropped or evicted and
+        would leave every later nonce gapped, so the counter is reset.
+
+        Args:
+            chain_pending_nonce: Result of get_transaction_count(addr, 'pending')
+            chain_latest_nonce: Result of get_transaction_count(addr, 'latest')
+                for a full check (None for a pending-only sync)
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            Next nonce after reconciliation
+        """
+        now = time.monotonic() if now is None else now
+
+        if self._next_nonce is None:
+            self._next_nonce = chain_pending_nonce
+        elif chain_pending_nonce > self._next_nonce:
+            logger.warning(
+                f"Local nonce {self._next_nonce} behind chain "
+                f"{chain_pending_nonce} - wallet used by another sender"
+            )
+            self._next_nonce = chain_pending_nonce
+        elif (
+            chain_latest_nonce is not None
+            and chain_pending_nonce == chain_latest_nonce
+            and chain_pending_nonce < self._next_nonce
+            and (
+                self._last_reserved_at is None
+                or now - self._last_reserved_at >= self.reconcile_interval
+            )
+        ):
+            logger.warning(
+                f"Local nonce {self._next_nonce} ahead of chain "
+                f"{chain_pending_nonce} with empty mempool - "
+                f"transactions dropped, resetting"
+            )
+            self._next_nonce = chain_pending_nonce
+
+        if chain_latest_nonce is not None:
+            self._last_full_check = now
+
+        return self._next_nonce
+
+    def reserve(self, count: int = 1) -> list[int]:
+        """
+        Reserve consecutive nonces.
+
+        Args:
+            count: Number of nonces
+
+        Returns:
+            List of consecutive nonces
+
+        Raises:
+            RuntimeError: If tracker has not been synced
+        """
+        if self._next_nonce is None:
+            raise RuntimeError("Nonce tracker is not synced with chain")
+
+        start = self._next_nonce
+        self._next_nonce += count
+        self._last_reserved_at = time.monotonic()
+        return list(range(start, start + count))
+
+    def release_unused(self, nonces: list[int]) -> None:
+        """
+        Give back reserved nonces that were never broadcast.
+
+        Only a tail of the reservation can be returned; a gap in the
+        middle would stall every later transaction, so in that case the
+        tracker is invalidated and resynced from chain on next use.
+
+        Args:
+            nonces: Unused nonces (ascending)
+        """
+        if not nonces:
+            return
+
+        if self._next_nonce == nonces[-1] + 1:
+            self._next_nonce = nonces[0]
+        else:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop local state so the next sync takes the chain value as-is."""
+        self._next_nonce = None
+        self._last_full_check = None
+
+
 class NonceManager:
     """
     Manages transaction nonces with safety features.
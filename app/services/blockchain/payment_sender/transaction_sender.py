@@ -25,6 +25,7 @@ from ..constants import (
     RETRY_DELAY_BASE,
     USDT_DECIMALS,
 )
+from ..gas_oracle import GasOracle
 from .nonce_manager import NonceManager
 from .transaction_status import TransactionStatusChecker
 
@@ -50,6 +51,7 @@ class TransactionSender:
         status_checker: TransactionStatusChecker,
         nonce_lock: asyncio.Lock,
         session_factory: Any = None,
+        gas_oracle: GasOracle | None = None,
     ):
         """
         Initialize transaction sender.
@@ -63,6 +65,8 @@ class TransactionSender:
             status_checker: Transaction status checker instance
             nonce_lock: Lock for nonce acquisition
             session_factory: Session factory for distributed lock (optional)
+            gas_oracle: Shared gas oracle (optional; gas price and limit
+                are queried from the node without it)
         """
         self.web3 = web3
         self.usdt_contract = usdt_contract
@@ -72,6 +76,7 @@ class TransactionSender:
         self.status_checker = status_checker
         self._nonce_lock = nonce_lock
         self._session_factory = session_factory
+        self.gas_oracle = gas_oracle
 
     async def send_payment(
         self,
@@ -286,36 +291,45 @@ class TransactionSender:
                     amount_wei,
                 )
 
-                # Estimate gas with timeout
-                try:
-                    gas_estimate = await asyncio.wait_for(
-                        transfer_function.estimate_gas(
-                            {"from": self.payout_address}
-                        ),
-                        timeout=BLOCKCHAIN_TIMEOUT,
+                gas_estimate = gas_price_wei = None
+                if self.gas_oracle:
+                    gas_estimate = await self.gas_oracle.get_transfer_gas(
+                        self.usdt_contract.address, self.payout_address
                     )
-                    # Add 20% buffer
-                    gas_limit = int(gas_estimate * 1.2)
-                except TimeoutError:
-                    logger.error("Timeout estimating gas, using default")
-                    gas_limit = DEFAULT_GAS_LIMIT
-                except ContractLogicError as e:
-                    logger.error(f"Gas estimation failed: {e}")
-                    gas_limit = DEFAULT_GAS_LIMIT
+                    gas_price_wei = await self.gas_oracle.get_gas_price()
+
+                # Estimate gas with timeout
+                if gas_estimate is None:
+                    try:
+                        gas_estimate = await asyncio.wait_for(
+                            transfer_function.estimate_gas(
+                                {"from": self.payout_address}
+                            ),
+                            timeout=BLOCKCHAIN_TIMEOUT,
+                        )
+                    except TimeoutError:
+                        logger.error("Timeout estimating gas, using default")
+                    except ContractLogicError as e:
+                        logger.error(f"Gas estimation failed: {e}")
+                # Add 20% buffer
+                gas_limit = (
+                    int(gas_estimate * 1.2) if gas_estimate else DEFAULT_GAS_LIMIT
+                )
 
                 # Get gas price with timeout
-                try:
-                    gas_price_wei = await asyncio.wait_for(
-                        self.web3.eth.gas_price,
-                        timeout=BLOCKCHAIN_TIMEOUT,
-                    )
-                except TimeoutError:
-                    logger.error("Timeout getting gas price")
-                    return {
-                        "success": False,
-                        "tx_hash": None,
-                        "error": "Timeout getting gas price",
-                    }
+                if gas_price_wei is None:
+                    try:
+                        gas_price_wei = await asyncio.wait_for(
+                            self.web3.eth.gas_price,
+                            timeout=BLOCKCHAIN_TIMEOUT,
+                        )
+                    except TimeoutError:
+                        logger.error("Timeout getting gas price")
+                        return {
+                            "success": False,
+                            "tx_hash": None,
+                            "error": "Timeout getting gas price",
+                        }
 
                 # Cap gas price
                 max_gas_price = self.web3.to_wei(MAX_GAS_PRICE_GWEI, "gwei")
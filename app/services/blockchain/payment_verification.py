@@ -136,6 +136,7 @@ class PaymentVerifier:
         from_address: str,
         since_block: int | None = None,
         max_blocks: int = 100000,
+        latest_block: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Scan all PLEX Transfer events from user to system wallet.
@@ -149,6 +150,7 @@ class PaymentVerifier:
                 (if None, scan from max_blocks ago)
             max_blocks: Maximum blocks to scan back
                 (if since_block is None)
+            latest_block: Chain head (queried from the node if None)
 
         Returns:
             List of payment dictionaries with tx_hash, amount,
@@ -159,6 +161,7 @@ class PaymentVerifier:
             from_address=from_address,
             since_block=since_block,
             max_blocks=max_blocks,
+            latest_block=latest_block,
         )
 
     # USDT scanning methods - delegated to UsdtDepositScanner
@@ -169,6 +172,7 @@ class PaymentVerifier:
         user_wallet: str,
         max_blocks: int = 50000,
         chunk_size: int = 5000,
+        latest_block: int | None = None,
     ) -> dict[str, Any]:
         """
         Scan all USDT Transfer events from user to system wallet.
@@ -180,6 +184,7 @@ class PaymentVerifier:
             user_wallet: User's wallet address
             max_blocks: Maximum number of blocks to scan back
             chunk_size: Number of blocks per scan chunk
+            latest_block: Chain head (queried from the node if None)
 
         Returns:
             Dict with total_amount, tx_count, transactions,
@@ -190,4 +195,5 @@ class PaymentVerifier:
             user_wallet=user_wallet,
             max_blocks=max_blocks,
             chunk_size=chunk_size,
+            latest_block=latest_block,
         )
@@ -0,0 +1,124 @@
+"""
+Withdrawal payout batcher.
+
+Admin approvals, escrow approvals and auto-payouts each pay one
+withdrawal. Payouts submitted within PAYOUT_BATCH_WINDOW of each other
+are sent as one batch (consecutive nonces, receipts tracked together),
+so a burst of approvals clears in about one block instead of queueing
+one by one behind the nonce lock. Every caller still awaits the result
+of its own payout.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from loguru import logger
+
+from app.config.constants import PAYOUT_BATCH_MAX_SIZE, PAYOUT_BATCH_WINDOW
+
+
+SendBatch = Callable[
+    [list[tuple[str, Decimal]], list[str]], Awaitable[list[dict[str, Any]]]
+]
+
+
+@dataclass
+class _Payout:
+    to_address: str
+    amount: Decimal
+    leg_ref: str
+    future: asyncio.Future
+
+
+class PayoutBatcher:
+    """
+    Coalesces concurrent payouts into batches.
+
+    Use from one event loop (the bot's): the pending queue and flush
+    tasks belong to it, like the transaction manager's nonce lock.
+    """
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        window: float = PAYOUT_BATCH_WINDOW,
+        max_size: int = PAYOUT_BATCH_MAX_SIZE,
+    ) -> None:
+        """
+        Initialize payout batcher.
+
+        Args:
+            send_batch: Sends (payments, leg refs) and returns one result
+                per payment, in order
+            window: Seconds to collect payouts after the first one
+            max_size: Batch is sent at once when it reaches this size
+        """
+        self._send_batch = send_batch
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[_Payout] = []
+        self._flush_task: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def submit(
+        self, to_address: str, amount: Decimal, leg_ref: str
+    ) -> dict[str, Any]:
+        """
+        Queue one payout and wait for its result.
+
+        The payout is sent even if the caller is cancelled.
+
+        Args:
+            to_address: Recipient wallet address
+            amount: Amount in USDT
+            leg_ref: Stable payout reference, e.g. "withdrawal:123"
+
+        Returns:
+            Payment result dict (success, tx_hash, error, status)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Payout(to_address, amount, leg_ref, future))
+
+        if len(self._pending) >= self.max_size:
+            self._start_batch()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        return await asyncio.shield(future)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        self._start_batch()
+
+    def _start_batch(self) -> None:
+        """Send the pending payouts as one batch in the background."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        payouts, self._pending = self._pending, []
+        if not payouts:
+            return
+
+        task = asyncio.create_task(self._send(payouts))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _send(self, payouts: list[_Payout]) -> None:
+        logger.info(f"Sending {len(payouts)} withdrawal payouts as one batch")
+        try:
+            results = await self._send_batch(
+                [(p.to_address, p.amount) for p in payouts],
+                [p.leg_ref for p in payouts],
+            )
+        except Exception as e:
+            logger.error(f"Payout batch of {len(payouts)} failed: {e}", exc_info=True)
+            results = [{"success": False, "error": str(e)} for _ in payouts]
+
+        for payout, result in zip(payouts, results, strict=True):
+            if not payout.future.done():
+                payout.future.set_result(result)
@@ -50,6 +50,7 @@ class PlexPaymentScanner:
         from_address: str,
         since_block: int | None = None,
         max_blocks: int = 100000,
+        latest_block: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Scan all PLEX Transfer events from user to system wallet.
@@ -61,6 +62,8 @@ class PlexPaymentScanner:
                 (if None, scan from max_blocks ago)
             max_blocks: Maximum number of blocks to scan back
                 (if since_block is None)
+            latest_block: Chain head published by the head tracker
+                (queried from the node if None)
 
         Returns:
             List of payment dictionaries with:
@@ -78,7 +81,9 @@ class PlexPaymentScanner:
             receiver = self.system_wallet_address
             token_address = self.plex_token_address
 
-            latest = w3.eth.block_number
+            latest = (
+                latest_block if latest_block is not None else w3.eth.block_number
+            )
 
             # Determine starting block
             if since_block is not None:
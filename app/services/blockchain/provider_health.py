@@ -0,0 +1,308 @@
+"""
+Latency-scored RPC provider routing.
+
+Providers used to be switched only after a hard failure. ProviderRouter
+keeps a rolling health record per provider and routes every call:
+
+- score = median latency of the last RPC_HEALTH_WINDOW calls, scaled
+  by (1 + RPC_ERROR_PENALTY * error rate); lower is better;
+- each provider has its own circuit breaker, opened after
+  RPC_BREAKER_FAILURES consecutive failures and probed again after
+  RPC_BREAKER_RECOVERY_SECONDS;
+- reads go to the best provider and are hedged: if no answer came
+  within RPC_HEDGE_DELAY the next provider is asked too and the first
+  answer wins (the slower call is recorded with its elapsed time, so a
+  provider that keeps losing the hedge drops in the ranking); a failed
+  read fails over to the next provider;
+- writes are pinned to the active provider (the best available one if
+  its circuit is open) and never retried on another provider, since
+  the first one may have broadcast already.
+
+With auto-switch disabled by the admin every call goes to the active
+provider only. Providers in RPC_MANUAL_ONLY_PROVIDERS (the reserve
+node) are routed to automatically only when nothing else is left.
+"""
+
+import asyncio
+import statistics
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from loguru import logger
+from web3.exceptions import ContractLogicError
+
+from app.config.constants import (
+    RPC_BREAKER_FAILURES,
+    RPC_BREAKER_RECOVERY_SECONDS,
+    RPC_ERROR_PENALTY,
+    RPC_HEALTH_WINDOW,
+    RPC_HEDGE_DELAY,
+    RPC_MANUAL_ONLY_PROVIDERS,
+)
+from app.utils.circuit_breaker import CircuitBreaker
+
+
+T = TypeVar("T")
+
+
+def is_provider_error(error: BaseException) -> bool:
+    """Check whether an error is the provider's fault (not a revert)."""
+    return not isinstance(error, ContractLogicError)
+
+
+class ProviderHealth:
+    """Rolling latency and error rate of one provider."""
+
+    def __init__(self, name: str, window: int = RPC_HEALTH_WINDOW) -> None:
+        """
+        Initialize health record.
+
+        Args:
+            name: Provider name
+            window: Recent calls kept
+        """
+        self.name = name
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.breaker = CircuitBreaker(
+            failure_threshold=RPC_BREAKER_FAILURES,
+            recovery_timeout=RPC_BREAKER_RECOVERY_SECONDS,
+            success_threshold=1,
+            name=f"RPC provider {name}",
+        )
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        """
+        Record a finished call.
+
+        Args:
+            latency: Call duration (seconds)
+            ok: False if the call failed
+        """
+        self.latencies.append(latency)
+        self.outcomes.append(ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def record_slow(self, latency: float) -> None:
+        """Record a call abandoned after latency seconds (lost a hedge)."""
+        self.latencies.append(latency)
+
+    @property
+    def latency(self) -> float | None:
+        """Median latency (seconds), None before the first call."""
+        return statistics.median(self.latencies) if self.latencies else None
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls in the window."""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def score(self) -> float:
+        """Routing score (lower is better); untried providers are neutral."""
+        latency = RPC_HEDGE_DELAY if self.latency is None else self.latency
+        return latency * (1 + RPC_ERROR_PENALTY * self.error_rate)
+
+    def is_available(self) -> bool:
+        """Check the circuit (moves an open circuit to half-open when due)."""
+        return self.breaker.can_proceed("read")[0]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Health figures for operators."""
+        latency = self.latency
+        return {
+            "score": round(self.score * 1000, 1),
+            "latency_ms": None if latency is None else round(latency * 1000),
+            "error_rate": round(self.error_rate, 3),
+            "calls": len(self.outcomes),
+            "circuit": self.breaker.state.value,
+        }
+
+
+class ProviderRouter:
+    """Routes RPC calls to providers by health score."""
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        hedge_delay: float = RPC_HEDGE_DELAY,
+        window: int = RPC_HEALTH_WINDOW,
+    ) -> None:
+        """
+        Initialize router.
+
+        Args:
+            names: Provider names
+            hedge_delay: Delay before a read is also sent to the next
+                provider (seconds)
+            window: Recent calls kept per provider
+        """
+        self.hedge_delay = hedge_delay
+        self.health = {name: ProviderHealth(name, window) for name in names}
+
+    def rank(self, active: str, auto_switch: bool = True) -> list[str]:
+        """
+        Order providers for a call.
+
+        Args:
+            active: Provider selected by the admin
+            auto_switch: False pins every call to the active provider
+
+        Returns:
+            Provider names, best first
+        """
+        if active not in self.health:
+            active = next(iter(self.health), active)
+        if not auto_switch:
+            return [active] if active in self.health else []
+
+        def key(name: str) -> tuple:
+            health = self.health[name]
+            return (
+                name in RPC_MANUAL_ONLY_PROVIDERS and name != active,
+                not health.is_available(),
+                health.score,
+                name != active,
+            )
+
+        return sorted(self.health, key=key)
+
+    def writer(self, active: str, auto_switch: bool = True) -> str | None:
+        """
+        Pick the provider for a write.
+
+        Args:
+            active: Provider selected by the admin
+            auto_switch: False pins writes to the active provider
+
+        Returns:
+            Active provider, or the best available one if auto-switch is
+            on and the active provider's circuit is open
+        """
+        if active in self.health and (
+            not auto_switch or self.health[active].is_available()
+        ):
+            return active
+        ranked = self.rank(active, auto_switch)
+        return ranked[0] if ranked else None
+
+    async def read(
+        self,
+        call: Callable[[str], Awaitable[T]],
+        active: str,
+        auto_switch: bool = True,
+    ) -> T:
+        """
+        Run a read on the best provider, hedged and with failover.
+
+        Args:
+            call: Coroutine factory taking the provider name
+            active: Provider selected by the admin
+            auto_switch: False pins the read to the active provider
+
+        Returns:
+            First successful result
+
+        Raises:
+            ConnectionError: If no provider is configured
+            Exception: Last provider error if every provider failed;
+                reverts are raised at once
+        """
+        remaining = self.rank(active, auto_switch)
+        if not remaining:
+            raise ConnectionError("No providers available")
+
+        loop = asyncio.get_running_loop()
+        running: dict[asyncio.Future, tuple[str, float]] = {}
+        hedged = False
+        last_error: BaseException | None = None
+
+        def launch() -> None:
+            name = remaining.pop(0)
+            running[asyncio.ensure_future(call(name))] = (name, loop.time())
+
+        launch()
+        try:
+            while running:
+                timeout = None if hedged or not remaining else self.hedge_delay
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    logger.debug(
+                        f"RPC read slower than {self.hedge_delay}s, "
+                        f"hedging to '{remaining[0]}'"
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    name, started = running.pop(task)
+                    elapsed = loop.time() - started
+                    error = task.exception()
+                    if error is None:
+                        self.health[name].record(elapsed)
+                        return task.result()
+                    if not is_provider_error(error):
+                        self.health[name].record(elapsed)
+                        raise error
+                    self.health[name].record(elapsed, ok=False)
+                    last_error = error
+                    logger.warning(f"RPC provider '{name}' failed: {error}")
+
+                if not running and remaining:
+                    logger.info(f"Failing over to provider '{remaining[0]}'")
+                    launch()
+        finally:
+            for task, (name, started) in running.items():
+                task.cancel()
+                self.health[name].record_slow(loop.time() - started)
+
+        raise last_error
+
+    async def write(
+        self,
+        call: Callable[[str], Awaitable[T]],
+        active: str,
+        auto_switch: bool = True,
+    ) -> T:
+        """
+        Run a write on the pinned provider (no hedging, no failover).
+
+        Args:
+            call: Coroutine factory taking the provider name
+            active: Provider selected by the admin
+            auto_switch: False pins the write to the active provider
+
+        Returns:
+            Call result
+
+        Raises:
+            ConnectionError: If no provider is configured
+        """
+        name = self.writer(active, auto_switch)
+        if name is None:
+            raise ConnectionError("No providers available")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            result = await call(name)
+        except Exception as e:
+            self.health[name].record(
+                loop.time() - started, ok=not is_provider_error(e)
+            )
+            raise
+        self.health[name].record(loop.time() - started)
+        return result
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Health figures of every provider."""
+        return {name: health.snapshot() for name, health in self.health.items()}
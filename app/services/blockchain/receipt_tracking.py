@@ -0,0 +1,228 @@
+"""
+Receipt tracking for batch payouts.
+
+After a batch is broadcast, the receipts of all its transactions are
+polled together (one executor call per poll) instead of one
+wait_for_transaction_receipt per transfer, so a batch of N clears in
+about one block rather than N confirmation waits.
+
+A transaction still unmined after PAYOUT_STUCK_AFTER seconds whose nonce
+is not used on-chain yet is replaced: the same transfer with the same
+nonce, re-signed with a gas price bumped by
+PAYOUT_REPLACEMENT_GAS_BUMP_PERCENT. Only one transaction per nonce can
+be mined, so every hash broadcast for it is tracked until one of them
+has a receipt.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+from web3 import Web3
+from web3.exceptions import TransactionNotFound, Web3Exception
+
+from app.config.constants import (
+    PAYOUT_RECEIPT_POLL_INTERVAL,
+    PAYOUT_RECEIPT_TIMEOUT,
+    PAYOUT_REPLACEMENT_GAS_BUMP_PERCENT,
+    PAYOUT_STUCK_AFTER,
+)
+from app.utils.distributed_lock import LockLease, LockLostError
+from app.utils.security import mask_tx_hash
+
+from .core_constants import MAX_GAS_PRICE_WEI
+from .rpc_wrapper import send_raw_transaction_once
+
+
+@dataclass
+class TrackedTx:
+    """One broadcast nonce of a batch and every hash sent for it."""
+
+    nonce: int
+    txn: dict[str, Any]  # Unsigned transaction of the latest broadcast
+    tx_hashes: list[str]  # Oldest first
+    receipt: Any | None = field(default=None, repr=False)
+
+    @property
+    def tx_hash(self) -> str:
+        """Hash of the mined transaction, else of the latest broadcast."""
+        if self.receipt is not None:
+            return _to_hex(self.receipt["transactionHash"])
+        return self.tx_hashes[-1]
+
+    def result(self) -> dict[str, Any]:
+        """
+        Payment result of this nonce.
+
+        Returns:
+            Dict with success, tx_hash, error, status ("confirmed",
+            "failed" or "pending"), nonce and replaced_tx_hashes
+        """
+        replaced = [h for h in self.tx_hashes if h != self.tx_hash]
+        if self.receipt is None:
+            status, error = "pending", "Receipt not available before timeout"
+        elif self.receipt["status"] == 1:
+            status, error = "confirmed", None
+        else:
+            status, error = "failed", "Transaction reverted"
+        return {
+            "success": status == "confirmed",
+            "tx_hash": self.tx_hash,
+            "error": error,
+            "status": status,
+            "nonce": self.nonce,
+            "replaced_tx_hashes": replaced,
+        }
+
+
+def _to_hex(value: Any) -> str:
+    if isinstance(value, bytes | bytearray):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+def bumped_gas_price(gas_price: int) -> int:
+    """Lowest gas price nodes accept for a replacement of gas_price."""
+    return -(-gas_price * (100 + PAYOUT_REPLACEMENT_GAS_BUMP_PERCENT) // 100)
+
+
+class ReceiptTracker:
+    """
+    Tracks receipts of broadcast payouts and replaces stuck ones.
+
+    Shares wallet, nonce lock and gas state with TransactionManager.
+    """
+
+    def __init__(self, transaction_manager: Any) -> None:
+        """
+        Initialize receipt tracker.
+
+        Args:
+            transaction_manager: TransactionManager of the payout wallet
+        """
+        self.transaction_manager = transaction_manager
+
+    async def track(
+        self,
+        w3: Web3,
+        txs: list[TrackedTx],
+        executor: Any,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Wait for the receipts of all transactions, replacing stuck ones.
+
+        Sets TrackedTx.receipt for every mined transaction; the ones
+        still unmined at the timeout keep receipt None.
+
+        Args:
+            w3: Web3 instance the batch was broadcast on
+            txs: Broadcast transactions
+            executor: Thread pool executor
+            timeout: Seconds to track before giving up (default:
+                PAYOUT_RECEIPT_TIMEOUT)
+        """
+        timeout = PAYOUT_RECEIPT_TIMEOUT if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        next_replacement = started + PAYOUT_STUCK_AFTER
+        outstanding = list(txs)
+
+        while True:
+            await loop.run_in_executor(
+                executor, lambda: self._poll_sync(w3, outstanding)
+            )
+            outstanding = [tx for tx in outstanding if tx.receipt is None]
+
+            now = time.monotonic()
+            if not outstanding or now - started >= timeout:
+                break
+
+            if now >= next_replacement:
+                await self._replace_stuck(w3, outstanding, executor)
+                next_replacement = now + PAYOUT_STUCK_AFTER
+
+            await asyncio.sleep(PAYOUT_RECEIPT_POLL_INTERVAL)
+
+        if outstanding:
+            logger.warning(
+                f"Payout receipts pending after {timeout:.0f}s: nonces "
+                f"{[tx.nonce for tx in outstanding]}"
+            )
+
+    def _poll_sync(self, w3: Web3, txs: list[TrackedTx]) -> None:
+        """
+        Fetch the receipts of all outstanding transactions.
+
+        SYNC method - runs in executor.
+        """
+        for tx in txs:
+            for tx_hash in reversed(tx.tx_hashes):
+                try:
+                    receipt = w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    continue
+                except (Web3Exception, TimeoutError, ConnectionError) as e:
+                    logger.debug(f"Receipt check of {mask_tx_hash(tx_hash)} failed: {e}")
+                    continue
+                if receipt:
+                    tx.receipt = receipt
+                    break
+
+    async def _replace_stuck(
+        self, w3: Web3, txs: list[TrackedTx], executor: Any
+    ) -> None:
+        """Re-broadcast unmined transactions with a bumped gas price."""
+        manager = self.transaction_manager
+        loop = asyncio.get_running_loop()
+
+        try:
+            async with manager.batch_send_lock() as lease:
+                await loop.run_in_executor(
+                    executor, lambda: self._replace_sync(w3, txs, lease)
+                )
+        except (TimeoutError, LockLostError, Web3Exception, ConnectionError) as e:
+            logger.warning(f"Stuck payout replacement skipped: {e}")
+
+    def _replace_sync(
+        self, w3: Web3, txs: list[TrackedTx], lease: LockLease | None
+    ) -> None:
+        """
+        Replace transactions whose nonce is still free on-chain.
+
+        SYNC method - runs in executor, under the batch send lock.
+        """
+        manager = self.transaction_manager
+        latest_nonce = w3.eth.get_transaction_count(manager.wallet_address, 'latest')
+
+        for tx in txs:
+            if tx.nonce < latest_nonce:
+                # Nonce used: one of our hashes is mined, the receipt follows
+                continue
+
+            gas_price = bumped_gas_price(tx.txn["gasPrice"])
+            if gas_price > MAX_GAS_PRICE_WEI:
+                logger.warning(
+                    f"Payout nonce {tx.nonce} stuck at the maximum gas "
+                    f"price, not replaced"
+                )
+                continue
+
+            txn = {**tx.txn, "gasPrice": gas_price}
+            signed = manager.wallet_account.sign_transaction(txn)
+            manager.ensure_lease_held(lease)
+            try:
+                tx_hash = send_raw_transaction_once(w3, signed.rawTransaction).hex()
+            except (Web3Exception, ValueError, TimeoutError, ConnectionError) as e:
+                # "nonce too low": the previous transaction was just mined
+                logger.warning(f"Replacement of payout nonce {tx.nonce} failed: {e}")
+                continue
+
+            tx.txn = txn
+            tx.tx_hashes.append(tx_hash)
+            logger.warning(
+                f"Payout nonce {tx.nonce} stuck, replaced with "
+                f"{mask_tx_hash(tx_hash)} at {gas_price / 10**9} Gwei"
+            )
@@ -0,0 +1,223 @@
+"""
+Reorg protection for ingested transfers.
+
+The transaction cache is filled up to the chain head, so its newest
+rows may sit in blocks that are later orphaned. ChainReorgGuard:
+
+- records the hash of every ingested block (blocks with cached
+  transfers and the last block of each sync range), checking the
+  parent hash against the block recorded below it;
+- rechecks recorded blocks against the chain before each sync; from
+  the fork block up, cached rows and recorded blocks are deleted and
+  the sync cursors rewound, so the next sync replays them from the
+  new chain;
+- keeps cached rows "pending" until they are at or below the
+  confirmation watermark (head - blockchain_confirmation_depth).
+
+Deposits and PLEX payments are only finalized from transfers at or
+below the watermark (see get_confirmation_watermark).
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from web3 import Web3
+from web3.exceptions import BlockNotFound
+
+from app.config.constants import CHAIN_REORG_WINDOW
+from app.config.settings import settings
+from app.models.blockchain_sync_state import BlockchainSyncState
+from app.repositories.blockchain_block_repository import (
+    BlockchainBlockRepository,
+)
+from app.repositories.blockchain_tx_cache_repository import (
+    BlockchainTxCacheRepository,
+)
+
+
+def get_confirmation_watermark(head: int) -> int:
+    """
+    Get the highest block considered final.
+
+    Args:
+        head: Current chain head
+
+    Returns:
+        Highest block with blockchain_confirmation_depth blocks on top
+    """
+    return head - settings.blockchain_confirmation_depth
+
+
+def _to_hash(value: Any) -> str:
+    if isinstance(value, bytes | bytearray):
+        return Web3.to_hex(value)
+    return str(value).lower()
+
+
+class ChainReorgGuard:
+    """Detects reorgs under the transaction cache and replays them."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        w3: Web3,
+        confirmations: int | None = None,
+        window: int = CHAIN_REORG_WINDOW,
+    ) -> None:
+        """
+        Initialize guard.
+
+        Args:
+            session: Database session (committed by the caller)
+            w3: Web3 instance
+            confirmations: Confirmation depth
+                (settings.blockchain_confirmation_depth if None)
+            window: Number of recent recorded blocks rechecked
+        """
+        self.session = session
+        self.w3 = w3
+        self.confirmations = (
+            confirmations or settings.blockchain_confirmation_depth
+        )
+        self.window = window
+        self.block_repo = BlockchainBlockRepository(session)
+        self.cache_repo = BlockchainTxCacheRepository(session)
+
+        # Results of the last check() / finalize()
+        self.last_fork: int | None = None
+        self.finalized = 0
+
+    def watermark(self, head: int) -> int:
+        """Highest block whose cached transfers are final."""
+        return head - self.confirmations
+
+    def _block_hash(self, number: int) -> str | None:
+        try:
+            return _to_hash(self.w3.eth.get_block(number)["hash"])
+        except BlockNotFound:
+            return None
+
+    async def check(self) -> int | None:
+        """
+        Recheck recorded blocks and roll back if the chain reorganized.
+
+        Returns:
+            First orphaned block, or None if the recorded blocks are
+            still on the chain
+        """
+        fork = await self.find_fork()
+        if fork is not None:
+            await self.rollback(fork)
+        return fork
+
+    async def find_fork(self) -> int | None:
+        """
+        Find the first recorded block no longer on the chain.
+
+        Walks recorded blocks from the newest down to the first one still
+        on the chain (normally the newest, i.e. one RPC call).
+
+        Returns:
+            Block above the highest recorded block still on the chain,
+            or None if there is no reorg
+        """
+        orphaned = None
+        for block in await self.block_repo.get_recent(self.window):
+            if self._block_hash(block.number) == block.hash:
+                return None if orphaned is None else block.number + 1
+            orphaned = block.number
+        # Nothing in the window is on the chain any more
+        return orphaned
+
+    async def record_log_block(self, log: Any) -> str:
+        """
+        Record the block of a transfer log.
+
+        Args:
+            log: Transfer event log
+
+        Returns:
+            Block hash, stored with the cached transfer
+        """
+        block_hash = _to_hash(log["blockHash"])
+        await self.block_repo.record(log["blockNumber"], block_hash)
+        return block_hash
+
+    async def record_block(self, number: int) -> bool:
+        """
+        Record the last block of a sync range.
+
+        Args:
+            number: Block number
+
+        Returns:
+            False if the block does not extend the block recorded below
+            it (the chain reorganized during the sync; nothing recorded)
+        """
+        block = self.w3.eth.get_block(number)
+        block_hash = _to_hash(block["hash"])
+        parent_hash = _to_hash(block["parentHash"])
+
+        parent = await self.block_repo.get_by(number=number - 1)
+        if parent is not None and parent.hash != parent_hash:
+            logger.warning(
+                f"[Reorg] Block {number} parent {parent_hash[:10]} does not "
+                f"match recorded block {parent.number} ({parent.hash[:10]})"
+            )
+            return False
+
+        await self.block_repo.record(number, block_hash, parent_hash)
+        return True
+
+    async def rollback(self, fork: int) -> list[str]:
+        """
+        Delete everything ingested from a fork block up and rewind the
+        sync cursors so the next sync replays it.
+
+        Args:
+            fork: First orphaned block
+
+        Returns:
+            Hashes of the cached transactions deleted
+        """
+        removed = await self.cache_repo.delete_from_block(fork)
+        await self.block_repo.delete_from(fork)
+        await self.session.execute(
+            update(BlockchainSyncState)
+            .where(BlockchainSyncState.last_synced_block >= fork)
+            .values(last_synced_block=fork - 1, updated_at=datetime.now(UTC))
+        )
+        self.last_fork = fork
+
+        logger.warning(
+            f"[Reorg] Chain reorganized from block {fork}: "
+            f"{len(removed)} cached transfers rolled back for replay"
+        )
+        final = [tx_hash for tx_hash, status in removed if status == "confirmed"]
+        if final:
+            logger.critical(
+                f"[Reorg] Reorg at block {fork} is deeper than "
+                f"{self.confirmations} confirmations, finalized transfers "
+                f"orphaned (check deposits and PLEX payments): {final}"
+            )
+        return [tx_hash for tx_hash, _status in removed]
+
+    async def finalize(self, head: int) -> int:
+        """
+        Confirm cached transfers at or below the watermark and forget
+        blocks too deep to be rechecked.
+
+        Args:
+            head: Current chain head
+
+        Returns:
+            Number of transfers confirmed
+        """
+        self.finalized = await self.cache_repo.confirm_up_to(
+            self.watermark(head)
+        )
+        await self.block_repo.prune_below(head - self.window)
+        return self.finalized
@@ -5,17 +5,25 @@ Provides centralized timeout and retry functionality for all blockchain RPC call
 """
 
 import asyncio
+import threading
+import time
 from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
+from hexbytes import HexBytes
 from loguru import logger
+from web3 import Web3
 
-from app.config.constants import BLOCKCHAIN_TIMEOUT
+from app.config.constants import BLOCKCHAIN_TIMEOUT, RPC_BROADCAST_DEDUP_TTL
 
 
 T = TypeVar("T")
 
+# Signed transactions broadcast recently: tx hash -> expiry (monotonic)
+_broadcasts: dict[str, float] = {}
+_broadcasts_lock = threading.Lock()
+
 
 class BlockchainTimeoutError(Exception):
     """Raised when blockchain RPC call times out."""
@@ -153,3 +161,44 @@ def timeout_decorator(
             )
         return wrapper
     return decorator
+
+
+def send_raw_transaction_once(w3: Web3, raw_transaction: bytes) -> HexBytes:
+    """
+    Broadcast a signed transaction at most once.
+
+    The same signed bytes sent again within RPC_BROADCAST_DEDUP_TTL (a
+    retry, a duplicate task) return the hash without a second broadcast,
+    and a node answering "already known" counts as broadcast. Runs in
+    executor threads.
+
+    Args:
+        w3: Web3 instance of the pinned provider
+        raw_transaction: Signed transaction
+
+    Returns:
+        Transaction hash
+    """
+    tx_hash = Web3.keccak(raw_transaction)
+    key = tx_hash.hex()
+    now = time.monotonic()
+    with _broadcasts_lock:
+        for expired in [k for k, expiry in _broadcasts.items() if expiry <= now]:
+            del _broadcasts[expired]
+        if key in _broadcasts:
+            logger.info(f"Transaction {key[:10]} already broadcast, not resent")
+            return tx_hash
+        _broadcasts[key] = now + RPC_BROADCAST_DEDUP_TTL
+
+    try:
+        return w3.eth.send_raw_transaction(raw_transaction)
+    except ValueError as e:
+        if "already known" in str(e).lower():
+            return tx_hash
+        with _broadcasts_lock:
+            _broadcasts.pop(key, None)
+        raise
+    except Exception:
+        with _broadcasts_lock:
+            _broadcasts.pop(key, None)
+        raise
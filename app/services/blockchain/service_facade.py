@@ -8,6 +8,8 @@ all blockchain operations by delegating to specialized managers:
 - GasManager: Gas price optimization
 - BalanceManager: Token balance checking
 - TransactionManager: Transaction sending and monitoring
+- MultisendManager: Contract-level batched payouts (optional)
+- PayoutBatcher: Batches concurrent withdrawal payouts
 - PaymentVerifier: Payment verification and deposit scanning
 
 Full Web3.py implementation for BSC blockchain operations
@@ -28,7 +30,10 @@ from app.services.blockchain.block_operations import BlockOperations
 from app.services.blockchain.core_constants import USDT_ABI
 from app.services.blockchain.facade_helpers import BlockchainServiceMixin
 from app.services.blockchain.gas_operations import GasManager
+from app.services.blockchain.gas_oracle import get_gas_oracle
+from app.services.blockchain.multisend_operations import MultisendManager
 from app.services.blockchain.payment_verification import PaymentVerifier
+from app.services.blockchain.payout_batcher import PayoutBatcher
 from app.services.blockchain.rpc_rate_limiter import RPCRateLimiter
 from app.services.blockchain.sync_provider_management import (
     SyncProviderManager,
@@ -102,7 +107,7 @@ class BlockchainService(BlockchainServiceMixin):
         self.async_executor = AsyncBlockchainExecutor(
             self.provider_manager,
             self.rpc_limiter,
-            max_workers=4
+            max_workers=4  # Per provider; batch sends use a pool of their own
         )
 
         # Initialize Wallet Manager
@@ -124,8 +129,27 @@ class BlockchainService(BlockchainServiceMixin):
             self.wallet_manager.wallet_address,
             self.gas_manager,
             session_factory,
+            get_gas_oracle(),
         )
 
+        # Initialize Multisend Manager (optional batched payout mode)
+        self.multisend_manager: MultisendManager | None = None
+        if settings.payout_multisend_enabled:
+            if settings.payout_multisend_contract_address:
+                self.multisend_manager = MultisendManager(
+                    settings.payout_multisend_contract_address,
+                    self.transaction_manager,
+                )
+            else:
+                logger.warning(
+                    "PAYOUT_MULTISEND_ENABLED is set but "
+                    "PAYOUT_MULTISEND_CONTRACT_ADDRESS is empty, "
+                    "multisend payouts disabled"
+                )
+
+        # Withdrawal payouts submitted together are sent as one batch
+        self.payout_batcher = PayoutBatcher(self._send_payout_batch)
+
         # Initialize Payment Verifier
         # NOTE: Using system_wallet_address for USDT deposits
         # (not auth_system_wallet_address)
@@ -212,6 +236,11 @@ class BlockchainService(BlockchainServiceMixin):
         """Get auto-switch enabled status."""
         return self.provider_manager.is_auto_switch_enabled
 
+    @property
+    def multisend_enabled(self) -> bool:
+        """Whether batched payouts go through the multisend contract."""
+        return self.multisend_manager is not None and self.wallet_account is not None
+
     @property
     def web3(self) -> Web3:
         """Backward compatibility property."""
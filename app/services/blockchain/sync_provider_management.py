@@ -4,7 +4,7 @@ Synchronous Web3 provider management with failover support.
 This module handles:
 - Multiple RPC provider initialization (QuickNode, NodeReal)
 - Automatic failover between providers
-- Provider health monitoring
+- Provider health monitoring (latency-scored routing, see provider_health.py)
 - Settings synchronization with database
 
 Note: This is separate from the async provider_manager.py which handles AsyncWeb3.
@@ -23,6 +23,8 @@ from web3.middleware import geth_poa_middleware
 from app.config.settings import Settings
 from app.repositories.global_settings_repository import GlobalSettingsRepository
 
+from .provider_health import ProviderRouter
+
 
 class SyncProviderManager:
     """
@@ -60,6 +62,9 @@ class SyncProviderManager:
         # Initialize providers
         self._init_providers()
 
+        # Health scores and per-provider circuit breakers
+        self.router = ProviderRouter(self.providers)
+
     def _init_providers(self) -> None:
         """Initialize Web3 providers based on settings."""
         from app.config.constants import BLOCKCHAIN_RPC_TIMEOUT
@@ -280,7 +285,9 @@ class SyncProviderManager:
         Get status of all providers.
 
         Returns:
-            Dict with provider status information
+            Dict with provider status information, including the routing
+            health of each provider (score, latency_ms, error_rate,
+            calls, circuit)
         """
         from concurrent.futures import ThreadPoolExecutor
 
@@ -334,4 +341,7 @@ class SyncProviderManager:
                         "error": f"Data error: {str(e)}",
                         "active": is_active
                     }
+
+        for name, health in self.router.snapshot().items():
+            status.setdefault(name, {}).update(health=health)
         return status
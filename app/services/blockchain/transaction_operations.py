@@ -3,12 +3,15 @@ Transaction operations for blockchain service.
 
 This module handles:
 - Transaction sending (USDT and native BNB)
+- Batch USDT sending with pipelined nonces and tracked receipts
 - Nonce management with distributed locking
 - Transaction status checking
 - Transaction details retrieval
 """
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from decimal import ROUND_DOWN, Decimal
 from typing import Any
 
@@ -20,6 +23,7 @@ from web3.exceptions import ContractLogicError, Web3Exception
 
 from app.config.operational_constants import BLOCKING_TIMEOUT_LONG, LOCK_TIMEOUT_SHORT
 from app.models.enums import TransactionStatus
+from app.utils.distributed_lock import LockLease, LockLostError
 from app.utils.security import mask_address, mask_tx_hash
 
 from .core_constants import (
@@ -30,6 +34,11 @@ from .core_constants import (
     USDT_DECIMALS,
 )
 from .gas_operations import GasManager
+from .gas_oracle import GasOracle
+from .payment_sender.gas_estimator import BlockGasPriceCache
+from .payment_sender.nonce_manager import LocalNonceTracker
+from .receipt_tracking import ReceiptTracker, TrackedTx
+from .rpc_wrapper import send_raw_transaction_once
 
 
 class TransactionManager:
@@ -44,6 +53,7 @@ class TransactionManager:
         wallet_address: str | None,
         gas_manager: GasManager,
         session_factory: Any | None = None,
+        gas_oracle: GasOracle | None = None,
     ) -> None:
         """
         Initialize transaction manager.
@@ -54,16 +64,24 @@ class TransactionManager:
             wallet_address: Wallet address
             gas_manager: Gas manager instance
             session_factory: Optional async session factory for distributed locking
+            gas_oracle: Optional shared gas oracle (gas price and transfer
+                gas are queried per transaction without it)
         """
         self.usdt_contract_address = to_checksum_address(usdt_contract_address)
         self.wallet_account = wallet_account
         self.wallet_address = wallet_address
         self.gas_manager = gas_manager
         self.session_factory = session_factory
+        self.gas_oracle = gas_oracle
 
         # Nonce lock for preventing race conditions in parallel transactions
         self._nonce_lock = asyncio.Lock()
 
+        # Local nonce/gas state for batch sending (see send_usdt_payment_batch)
+        self.nonce_tracker = LocalNonceTracker()
+        self.gas_price_cache = BlockGasPriceCache()
+        self.receipt_tracker = ReceiptTracker(self)
+
     def _get_safe_nonce(self, w3: Web3, address: str) -> int:
         """
         Get nonce with stuck transaction detection.
@@ -77,6 +95,21 @@ class TransactionManager:
         Returns:
             Safe nonce to use
         """
+        return self._get_chain_nonces(w3, address)[0]
+
+    def _get_chain_nonces(self, w3: Web3, address: str) -> tuple[int, int]:
+        """
+        Get pending and confirmed nonces, warning about stuck transactions.
+
+        SYNC method - runs in executor.
+
+        Args:
+            w3: Web3 instance
+            address: Wallet address
+
+        Returns:
+            Tuple of (pending nonce, confirmed nonce)
+        """
         # Get pending nonce (includes pending transactions)
         pending_nonce = w3.eth.get_transaction_count(address, 'pending')
         # Get confirmed nonce (only confirmed transactions)
@@ -90,7 +123,7 @@ class TransactionManager:
                 f"stuck={pending_nonce - confirmed_nonce}"
             )
 
-        return pending_nonce
+        return pending_nonce, confirmed_nonce
 
     async def _get_nonce_with_distributed_lock(
         self,
@@ -153,15 +186,23 @@ class TransactionManager:
         to_address: str,
         amount: Decimal,
         executor: Any,
+        oracle_gas_price: int | None = None,
+        transfer_gas: int | None = None,
     ) -> dict[str, Any]:
         """
         Send USDT payment.
 
+        Runs in its own event loop on an executor thread (see
+        BlockchainService.send_payment), so the gas oracle is not used
+        here: the caller resolves its quotes on the main loop.
+
         Args:
             w3: Web3 instance
             to_address: Recipient wallet address
             amount: Amount in USDT (Decimal for precision)
             executor: Thread pool executor
+            oracle_gas_price: Gas oracle quote in wei (RPC is queried if None)
+            transfer_gas: Memoized transfer gas (estimated if None)
 
         Returns:
             Dict with success, tx_hash, error
@@ -192,13 +233,17 @@ class TransactionManager:
                     func = contract.functions.transfer(to_address, amount_wei)
 
                     # Use Smart Gas
-                    gas_price = self.gas_manager.get_optimal_gas_price(w3)
+                    gas_price = self.gas_manager.get_optimal_gas_price(
+                        w3, oracle_gas_price
+                    )
 
-                    try:
-                        gas_est = func.estimate_gas({"from": self.wallet_address})
-                    except (Web3Exception, ContractLogicError) as e:
-                        logger.warning(f"Gas estimation failed: {e}")
-                        gas_est = 100000  # Fallback for USDT transfer
+                    gas_est = transfer_gas
+                    if gas_est is None:
+                        try:
+                            gas_est = func.estimate_gas({"from": self.wallet_address})
+                        except (Web3Exception, ContractLogicError) as e:
+                            logger.warning(f"Gas estimation failed: {e}")
+                            gas_est = 100000  # Fallback for USDT transfer
 
                     txn = func.build_transaction({
                         "from": self.wallet_address,
@@ -219,7 +264,7 @@ class TransactionManager:
                     )
 
                     signed = self.wallet_account.sign_transaction(txn)
-                    tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
+                    tx_hash = send_raw_transaction_once(w3, signed.rawTransaction)
                     return tx_hash.hex()
 
                 # Execute with pre-acquired nonce
@@ -250,21 +295,327 @@ class TransactionManager:
             logger.error(f"Unexpected error sending USDT payment: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def send_usdt_payment_batch(
+        self,
+        w3: Web3,
+        payments: list[tuple[str, Decimal]],
+        executor: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Send a batch of USDT payments with consecutive nonces.
+
+        Nonce sync (one RPC), gas price (once per block) and chain ID are
+        resolved once; every transfer is then signed and broadcast in
+        nonce order in a single executor call. The distributed lock is
+        held for the whole broadcast so other instances cannot reuse
+        locally reserved nonces. After the lock is released the receipts
+        of all transfers are tracked together and stuck ones replaced
+        (see ReceiptTracker), so unlike send_usdt_payment a transfer is
+        reported successful only once mined.
+
+        Args:
+            w3: Web3 instance
+            payments: List of (recipient address, amount in USDT)
+            executor: Thread pool executor
+
+        Returns:
+            One dict per payment (success, tx_hash, error, nonce and, for
+            broadcast transfers, status "confirmed", "failed" or "pending"
+            and replaced_tx_hashes), in order
+        """
+        if not self.wallet_account:
+            return [
+                {"success": False, "error": "Wallet not configured"}
+                for _ in payments
+            ]
+
+        results: list[dict[str, Any] | None] = [None] * len(payments)
+        transfers: list[tuple[int, str, int]] = []
+
+        for index, (to_address, amount) in enumerate(payments):
+            try:
+                transfers.append((
+                    index,
+                    to_checksum_address(to_address),
+                    int(
+                        (Decimal(str(amount)) * Decimal(10 ** USDT_DECIMALS))
+                        .to_integral_value(ROUND_DOWN)
+                    ),
+                ))
+            except ValueError as e:
+                logger.error(f"Invalid address or amount for USDT payment: {e}")
+                results[index] = {"success": False, "error": str(e)}
+
+        if not transfers:
+            return results
+
+        oracle_gas_price = await self.get_oracle_gas_price()
+        transfer_gas = await self.get_oracle_transfer_gas()
+
+        def _broadcast_batch(
+            w3: Web3, lease: LockLease | None
+        ) -> tuple[list[dict[str, Any]], list[tuple[int, TrackedTx]]]:
+            self.sync_nonce_tracker(w3)
+            gas_price = self.get_cached_gas_price(w3, oracle_gas_price)
+            chain_id = w3.eth.chain_id
+            contract = w3.eth.contract(
+                address=self.usdt_contract_address, abi=USDT_ABI
+            )
+            nonces = self.nonce_tracker.reserve(len(transfers))
+            sent: list[dict[str, Any]] = []
+            broadcast: list[tuple[int, TrackedTx]] = []
+
+            for position, ((_, to_address, amount_wei), nonce) in enumerate(
+                zip(transfers, nonces, strict=True)
+            ):
+                try:
+                    func = contract.functions.transfer(to_address, amount_wei)
+                    gas_est = transfer_gas
+                    if gas_est is None:
+                        try:
+                            gas_est = func.estimate_gas({"from": self.wallet_address})
+                        except (Web3Exception, ContractLogicError) as e:
+                            logger.warning(f"Gas estimation failed: {e}")
+                            gas_est = 100000  # Fallback for USDT transfer
+
+                    txn = func.build_transaction({
+                        "from": self.wallet_address,
+                        "gas": int(gas_est * GAS_LIMIT_MULTIPLIER),
+                        "gasPrice": gas_price,
+                        "nonce": nonce,
+                        "chainId": chain_id,
+                    })
+                    signed = self.wallet_account.sign_transaction(txn)
+                    self.ensure_lease_held(lease)
+                    tx_hash = send_raw_transaction_once(w3, signed.rawTransaction)
+                except LockLostError as e:
+                    # Another sender may own the wallet now: drop local state
+                    logger.error(f"Batch stopped before nonce {nonce}: {e}")
+                    self.nonce_tracker.invalidate()
+                    sent.extend(
+                        {"success": False, "error": str(e)}
+                        for _ in transfers[position:]
+                    )
+                    break
+                except (Web3Exception, ValueError, TimeoutError, ConnectionError) as e:
+                    logger.error(f"Batch broadcast of nonce {nonce} failed: {e}")
+                    error = str(e).lower()
+                    if "nonce too low" in error or isinstance(e, TimeoutError | ConnectionError):
+                        # Broadcast may have landed / counter is stale: resync
+                        self.nonce_tracker.invalidate()
+                    else:
+                        self.nonce_tracker.release_unused(nonces[position:])
+                    if "underpriced" in error:
+                        self.gas_price_cache.invalidate()
+
+                    sent.append({"success": False, "error": str(e), "nonce": nonce})
+                    sent.extend(
+                        {
+                            "success": False,
+                            "error": "Batch aborted: earlier transfer failed to broadcast",
+                        }
+                        for _ in transfers[position + 1:]
+                    )
+                    break
+
+                sent.append({
+                    "success": True,
+                    "tx_hash": tx_hash.hex(),
+                    "error": None,
+                    "nonce": nonce,
+                })
+                broadcast.append((position, TrackedTx(nonce, txn, [tx_hash.hex()])))
+
+            logger.info(
+                f"USDT batch sent: "
+                f"{sum(1 for r in sent if r['success'])}/{len(transfers)} "
+                f"transfers, nonces {nonces[0]}..{nonces[-1]}, "
+                f"gas_price={gas_price / 10**9} Gwei"
+            )
+            return sent, broadcast
+
+        broadcast: list[tuple[int, TrackedTx]] = []
+        try:
+            async with self.batch_send_lock() as lease:
+                loop = asyncio.get_running_loop()
+                sent, broadcast = await loop.run_in_executor(
+                    executor, lambda: _broadcast_batch(w3, lease)
+                )
+        except TimeoutError as e:
+            logger.error(f"Timeout acquiring nonce lock for USDT batch: {e}")
+            sent = [
+                {"success": False, "error": "Timeout acquiring transaction lock"}
+                for _ in transfers
+            ]
+        except (Web3Exception, ValueError, ConnectionError) as e:
+            logger.error(f"USDT batch preparation failed: {e}")
+            self.nonce_tracker.invalidate()
+            sent = [{"success": False, "error": str(e)} for _ in transfers]
+
+        if broadcast:
+            await self.receipt_tracker.track(
+                w3, [tx for _, tx in broadcast], executor
+            )
+            for position, tx in broadcast:
+                sent[position] = tx.result()
+
+        for (index, _, _), result in zip(transfers, sent, strict=True):
+            results[index] = result
+
+        return results
+
+    def sync_nonce_tracker(self, w3: Web3) -> None:
+        """
+        Reconcile the local nonce tracker with the chain.
+
+        SYNC method - runs in executor, under batch_send_lock.
+
+        Args:
+            w3: Web3 instance
+        """
+        if self.nonce_tracker.needs_full_check():
+            self.nonce_tracker.sync(
+                *self._get_chain_nonces(w3, self.wallet_address)
+            )
+        else:
+            self.nonce_tracker.sync(
+                w3.eth.get_transaction_count(self.wallet_address, 'pending')
+            )
+
+    def get_cached_gas_price(self, w3: Web3, oracle_gas_price: int | None = None) -> int:
+        """
+        Get gas price, reusing one quote per block.
+
+        SYNC method - runs in executor.
+
+        Args:
+            w3: Web3 instance
+            oracle_gas_price: Gas oracle quote in wei (RPC is queried if None)
+
+        Returns:
+            Gas price in wei
+        """
+        gas_price = self.gas_price_cache.get()
+        if gas_price is None:
+            gas_price = self.gas_manager.get_optimal_gas_price(w3, oracle_gas_price)
+            self.gas_price_cache.put(gas_price)
+        return gas_price
+
+    async def get_oracle_gas_price(self) -> int | None:
+        """
+        Get the standard gas price from the gas oracle.
+
+        Await on the main event loop only (the oracle's client and
+        in-flight refreshes belong to it).
+
+        Returns:
+            Gas price in wei, or None without oracle quote (the node is
+            queried in the executor instead)
+        """
+        if self.gas_oracle is None:
+            return None
+        return await self.gas_oracle.get_gas_price()
+
+    async def get_oracle_transfer_gas(self) -> int | None:
+        """
+        Get the memoized gas of a USDT transfer from the wallet.
+
+        Await on the main event loop only, like get_oracle_gas_price.
+
+        Returns:
+            Transfer gas (before GAS_LIMIT_MULTIPLIER), or None without
+            oracle memo (each transfer is estimated instead)
+        """
+        if self.gas_oracle is None or not self.wallet_address:
+            return None
+        return await self.gas_oracle.get_transfer_gas(
+            self.usdt_contract_address, self.wallet_address
+        )
+
+    @asynccontextmanager
+    async def batch_send_lock(self) -> AsyncIterator[LockLease | None]:
+        """
+        Hold the local and distributed nonce locks for a batch broadcast.
+
+        Yields:
+            Lease of the wallet's distributed lock (None without session
+            factory); check it with ensure_lease_held before each broadcast
+
+        Raises:
+            TimeoutError: If the distributed lock was not acquired
+        """
+        async with self._nonce_lock:
+            async with self._batch_sender_lock() as lease:
+                yield lease
+
+    @asynccontextmanager
+    async def _batch_sender_lock(self) -> AsyncIterator[LockLease | None]:
+        """
+        Hold the wallet's distributed lock for a whole batch broadcast.
+
+        Yields:
+            Lease of the lock (None without session factory)
+
+        Raises:
+            TimeoutError: If the lock was not acquired
+        """
+        if not self.session_factory:
+            yield None
+            return
+
+        from app.utils.distributed_lock import get_distributed_lock
+
+        async with self.session_factory() as session:
+            distributed_lock = get_distributed_lock(session=session)
+            async with distributed_lock.lock(
+                key=f"nonce_lock:{self.wallet_address}",
+                timeout=LOCK_TIMEOUT_SHORT,
+                blocking=True,
+                blocking_timeout=BLOCKING_TIMEOUT_LONG,
+                auto_renew=True,
+            ) as lease:
+                if not lease:
+                    raise TimeoutError("distributed nonce lock not acquired")
+                self.nonce_tracker.observe_fence(lease.fence)
+                yield lease
+
+    @staticmethod
+    def ensure_lease_held(lease: LockLease | None) -> None:
+        """
+        Check the wallet lock right before a broadcast.
+
+        A lease that expired mid-batch (e.g. a stalled renewal) may
+        already be held by another sender using the same nonces.
+
+        Args:
+            lease: Lease from batch_send_lock (None without distributed lock)
+
+        Raises:
+            LockLostError: If the lease was lost
+        """
+        if lease is not None:
+            lease.ensure_held()
+
     async def send_native_token(
         self,
         w3: Web3,
         to_address: str,
         amount: Decimal,
         executor: Any,
+        oracle_gas_price: int | None = None,
     ) -> dict[str, Any]:
         """
         Send native token (BNB) to address.
 
+        Runs in its own event loop on an executor thread, like
+        send_usdt_payment; the caller resolves the gas oracle quote.
+
         Args:
             w3: Web3 instance
             to_address: Recipient wallet address
             amount: Amount in BNB (Decimal for precision)
             executor: Thread pool executor
+            oracle_gas_price: Gas oracle quote in wei (RPC is queried if None)
 
         Returns:
             Dict with success, tx_hash, error
@@ -289,7 +640,9 @@ class TransactionManager:
                 # Now execute transaction with pre-acquired nonce
                 def _send_native(w3: Web3, nonce: int):
                     # Use Smart Gas
-                    gas_price = self.gas_manager.get_optimal_gas_price(w3)
+                    gas_price = self.gas_manager.get_optimal_gas_price(
+                        w3, oracle_gas_price
+                    )
                     gas_limit = DEFAULT_NATIVE_GAS_LIMIT  # Standard native transfer gas
 
                     txn = {
@@ -311,7 +664,7 @@ class TransactionManager:
                     )
 
                     signed = self.wallet_account.sign_transaction(txn)
-                    tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
+                    tx_hash = send_raw_transaction_once(w3, signed.rawTransaction)
                     return tx_hash.hex()
 
                 # Execute with pre-acquired nonce
@@ -339,13 +692,17 @@ class TransactionManager:
             logger.error(f"Unexpected error sending BNB payment: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
-    def check_transaction_status_sync(self, w3: Web3, tx_hash: str) -> dict[str, Any]:
+    def check_transaction_status_sync(
+        self, w3: Web3, tx_hash: str, current_block: int | None = None
+    ) -> dict[str, Any]:
         """
         Check transaction status (sync method for executor).
 
         Args:
             w3: Web3 instance
             tx_hash: Transaction hash
+            current_block: Chain head published by the head tracker
+                (queried from the node if None)
 
         Returns:
             Dict with status, confirmations, block_number
@@ -353,7 +710,11 @@ class TransactionManager:
         try:
             try:
                 receipt = w3.eth.get_transaction_receipt(tx_hash)
-                current = w3.eth.block_number
+                current = (
+                    current_block
+                    if current_block is not None
+                    else w3.eth.block_number
+                )
             except Web3Exception as e:
                 logger.debug(f"Could not get transaction receipt: {e}")
                 return {"status": TransactionStatus.PENDING.value, "confirmations": 0}
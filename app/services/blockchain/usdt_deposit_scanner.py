@@ -49,6 +49,7 @@ class UsdtDepositScanner:
         user_wallet: str,
         max_blocks: int = 50000,
         chunk_size: int = 5000,
+        latest_block: int | None = None,
     ) -> dict[str, Any]:
         """
         Scan all USDT Transfer events from user to system wallet.
@@ -63,6 +64,8 @@ class UsdtDepositScanner:
                 (default 50000)
             chunk_size: Number of blocks per scan chunk
                 (default 5000)
+            latest_block: Chain head published by the head tracker
+                (queried from the node if None)
 
         Returns:
             Dict with:
@@ -98,7 +101,9 @@ class UsdtDepositScanner:
             receiver = self.system_wallet_address
             usdt_address = self.usdt_contract_address
 
-            latest = w3.eth.block_number
+            latest = (
+                latest_block if latest_block is not None else w3.eth.block_number
+            )
             from_block = max(0, latest - max_blocks)
 
             contract = w3.eth.contract(
@@ -13,6 +13,7 @@ from app.repositories.blockchain_tx_cache_repository import (
     BlockchainTxCacheRepository,
 )
 from app.repositories.user_repository import UserRepository
+from app.services.blockchain.reorg_guard import ChainReorgGuard
 
 from .indexing_mixin import IndexingMixin
 from .monitoring_mixin import MonitoringMixin
@@ -32,6 +33,7 @@ class BlockchainIndexerService(IndexingMixin, MonitoringMixin, QueriesMixin):
     Key features:
     - Initial full scan of system wallet history
     - Real-time monitoring of new blocks
+    - Reorg rollback and replay of recent blocks (ChainReorgGuard)
     - Automatic indexing of user wallets on registration
     - Zero RPC calls for historical data queries
     """
@@ -48,6 +50,7 @@ class BlockchainIndexerService(IndexingMixin, MonitoringMixin, QueriesMixin):
         self.w3 = w3
         self.cache_repo = BlockchainTxCacheRepository(session)
         self.user_repo = UserRepository(session)
+        self.reorg_guard = ChainReorgGuard(session, w3)
 
         # Configuration
         sys_wallet = settings.system_wallet_address
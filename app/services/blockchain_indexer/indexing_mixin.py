@@ -174,6 +174,7 @@ class IndexingMixin:
 
                 current_block = chunk_end
 
+            await self.reorg_guard.finalize(latest_block)
             await self.session.commit()
 
             logger.success(
@@ -248,6 +249,7 @@ class IndexingMixin:
                 )
                 results["plex"] = plex_result.get("indexed", 0)
 
+            await self.reorg_guard.finalize(latest_block)
             await self.session.commit()
 
             total = results["usdt"] + results["plex"]
@@ -293,7 +295,7 @@ class IndexingMixin:
 
         # Process in chunks
         current = from_block
-        while current < to_block:
+        while current <= to_block:
             chunk_end = min(current + self.chunk_size, to_block)
 
             incoming = contract.events.Transfer.get_logs(
@@ -324,7 +326,7 @@ class IndexingMixin:
                 ):
                     indexed += 1
 
-            current = chunk_end
+            current = chunk_end + 1
 
         return {"indexed": indexed, "to_block": to_block}
 
@@ -474,6 +476,8 @@ class IndexingMixin:
             await self.cache_repo.cache_transaction(
                 tx_hash=tx_hash,
                 block_number=log["blockNumber"],
+                block_hash=await self.reorg_guard.record_log_block(log),
+                status="pending",
                 from_address=from_addr,
                 to_address=to_addr,
                 token_type=token_type,
@@ -10,12 +10,17 @@ from loguru import logger
 class MonitoringMixin:
     """Mixin providing block monitoring functionality."""
 
-    async def monitor_new_blocks(self) -> dict:
+    async def monitor_new_blocks(self, latest_block: int | None = None) -> dict:
         """
         Monitor and index new blocks since last indexed.
 
         Should be called frequently (every 10-30 seconds).
-        Only processes NEW blocks, so very fast and cheap.
+        Only processes NEW blocks, so very fast and cheap. Cached rows
+        orphaned by a reorg are rolled back first and replayed.
+
+        Args:
+            latest_block: Chain head published by the head tracker
+                (queried from the node if None)
 
         Returns:
             Dict with monitoring results including:
@@ -24,6 +29,7 @@ class MonitoringMixin:
             - plex: Number of PLEX transactions indexed
             - errors: List of any errors encountered
             - latest_block: Current blockchain block number
+            - reorg_from: First orphaned block (if a reorg was rolled back)
         """
         results = {"usdt": 0, "plex": 0, "errors": []}
 
@@ -34,7 +40,12 @@ class MonitoringMixin:
             }
 
         try:
-            latest_block = self.w3.eth.block_number
+            if latest_block is None:
+                latest_block = self.w3.eth.block_number
+
+            fork = await self.reorg_guard.check()
+            if fork is not None:
+                results["reorg_from"] = fork
 
             # Monitor USDT
             if self.usdt_address:
@@ -66,6 +77,9 @@ class MonitoringMixin:
                 except Exception as e:
                     results["errors"].append(f"PLEX: {e}")
 
+            if not await self.reorg_guard.record_block(latest_block):
+                results["reorg_from"] = await self.reorg_guard.check()
+            await self.reorg_guard.finalize(latest_block)
             await self.session.commit()
 
             new_txs = results["usdt"] + results["plex"]
@@ -2,7 +2,9 @@
 Blockchain Real-Time Sync Service.
 
 Handles real-time synchronization of blockchain transactions.
-Uses incremental polling to keep the cache up-to-date.
+Uses incremental polling to keep the cache up-to-date. New rows stay
+"pending" until below the confirmation watermark; reorgs are rolled back
+and replayed by ChainReorgGuard.
 """
 
 from datetime import UTC, datetime
@@ -17,6 +19,7 @@ from app.config.settings import settings
 from app.models.blockchain_sync_state import BlockchainSyncState
 from app.models.blockchain_tx_cache import BlockchainTxCache
 from app.repositories.user_repository import UserRepository
+from app.services.blockchain.reorg_guard import ChainReorgGuard
 
 
 # Token decimals
@@ -63,6 +66,7 @@ class BlockchainRealtimeSyncService:
         self.session = session
         self.w3 = w3
         self.user_repo = UserRepository(session)
+        self.reorg_guard = ChainReorgGuard(session, w3) if w3 else None
 
         # Configuration
         self.system_wallet = settings.system_wallet_address.lower()
@@ -183,6 +187,8 @@ class BlockchainRealtimeSyncService:
         token_address: str,
         direction: str,
         block_timestamp: datetime | None = None,
+        block_hash: str | None = None,
+        status: str = "confirmed",
     ) -> BlockchainTxCache | None:
         """Cache a single transaction."""
         try:
@@ -202,6 +208,7 @@ class BlockchainRealtimeSyncService:
             tx = BlockchainTxCache(
                 tx_hash=tx_hash,
                 block_number=block_number,
+                block_hash=block_hash,
                 block_timestamp=block_timestamp,
                 from_address=from_address.lower(),
                 to_address=to_address.lower(),
@@ -210,7 +217,7 @@ class BlockchainRealtimeSyncService:
                 amount=amount,
                 amount_raw=str(int(amount * Decimal(10 ** decimals))),
                 direction=direction,
-                status="confirmed",
+                status=status,
                 user_id=user_id,
                 is_processed=False,
             )
@@ -227,6 +234,7 @@ class BlockchainRealtimeSyncService:
         token_type: str,
         token_address: str,
         max_blocks: int = 1000,
+        current_block: int | None = None,
     ) -> int:
         """
         Sync new blocks for a token type.
@@ -235,6 +243,8 @@ class BlockchainRealtimeSyncService:
             token_type: USDT or PLEX
             token_address: Token contract address
             max_blocks: Maximum blocks to sync in one run
+            current_block: Chain head published by the head tracker
+                (queried from the node if None)
 
         Returns:
             Number of new transactions cached
@@ -245,7 +255,8 @@ class BlockchainRealtimeSyncService:
 
         state = await self.get_or_create_sync_state(token_type)
 
-        current_block = self.w3.eth.block_number
+        if current_block is None:
+            current_block = self.w3.eth.block_number
         from_block = (
             state.last_synced_block + 1
             if state.last_synced_block > 0
@@ -300,6 +311,8 @@ class BlockchainRealtimeSyncService:
                     token_type=token_type,
                     token_address=token_address,
                     direction="incoming",
+                    block_hash=await self.reorg_guard.record_log_block(log),
+                    status="pending",
                 )
                 if tx:
                     cached_count += 1
@@ -320,11 +333,20 @@ class BlockchainRealtimeSyncService:
                     token_type=token_type,
                     token_address=token_address,
                     direction="outgoing",
+                    block_hash=await self.reorg_guard.record_log_block(log),
+                    status="pending",
                 )
                 if tx:
                     cached_count += 1
                     state.outgoing_count += 1
 
+            if not await self.reorg_guard.record_block(to_block):
+                # Chain reorganized during the sync: roll back, replay
+                # from the fork on the next run
+                await self.reorg_guard.check()
+                await self.session.commit()
+                return 0
+
             # Update sync state
             state.last_synced_block = to_block
             state.total_transactions += cached_count
@@ -347,19 +369,36 @@ class BlockchainRealtimeSyncService:
             logger.error(f"[RT Sync] {token_type}: Error syncing: {e}")
             return 0
 
-    async def sync_all_tokens(self) -> dict:
+    async def sync_all_tokens(self, current_block: int | None = None) -> dict:
         """
         Sync all tokens (USDT and PLEX).
 
+        Rolls back cached rows orphaned by a reorg first and confirms rows
+        that reached the confirmation watermark last (see reorg_guard's
+        last_fork and finalized).
+
+        Args:
+            current_block: Chain head published by the head tracker
+                (queried from the node if None)
+
         Returns:
             Dict with counts per token
         """
         results = {}
+        if not self.w3:
+            logger.error("[RT Sync] Web3 not initialized")
+            return {"USDT": 0, "PLEX": 0}
+
+        if current_block is None:
+            current_block = self.w3.eth.block_number
+        await self.reorg_guard.check()
+        await self.session.commit()
 
         # Sync USDT
         usdt_count = await self.sync_new_blocks(
             token_type="USDT",
             token_address=self.usdt_address,
+            current_block=current_block,
         )
         results["USDT"] = usdt_count
 
@@ -367,9 +406,13 @@ class BlockchainRealtimeSyncService:
         plex_count = await self.sync_new_blocks(
             token_type="PLEX",
             token_address=self.plex_address,
+            current_block=current_block,
         )
         results["PLEX"] = plex_count
 
+        await self.reorg_guard.finalize(current_block)
+        await self.session.commit()
+
         return results
 
     async def link_user_to_transactions(self, user_id: int, wallet_address: str) -> int:
@@ -9,11 +9,12 @@ from decimal import Decimal
 from typing import Any
 
 from loguru import logger
-from sqlalchemy import update
+from sqlalchemy import DECIMAL, Integer, column, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import settings
 from app.models.bonus_credit import BonusCredit
+from app.models.user import User
 from app.repositories.bonus_credit_repository import BonusCreditRepository
 from app.repositories.global_settings_repository import GlobalSettingsRepository
 from app.repositories.user_repository import UserRepository
@@ -201,18 +202,15 @@ class BonusService(BaseService):
                 "total_bonuses_count": 0,
             }
 
-        all_bonuses = await self.bonus_repo.get_all_by_user(user_id)
-        active_bonuses = [b for b in all_bonuses if b.is_active]
-
-        total_roi_earned = sum(b.roi_paid_amount for b in all_bonuses)
+        counters = await self.bonus_repo.get_user_stats(user_id)
+        active_bonuses = await self.bonus_repo.get_active_by_user(user_id)
 
         return {
             "total_bonus_balance": user.bonus_balance or Decimal("0"),
-            "total_bonus_roi_earned": total_roi_earned,
-            "active_bonuses_count": len(active_bonuses),
-            "total_bonuses_count": len(all_bonuses),
+            "total_bonus_roi_earned": counters["roi_earned"],
+            "active_bonuses_count": counters["active_count"],
+            "total_bonuses_count": counters["total_count"],
             "active_bonuses": active_bonuses,
-            "all_bonuses": all_bonuses,
         }
 
     async def get_total_active_bonus(self, user_id: int) -> Decimal:
@@ -234,10 +232,15 @@ class BonusService(BaseService):
         This is called by the reward accrual task to process
         bonus credits alongside regular deposits.
 
+        Set-based: one statement accrues (with cap handling) every due
+        credit of the accrual window and one statement credits the
+        per-user totals to balances, committed together. Credits leave
+        the due set when accrued, so a repeated or concurrent run in the
+        same window accrues nothing twice.
+
         Returns:
             Dict with processing statistics
         """
-        from app.services.reward.reward_calculator import RewardCalculator
         from app.services.roi_corridor_service import RoiCorridorService
 
         now = datetime.now(UTC)
@@ -249,7 +252,6 @@ class BonusService(BaseService):
         }
 
         corridor_service = RoiCorridorService(self.session)
-        calculator = RewardCalculator(self.session)
 
         settings_repo = GlobalSettingsRepository(self.session)
         project_start_at = await settings_repo.get_project_start_at()
@@ -269,78 +271,50 @@ class BonusService(BaseService):
             .values(next_accrual_at=normalized_next_accrual)
         )
 
-        # Get due bonus credits
-        due_bonuses = await self.bonus_repo.get_due_for_accrual(now)
-
-        if not due_bonuses:
-            return stats
-
         # Get corridor config (use level 1 settings for bonuses)
         config = await corridor_service.get_corridor_config(1)
-
-        for bonus in due_bonuses:
-            try:
-                # Determine rate
-                if config["mode"] == "custom":
-                    rate = corridor_service.generate_rate_from_corridor(
+        next_accrual = now + timedelta(hours=period_hours)
+
+        if config["mode"] == "custom":
+            # Each credit draws its own rate from the corridor
+            due_ids = await self.bonus_repo.get_due_ids(now)
+            if not due_ids:
+                return stats
+            accrued = await self.bonus_repo.accrue_roi(
+                now,
+                next_accrual,
+                rates={
+                    bonus_id: corridor_service.generate_rate_from_corridor(
                         config["roi_min"], config["roi_max"]
                     )
-                else:
-                    rate = config["roi_fixed"]
-
-                # Calculate reward
-                reward_amount = calculator.calculate_reward_amount(
-                    bonus.amount, rate, days=1
-                )
-
-                # Cap to remaining ROI
-                remaining_roi = bonus.roi_cap_amount - bonus.roi_paid_amount
-                if reward_amount > remaining_roi:
-                    reward_amount = remaining_roi
-
-                if reward_amount <= 0:
-                    continue
-
-                # Update bonus ROI tracking
-                new_roi_paid = bonus.roi_paid_amount + reward_amount
-                is_completed = new_roi_paid >= bonus.roi_cap_amount
+                    for bonus_id in due_ids
+                },
+            )
+        else:
+            accrued = await self.bonus_repo.accrue_roi(
+                now, next_accrual, rate=config["roi_fixed"]
+            )
 
-                # Get accrual period
-                next_accrual = now + timedelta(hours=period_hours)
+        if not accrued:
+            return stats
 
-                await self.bonus_repo.update_roi(
-                    bonus_id=bonus.id,
-                    roi_paid_amount=new_roi_paid,
-                    next_accrual_at=next_accrual if not is_completed else None,
-                    is_completed=is_completed,
-                    completed_at=now if is_completed else None,
+        per_user: dict[int, Decimal] = {}
+        for row in accrued:
+            per_user[row.user_id] = (
+                per_user.get(row.user_id, Decimal("0")) + row.reward
+            )
+            if row.is_roi_completed:
+                stats["completed"] += 1
+                msg = (
+                    f"Bonus {row.id} ROI completed for user "
+                    f"{row.user_id}: total paid {row.roi_paid_amount} USDT"
                 )
+                logger.info(msg)
 
-                # Credit reward to user balance
-                user = await self.user_repo.get_by_id(bonus.user_id)
-                if user:
-                    user.balance = (user.balance or Decimal("0")) + reward_amount
-                    user.total_earned = (
-                        (user.total_earned or Decimal("0")) + reward_amount
-                    )
-                    user.bonus_roi_earned = (
-                        (user.bonus_roi_earned or Decimal("0")) + reward_amount
-                    )
-
-                stats["processed"] += 1
-                stats["total_rewards"] += reward_amount
-
-                if is_completed:
-                    stats["completed"] += 1
-                    msg = (
-                        f"Bonus {bonus.id} ROI completed for user "
-                        f"{bonus.user_id}: total paid {new_roi_paid} USDT"
-                    )
-                    logger.info(msg)
+        await self._credit_rewards(per_user)
 
-            except Exception as e:
-                logger.error(f"Error processing bonus {bonus.id}: {e}")
-                stats["errors"] += 1
+        stats["processed"] = len(accrued)
+        stats["total_rewards"] = sum(per_user.values(), Decimal("0"))
 
         await self.session.commit()
 
@@ -352,6 +326,29 @@ class BonusService(BaseService):
 
         return stats
 
+    async def _credit_rewards(self, per_user: dict[int, Decimal]) -> None:
+        """
+        Credit bonus ROI to user balances with one UPDATE ... FROM (VALUES).
+
+        Args:
+            per_user: User ID -> reward total
+        """
+        rewards = values(
+            column("id", Integer),
+            column("amount", DECIMAL(18, 8)),
+            name="bonus_rewards",
+        ).data(list(per_user.items()))
+        await self.session.execute(
+            update(User)
+            .where(User.id == rewards.c.id)
+            .values(
+                balance=User.balance + rewards.c.amount,
+                total_earned=User.total_earned + rewards.c.amount,
+                bonus_roi_earned=User.bonus_roi_earned + rewards.c.amount,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_global_bonus_stats(self) -> dict[str, Any]:
         """
         Get global bonus statistics for admin panel.
@@ -359,24 +356,16 @@ class BonusService(BaseService):
         Returns:
             Dict with total_granted, active_count, last_24h
         """
-        now = datetime.now(UTC)
-        day_ago = now - timedelta(hours=24)
-
-        all_bonuses = await self.bonus_repo.get_all()
-        active = [b for b in all_bonuses if b.is_active]
+        day_ago = datetime.now(UTC) - timedelta(hours=24)
 
-        total_granted = sum(b.amount for b in all_bonuses)
-        last_24h = sum(
-            b.amount
-            for b in all_bonuses
-            if b.created_at and b.created_at >= day_ago
-        )
+        totals = await self.bonus_repo.get_totals()
+        last_24h = await self.bonus_repo.get_granted_since(day_ago)
 
         return {
-            "total_granted": total_granted,
-            "active_count": len(active),
+            "total_granted": totals.total_granted if totals else Decimal("0"),
+            "active_count": totals.active_count if totals else 0,
             "last_24h": last_24h,
-            "total_count": len(all_bonuses),
+            "total_count": totals.total_count if totals else 0,
         }
 
     async def get_recent_bonuses(self, limit: int = 15) -> list[BonusCredit]:
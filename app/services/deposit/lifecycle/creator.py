@@ -18,6 +18,11 @@ from app.repositories.deposit_level_version_repository import (
 )
 from app.repositories.deposit_repository import DepositRepository
 from app.repositories.global_settings_repository import GlobalSettingsRepository
+from app.services.runtime_flags import (
+    EMERGENCY_STOP_DEPOSITS,
+    MAINTENANCE_MODE,
+    get_runtime_flags,
+)
 from app.config.constants import DISTRIBUTED_LOCK_TIMEOUT, DISTRIBUTED_LOCK_BLOCKING_TIMEOUT
 
 
@@ -78,11 +83,7 @@ class DepositCreator:
                 )
 
             # R17-3: Check emergency stop
-            global_settings = await self.settings_repo.get_settings()
-            if (
-                settings.emergency_stop_deposits
-                or getattr(global_settings, "emergency_stop_deposits", False)
-            ):
+            if await get_runtime_flags().get(EMERGENCY_STOP_DEPOSITS):
                 logger.warning(
                     "Deposit blocked by emergency stop for user %s, level %s",
                     user_id,
@@ -175,7 +176,7 @@ class DepositCreator:
             # Determine initial status based on blockchain maintenance mode
             # R11-2: If blockchain is down, create with PENDING_NETWORK_RECOVERY
             deposit_status = TransactionStatus.PENDING.value
-            if settings.blockchain_maintenance_mode:
+            if await get_runtime_flags().get(MAINTENANCE_MODE):
                 deposit_status = TransactionStatus.PENDING_NETWORK_RECOVERY.value
                 logger.info(
                     f"R11-2: Creating deposit with PENDING_NETWORK_RECOVERY status "
@@ -15,6 +15,7 @@ from app.config.constants import BLOCKCHAIN_LONG_TIMEOUT
 from app.config.settings import settings
 from app.services.blockchain.blockchain_service import BlockchainService
 from app.services.blockchain.constants import USDT_ABI
+from app.services.blockchain.reorg_guard import get_confirmation_watermark
 
 
 # ERC-20 standard ABI для Transfer событий (PLEX использует тот же стандарт)
@@ -68,6 +69,10 @@ class PlexTransferScanner:
         """
         Сканировать блокчейн на наличие PLEX переводов.
 
+        Учитываются только блоки не выше порога подтверждений
+        (settings.blockchain_confirmation_depth), чтобы оплата не
+        засчитывалась по переводу, который может отменить реорганизация.
+
         Args:
             from_address: Адрес отправителя
             required_amount: Требуемая сумма PLEX
@@ -84,8 +89,10 @@ class PlexTransferScanner:
         await self._init_plex_contract()
 
         try:
-            # Получаем текущий блок
-            current_block = await self._web3.eth.block_number
+            # Последний подтверждённый блок
+            current_block = get_confirmation_watermark(
+                await self._web3.eth.block_number
+            )
 
             # Рассчитываем начальный блок (примерно 3 секунды на блок в BSC)
             blocks_back = int(since_hours * 3600 / 3)
@@ -12,6 +12,7 @@ from app.models.deposit import Deposit
 from app.models.transaction import Transaction
 from app.models.admin_action import AdminAction
 from app.models.admin import Admin
+from app.repositories.user_repository import UserRepository
 
 
 # Try to import optional models
@@ -280,7 +281,7 @@ class UserStatsService:
         self, query: str, limit: int = 10
     ) -> list[dict[str, Any]]:
         """
-        Search users by username, telegram_id, or wallet.
+        Search users by username, id, telegram_id, wallet or referral code.
 
         Args:
             query: Search query
@@ -290,47 +291,18 @@ class UserStatsService:
             List of matching users
         """
         try:
-            results = []
-
-            # Search by username
-            if query:
-                search_term = query.replace("@", "")
-                username_result = await self.session.execute(
-                    select(User)
-                    .where(User.username.ilike(f"%{search_term}%"))
-                    .limit(limit)
-                )
-                for user in username_result.scalars().all():
-                    results.append(
-                        {
-                            "id": user.id,
-                            "telegram_id": user.telegram_id,
-                            "username": user.username,
-                            "balance": float(user.balance),
-                            "is_verified": user.is_verified,
-                            "is_banned": user.is_banned,
-                        }
-                    )
-
-            # If query is numeric, also search by telegram_id
-            if query.isdigit() and len(results) < limit:
-                tg_result = await self.session.execute(
-                    select(User).where(User.telegram_id == int(query))
-                )
-                user = tg_result.scalar_one_or_none()
-                if user and user.id not in [r["id"] for r in results]:
-                    results.append(
-                        {
-                            "id": user.id,
-                            "telegram_id": user.telegram_id,
-                            "username": user.username,
-                            "balance": float(user.balance),
-                            "is_verified": user.is_verified,
-                            "is_banned": user.is_banned,
-                        }
-                    )
-
-            return results[:limit]
+            users = await UserRepository(self.session).search(query, limit=limit)
+            return [
+                {
+                    "id": user.id,
+                    "telegram_id": user.telegram_id,
+                    "username": user.username,
+                    "balance": float(user.balance),
+                    "is_verified": user.is_verified,
+                    "is_banned": user.is_banned,
+                }
+                for user in users
+            ]
         except Exception as e:
             logger.error(f"Error searching users: {e}")
             return []
@@ -7,6 +7,7 @@ Structure:
 - core.py: Core notification service with basic text/photo sending
 - admin.py: Admin notification methods
 - user_notifications.py: User-specific notifications (withdrawals, ROI)
+- delivery_queue.py: Rate-shaped, resumable queue for bulk runs
 
 Usage:
     from app.services.notification import NotificationService
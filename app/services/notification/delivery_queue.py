@@ -0,0 +1,248 @@
+"""
+Rate-shaped, resumable delivery queue for bulk notifications.
+
+Bulk runs (hourly balance notifications) send one message per user.
+DeliveryQueue shapes them to Telegram's per-bot limit:
+
+- a token bucket of TELEGRAM_DELIVERY_RATE messages per second shared
+  by TELEGRAM_DELIVERY_WORKERS concurrent senders, so API latency does
+  not lower the rate and bursts never exceed it;
+- flood control (TelegramRetryAfter) pauses the whole queue for
+  retry_after seconds (flood limits are per bot, not per chat) and the
+  message is requeued, up to TELEGRAM_DELIVERY_MAX_ATTEMPTS sends;
+- recipients that blocked the bot (TelegramForbiddenError) are
+  collected for one bulk update by the caller.
+
+Delivered keys are added to a Redis set per run (e.g. per hour), so a
+retried or restarted run resumes where it stopped instead of sending
+twice. Without Redis a run is not resumable but still rate-shaped.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from loguru import logger
+
+from app.config.constants import (
+    TELEGRAM_DELIVERY_MAX_ATTEMPTS,
+    TELEGRAM_DELIVERY_RATE,
+    TELEGRAM_DELIVERY_RUN_TTL,
+    TELEGRAM_DELIVERY_WORKERS,
+    TELEGRAM_MAX_RETRY_AFTER,
+    TELEGRAM_TIMEOUT,
+)
+from app.utils.redis_utils import redis_or_short_lived
+
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+DELIVERY_RUN_KEY_PREFIX = "delivery:run:"
+
+
+@dataclass
+class Delivery:
+    """One message of a bulk run."""
+
+    key: int  # Resume marker (user ID)
+    chat_id: int
+    text: str
+    attempts: int = 0
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of a bulk run (lists of delivery keys)."""
+
+    sent: list[int] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+    blocked: list[int] = field(default_factory=list)
+
+
+class DeliveryQueue:
+    """Sends a bulk run through a shared token bucket."""
+
+    def __init__(
+        self,
+        bot: "Bot",
+        run_id: str,
+        redis_client: Any | None = None,
+        rate: float = TELEGRAM_DELIVERY_RATE,
+        workers: int = TELEGRAM_DELIVERY_WORKERS,
+        max_attempts: int = TELEGRAM_DELIVERY_MAX_ATTEMPTS,
+        max_retry_after: float = TELEGRAM_MAX_RETRY_AFTER,
+        parse_mode: str | None = "Markdown",
+    ) -> None:
+        """
+        Initialize queue.
+
+        Args:
+            bot: Telegram bot instance
+            run_id: Run identifier; runs with the same ID share the
+                delivered set (e.g. "balance:2025122410")
+            redis_client: Redis client (a short-lived one is used per
+                lookup if None)
+            rate: Messages per second
+            workers: Concurrent senders
+            max_attempts: Sends per message under flood control
+            max_retry_after: Cap on one flood control pause (seconds)
+            parse_mode: Parse mode of the messages
+        """
+        self.bot = bot
+        self.run_key = f"{DELIVERY_RUN_KEY_PREFIX}{run_id}"
+        self.redis_client = redis_client
+        self.rate = rate
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.max_retry_after = max_retry_after
+        self.parse_mode = parse_mode
+
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._bucket_lock = asyncio.Lock()
+
+    async def pending(self, keys: Iterable[int]) -> list[int]:
+        """
+        Filter out keys already delivered in this run.
+
+        Args:
+            keys: Delivery keys of the run
+
+        Returns:
+            Keys not delivered yet, in the given order
+        """
+        keys = list(keys)
+        async with redis_or_short_lived(self.redis_client, "Delivery queue") as client:
+            if client is None:
+                return keys
+            try:
+                delivered = await client.smembers(self.run_key)
+            except Exception as e:
+                logger.warning(f"Delivery run {self.run_key} not resumable: {e}")
+                return keys
+        done = {int(key) for key in delivered}
+        return [key for key in keys if key not in done]
+
+    async def run(self, deliveries: Iterable[Delivery]) -> DeliveryResult:
+        """
+        Send all deliveries.
+
+        Args:
+            deliveries: Messages to send (see pending())
+
+        Returns:
+            Sent, failed and blocked delivery keys
+        """
+        queue: asyncio.Queue[Delivery] = asyncio.Queue()
+        for delivery in deliveries:
+            queue.put_nowait(delivery)
+
+        result = DeliveryResult()
+        async with redis_or_short_lived(self.redis_client, "Delivery queue") as client:
+            senders = [
+                asyncio.create_task(self._worker(queue, client, result))
+                for _ in range(min(self.workers, queue.qsize()))
+            ]
+            try:
+                await queue.join()
+            finally:
+                for sender in senders:
+                    sender.cancel()
+                await asyncio.gather(*senders, return_exceptions=True)
+        return result
+
+    async def _worker(
+        self,
+        queue: "asyncio.Queue[Delivery]",
+        client: Any | None,
+        result: DeliveryResult,
+    ) -> None:
+        while True:
+            delivery = await queue.get()
+            try:
+                await self._deliver(delivery, queue, client, result)
+            finally:
+                queue.task_done()
+
+    async def _deliver(
+        self,
+        delivery: Delivery,
+        queue: "asyncio.Queue[Delivery]",
+        client: Any | None,
+        result: DeliveryResult,
+    ) -> None:
+        await self._acquire()
+        delivery.attempts += 1
+        try:
+            await asyncio.wait_for(
+                self.bot.send_message(
+                    chat_id=delivery.chat_id,
+                    text=delivery.text,
+                    parse_mode=self.parse_mode,
+                ),
+                timeout=TELEGRAM_TIMEOUT,
+            )
+        except TelegramRetryAfter as e:
+            self.pause(e.retry_after)
+            if delivery.attempts < self.max_attempts:
+                queue.put_nowait(delivery)
+            else:
+                logger.error(
+                    f"Delivery to {delivery.chat_id} dropped after "
+                    f"{delivery.attempts} flood control retries"
+                )
+                result.failed.append(delivery.key)
+            return
+        except TelegramForbiddenError:
+            logger.debug(f"Bot blocked by {delivery.chat_id}")
+            result.blocked.append(delivery.key)
+            return
+        except Exception as e:
+            logger.error(f"Delivery to {delivery.chat_id} failed: {e}")
+            result.failed.append(delivery.key)
+            return
+
+        result.sent.append(delivery.key)
+        if client is not None:
+            try:
+                await client.sadd(self.run_key, delivery.key)
+                await client.expire(self.run_key, TELEGRAM_DELIVERY_RUN_TTL)
+            except Exception as e:
+                logger.debug(f"Delivery progress not stored: {e}")
+
+    def pause(self, retry_after: float) -> None:
+        """
+        Stop sending for retry_after seconds (flood control).
+
+        Args:
+            retry_after: Seconds requested by Telegram
+                (capped at max_retry_after)
+        """
+        delay = min(retry_after, self.max_retry_after)
+        logger.warning(f"Flood control, delivery paused for {delay}s")
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0.0
+
+    async def _acquire(self) -> None:
+        """Wait for a send token (and for any flood control pause)."""
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    self._updated = time.monotonic()
+                    continue
+                self._tokens = min(
+                    self.rate, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
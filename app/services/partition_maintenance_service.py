@@ -0,0 +1,93 @@
+"""
+Partition maintenance service.
+
+Keeps monthly partitions of append-only tables ahead of time and applies
+retention by dropping (or, for archived tables, detaching) whole
+partitions instead of deleting rows. Detached partitions are dropped once
+their archive retention has passed too.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.constants import (
+    PARTITION_ARCHIVED_TABLES,
+    PARTITION_MONTHS_AHEAD,
+    PARTITIONED_TABLES,
+)
+from app.repositories.partition_repository import (
+    PartitionRepository,
+    month_start,
+    retention_cutoff,
+)
+
+
+class PartitionMaintenanceService:
+    """Service for partition maintenance."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize service.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+        self.repo = PartitionRepository(session)
+
+    async def maintain(self, now: datetime | None = None) -> dict[str, dict]:
+        """
+        Create upcoming partitions and remove expired ones for all tables.
+
+        Each table is handled in its own savepoint, so a table that is not
+        partitioned (e.g. created without migrations) does not block others.
+        The caller commits.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Dict of created/removed (and, for archived tables,
+            archive_dropped) partition names per table
+        """
+        now = now or datetime.now(UTC)
+        report: dict[str, dict] = {}
+
+        for table in PARTITIONED_TABLES:
+            try:
+                async with self.session.begin_nested():
+                    created = await self.repo.create_partitions(
+                        table, month_start(now), PARTITION_MONTHS_AHEAD + 1
+                    )
+                    cutoff = retention_cutoff(table, now)
+                    removed = await self.repo.remove_partitions_before(
+                        table, cutoff, detach=table in PARTITION_ARCHIVED_TABLES
+                    )
+                    if table in PARTITION_ARCHIVED_TABLES:
+                        archive_dropped = await self.repo.drop_detached_before(
+                            table,
+                            cutoff - timedelta(days=PARTITION_ARCHIVED_TABLES[table]),
+                        )
+            except Exception as e:
+                logger.error(f"Partition maintenance failed for {table}: {e}")
+                report[table] = {"error": str(e)}
+                continue
+
+            report[table] = {"created": created, "removed": removed}
+            if table in PARTITION_ARCHIVED_TABLES:
+                report[table]["archive_dropped"] = archive_dropped
+            if created or removed:
+                logger.info(
+                    f"Partitions of {table}: created {created}, "
+                    f"{'detached' if table in PARTITION_ARCHIVED_TABLES else 'dropped'} "
+                    f"{removed}"
+                )
+            if report[table].get("archive_dropped"):
+                logger.info(
+                    f"Archived partitions of {table} past retention dropped: "
+                    f"{archive_dropped}"
+                )
+
+        return report
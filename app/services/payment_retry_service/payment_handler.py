@@ -7,6 +7,7 @@ Manages transaction execution and state updates.
 """
 
 from datetime import UTC, datetime
+from typing import Any
 
 from loguru import logger
 from sqlalchemy import select
@@ -52,6 +53,48 @@ class PaymentRetryHandler:
             payment_result = await self._execute_payment(
                 retry, user, blockchain_service
             )
+        except Exception as e:
+            return await self._handle_payment_failure(retry, e)
+
+        return await self.complete_retry(retry, user, payment_result)
+
+    async def prepare_retry(self, retry: PaymentRetry) -> tuple[Any, dict | None]:
+        """
+        Start a retry attempt whose payment is sent as part of a batch.
+
+        Args:
+            retry: PaymentRetry record
+
+        Returns:
+            Tuple of (user to pay, None) or (None, failure result dict)
+        """
+        logger.info(
+            f"Preparing batched retry {retry.id} for user {retry.user_id}, "
+            f"attempt {retry.attempt_count + 1}/{retry.max_retries}"
+        )
+
+        await self._increment_retry_attempt(retry)
+
+        try:
+            return await self._load_and_validate_user(retry), None
+        except Exception as e:
+            return None, await self._handle_payment_failure(retry, e)
+
+    async def complete_retry(
+        self, retry: PaymentRetry, user, payment_result: dict
+    ) -> dict:
+        """
+        Record the outcome of a payment for a retry attempt.
+
+        Args:
+            retry: PaymentRetry record
+            user: User that was paid
+            payment_result: Result from send_payment / send_payment_batch
+
+        Returns:
+            Dict with success and moved_to_dlq flags
+        """
+        try:
             await self._save_payment_tx_hash(retry, payment_result)
             self._validate_payment_result(payment_result)
 
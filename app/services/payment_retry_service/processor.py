@@ -64,6 +64,17 @@ class PaymentRetryProcessor:
             "moved_to_dlq": 0,
         }
 
+        # Retries with a previous tx_hash must check it before resending,
+        # so only fresh ones go through the pipelined batch sender
+        batchable = [retry for retry in pending if not retry.tx_hash]
+        if len(batchable) > 1 and hasattr(blockchain_service, "send_payment_batch"):
+            for result in await self._process_retries_as_batch(
+                batchable, blockchain_service
+            ):
+                stats["processed"] += 1
+                stats[result] += 1
+            pending = [retry for retry in pending if retry.tx_hash]
+
         for retry in pending:
             result = await self._process_single_retry_safe(
                 retry, blockchain_service
@@ -73,6 +84,66 @@ class PaymentRetryProcessor:
 
         return stats
 
+    async def _process_retries_as_batch(
+        self, retries: list[PaymentRetry], blockchain_service
+    ) -> list[str]:
+        """
+        Send fresh retries as one nonce-pipelined or multisend batch.
+
+        Returns:
+            One of 'successful', 'failed', 'moved_to_dlq' per retry
+        """
+        # Import here to avoid circular dependency
+        from .payment_handler import PaymentRetryHandler
+
+        handler = PaymentRetryHandler(self.retry_core, self.retry_repo, self.session)
+        outcomes: list[str] = []
+        prepared = []
+
+        for retry in retries:
+            try:
+                user, failure = await handler.prepare_retry(retry)
+            except Exception as e:
+                logger.error(f"Error preparing retry {retry.id}: {e}")
+                outcomes.append("failed")
+                continue
+
+            if failure is not None:
+                outcomes.append("moved_to_dlq" if failure["moved_to_dlq"] else "failed")
+            else:
+                prepared.append((retry, user))
+
+        if not prepared:
+            return outcomes
+
+        logger.info(f"Sending {len(prepared)} payment retries as one batch")
+
+        payments = [(user.wallet_address, retry.amount) for retry, user in prepared]
+
+        if getattr(blockchain_service, "multisend_enabled", False):
+            payment_results = await blockchain_service.send_payment_multisend(
+                payments, [f"payment_retry:{retry.id}" for retry, _ in prepared]
+            )
+        else:
+            payment_results = await blockchain_service.send_payment_batch(payments)
+
+        for (retry, user), payment_result in zip(prepared, payment_results, strict=True):
+            try:
+                result = await handler.complete_retry(retry, user, payment_result)
+            except Exception as e:
+                logger.error(f"Error processing retry {retry.id}: {e}")
+                outcomes.append("failed")
+                continue
+
+            if result["success"]:
+                outcomes.append("successful")
+            elif result["moved_to_dlq"]:
+                outcomes.append("moved_to_dlq")
+            else:
+                outcomes.append("failed")
+
+        return outcomes
+
     async def _process_single_retry_safe(
         self, retry: PaymentRetry, blockchain_service
     ) -> str:
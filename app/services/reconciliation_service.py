@@ -2,22 +2,43 @@
 Reconciliation Service (R10-2).
 
 Financial reconciliation service for daily balance verification.
+
+Totals come from ledger rollups maintained by database triggers (see
+LedgerRollup): running totals of the last closed day plus the open
+deltas, so reconciliation cost does not grow with history. Closed days
+also allow reconciling any historical range with two lookups.
 """
 
 import json
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
+from itertools import groupby
 
 from loguru import logger
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.daily_balance_snapshot import DailyBalanceSnapshot
-from app.models.deposit import Deposit
-from app.models.enums import TransactionStatus, TransactionType
-from app.models.referral_earning import ReferralEarning
-from app.models.transaction import Transaction
-from app.models.user import User
+from app.models.enums import LedgerEntryType
+from app.repositories.ledger_rollup_repository import (
+    LedgerRollupRepository,
+    LedgerTotals,
+)
+
+
+# Expected = deposits - withdrawals - paid referral earnings
+EXPECTED_SIGNS = {
+    LedgerEntryType.DEPOSIT_CONFIRMED: 1,
+    LedgerEntryType.WITHDRAWAL_CONFIRMED: -1,
+    LedgerEntryType.REFERRAL_PAID: -1,
+}
+
+# Actual = user balances + pending earnings + pending withdrawals
+ACTUAL_TYPES = (
+    LedgerEntryType.USER_BALANCE,
+    LedgerEntryType.USER_PENDING_EARNINGS,
+    LedgerEntryType.WITHDRAWAL_PENDING,
+)
 
 
 class ReconciliationService:
@@ -26,9 +47,14 @@ class ReconciliationService:
     # Tolerance for reconciliation (5%)
     RECONCILIATION_TOLERANCE = Decimal("0.05")
 
+    # Days kept open after they end, so transactions that started before
+    # midnight and commit later still land in an open day
+    CLOSE_GRACE_DAYS = 1
+
     def __init__(self, session: AsyncSession) -> None:
         """Initialize reconciliation service."""
         self.session = session
+        self.ledger = LedgerRollupRepository(session)
 
     async def perform_reconciliation(
         self, snapshot_date: date | None = None
@@ -54,11 +80,11 @@ class ReconciliationService:
         logger.info(f"Starting reconciliation for {snapshot_date}")
 
         try:
-            # Calculate expected balance
-            expected = await self._calculate_expected_balance()
+            totals = await self._get_current_totals()
 
-            # Calculate actual balance
-            actual = await self._calculate_actual_balance()
+            # Calculate expected and actual balance
+            expected = self._calculate_expected_balance(totals)
+            actual = self._calculate_actual_balance(totals)
 
             # Calculate discrepancy
             discrepancy = actual - expected
@@ -72,7 +98,7 @@ class ReconciliationService:
             )
 
             # Get detailed breakdown
-            breakdown = await self._get_breakdown()
+            breakdown = self._get_breakdown(totals)
 
             # Create snapshot
             snapshot = await self._create_snapshot(
@@ -125,188 +151,203 @@ class ReconciliationService:
                 "error": str(e),
             }
 
-    async def _calculate_expected_balance(self) -> Decimal:
+    async def reconcile_range(self, start: date, end: date) -> dict:
         """
-        Calculate expected system balance.
+        Reconcile changes over a range of closed days.
 
-        Expected = SUM(confirmed_deposits) - SUM(confirmed_withdrawals)
-                  - SUM(paid_referral_earnings)
+        Two lookups of running totals, whatever the range length.
+
+        Args:
+            start: First day (UTC)
+            end: Last day (UTC), must be closed
 
         Returns:
-            Expected balance
+            Dict with expected/actual change, discrepancy and per-type
+            changes
+
+        Raises:
+            ValueError: If the range is empty or not closed yet
         """
-        # Sum confirmed deposits
-        deposits_stmt = select(func.sum(Deposit.amount)).where(
-            Deposit.status == TransactionStatus.CONFIRMED.value
-        )
-        deposits_result = await self.session.execute(deposits_stmt)
-        total_deposits = deposits_result.scalar() or Decimal("0")
-
-        # Sum confirmed withdrawals
-        withdrawals_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(
-                Transaction.type == TransactionType.WITHDRAWAL.value,
-                Transaction.status == TransactionStatus.CONFIRMED.value,
+        if start > end:
+            raise ValueError(f"Empty range: {start} > {end}")
+
+        last_closed = await self._close_ledger_days()
+        if last_closed is None or end > last_closed:
+            raise ValueError(
+                f"Ledger is closed through {last_closed}, cannot reconcile to {end}"
             )
-        )
-        withdrawals_result = await self.session.execute(withdrawals_stmt)
-        total_withdrawals = withdrawals_result.scalar() or Decimal("0")
 
-        # Sum paid referral earnings
-        referral_earnings_stmt = select(func.sum(ReferralEarning.amount)).where(
-            ReferralEarning.paid == True  # noqa: E712
-        )
-        referral_result = await self.session.execute(referral_earnings_stmt)
-        total_paid_referral = referral_result.scalar() or Decimal("0")
-
-        # Calculate expected
-        expected = total_deposits - total_withdrawals - total_paid_referral
-
-        logger.debug(
-            f"Expected balance calculation: "
-            f"deposits={total_deposits}, "
-            f"withdrawals={total_withdrawals}, "
-            f"paid_referral={total_paid_referral}, "
-            f"expected={expected}"
-        )
+        before = await self.ledger.get_closed_totals(start - timedelta(days=1))
+        after = await self.ledger.get_closed_totals(end)
+        changes: LedgerTotals = {
+            entry_type: (
+                after[entry_type][0] - before[entry_type][0],
+                after[entry_type][1] - before[entry_type][1],
+            )
+            for entry_type in LedgerEntryType
+        }
+
+        expected_change = self._calculate_expected_balance(changes)
+        actual_change = self._calculate_actual_balance(changes)
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "expected_change": float(expected_change),
+            "actual_change": float(actual_change),
+            "discrepancy": float(actual_change - expected_change),
+            "changes": {
+                entry_type.value: {"amount": float(amount), "count": count}
+                for entry_type, (amount, count) in changes.items()
+            },
+        }
+
+    async def find_first_divergence(
+        self, start: date, end: date
+    ) -> dict | None:
+        """
+        Find the first closed day whose running totals are out of tolerance.
 
-        return expected
+        Args:
+            start: First day (UTC)
+            end: Last day (UTC)
 
-    async def _calculate_actual_balance(self) -> Decimal:
+        Returns:
+            Dict with the day, the entry type that moved most that day,
+            discrepancy and the day's per-type changes; None if every
+            closed day in the range is within tolerance
         """
-        Calculate actual system balance.
+        await self._close_ledger_days()
+        rows = await self.ledger.get_day_totals(start, end)
 
-        Actual = SUM(users.balance) + SUM(users.pending_earnings)
-                + SUM(pending_withdrawals.amount)
+        for day, day_rows in groupby(rows, key=lambda row: row.day):
+            cumulative: LedgerTotals = {
+                entry_type: (Decimal("0"), 0) for entry_type in LedgerEntryType
+            }
+            deltas: dict[LedgerEntryType, Decimal] = {}
+            for row in day_rows:
+                if row.entry_type not in cumulative:
+                    continue
+                entry_type = LedgerEntryType(row.entry_type)
+                cumulative[entry_type] = (row.cumulative_amount, row.cumulative_count)
+                deltas[entry_type] = row.amount
+
+            expected = self._calculate_expected_balance(cumulative)
+            actual = self._calculate_actual_balance(cumulative)
+            discrepancy = actual - expected
+            if expected > 0 and abs(discrepancy / expected) <= (
+                self.RECONCILIATION_TOLERANCE
+            ):
+                continue
+            if expected <= 0 and discrepancy == 0:
+                continue
+
+            entry_type = max(deltas, key=lambda t: abs(deltas[t]))
+            return {
+                "day": day.isoformat(),
+                "entry_type": entry_type.value,
+                "expected_balance": float(expected),
+                "actual_balance": float(actual),
+                "discrepancy": float(discrepancy),
+                "changes": {
+                    t.value: float(amount) for t, amount in deltas.items()
+                },
+            }
+
+        return None
+
+    async def _close_ledger_days(self) -> date | None:
+        """
+        Close ledger days past the grace period.
 
         Returns:
-            Actual balance
+            Last closed day (None if the ledger is empty)
         """
-        # Sum user balances
-        user_balance_stmt = select(func.sum(User.balance))
-        user_balance_result = await self.session.execute(user_balance_stmt)
-        total_user_balances = user_balance_result.scalar() or Decimal("0")
-
-        # Sum pending earnings
-        pending_earnings_stmt = select(func.sum(User.pending_earnings))
-        pending_earnings_result = await self.session.execute(
-            pending_earnings_stmt
-        )
-        total_pending_earnings = (
-            pending_earnings_result.scalar() or Decimal("0")
+        today = datetime.now(UTC).date()
+        await self.ledger.close_days(
+            today - timedelta(days=self.CLOSE_GRACE_DAYS + 1)
         )
+        return await self.ledger.get_last_closed_day()
 
-        # Sum pending withdrawals
-        pending_withdrawals_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(
-                Transaction.type == TransactionType.WITHDRAWAL.value,
-                Transaction.status.in_(
-                    [
-                        TransactionStatus.PENDING.value,
-                        TransactionStatus.PROCESSING.value,
-                    ]
-                ),
+    async def _get_current_totals(self) -> LedgerTotals:
+        """
+        Get current totals: last closed day plus open deltas.
+
+        Returns:
+            Totals per entry type
+        """
+        last_closed = await self._close_ledger_days()
+        open_totals = await self.ledger.get_open_totals()
+        if last_closed is None:
+            return open_totals
+
+        closed = await self.ledger.get_closed_totals(last_closed)
+        return {
+            entry_type: (
+                closed[entry_type][0] + open_totals[entry_type][0],
+                closed[entry_type][1] + open_totals[entry_type][1],
             )
-        )
-        pending_withdrawals_result = await self.session.execute(
-            pending_withdrawals_stmt
-        )
-        total_pending_withdrawals = (
-            pending_withdrawals_result.scalar() or Decimal("0")
-        )
+            for entry_type in LedgerEntryType
+        }
 
-        # Calculate actual
-        actual = (
-            total_user_balances
-            + total_pending_earnings
-            + total_pending_withdrawals
-        )
+    @staticmethod
+    def _calculate_expected_balance(totals: LedgerTotals) -> Decimal:
+        """
+        Calculate expected system balance.
+
+        Expected = SUM(confirmed_deposits) - SUM(confirmed_withdrawals)
+                  - SUM(paid_referral_earnings)
+
+        Args:
+            totals: Ledger totals
 
-        logger.debug(
-            f"Actual balance calculation: "
-            f"user_balances={total_user_balances}, "
-            f"pending_earnings={total_pending_earnings}, "
-            f"pending_withdrawals={total_pending_withdrawals}, "
-            f"actual={actual}"
+        Returns:
+            Expected balance
+        """
+        return sum(
+            (sign * totals[entry_type][0] for entry_type, sign in EXPECTED_SIGNS.items()),
+            Decimal("0"),
         )
 
-        return actual
+    @staticmethod
+    def _calculate_actual_balance(totals: LedgerTotals) -> Decimal:
+        """
+        Calculate actual system balance.
+
+        Actual = SUM(users.balance) + SUM(users.pending_earnings)
+                + SUM(pending_withdrawals.amount)
+
+        Args:
+            totals: Ledger totals
+
+        Returns:
+            Actual balance
+        """
+        return sum(
+            (totals[entry_type][0] for entry_type in ACTUAL_TYPES),
+            Decimal("0"),
+        )
 
-    async def _get_breakdown(self) -> dict:
+    @staticmethod
+    def _get_breakdown(totals: LedgerTotals) -> dict:
         """
         Get detailed breakdown of reconciliation components.
 
+        Args:
+            totals: Ledger totals
+
         Returns:
             Dict with detailed breakdown
         """
-        # Get deposit breakdown
-        deposits_stmt = select(
-            func.count(Deposit.id),
-            func.sum(Deposit.amount),
-        ).where(Deposit.status == TransactionStatus.CONFIRMED.value)
-        deposits_result = await self.session.execute(deposits_stmt)
-        deposits_row = deposits_result.first()
-        deposit_count = deposits_row[0] or 0
-        deposit_total = deposits_row[1] or Decimal("0")
-
-        # Get withdrawal breakdown
-        withdrawals_stmt = select(
-            func.count(Transaction.id),
-            func.sum(Transaction.amount),
-        ).where(
-            Transaction.type == TransactionType.WITHDRAWAL.value,
-            Transaction.status == TransactionStatus.CONFIRMED.value,
-        )
-        withdrawals_result = await self.session.execute(withdrawals_stmt)
-        withdrawals_row = withdrawals_result.first()
-        withdrawal_count = withdrawals_row[0] or 0
-        withdrawal_total = withdrawals_row[1] or Decimal("0")
-
-        # Get referral earnings breakdown
-        referral_stmt = select(
-            func.count(ReferralEarning.id),
-            func.sum(ReferralEarning.amount),
-        ).where(ReferralEarning.paid == True)  # noqa: E712
-        referral_result = await self.session.execute(referral_stmt)
-        referral_row = referral_result.first()
-        referral_count = referral_row[0] or 0
-        referral_total = referral_row[1] or Decimal("0")
-
-        # Get user balance breakdown
-        user_balance_stmt = select(
-            func.count(User.id),
-            func.sum(User.balance),
-            func.sum(User.pending_earnings),
-        )
-        user_balance_result = await self.session.execute(user_balance_stmt)
-        user_balance_row = user_balance_result.first()
-        user_count = user_balance_row[0] or 0
-        total_user_balance = user_balance_row[1] or Decimal("0")
-        total_pending_earnings = user_balance_row[2] or Decimal("0")
-
-        # Get pending withdrawals breakdown
-        pending_withdrawals_stmt = select(
-            func.count(Transaction.id),
-            func.sum(Transaction.amount),
-        ).where(
-            Transaction.type == TransactionType.WITHDRAWAL.value,
-            Transaction.status.in_(
-                [
-                    TransactionStatus.PENDING.value,
-                    TransactionStatus.PROCESSING.value,
-                ]
-            ),
-        )
-        pending_withdrawals_result = await self.session.execute(
-            pending_withdrawals_stmt
-        )
-        pending_withdrawals_row = pending_withdrawals_result.first()
-        pending_withdrawal_count = pending_withdrawals_row[0] or 0
-        pending_withdrawal_total = (
-            pending_withdrawals_row[1] or Decimal("0")
-        )
+        deposit_total, deposit_count = totals[LedgerEntryType.DEPOSIT_CONFIRMED]
+        withdrawal_total, withdrawal_count = totals[
+            LedgerEntryType.WITHDRAWAL_CONFIRMED
+        ]
+        referral_total, referral_count = totals[LedgerEntryType.REFERRAL_PAID]
+        total_user_balance, user_count = totals[LedgerEntryType.USER_BALANCE]
+        total_pending_earnings, _ = totals[LedgerEntryType.USER_PENDING_EARNINGS]
+        pending_withdrawal_total, pending_withdrawal_count = totals[
+            LedgerEntryType.WITHDRAWAL_PENDING
+        ]
 
         return {
             "deposits": {
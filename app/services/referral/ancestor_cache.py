@@ -0,0 +1,120 @@
+"""
+Referral ancestor cache.
+
+Compact in-memory view of the referrals closure table: for every user,
+the ancestors (referrers at levels 1..REFERRAL_DEPTH) and the referral
+relationship id of each link. Loaded once per job with a single query so
+reward processing does not hit the database per accrual.
+"""
+
+from array import array
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.referral_repository import ReferralRepository
+from app.services.referral.config import REFERRAL_DEPTH
+
+
+class ReferralAncestorCache:
+    """
+    Array-backed user_id -> (ancestor ids, levels) map.
+
+    All links live in three flat arrays ordered by (user, level); each
+    user maps to a (start, count) span in them. This keeps memory at a
+    few bytes per link instead of one ORM object per relationship.
+    """
+
+    def __init__(self, depth: int = REFERRAL_DEPTH) -> None:
+        """
+        Initialize empty cache.
+
+        Args:
+            depth: Maximum referral level kept
+        """
+        self.depth = depth
+        self._referrer_ids = array("q")
+        self._relationship_ids = array("q")
+        self._levels = array("b")
+        self._spans: dict[int, tuple[int, int]] = {}
+
+    @classmethod
+    async def load(
+        cls,
+        session: AsyncSession,
+        user_ids: Iterable[int] | None = None,
+        depth: int = REFERRAL_DEPTH,
+    ) -> "ReferralAncestorCache":
+        """
+        Load ancestors from the referrals closure table.
+
+        Args:
+            session: Database session
+            user_ids: Users to load (all users if None)
+            depth: Maximum referral level
+
+        Returns:
+            Loaded cache
+        """
+        cache = cls(depth)
+        rows = await ReferralRepository(session).get_ancestor_rows(
+            user_ids=list(user_ids) if user_ids is not None else None,
+            max_level=depth,
+        )
+        cache.add_rows(rows)
+        return cache
+
+    def add_rows(
+        self, rows: Iterable[tuple[int, int, int, int]]
+    ) -> None:
+        """
+        Append closure rows.
+
+        Args:
+            rows: (user_id, referrer_id, level, relationship_id) tuples,
+                grouped by user_id and ordered by level
+        """
+        for user_id, referrer_id, level, relationship_id in rows:
+            if level > self.depth:
+                continue
+
+            start, count = self._spans.get(user_id, (len(self._levels), 0))
+            if start + count != len(self._levels):
+                raise ValueError(
+                    f"Closure rows for user {user_id} are not contiguous"
+                )
+
+            self._referrer_ids.append(referrer_id)
+            self._relationship_ids.append(relationship_id)
+            self._levels.append(level)
+            self._spans[user_id] = (start, count + 1)
+
+    def ancestors(self, user_id: int) -> list[tuple[int, int, int]]:
+        """
+        Get ancestors of a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of (referrer_id, level, relationship_id), nearest first
+        """
+        span = self._spans.get(user_id)
+        if span is None:
+            return []
+
+        start, count = span
+        return list(zip(
+            self._referrer_ids[start:start + count],
+            self._levels[start:start + count],
+            self._relationship_ids[start:start + count],
+            strict=True,
+        ))
+
+    def __contains__(self, user_id: int) -> bool:
+        """Whether the user has at least one ancestor."""
+        return user_id in self._spans
+
+    def __len__(self) -> int:
+        """Number of cached links."""
+        return len(self._levels)
@@ -10,6 +10,7 @@ from loguru import logger
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.referral import Referral
 from app.models.user import User
 from app.repositories.referral_repository import ReferralRepository
 from app.services.referral.config import REFERRAL_DEPTH
@@ -27,9 +28,38 @@ class ReferralChainManager:
         self, user_id: int, depth: int = REFERRAL_DEPTH
     ) -> list[User]:
         """
-        Get referral chain (PostgreSQL CTE optimized).
+        Get referral chain from the referrals closure table.
 
-        Uses recursive CTE to efficiently fetch entire referral chain.
+        The referrals table holds one row per (ancestor, user) pair up to
+        REFERRAL_DEPTH, so the chain is a single indexed join. Users
+        without closure rows fall back to walking users.referrer_id.
+
+        Args:
+            user_id: User ID
+            depth: Chain depth to retrieve
+
+        Returns:
+            List of users from direct referrer to Nth level
+        """
+        stmt = (
+            select(User)
+            .join(Referral, Referral.referrer_id == User.id)
+            .where(Referral.referral_id == user_id, Referral.level <= depth)
+            .order_by(Referral.level)
+        )
+        result = await self.session.execute(stmt)
+        chain = list(result.scalars().all())
+
+        if chain:
+            return chain
+
+        return await self._get_referral_chain_recursive(user_id, depth)
+
+    async def _get_referral_chain_recursive(
+        self, user_id: int, depth: int
+    ) -> list[User]:
+        """
+        Get referral chain (PostgreSQL CTE) by walking users.referrer_id.
 
         Args:
             user_id: User ID
@@ -10,16 +10,18 @@ from decimal import Decimal
 from typing import Literal
 
 from loguru import logger
-from sqlalchemy import update
+from sqlalchemy import DECIMAL, Integer, column, insert, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.referral import Referral
+from app.models.referral_earning import ReferralEarning
 from app.models.user import User
 from app.repositories.referral_earning_repository import (
     ReferralEarningRepository,
 )
 from app.repositories.referral_repository import ReferralRepository
 from app.repositories.user_repository import UserRepository
+from app.services.referral.ancestor_cache import ReferralAncestorCache
 from app.services.referral.config import REFERRAL_DEPTH, REFERRAL_RATES
 
 # Type alias for reward types
@@ -174,6 +176,147 @@ class ReferralRewardProcessor:
             notifications=notifications,
         )
 
+    async def process_rewards_batch(
+        self,
+        accruals: list[tuple[int, Decimal]],
+        reward_type: RewardType,
+        ancestor_cache: ReferralAncestorCache | None = None,
+        tx_hash: str | None = None,
+    ) -> ProcessResult:
+        """
+        Process referral rewards for a whole batch of accruals.
+
+        Rewards are aggregated in memory (per referrer for balances, per
+        referral relationship for earnings) and written with one bulk
+        balance update, one bulk relationship update and one bulk
+        earnings insert. Does not commit: the caller commits together
+        with the accrual batch. No notifications are collected.
+
+        Args:
+            accruals: List of (user_id, amount) that triggered rewards
+            reward_type: Type of reward - "deposit" or "roi"
+            ancestor_cache: Preloaded ancestors (loaded for the batch if None)
+            tx_hash: Optional blockchain transaction hash
+
+        Returns:
+            ProcessResult with total rewards and earning rows created
+        """
+        if ancestor_cache is None:
+            ancestor_cache = await ReferralAncestorCache.load(
+                self.session, {user_id for user_id, _ in accruals}
+            )
+
+        per_relationship, per_referrer = self.aggregate_rewards(
+            accruals, ancestor_cache
+        )
+
+        if not per_relationship:
+            return ProcessResult(success=True, total_rewards=Decimal("0"))
+
+        if tx_hash is None:
+            tx_hash = f"internal_balance_{reward_type}"
+
+        # R9-2: Atomic increments, one UPDATE ... FROM (VALUES ...) each
+        referrer_amounts = values(
+            column("id", Integer),
+            column("amount", DECIMAL(18, 8)),
+            name="referrer_rewards",
+        ).data(list(per_referrer.items()))
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == referrer_amounts.c.id)
+            .values(
+                balance=User.balance + referrer_amounts.c.amount,
+                total_earned=User.total_earned + referrer_amounts.c.amount,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(per_referrer):
+            logger.warning(
+                "Some referrers not found for batch rewards",
+                extra={
+                    "expected": len(per_referrer),
+                    "updated": result.rowcount,
+                    "reward_type": reward_type,
+                },
+            )
+
+        relationship_amounts = values(
+            column("id", Integer),
+            column("amount", DECIMAL(18, 8)),
+            name="relationship_rewards",
+        ).data(list(per_relationship.items()))
+        await self.session.execute(
+            update(Referral)
+            .where(Referral.id == relationship_amounts.c.id)
+            .values(total_earned=Referral.total_earned + relationship_amounts.c.amount)
+            .execution_options(synchronize_session=False)
+        )
+
+        await self.session.execute(
+            insert(ReferralEarning),
+            [
+                {
+                    "referral_id": relationship_id,
+                    "amount": amount,
+                    "paid": True,  # Paid to internal balance
+                    "tx_hash": tx_hash,
+                }
+                for relationship_id, amount in per_relationship.items()
+            ],
+        )
+
+        total_rewards = sum(per_referrer.values(), Decimal("0"))
+
+        logger.info(
+            "Referral rewards processed (batch)",
+            extra={
+                "reward_type": reward_type,
+                "accruals": len(accruals),
+                "referrers": len(per_referrer),
+                "total_rewards": str(total_rewards),
+            },
+        )
+
+        return ProcessResult(
+            success=True,
+            total_rewards=total_rewards,
+            rewards_count=len(per_relationship),
+        )
+
+    def aggregate_rewards(
+        self,
+        accruals: list[tuple[int, Decimal]],
+        ancestor_cache: ReferralAncestorCache,
+    ) -> tuple[dict[int, Decimal], dict[int, Decimal]]:
+        """
+        Sum level rewards of a batch of accruals.
+
+        Args:
+            accruals: List of (user_id, amount)
+            ancestor_cache: Ancestors of the accruing users
+
+        Returns:
+            Tuple of (relationship_id -> amount, referrer_id -> amount)
+        """
+        per_relationship: dict[int, Decimal] = {}
+        per_referrer: dict[int, Decimal] = {}
+
+        for user_id, amount in accruals:
+            for referrer_id, level, relationship_id in ancestor_cache.ancestors(user_id):
+                reward_amount = self._calculate_level_reward(amount, level)
+                if reward_amount <= 0:
+                    continue
+
+                per_relationship[relationship_id] = (
+                    per_relationship.get(relationship_id, Decimal("0")) + reward_amount
+                )
+                per_referrer[referrer_id] = (
+                    per_referrer.get(referrer_id, Decimal("0")) + reward_amount
+                )
+
+        return per_relationship, per_referrer
+
     async def _get_referral_chain(
         self, user_id: int, levels: int = REFERRAL_DEPTH
     ) -> list[Referral]:
@@ -18,6 +18,9 @@ from app.repositories.referral_earning_repository import (
     ReferralEarningRepository,
 )
 from app.repositories.referral_repository import ReferralRepository
+from app.repositories.referral_stats_repository import (
+    ReferralStatsRepository,
+)
 
 
 class ReferralStatisticsManager:
@@ -28,120 +31,59 @@ class ReferralStatisticsManager:
         self.session = session
         self.referral_repo = ReferralRepository(session)
         self.earning_repo = ReferralEarningRepository(session)
+        self.stats_repo = ReferralStatsRepository(session)
 
     async def get_referral_stats(self, user_id: int) -> dict:
         """
         Get referral statistics for user.
 
+        Reads the pre-aggregated referral_stats row (one PK lookup).
+
         Args:
             user_id: User ID
 
         Returns:
             Dict with referral counts and earnings
         """
-        # Get all referral relationships
-        all_relationships = await self.referral_repo.find_by(
-            referrer_id=user_id
-        )
+        stats = await self.stats_repo.get_by_referrer(user_id)
 
-        # Count by level
-        direct_referrals = sum(1 for r in all_relationships if r.level == 1)
-        level2_referrals = sum(1 for r in all_relationships if r.level == 2)
-        level3_referrals = sum(1 for r in all_relationships if r.level == 3)
-
-        # Calculate earnings
-        relationship_ids = [r.id for r in all_relationships]
-
-        if relationship_ids:
-            all_earnings = await self.earning_repo.find_by_referral_ids(
-                relationship_ids
-            )
-            total_earned = sum(e.amount for e in all_earnings)
-            paid_earnings = sum(e.amount for e in all_earnings if e.paid)
-            pending_earnings = sum(
-                e.amount for e in all_earnings if not e.paid
-            )
-        else:
-            total_earned = Decimal("0")
-            paid_earnings = Decimal("0")
-            pending_earnings = Decimal("0")
+        if stats is None:
+            return {
+                "direct_referrals": 0,
+                "level2_referrals": 0,
+                "level3_referrals": 0,
+                "total_earned": Decimal("0"),
+                "pending_earnings": Decimal("0"),
+                "paid_earnings": Decimal("0"),
+            }
 
         return {
-            "direct_referrals": direct_referrals,
-            "level2_referrals": level2_referrals,
-            "level3_referrals": level3_referrals,
-            "total_earned": total_earned,
-            "pending_earnings": pending_earnings,
-            "paid_earnings": paid_earnings,
+            "direct_referrals": stats.direct_count,
+            "level2_referrals": stats.level2_count,
+            "level3_referrals": stats.level3_count,
+            "total_earned": stats.total_earned,
+            "pending_earnings": stats.pending_earned,
+            "paid_earnings": stats.paid_earned,
         }
 
     async def get_referral_leaderboard(self, limit: int = 10) -> dict:
         """
         Get referral leaderboard.
 
+        Both boards are top-k index scans on referral_stats.
+
         Args:
             limit: Number of top users to return
 
         Returns:
             Dict with by_referrals and by_earnings lists
         """
-        # Get all users with referrals
-        stmt = text("""
-            WITH referral_stats AS (
-                SELECT
-                    r.referrer_id,
-                    COUNT(DISTINCT r.referral_id) as referral_count,
-                    COALESCE(SUM(re.amount), 0) as total_earnings
-                FROM referrals r
-                LEFT JOIN referral_earnings re ON re.referral_id = r.id
-                GROUP BY r.referrer_id
-            )
-            SELECT
-                u.id as user_id,
-                u.telegram_id,
-                u.username,
-                rs.referral_count,
-                rs.total_earnings
-            FROM referral_stats rs
-            JOIN users u ON u.id = rs.referrer_id
-            ORDER BY rs.referral_count DESC, rs.total_earnings DESC
-        """)
-
-        result = await self.session.execute(stmt)
-        rows = result.all()
-
-        # Build by_referrals leaderboard
-        by_referrals = []
-        for idx, row in enumerate(rows[:limit], 1):
-            by_referrals.append({
-                "rank": idx,
-                "user_id": row.user_id,
-                "telegram_id": row.telegram_id,
-                "username": row.username,
-                "referral_count": row.referral_count,
-                "total_earnings": Decimal(str(row.total_earnings)),
-            })
-
-        # Build by_earnings leaderboard (sorted differently)
-        sorted_by_earnings = sorted(
-            rows,
-            key=lambda r: (r.total_earnings, r.referral_count),
-            reverse=True
-        )
-        by_earnings = []
-        for idx, row in enumerate(sorted_by_earnings[:limit], 1):
-            by_earnings.append({
-                "rank": idx,
-                "user_id": row.user_id,
-                "telegram_id": row.telegram_id,
-                "username": row.username,
-                "referral_count": row.referral_count,
-                "total_earnings": Decimal(str(row.total_earnings)),
-            })
+        by_referrals = await self.stats_repo.get_top_by_referrals(limit)
+        by_earnings = await self.stats_repo.get_top_by_earnings(limit)
 
         return {
-            "by_referrals": by_referrals,
-            "by_earnings": by_earnings,
+            "by_referrals": self._leaderboard_entries(by_referrals),
+            "by_earnings": self._leaderboard_entries(by_earnings),
         }
 
     async def get_user_leaderboard_position(self, user_id: int) -> dict:
@@ -154,47 +96,31 @@ class ReferralStatisticsManager:
         Returns:
             Dict with referral_rank, earnings_rank, total_users
         """
-        # Get all users with referrals
-        stmt = text("""
-            WITH referral_stats AS (
-                SELECT
-                    r.referrer_id,
-                    COUNT(DISTINCT r.referral_id) as referral_count,
-                    COALESCE(SUM(re.amount), 0) as total_earnings
-                FROM referrals r
-                LEFT JOIN referral_earnings re ON re.referral_id = r.id
-                GROUP BY r.referrer_id
-            )
-            SELECT
-                referrer_id,
-                referral_count,
-                total_earnings,
-                RANK() OVER (ORDER BY referral_count DESC,
-                             total_earnings DESC) as referral_rank,
-                RANK() OVER (ORDER BY total_earnings DESC,
-                             referral_count DESC) as earnings_rank
-            FROM referral_stats
-        """)
-
-        result = await self.session.execute(stmt)
-        rows = result.all()
-
-        # Find user's position
-        referral_rank = None
-        earnings_rank = None
-
-        for row in rows:
-            if row.referrer_id == user_id:
-                referral_rank = row.referral_rank
-                earnings_rank = row.earnings_rank
-                break
+        referral_rank, earnings_rank, total_users = (
+            await self.stats_repo.get_ranks(user_id)
+        )
 
         return {
             "referral_rank": referral_rank,
             "earnings_rank": earnings_rank,
-            "total_users": len(rows),
+            "total_users": total_users,
         }
 
+    @staticmethod
+    def _leaderboard_entries(rows: list) -> list[dict]:
+        """Convert leaderboard rows to ranked dicts."""
+        return [
+            {
+                "rank": idx,
+                "user_id": row.user_id,
+                "telegram_id": row.telegram_id,
+                "username": row.username,
+                "referral_count": row.referral_count,
+                "total_earnings": Decimal(str(row.total_earnings)),
+            }
+            for idx, row in enumerate(rows, 1)
+        ]
+
     async def get_platform_referral_stats(self) -> dict:
         """
         Get platform-wide referral statistics.
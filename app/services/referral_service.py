@@ -24,6 +24,7 @@ from app.repositories.referral_earning_repository import (
 from app.repositories.referral_repository import ReferralRepository
 from app.repositories.user_repository import UserRepository
 from app.services.base_service import BaseService
+from app.services.referral.ancestor_cache import ReferralAncestorCache
 from app.services.referral.chain_manager import ReferralChainManager
 from app.services.referral.config import REFERRAL_DEPTH
 from app.services.referral.earnings_manager import ReferralEarningsManager
@@ -148,6 +149,32 @@ class ReferralService(BaseService):
 
         return result.success, result.total_rewards, result.error_message
 
+    async def process_roi_referral_rewards_batch(
+        self,
+        accruals: list[tuple[int, Decimal]],
+        ancestor_cache: ReferralAncestorCache | None = None,
+    ) -> tuple[bool, Decimal, str | None]:
+        """
+        Process referral rewards for a batch of ROI accruals.
+
+        Rewards are aggregated per referrer and written in bulk; the
+        caller commits together with the accruals.
+
+        Args:
+            accruals: List of (user_id, roi_amount)
+            ancestor_cache: Preloaded ancestors (loaded if None)
+
+        Returns:
+            Tuple of (success, total_rewards, error_message)
+        """
+        result = await self.reward_processor.process_rewards_batch(
+            accruals=accruals,
+            reward_type="roi",
+            ancestor_cache=ancestor_cache,
+        )
+
+        return result.success, result.total_rewards, result.error_message
+
     async def _send_reward_notifications(
         self, bot: "Bot", notifications: list
     ) -> None:
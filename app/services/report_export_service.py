@@ -0,0 +1,301 @@
+"""
+Report export service.
+
+Streams admin exports (users, transactions, deposits) from a server-side
+cursor into a spooled temp file: gzip-compressed CSV or a write-only XLSX
+workbook. Formatting and writing run in the CPU offload pool chunk by chunk,
+so neither the whole result set nor the whole file is built on the
+event loop.
+"""
+
+import csv
+import gzip
+import io
+import tempfile
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+from typing import IO, Any
+
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.constants import (
+    EXPORT_CHUNK_ROWS,
+    EXPORT_SPOOL_MAX_BYTES,
+)
+from app.models.deposit import Deposit
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.utils.cpu_offload import offload
+
+
+# Called with the number of rows written so far
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """Exported column: header and SQL expression."""
+
+    header: str
+    expression: Any
+
+
+def _deposit_total() -> Any:
+    return (
+        select(func.coalesce(func.sum(Deposit.amount), 0))
+        .where(Deposit.user_id == User.id)
+        .scalar_subquery()
+    )
+
+
+def _deposit_count() -> Any:
+    return (
+        select(func.count(Deposit.id))
+        .where(Deposit.user_id == User.id)
+        .scalar_subquery()
+    )
+
+
+# Per dataset: (model, columns by key). Date ranges filter on created_at,
+# rows are ordered by id.
+EXPORT_DATASETS: dict[str, tuple[Any, dict[str, ExportColumn]]] = {
+    "users": (User, {
+        "id": ExportColumn("ID", User.id),
+        "telegram_id": ExportColumn("Telegram ID", User.telegram_id),
+        "username": ExportColumn("Username", User.username),
+        "wallet": ExportColumn("Wallet", User.wallet_address),
+        "balance": ExportColumn("Balance", User.balance),
+        "total_earned": ExportColumn("Total Earned", User.total_earned),
+        "total_deposited": ExportColumn("Total Deposited", _deposit_total()),
+        "deposits_count": ExportColumn("Deposits Count", _deposit_count()),
+        "verified": ExportColumn("Verified", User.is_verified),
+        "banned": ExportColumn("Banned", User.is_banned),
+        "created_at": ExportColumn("Created At", User.created_at),
+        "last_active": ExportColumn("Last Active", User.last_active),
+    }),
+    "transactions": (Transaction, {
+        "id": ExportColumn("ID", Transaction.id),
+        "user_id": ExportColumn("User ID", Transaction.user_id),
+        "type": ExportColumn("Type", Transaction.type),
+        "status": ExportColumn("Status", Transaction.status),
+        "amount": ExportColumn("Amount", Transaction.amount),
+        "fee": ExportColumn("Fee", Transaction.fee),
+        "balance_before": ExportColumn("Balance Before", Transaction.balance_before),
+        "balance_after": ExportColumn("Balance After", Transaction.balance_after),
+        "tx_hash": ExportColumn("TX Hash", Transaction.tx_hash),
+        "to_address": ExportColumn("To Address", Transaction.to_address),
+        "created_at": ExportColumn("Created At", Transaction.created_at),
+    }),
+    "deposits": (Deposit, {
+        "id": ExportColumn("ID", Deposit.id),
+        "user_id": ExportColumn("User ID", Deposit.user_id),
+        "level": ExportColumn("Level", Deposit.level),
+        "amount": ExportColumn("Amount", Deposit.amount),
+        "status": ExportColumn("Status", Deposit.status),
+        "roi_cap": ExportColumn("ROI Cap", Deposit.roi_cap_amount),
+        "roi_paid": ExportColumn("ROI Paid", Deposit.roi_paid_amount),
+        "roi_completed": ExportColumn("ROI Completed", Deposit.is_roi_completed),
+        "tx_hash": ExportColumn("TX Hash", Deposit.tx_hash),
+        "created_at": ExportColumn("Created At", Deposit.created_at),
+        "confirmed_at": ExportColumn("Confirmed At", Deposit.confirmed_at),
+    }),
+}
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+
+@dataclass
+class ExportResult:
+    """Finished export, positioned at the start of the file."""
+
+    file: IO[bytes]
+    filename: str
+    rows: int
+    size: int
+
+
+def format_value(value: Any) -> Any:
+    """Convert a DB value to a plain cell value."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return value
+
+
+class _CsvWriter:
+    """Gzip-compressed CSV (UTF-8 with BOM for Excel)."""
+
+    def __init__(self, target: IO[bytes]) -> None:
+        self._gzip = gzip.GzipFile(fileobj=target, mode="wb")
+        self._text = io.TextIOWrapper(self._gzip, encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._text)
+
+    def write(self, rows: list[Any]) -> None:
+        self._writer.writerows(
+            [format_value(value) for value in row] for row in rows
+        )
+
+    def close(self) -> None:
+        self._text.close()
+
+
+class _XlsxWriter:
+    """Write-only workbook (rows are flushed to openpyxl's temp storage)."""
+
+    def __init__(self, target: IO[bytes]) -> None:
+        self._target = target
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Export")
+
+    def write(self, rows: list[Any]) -> None:
+        for row in rows:
+            self._sheet.append([format_value(value) for value in row])
+
+    def close(self) -> None:
+        self._workbook.save(self._target)
+
+
+class ReportExportService:
+    """Service for streaming admin exports."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize service.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    @staticmethod
+    def resolve_columns(dataset: str, columns: list[str] | None) -> list[str]:
+        """
+        Validate a column selection.
+
+        Args:
+            dataset: Dataset name
+            columns: Column keys (None or empty for all)
+
+        Returns:
+            Column keys in requested order
+
+        Raises:
+            ValueError: Unknown dataset or column
+        """
+        if dataset not in EXPORT_DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        available = EXPORT_DATASETS[dataset][1]
+        if not columns:
+            return list(available)
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        return list(dict.fromkeys(columns))
+
+    def build_query(
+        self,
+        dataset: str,
+        columns: list[str],
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Any:
+        """
+        Build the export select.
+
+        Args:
+            dataset: Dataset name
+            columns: Validated column keys
+            start: First day included (created_at, UTC)
+            end: Last day included (created_at, UTC)
+
+        Returns:
+            Select statement ordered by id
+        """
+        model, available = EXPORT_DATASETS[dataset]
+        stmt = select(
+            *(available[key].expression.label(key) for key in columns)
+        ).order_by(model.id)
+        if start:
+            stmt = stmt.where(
+                model.created_at >= datetime.combine(start, time.min, UTC)
+            )
+        if end:
+            stmt = stmt.where(
+                model.created_at
+                < datetime.combine(end + timedelta(days=1), time.min, UTC)
+            )
+        return stmt
+
+    async def export(
+        self,
+        dataset: str,
+        file_format: str = "csv",
+        columns: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> ExportResult:
+        """
+        Stream a dataset into a temp file.
+
+        Args:
+            dataset: Dataset name (see EXPORT_DATASETS)
+            file_format: "csv" (gzip-compressed) or "xlsx"
+            columns: Column keys (None for all)
+            start: First day included
+            end: Last day included
+            progress: Awaited after every written chunk
+
+        Returns:
+            Export result; the caller closes result.file
+
+        Raises:
+            ValueError: Unknown dataset, format or column, or bad range
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown format: {file_format}")
+        if start and end and start > end:
+            raise ValueError("Start date is after end date")
+        columns = self.resolve_columns(dataset, columns)
+        headers = [EXPORT_DATASETS[dataset][1][key].header for key in columns]
+        stmt = self.build_query(dataset, columns, start, end)
+
+        target = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+        try:
+            writer = await offload(
+                "export", _CsvWriter if file_format == "csv" else _XlsxWriter, target
+            )
+            await offload("export", writer.write, [headers])
+
+            rows = 0
+            result = await self.session.stream(
+                stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS)
+            )
+            async for chunk in result.partitions():
+                await offload("export", writer.write, chunk)
+                rows += len(chunk)
+                if progress:
+                    await progress(rows)
+
+            await offload("export", writer.close)
+            size = target.tell()
+            target.seek(0)
+        except BaseException:
+            target.close()
+            raise
+
+        extension = "csv.gz" if file_format == "csv" else "xlsx"
+        suffix = ""
+        if start or end:
+            suffix = f"_{start or 'begin'}_{end or 'now'}"
+        filename = f"{dataset}_export{suffix}.{extension}"
+        return ExportResult(file=target, filename=filename, rows=rows, size=size)
@@ -19,6 +19,7 @@ from app.models.referral import Referral
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.repositories.referral_earning_repository import ReferralEarningRepository
+from app.utils.cpu_offload import offload
 
 
 class ReportService:
@@ -47,6 +48,28 @@ class ReportService:
         earnings = await self.earning_repo.get_all_for_referrer(user_id)
         wallet_history = await self._get_wallet_history(user_id)
 
+        # Build the workbook off the event loop
+        return await offload(
+            "xlsx",
+            self._build_workbook,
+            user,
+            transactions,
+            deposits,
+            referrals,
+            earnings,
+            wallet_history,
+        )
+
+    def _build_workbook(
+        self,
+        user: User,
+        transactions: list[Transaction],
+        deposits: list[Deposit],
+        referrals: list[Referral],
+        earnings: list,
+        wallet_history: list,
+    ) -> bytes:
+        """Build the report workbook from loaded data (runs in a worker)."""
         # Create workbook
         wb = openpyxl.Workbook()
 
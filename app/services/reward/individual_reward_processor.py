@@ -17,6 +17,7 @@ from app.models.deposit import Deposit
 from app.repositories.deposit_repository import DepositRepository
 from app.repositories.deposit_reward_repository import DepositRewardRepository
 from app.repositories.global_settings_repository import GlobalSettingsRepository
+from app.services.referral.ancestor_cache import ReferralAncestorCache
 from app.services.reward.reward_calculator import RewardCalculator
 
 
@@ -101,6 +102,13 @@ class IndividualRewardProcessor:
             extra={"deposits_count": len(deposits)},
         )
 
+        # Ancestors of every accruing user in one closure-table query;
+        # referral rewards are applied in bulk after the loop
+        ancestor_cache = await ReferralAncestorCache.load(
+            self.session, {deposit.user_id for deposit in deposits}
+        )
+        roi_accruals: list[tuple[int, Decimal]] = []
+
         for deposit in deposits:
             try:
                 # Get corridor config
@@ -152,10 +160,8 @@ class IndividualRewardProcessor:
                     next_accrual_at=next_accrual,
                 )
 
-                # R19: Process referral rewards from ROI
-                await referral_service.process_roi_referral_rewards(
-                    deposit.user_id, reward_amount
-                )
+                # R19: Referral rewards from ROI (applied in bulk below)
+                roi_accruals.append((deposit.user_id, reward_amount))
 
                 # Check if ROI completed using RewardCalculator
                 if self.calculator.is_roi_cap_reached(deposit, total_earned=new_roi_paid):
@@ -201,6 +207,11 @@ class IndividualRewardProcessor:
                 )
                 continue
 
+        if roi_accruals:
+            await referral_service.process_roi_referral_rewards_batch(
+                roi_accruals, ancestor_cache
+            )
+
         await self.session.commit()
 
         logger.info(
@@ -14,7 +14,6 @@ from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.config.settings import settings
 from app.models.deposit import Deposit
 from app.models.deposit_reward import DepositReward
 from app.models.enums import TransactionStatus
@@ -22,6 +21,7 @@ from app.repositories.deposit_repository import DepositRepository
 from app.repositories.deposit_reward_repository import DepositRewardRepository
 from app.repositories.reward_session_repository import RewardSessionRepository
 from app.services.reward.reward_calculator import RewardCalculator
+from app.services.runtime_flags import EMERGENCY_STOP_ROI, get_runtime_flags
 
 
 if TYPE_CHECKING:
@@ -63,7 +63,7 @@ class SessionRewardProcessor:
             Tuple of (success, rewards_calculated, total_amount, error)
         """
         # R17-3: Emergency stop for ROI accruals
-        if settings.emergency_stop_roi:
+        if await get_runtime_flags().get(EMERGENCY_STOP_ROI):
             logger.warning(
                 "Reward calculation blocked by emergency stop ROI",
                 extra={"session_id": session_id},
@@ -0,0 +1,150 @@
+"""
+ROI Projection Service.
+
+Projects platform ROI liability of the active deposit book under current
+or proposed corridor settings (batch simulation from
+calculator.core.projection).
+"""
+
+import asyncio
+import time
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.deposit_repository import DepositRepository
+from app.services.roi_corridor_service import RoiCorridorService
+from calculator.core.projection import (
+    RATE_SCALE,
+    DepositBook,
+    PortfolioProjector,
+    RateSpec,
+    from_units,
+)
+
+
+# Projection defaults
+PROJECTION_DAYS = 30
+PROJECTION_RUNS = 200  # Monte Carlo runs when any level uses a corridor
+PROJECTION_SEED = 20251215  # Same draws for baseline and what-if
+
+_RATE_QUANTUM = Decimal(1) / RATE_SCALE
+
+
+class RoiProjectionService:
+    """Service for ROI liability projections."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize ROI projection service.
+
+        Args:
+            session: SQLAlchemy async session
+        """
+        self.session = session
+        self.deposit_repo = DepositRepository(session)
+        self.corridor_service = RoiCorridorService(session)
+
+    async def get_current_rates(self) -> dict[int, RateSpec]:
+        """
+        Get rate spec of every level from corridor settings.
+
+        Returns:
+            Level -> fixed rate or (min, max) corridor
+        """
+        rates: dict[int, RateSpec] = {}
+        for level in range(1, 6):
+            config = await self.corridor_service.get_corridor_config(level)
+            if config["mode"] == "custom":
+                rates[level] = (config["roi_min"], config["roi_max"])
+            else:
+                rates[level] = config["roi_fixed"]
+        return rates
+
+    async def project(
+        self,
+        overrides: Mapping[int, RateSpec] | None = None,
+        days: int = PROJECTION_DAYS,
+    ) -> dict[str, Any]:
+        """
+        Project liability with current settings and optional overrides.
+
+        With overrides, baseline and scenario are simulated with the same
+        random draws so the difference reflects the rate change only.
+
+        Args:
+            overrides: Level -> rate spec replacing current settings
+            days: Projection horizon in days
+
+        Returns:
+            Dict with baseline (and scenario) summaries, deposits_count,
+            periods, elapsed_ms
+        """
+        started = time.perf_counter()
+        rows = await self.deposit_repo.get_active_roi_book()
+        rates = await self.get_current_rates()
+        period_hours = await self.corridor_service.get_accrual_period_hours()
+        periods = max(days * 24 // period_hours, 1)
+
+        book = DepositBook.from_decimals(rows)
+        projector = PortfolioProjector(book)
+
+        baseline = await asyncio.to_thread(
+            self._summarize, projector, rates, periods
+        )
+        result: dict[str, Any] = {
+            "deposits_count": len(book),
+            "periods": periods,
+            "period_hours": period_hours,
+            "days": days,
+            "baseline": baseline,
+        }
+        if overrides:
+            result["scenario"] = await asyncio.to_thread(
+                self._summarize, projector, {**rates, **overrides}, periods
+            )
+
+        result["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+        return result
+
+    @staticmethod
+    def _summarize(
+        projector: PortfolioProjector,
+        rates: Mapping[int, RateSpec],
+        periods: int,
+    ) -> dict[str, Any]:
+        """Run one projection and reduce it to Decimal figures."""
+        rates = {
+            level: _quantize_rate(spec) for level, spec in rates.items()
+        }
+        runs = (
+            PROJECTION_RUNS
+            if any(isinstance(spec, tuple) for spec in rates.values())
+            else 1
+        )
+        projection = projector.project(
+            rates, periods, runs=runs, seed=PROJECTION_SEED
+        )
+
+        p5, p50, p95 = projection.payout_percentiles((5, 50, 95))[:, -1]
+        completed = (projection.completion_period > 0).sum(axis=1)
+        return {
+            "runs": runs,
+            "outstanding_now": from_units(projection.outstanding_at_start),
+            "paid_p5": from_units(p5),
+            "paid_p50": from_units(p50),
+            "paid_p95": from_units(p95),
+            "outstanding_after": from_units(
+                projection.outstanding_at_start - p50
+            ),
+            "completed_p50": int(sorted(completed)[len(completed) // 2]),
+        }
+
+
+def _quantize_rate(spec: RateSpec) -> RateSpec:
+    """Round rate spec to the projection rate precision."""
+    if isinstance(spec, tuple):
+        return (spec[0].quantize(_RATE_QUANTUM), spec[1].quantize(_RATE_QUANTUM))
+    return spec.quantize(_RATE_QUANTUM)
@@ -0,0 +1,303 @@
+"""
+Runtime operational flags.
+
+Cluster-wide switches (blockchain maintenance mode, emergency stops)
+shared by the bot, worker and scheduler processes. The runtime_flags
+table is the source of truth; every flip is audited in
+runtime_flag_changes.
+
+Each process reads flags from a local snapshot:
+
+- a change is published on RUNTIME_FLAGS_CHANNEL and processes running
+  listen() (bot, scheduler) reload their snapshot immediately;
+- get() reloads a snapshot older than RUNTIME_FLAGS_MAX_AGE_SECONDS, so
+  processes without a listener (workers) or with a broken subscription
+  see a change within that delay.
+
+A flag enabled in the environment (Settings field of the same name)
+stays on regardless of the table.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+from app.config.constants import (
+    RUNTIME_FLAGS,
+    RUNTIME_FLAGS_CHANNEL,
+    RUNTIME_FLAGS_MAX_AGE_SECONDS,
+)
+from app.config.settings import settings
+from app.repositories.runtime_flag_repository import RuntimeFlagRepository
+
+
+MAINTENANCE_MODE = "blockchain_maintenance_mode"
+EMERGENCY_STOP_DEPOSITS = "emergency_stop_deposits"
+EMERGENCY_STOP_WITHDRAWALS = "emergency_stop_withdrawals"
+EMERGENCY_STOP_ROI = "emergency_stop_roi"
+
+_SOURCE = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class RuntimeFlags:
+    """Process-local snapshot of the runtime flags."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] | None = None,
+        redis_client: Any | None = None,
+        max_age: float = RUNTIME_FLAGS_MAX_AGE_SECONDS,
+    ) -> None:
+        """
+        Initialize runtime flags.
+
+        Args:
+            session_factory: Database session factory (async_session_maker)
+            redis_client: Optional Redis client for publishing and
+                listening (a client per call is created if None)
+            max_age: Max snapshot age in seconds before get() reloads it
+        """
+        self._session_factory = session_factory
+        self.redis_client = redis_client
+        self.max_age = max_age
+
+        self._states: dict[str, bool] = {}
+        self._loaded_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @staticmethod
+    def _check_name(name: str) -> None:
+        if name not in RUNTIME_FLAGS:
+            raise ValueError(f"Unknown runtime flag: {name}")
+
+    def _sessions(self) -> Callable[[], Any]:
+        if self._session_factory is None:
+            from app.config.database import async_session_maker
+
+            self._session_factory = async_session_maker
+        return self._session_factory
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the snapshot is older than max_age (or never loaded)."""
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.max_age
+        )
+
+    def is_set(self, name: str) -> bool:
+        """
+        Read a flag from the current snapshot without reloading it.
+
+        Args:
+            name: Flag name (see RUNTIME_FLAGS)
+
+        Returns:
+            True if the flag is enabled
+        """
+        self._check_name(name)
+        return bool(getattr(settings, name, False)) or self._states.get(
+            name, False
+        )
+
+    async def get(self, name: str) -> bool:
+        """
+        Read a flag, reloading the snapshot first if it is stale.
+
+        Args:
+            name: Flag name (see RUNTIME_FLAGS)
+
+        Returns:
+            True if the flag is enabled
+        """
+        self._check_name(name)
+        if self.is_stale:
+            await self.refresh()
+        return self.is_set(name)
+
+    async def get_all(self) -> dict[str, bool]:
+        """
+        Read every flag.
+
+        Returns:
+            Dict of flag name -> enabled
+        """
+        if self.is_stale:
+            await self.refresh()
+        return {name: self.is_set(name) for name in RUNTIME_FLAGS}
+
+    async def refresh(self) -> None:
+        """
+        Reload the snapshot from the database.
+
+        Concurrent callers on the same event loop share one query. On a
+        database error the previous snapshot is kept.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._refresh_task = loop.create_task(self._load())
+        await asyncio.shield(task)
+
+    async def _load(self) -> None:
+        try:
+            async with self._sessions()() as session:
+                states = await RuntimeFlagRepository(session).get_states()
+        except Exception as e:
+            logger.warning(f"Runtime flags reload failed, keeping snapshot: {e}")
+            return
+        self._states = states
+        self._loaded_at = time.monotonic()
+
+    async def set(
+        self,
+        name: str,
+        enabled: bool,
+        changed_by: str,
+        reason: str | None = None,
+    ) -> bool:
+        """
+        Set a flag cluster-wide.
+
+        The change is committed in its own transaction, applied to the
+        local snapshot and published to the other processes.
+
+        Args:
+            name: Flag name (see RUNTIME_FLAGS)
+            enabled: New state
+            changed_by: Admin id or "system:<component>"
+            reason: Reason, stored in the audit trail
+
+        Returns:
+            True if the state changed
+        """
+        self._check_name(name)
+        async with self._sessions()() as session:
+            changed = await RuntimeFlagRepository(session).set_flag(
+                name, enabled, changed_by=changed_by, reason=reason,
+                source=_SOURCE,
+            )
+            await session.commit()
+
+        self._states = {**self._states, name: enabled}
+        if changed:
+            logger.warning(
+                f"Runtime flag {name} set to {enabled} by {changed_by}"
+                + (f": {reason}" if reason else "")
+            )
+            await self._publish(name, enabled)
+        return changed
+
+    async def _publish(self, name: str, enabled: bool) -> None:
+        """Notify other processes (best effort, max_age bounds the delay)."""
+        payload = json.dumps(
+            {"name": name, "enabled": enabled, "source": _SOURCE}
+        )
+        client = self.redis_client
+        try:
+            if client is None:
+                from app.utils.redis_utils import get_redis_client
+
+                client = await get_redis_client()
+                try:
+                    await client.publish(RUNTIME_FLAGS_CHANNEL, payload)
+                finally:
+                    await client.aclose()
+            else:
+                await client.publish(RUNTIME_FLAGS_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"Runtime flag change not published: {e}")
+
+    async def apply_message(self, data: Any) -> None:
+        """
+        Apply a change notification and reload the snapshot.
+
+        Args:
+            data: Message payload published by set()
+        """
+        try:
+            change = json.loads(data)
+            name, enabled = change["name"], bool(change["enabled"])
+        except (TypeError, ValueError, KeyError):
+            logger.warning(f"Invalid runtime flag message: {data!r}")
+            return
+        if name in RUNTIME_FLAGS:
+            self._states = {**self._states, name: enabled}
+        await self.refresh()
+
+    async def listen(self) -> None:
+        """
+        Keep the snapshot up to date from change notifications.
+
+        Runs until cancelled, resubscribing after Redis errors. The
+        snapshot is reloaded after every (re)subscription so changes
+        missed while disconnected are picked up.
+        """
+        while True:
+            client = self.redis_client
+            owned = client is None
+            pubsub = None
+            try:
+                if owned:
+                    from app.utils.redis_utils import get_redis_client
+
+                    client = await get_redis_client()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(RUNTIME_FLAGS_CHANNEL)
+                await self.refresh()
+                logger.info("Runtime flags listener subscribed")
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.max_age
+                    )
+                    if message is not None:
+                        await self.apply_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Runtime flags listener error: {e}")
+                await asyncio.sleep(self.max_age)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+                if owned and client is not None:
+                    await client.aclose()
+
+    async def get_changes(
+        self, name: str | None = None, limit: int = 50
+    ) -> list[Any]:
+        """
+        Get the audit trail of flag changes, newest first.
+
+        Args:
+            name: Optional flag name filter
+            limit: Maximum records
+
+        Returns:
+            List of RuntimeFlagChange
+        """
+        async with self._sessions()() as session:
+            return await RuntimeFlagRepository(session).get_changes(name, limit)
+
+
+# Global registry instance
+_runtime_flags: RuntimeFlags | None = None
+
+
+def get_runtime_flags() -> RuntimeFlags:
+    """
+    Get global runtime flags instance.
+
+    Returns:
+        RuntimeFlags instance
+    """
+    global _runtime_flags
+    if _runtime_flags is None:
+        _runtime_flags = RuntimeFlags()
+    return _runtime_flags
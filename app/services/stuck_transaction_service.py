@@ -18,6 +18,7 @@ from app.models.enums import TransactionStatus, TransactionType
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.repositories.transaction_repository import TransactionRepository
+from app.services.blockchain.gas_oracle import get_gas_oracle
 from app.services.user_service import UserService
 
 
@@ -249,25 +250,32 @@ class StuckTransactionService:
                         "success": False,
                     }
 
-                # Get current gas price with timeout
-                try:
-                    current_gas_price = await asyncio.wait_for(
-                        web3.eth.gas_price,
-                        timeout=BLOCKCHAIN_TIMEOUT,
-                    )
-                except TimeoutError:
-                    logger.error("Timeout getting gas price")
-                    return {
-                        "action": "pending_gas_price_timeout",
-                        "success": False,
-                        "error": "Timeout",
-                    }
+                # Get current gas price (shared oracle quote, node if
+                # unavailable)
+                quote = await get_gas_oracle().get_quote()
+                if quote:
+                    current_gas_price = quote.standard
+                else:
+                    try:
+                        current_gas_price = await asyncio.wait_for(
+                            web3.eth.gas_price,
+                            timeout=BLOCKCHAIN_TIMEOUT,
+                        )
+                    except TimeoutError:
+                        logger.error("Timeout getting gas price")
+                        return {
+                            "action": "pending_gas_price_timeout",
+                            "success": False,
+                            "error": "Timeout",
+                        }
                 tx_gas_price = tx.get("gasPrice", 0)
 
                 # If our gas price is lower, try speed-up
                 if tx_gas_price < current_gas_price:
-                    # Increase gas by 20%
+                    # Increase gas by 20%, at least to the fast tier
                     new_gas_price = int(current_gas_price * 1.2)
+                    if quote:
+                        new_gas_price = max(new_gas_price, quote.fast)
 
                     logger.info(
                         f"Attempting speed-up for transaction "
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.user_repository import UserRepository
 from app.config.constants import FINPASS_MAX_ATTEMPTS, FINPASS_LOCKOUT_MINUTES
+from app.utils.cpu_offload import offload
 
 
 class UserAuthenticationMixin:
@@ -59,8 +60,8 @@ class UserAuthenticationMixin:
                 user.finpass_locked_until = None
                 await self.session.commit()
 
-        # Verify password using model method
-        is_valid = user.verify_financial_password(password)
+        # Verify password using model method (bcrypt, off the event loop)
+        is_valid = await offload("bcrypt", user.verify_financial_password, password)
 
         if is_valid:
             # Reset attempts on success
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.repositories.blacklist_repository import BlacklistRepository
 from app.repositories.user_repository import UserRepository
+from app.utils.cpu_offload import offload
 
 
 class UserRegistrationMixin:
@@ -89,8 +90,10 @@ class UserRegistrationMixin:
                 break
 
         # Hash financial password
-        hashed_password = bcrypt.hashpw(
-            financial_password.encode(), bcrypt.gensalt()
+        hashed_password = (
+            await offload(
+                "bcrypt", bcrypt.hashpw, financial_password.encode(), bcrypt.gensalt()
+            )
         ).decode()
 
         # Create user
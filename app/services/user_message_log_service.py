@@ -36,7 +36,10 @@ class UserMessageLogService:
         user_id: int | None = None,
     ) -> UserMessageLog:
         """
-        Log user message and cleanup old messages.
+        Log user message.
+
+        Old messages are removed with whole monthly partitions by the
+        cleanup task, not per message.
 
         Args:
             telegram_id: Telegram user ID
@@ -46,32 +49,12 @@ class UserMessageLogService:
         Returns:
             Created UserMessageLog
         """
-        # Create log entry
-        log = await self.repo.create(
+        return await self.repo.create(
             telegram_id=telegram_id,
             message_text=message_text,
             user_id=user_id,
         )
 
-        # Cleanup old messages (keep last 500)
-        try:
-            deleted_count = await self.repo.cleanup_old_messages(
-                telegram_id=telegram_id,
-                keep_last=self.MAX_MESSAGES_PER_USER,
-            )
-            if deleted_count > 0:
-                logger.debug(
-                    f"Cleaned up {deleted_count} old messages "
-                    f"for user {telegram_id}"
-                )
-        except Exception as e:
-            logger.warning(
-                f"Failed to cleanup old messages for user {telegram_id}: {e}"
-            )
-            # Don't fail if cleanup fails
-
-        return log
-
     async def get_user_messages(
         self,
         telegram_id: int,
@@ -91,7 +74,7 @@ class UserMessageLogService:
         """
         messages = await self.repo.get_user_messages(
             telegram_id=telegram_id,
-            limit=limit,
+            limit=min(limit, self.MAX_MESSAGES_PER_USER),
             offset=offset,
         )
         total = await self.repo.count_user_messages(telegram_id=telegram_id)
@@ -5,6 +5,9 @@ Provides comprehensive wallet information:
 - Token balances (PLEX, USDT, BNB)
 - Transaction history from NodeReal Enhanced API
 - Balance formatting and caching
+
+Balances are cached per wallet and block bucket, token history is kept
+in Redis and extended from the last cached block (wallet_snapshot_cache).
 """
 
 import asyncio
@@ -17,11 +20,23 @@ import aiohttp
 from loguru import logger
 
 from app.config.business_constants import PLEX_CONTRACT_ADDRESS
+from app.config.constants import (
+    BSC_BLOCK_TIME_SECONDS,
+    BSCSCAN_TX_URL,
+    RPC_MAX_RPS,
+    WALLET_HISTORY_KEEP,
+    WALLET_HISTORY_REORG_DEPTH,
+    WALLET_HISTORY_TTL,
+    WALLET_SNAPSHOT_BLOCK_BUCKET,
+    WALLET_SNAPSHOT_HEAD_TTL,
+)
+from app.config.operational_constants import MAX_BLOCKS_HISTORY_SCAN
 from app.config.settings import settings
+from app.services.blockchain.chain_head import get_head_number
 from app.services.blockchain.rpc_rate_limiter import RPCRateLimiter
 from app.services.blockchain_service import get_blockchain_service
+from app.services.wallet_snapshot_cache import WalletSnapshotCache, single_flight
 from app.utils.security import mask_address
-from app.config.constants import BSCSCAN_TX_URL, RPC_MAX_RPS
 
 
 # Transaction types for display
@@ -105,16 +120,23 @@ class WalletInfoService:
     Uses:
     - BlockchainService for balance queries (RPC)
     - eth_getLogs for token transfer history (standard RPC method)
+    - WalletSnapshotCache for shared snapshots of both
     """
 
     # ERC-20 Transfer event signature
     TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
 
-    def __init__(self) -> None:
-        """Initialize wallet info service."""
+    def __init__(self, redis_client: Any | None = None) -> None:
+        """
+        Initialize wallet info service.
+
+        Args:
+            redis_client: Redis client for snapshots (default: shared client)
+        """
         self.rpc_url = settings.rpc_url
         self._session: aiohttp.ClientSession | None = None
         self._rate_limiter = RPCRateLimiter(max_rps=RPC_MAX_RPS)
+        self.snapshots = WalletSnapshotCache(redis_client)
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
@@ -166,38 +188,58 @@ class WalletInfoService:
         """
         Get all token balances for wallet.
 
+        Served from the snapshot of the current block bucket; concurrent
+        requests for the same wallet share one fetch.
+
         Args:
             wallet_address: BSC wallet address
 
         Returns:
             WalletBalance or None on error
         """
+        head = await self._get_head_block()
+        if head == 0:
+            snapshot = await self._fetch_balance_snapshot(wallet_address)
+        else:
+            bucket = head // WALLET_SNAPSHOT_BLOCK_BUCKET
+            snapshot = await self.snapshots.get_or_fetch(
+                f"balance:{wallet_address.lower()}:{bucket}",
+                ttl=WALLET_SNAPSHOT_BLOCK_BUCKET * BSC_BLOCK_TIME_SECONDS * 2,
+                fetch=lambda: self._fetch_balance_snapshot(wallet_address),
+                store_if=lambda value: value["complete"],
+            )
+
+        if snapshot is None:
+            return None
+
+        return WalletBalance(
+            address=wallet_address,
+            bnb_balance=Decimal(snapshot["bnb"]),
+            usdt_balance=Decimal(snapshot["usdt"]),
+            plex_balance=Decimal(snapshot["plex"]),
+            last_updated=datetime.fromisoformat(snapshot["last_updated"]),
+        )
+
+    async def _fetch_balance_snapshot(
+        self, wallet_address: str
+    ) -> dict[str, Any] | None:
+        """
+        Fetch all token balances from the blockchain (3 RPCs).
+
+        Returns:
+            JSON snapshot or None on error; failed balances are 0 and
+            mark the snapshot incomplete (not cached)
+        """
         try:
             blockchain = get_blockchain_service()
 
             # Get all balances in parallel
-            bnb_task = blockchain.get_native_balance(wallet_address)
-            usdt_task = blockchain.get_usdt_balance(wallet_address)
-            plex_task = blockchain.get_plex_balance(wallet_address)
-
-            bnb, usdt, plex = await asyncio.gather(
-                bnb_task, usdt_task, plex_task,
+            results = await asyncio.gather(
+                blockchain.get_native_balance(wallet_address),
+                blockchain.get_usdt_balance(wallet_address),
+                blockchain.get_plex_balance(wallet_address),
                 return_exceptions=True
             )
-
-            # Handle exceptions
-            bnb_balance = bnb if isinstance(bnb, Decimal) else Decimal("0")
-            usdt_balance = usdt if isinstance(usdt, Decimal) else Decimal("0")
-            plex_balance = plex if isinstance(plex, Decimal) else Decimal("0")
-
-            return WalletBalance(
-                address=wallet_address,
-                bnb_balance=bnb_balance,
-                usdt_balance=usdt_balance,
-                plex_balance=plex_balance,
-                last_updated=datetime.now(UTC),
-            )
-
         except Exception as e:
             error_msg = (
                 f"Failed to get wallet balances for "
@@ -206,6 +248,33 @@ class WalletInfoService:
             logger.error(error_msg)
             return None
 
+        # Handle exceptions
+        bnb, usdt, plex = (
+            str(value) if isinstance(value, Decimal) else "0"
+            for value in results
+        )
+        return {
+            "bnb": bnb,
+            "usdt": usdt,
+            "plex": plex,
+            "last_updated": datetime.now(UTC).isoformat(),
+            "complete": all(isinstance(value, Decimal) for value in results),
+        }
+
+    async def _get_head_block(self) -> int:
+        """Get current block number, shared for one block time."""
+        head = await get_head_number()
+        if head is not None:
+            return head
+
+        async def fetch_head() -> int | None:
+            return await self._get_current_block() or None
+
+        head = await self.snapshots.get_or_fetch(
+            "head", ttl=WALLET_SNAPSHOT_HEAD_TTL, fetch=fetch_head
+        )
+        return head or 0
+
     async def _get_current_block(self) -> int:
         """Get current block number."""
         result = await self._rpc_call("eth_blockNumber", [])
@@ -225,73 +294,117 @@ class WalletInfoService:
         """
         Get BEP-20 token transaction history using eth_getLogs.
 
+        Transfers of the last ~100k blocks are cached per wallet and token
+        and extended from the last cached block.
+
         Args:
             wallet_address: Wallet address
             contract_address: Token contract address
             token_symbol: Token symbol (USDT, PLEX)
             token_name: Token name for display
             decimals: Token decimals
-            limit: Max transactions to return
+            limit: Max transactions to return (up to WALLET_HISTORY_KEEP
+                per direction)
 
         Returns:
             List of TokenTransaction
         """
-        wallet_padded = "0x" + wallet_address.lower()[2:].zfill(64)
-
         # Get current block
-        current_block = await self._get_current_block()
+        current_block = await self._get_head_block()
         if current_block == 0:
             return []
 
-        # Search last ~100k blocks (~3-4 days)
-        from_block = max(0, current_block - 100000)
+        history = await single_flight(
+            f"transfers:{contract_address.lower()}:{wallet_address.lower()}",
+            lambda: self._sync_transfer_history(
+                wallet_address, contract_address, current_block
+            ),
+        )
 
         transactions = []
-
-        # Get incoming transfers (to wallet)
-        incoming_logs = await self._rpc_call("eth_getLogs", [{
-            "fromBlock": hex(from_block),
-            "toBlock": "latest",
-            "address": contract_address,
-            "topics": [self.TRANSFER_TOPIC, None, wallet_padded],
-        }])
-
-        if incoming_logs:
-            for log in incoming_logs[-limit:]:
-                try:
-                    tx = self._parse_transfer_log(
-                        log, token_symbol, token_name,
-                        decimals, TX_TYPE_TRANSFER_IN
-                    )
-                    if tx:
-                        transactions.append(tx)
-                except Exception as e:
-                    logger.debug(f"Failed to parse incoming tx: {e}")
-
-        # Get outgoing transfers (from wallet)
-        outgoing_logs = await self._rpc_call("eth_getLogs", [{
-            "fromBlock": hex(from_block),
-            "toBlock": "latest",
-            "address": contract_address,
-            "topics": [self.TRANSFER_TOPIC, wallet_padded, None],
-        }])
-
-        if outgoing_logs:
-            for log in outgoing_logs[-limit:]:
-                try:
-                    tx = self._parse_transfer_log(
-                        log, token_symbol, token_name,
-                        decimals, TX_TYPE_TRANSFER_OUT
-                    )
-                    if tx:
-                        transactions.append(tx)
-                except Exception as e:
-                    logger.debug(f"Failed to parse outgoing tx: {e}")
+        for direction in (TX_TYPE_TRANSFER_IN, TX_TYPE_TRANSFER_OUT):
+            for log in history[direction][-limit:]:
+                tx = self._parse_transfer_log(
+                    log, token_symbol, token_name, decimals, direction
+                )
+                if tx:
+                    transactions.append(tx)
 
         # Sort by block number descending and limit
         transactions.sort(key=lambda x: x.block_number, reverse=True)
         return transactions[:limit]
 
+    async def _sync_transfer_history(
+        self,
+        wallet_address: str,
+        contract_address: str,
+        current_block: int,
+    ) -> dict[str, Any]:
+        """
+        Bring cached transfer logs of a wallet up to current_block.
+
+        Only blocks after the cached height are fetched, minus a reorg
+        margin of WALLET_HISTORY_REORG_DEPTH blocks that is re-fetched and
+        replaced. Without usable cache the last ~100k blocks are scanned.
+
+        Returns:
+            {"to_block": int, "in": [log, ...], "out": [log, ...]}
+            with logs in chain order
+        """
+        key = f"transfers:{contract_address.lower()}:{wallet_address.lower()}"
+        cached = await self.snapshots.load(key)
+        # Search last ~100k blocks (~3-4 days)
+        window_start = max(0, current_block - MAX_BLOCKS_HISTORY_SCAN)
+
+        if cached and cached["to_block"] >= current_block:
+            return cached
+        if cached and cached["to_block"] - WALLET_HISTORY_REORG_DEPTH >= window_start:
+            from_block = cached["to_block"] - WALLET_HISTORY_REORG_DEPTH + 1
+        else:
+            cached = None
+            from_block = window_start
+
+        wallet_padded = "0x" + wallet_address.lower()[2:].zfill(64)
+        # Incoming (to wallet) and outgoing (from wallet) transfers
+        incoming, outgoing = await asyncio.gather(
+            self._rpc_call("eth_getLogs", [{
+                "fromBlock": hex(from_block),
+                "toBlock": hex(current_block),
+                "address": contract_address,
+                "topics": [self.TRANSFER_TOPIC, None, wallet_padded],
+            }]),
+            self._rpc_call("eth_getLogs", [{
+                "fromBlock": hex(from_block),
+                "toBlock": hex(current_block),
+                "address": contract_address,
+                "topics": [self.TRANSFER_TOPIC, wallet_padded, None],
+            }]),
+        )
+        if incoming is None or outgoing is None:
+            # RPC failed: serve what we have, retry on next request
+            return cached or {
+                "to_block": current_block,
+                "in": incoming or [],
+                "out": outgoing or [],
+            }
+
+        history: dict[str, Any] = {"to_block": current_block}
+        for direction, fresh in (
+            (TX_TYPE_TRANSFER_IN, incoming),
+            (TX_TYPE_TRANSFER_OUT, outgoing),
+        ):
+            kept = [
+                log
+                for log in (cached[direction] if cached else [])
+                if window_start <= int(log["blockNumber"], 16) < from_block
+            ]
+            history[direction] = (
+                kept + [_slim_log(log) for log in fresh]
+            )[-WALLET_HISTORY_KEEP:]
+
+        await self.snapshots.save(key, history, WALLET_HISTORY_TTL)
+        return history
+
     def _parse_transfer_log(
         self,
         log: dict,
@@ -405,3 +518,14 @@ class WalletInfoService:
             "USDT": usdt_txs if isinstance(usdt_txs, list) else [],
             "PLEX": plex_txs if isinstance(plex_txs, list) else [],
         }
+
+
+def _slim_log(log: dict) -> dict:
+    """Keep the transfer log fields needed to rebuild a TokenTransaction."""
+    return {
+        "transactionHash": log.get("transactionHash", ""),
+        "blockNumber": log.get("blockNumber", "0x0"),
+        "logIndex": log.get("logIndex", "0x0"),
+        "topics": log.get("topics", []),
+        "data": log.get("data", "0x0"),
+    }
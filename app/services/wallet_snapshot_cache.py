@@ -0,0 +1,156 @@
+"""
+Wallet snapshot cache.
+
+Redis-backed snapshots for wallet views (balances, token history) with
+single-flight coalescing: concurrent requests for the same key inside
+the process share one in-flight fetch, and the result is stored in Redis
+for other requests and processes.
+
+The Redis client is shared process-wide (set once at bot startup), so
+user, admin and AI wallet tools read the same snapshots. Without Redis
+only single-flight coalescing applies.
+"""
+
+import asyncio
+import json
+import threading
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+
+SNAPSHOT_KEY_PREFIX = "wallet_snapshot:"
+
+_redis_client: Any | None = None
+# In-flight fetches per event loop: a task can only be awaited on its own
+# loop, and worker threads (dramatiq actors) run their own loops
+_inflight: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Task]
+] = weakref.WeakKeyDictionary()
+_inflight_lock = threading.Lock()
+
+
+def set_snapshot_redis(redis_client: Any | None) -> None:
+    """Set shared Redis client. Called at bot startup."""
+    global _redis_client
+    _redis_client = redis_client
+
+
+def get_snapshot_redis() -> Any | None:
+    """Get shared Redis client (None if not configured)."""
+    return _redis_client
+
+
+async def single_flight(
+    key: str, fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Run fetch once for all concurrent callers with the same key.
+
+    The fetch runs as a task, so a cancelled caller does not cancel it
+    for the others. Callers are coalesced per event loop.
+
+    Args:
+        key: Coalescing key
+        fetch: Coroutine factory
+
+    Returns:
+        Fetch result (exceptions propagate to every caller)
+    """
+    loop = asyncio.get_running_loop()
+    with _inflight_lock:
+        inflight = _inflight.setdefault(loop, {})
+
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+class WalletSnapshotCache:
+    """JSON snapshots in Redis with single-flight fetches."""
+
+    def __init__(self, redis_client: Any | None = None) -> None:
+        """
+        Initialize snapshot cache.
+
+        Args:
+            redis_client: Redis client (default: shared client)
+        """
+        self.redis_client = redis_client or get_snapshot_redis()
+
+    async def load(self, key: str) -> Any | None:
+        """
+        Load snapshot.
+
+        Args:
+            key: Key without prefix
+
+        Returns:
+            Stored value or None (missing, no Redis or Redis error)
+        """
+        if not self.redis_client:
+            return None
+        try:
+            raw = await self.redis_client.get(SNAPSHOT_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Wallet snapshot read failed for {key}: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def save(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store snapshot.
+
+        Args:
+            key: Key without prefix
+            value: JSON-serializable value
+            ttl: Time to live in seconds
+        """
+        if not self.redis_client:
+            return
+        try:
+            await self.redis_client.set(
+                SNAPSHOT_KEY_PREFIX + key,
+                json.dumps(value),
+                px=max(int(ttl * 1000), 1),
+            )
+        except Exception as e:
+            logger.warning(f"Wallet snapshot write failed for {key}: {e}")
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Any | None]],
+        store_if: Callable[[Any], bool] | None = None,
+    ) -> Any | None:
+        """
+        Get snapshot, fetching it once on miss.
+
+        Args:
+            key: Key without prefix
+            ttl: Time to live of a fetched snapshot in seconds
+            fetch: Coroutine factory returning a JSON-serializable value
+                (None results are not stored)
+            store_if: Predicate deciding whether a fetched value is stored
+                (e.g. skip partial results)
+
+        Returns:
+            Snapshot value or None
+        """
+
+        async def load_or_fetch() -> Any | None:
+            value = await self.load(key)
+            if value is not None:
+                return value
+            value = await fetch()
+            if value is not None and (store_if is None or store_if(value)):
+                await self.save(key, value, ttl)
+            return value
+
+        return await single_flight(key, load_or_fetch)
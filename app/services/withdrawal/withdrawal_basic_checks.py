@@ -16,11 +16,14 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.settings import settings
 from app.models.global_settings import GlobalSettings
 from app.models.user import User
 from app.repositories.deposit_repository import DepositRepository
 from app.repositories.transaction_repository import TransactionRepository
+from app.services.runtime_flags import (
+    EMERGENCY_STOP_WITHDRAWALS,
+    get_runtime_flags,
+)
 
 
 class BasicChecksMixin:
@@ -37,11 +40,7 @@ class BasicChecksMixin:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        # Check both static config flag and DB flag
-        emergency_stop = settings.emergency_stop_withdrawals or getattr(
-            self.global_settings, "emergency_stop_withdrawals", False
-        )
-        if emergency_stop:
+        if await get_runtime_flags().get(EMERGENCY_STOP_WITHDRAWALS):
             logger.warning("Withdrawal blocked by emergency stop")
             return False, (
                 "⚠️ Временная приостановка выводов из-за "
@@ -13,13 +13,13 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.settings import settings
 from app.models.enums import TransactionStatus, TransactionType
 from app.models.transaction import Transaction
 from app.repositories.admin_action_escrow_repository import (
     AdminActionEscrowRepository,
 )
 from app.repositories.transaction_repository import TransactionRepository
+from app.services.runtime_flags import MAINTENANCE_MODE, get_runtime_flags
 from app.services.withdrawal.withdrawal_balance_manager import (
     WithdrawalBalanceManager,
 )
@@ -206,76 +206,146 @@ class WithdrawalLifecycleHandler:
         """
         try:
             escrow_repo = AdminActionEscrowRepository(self.session)
-            escrow = await escrow_repo.get_by_id(escrow_id)
+            payout, error = await self._load_escrow_payout(
+                escrow_repo, escrow_id, approver_admin_id
+            )
+            if error:
+                return False, error, None
+
+            withdrawal, to_address = payout
 
-            if not escrow:
-                return False, "Escrow не найден", None
+            # CRITICAL: Send net_amount (amount - fee) to user, not gross amount
+            net_amount = withdrawal.amount - withdrawal.fee
+            payment_result = await blockchain_service.send_withdrawal_payout(
+                to_address, net_amount, f"withdrawal:{withdrawal.id}"
+            )
 
-            if escrow.status != "PENDING":
-                return False, f"Escrow уже обработан (статус: {escrow.status})", None
+            return await self._complete_escrow_payout(
+                escrow_repo, escrow_id, withdrawal.id,
+                approver_admin_id, payment_result,
+            )
+
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(
+                "Failed to approve withdrawal via escrow",
+                extra={
+                    "escrow_id": escrow_id,
+                    "approver_admin_id": approver_admin_id,
+                    "error": str(e),
+                },
+                exc_info=True,
+            )
+            return False, f"Ошибка при одобрении через escrow: {str(e)}", None
 
-            if escrow.operation_type != "WITHDRAWAL_APPROVAL":
-                return False, "Неподдерживаемый тип операции", None
+    async def _load_escrow_payout(
+        self,
+        escrow_repo: AdminActionEscrowRepository,
+        escrow_id: int,
+        approver_admin_id: int,
+    ) -> tuple[tuple[Transaction, str] | None, str | None]:
+        """
+        Validate an escrow and load the withdrawal it approves.
 
-            if escrow.initiator_admin_id == approver_admin_id:
-                return False, "Нельзя одобрить собственную инициацию", None
+        Returns:
+            Tuple of ((withdrawal, to_address), None) or (None, error_message)
+        """
+        escrow = await escrow_repo.get_by_id(escrow_id)
 
-            transaction_id = escrow.operation_data.get("transaction_id")
-            Decimal(str(escrow.operation_data.get("amount", 0)))
-            to_address = escrow.operation_data.get("to_address")
+        if not escrow:
+            return None, "Escrow не найден"
 
-            if not transaction_id or not to_address:
-                return False, "Неверные данные в escrow", None
+        if escrow.status != "PENDING":
+            return None, f"Escrow уже обработан (статус: {escrow.status})"
 
-            if settings.blockchain_maintenance_mode:
-                return False, "Blockchain в режиме обслуживания", None
+        if escrow.operation_type != "WITHDRAWAL_APPROVAL":
+            return None, "Неподдерживаемый тип операции"
 
-            # Get withdrawal transaction to retrieve fee
-            withdrawal = await self.get_withdrawal_by_id(transaction_id)
-            if not withdrawal:
-                return False, "Транзакция не найдена", None
+        if escrow.initiator_admin_id == approver_admin_id:
+            return None, "Нельзя одобрить собственную инициацию"
 
-            # CRITICAL: Send net_amount (amount - fee) to user, not gross amount
-            net_amount = withdrawal.amount - withdrawal.fee
-            payment_result = await blockchain_service.send_payment(
-                to_address, net_amount
-            )
+        transaction_id = escrow.operation_data.get("transaction_id")
+        Decimal(str(escrow.operation_data.get("amount", 0)))
+        to_address = escrow.operation_data.get("to_address")
 
-            if not payment_result["success"]:
-                error_msg = payment_result.get("error", "Неизвестная ошибка")
-                return False, f"Ошибка отправки в блокчейн: {error_msg}", None
+        if not transaction_id or not to_address:
+            return None, "Неверные данные в escrow"
 
-            tx_hash = payment_result["tx_hash"]
+        if await get_runtime_flags().get(MAINTENANCE_MODE):
+            return None, "Blockchain в режиме обслуживания"
 
-            approved_escrow = await escrow_repo.approve(escrow_id, approver_admin_id)
+        # Get withdrawal transaction to retrieve fee
+        withdrawal = await self.get_withdrawal_by_id(transaction_id)
+        if not withdrawal:
+            return None, "Транзакция не найдена"
 
-            if not approved_escrow:
-                return False, "Ошибка при подтверждении escrow", None
+        return (withdrawal, to_address), None
 
-            success, error_msg = await self.approve_withdrawal(
-                transaction_id, tx_hash, approver_admin_id
+    async def _complete_escrow_payout(
+        self,
+        escrow_repo: AdminActionEscrowRepository,
+        escrow_id: int,
+        transaction_id: int,
+        approver_admin_id: int,
+        payment_result: dict[str, Any],
+    ) -> tuple[bool, str | None, str | None]:
+        """
+        Approve escrow and withdrawal after the payout was sent.
+
+        A payout that was broadcast but whose receipt did not arrive in
+        time (status "pending") is recorded like a sent one: the escrow
+        is approved and the withdrawal moves to PROCESSING with its
+        tx_hash, so it cannot be approved and paid a second time. The
+        receipt is checked later by the stuck transaction monitor.
+
+        Returns:
+            Tuple of (success, error_message, tx_hash)
+        """
+        tx_hash = payment_result.get("tx_hash")
+
+        if not payment_result["success"]:
+            if not tx_hash or payment_result.get("status") != "pending":
+                error_msg = payment_result.get("error", "Неизвестная ошибка")
+                return False, f"Ошибка отправки в блокчейн: {error_msg}", None
+
+            logger.warning(
+                "Escrow payout broadcast, receipt pending",
+                extra={
+                    "escrow_id": escrow_id,
+                    "transaction_id": transaction_id,
+                    "tx_hash": tx_hash,
+                    "error": payment_result.get("error"),
+                },
             )
 
-            if not success:
-                await self.session.rollback()
-                return False, error_msg or "Ошибка при одобрении вывода", None
+        approved_escrow = await escrow_repo.approve(escrow_id, approver_admin_id)
 
-            await self.session.commit()
+        if not approved_escrow:
+            logger.error(
+                "Escrow payout sent but escrow not approved",
+                extra={"escrow_id": escrow_id, "tx_hash": tx_hash},
+            )
+            return False, "Ошибка при подтверждении escrow", tx_hash
 
-            return True, None, tx_hash
+        success, error_msg = await self.approve_withdrawal(
+            transaction_id, tx_hash, approver_admin_id
+        )
 
-        except SQLAlchemyError as e:
+        if not success:
             await self.session.rollback()
             logger.error(
-                "Failed to approve withdrawal via escrow",
+                "Escrow payout sent but withdrawal not updated",
                 extra={
                     "escrow_id": escrow_id,
-                    "approver_admin_id": approver_admin_id,
-                    "error": str(e),
+                    "transaction_id": transaction_id,
+                    "tx_hash": tx_hash,
                 },
-                exc_info=True,
             )
-            return False, f"Ошибка при одобрении через escrow: {str(e)}", None
+            return False, error_msg or "Ошибка при одобрении вывода", tx_hash
+
+        await self.session.commit()
+
+        return True, None, tx_hash
 
     async def reject_withdrawal(
         self, transaction_id: int, reason: str | None = None
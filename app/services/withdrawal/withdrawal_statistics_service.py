@@ -5,12 +5,13 @@ Handles platform-wide withdrawal statistics, aggregations,
 and detailed reporting for admin analytics.
 """
 
-from sqlalchemy import func, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.enums import TransactionStatus
 from app.models.transaction import Transaction
 from app.models.user import User
+from app.repositories.base import keyset_paginate
 
 
 class WithdrawalStatisticsService:
@@ -101,91 +102,53 @@ class WithdrawalStatisticsService:
         }
 
     async def get_detailed_withdrawals(
-        self, page: int = 1, per_page: int = 5
+        self,
+        page: int = 1,
+        per_page: int = 5,
+        after: str | None = None,
+        before: str | None = None,
+        total_count: int | None = None,
     ) -> dict:
         """
-        Get detailed withdrawal transactions with pagination.
+        Get detailed withdrawal transactions with keyset pagination.
 
         Args:
-            page: Page number (1-based)
+            page: Page number (1-based, for display)
             per_page: Items per page
+            after: Cursor of the previous page's last item (next page)
+            before: Cursor of the next page's first item (previous page)
+            total_count: Count from an earlier page (skips COUNT)
 
         Returns:
             Dictionary with withdrawals list and pagination info
         """
-        # Count total confirmed withdrawals
-        count_stmt = (
-            select(func.count(Transaction.id))
-            .where(
-                Transaction.type == "withdrawal",
-                Transaction.status == TransactionStatus.CONFIRMED.value,
-            )
+        return await self._confirmed_withdrawals_page(
+            [], page, per_page, after, before, total_count
         )
-        count_result = await self.session.execute(count_stmt)
-        total_count = count_result.scalar() or 0
-
-        # Calculate pagination
-        total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
-        offset = (page - 1) * per_page
-
-        # Get withdrawals with details
-        withdrawals_stmt = (
-            select(
-                User.username,
-                User.telegram_id,
-                Transaction.amount,
-                Transaction.tx_hash,
-                Transaction.created_at,
-            )
-            .join(User, Transaction.user_id == User.id)
-            .where(
-                Transaction.type == "withdrawal",
-                Transaction.status == TransactionStatus.CONFIRMED.value,
-            )
-            .order_by(Transaction.created_at.desc())
-            .offset(offset)
-            .limit(per_page)
-        )
-        result = await self.session.execute(withdrawals_stmt)
-        rows = result.all()
-
-        withdrawals = [
-            {
-                "username": row.username,
-                "telegram_id": row.telegram_id,
-                "amount": row.amount,
-                "tx_hash": row.tx_hash,
-                "created_at": row.created_at,
-            }
-            for row in rows
-        ]
-
-        return {
-            "withdrawals": withdrawals,
-            "page": page,
-            "per_page": per_page,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_prev": page > 1,
-            "has_next": page < total_pages,
-        }
 
     async def search_withdrawals(
-        self, query: str, page: int = 1, per_page: int = 5
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 5,
+        after: str | None = None,
+        before: str | None = None,
+        total_count: int | None = None,
     ) -> dict:
         """
         Search withdrawal transactions by username, telegram_id or tx_hash.
 
         Args:
             query: Search query (username, telegram_id, or tx_hash prefix)
-            page: Page number (1-based)
+            page: Page number (1-based, for display)
             per_page: Items per page
+            after: Cursor of the previous page's last item (next page)
+            before: Cursor of the next page's first item (previous page)
+            total_count: Count from an earlier page (skips COUNT)
 
         Returns:
             Dictionary with withdrawals list and pagination info
         """
-        from sqlalchemy import or_
-
         # Build search conditions
         search_conditions = [
             User.username.ilike(f"%{query}%"),
@@ -196,26 +159,46 @@ class WithdrawalStatisticsService:
         if query.isdigit():
             search_conditions.append(User.telegram_id == int(query))
 
-        # Count matching withdrawals
-        count_stmt = (
-            select(func.count(Transaction.id))
-            .join(User, Transaction.user_id == User.id)
-            .where(
-                Transaction.type == "withdrawal",
-                Transaction.status == TransactionStatus.CONFIRMED.value,
-                or_(*search_conditions),
-            )
+        result = await self._confirmed_withdrawals_page(
+            [or_(*search_conditions)],
+            page, per_page, after, before, total_count,
         )
-        count_result = await self.session.execute(count_stmt)
-        total_count = count_result.scalar() or 0
+        result["search_query"] = query
+        return result
+
+    async def _confirmed_withdrawals_page(
+        self,
+        conditions: list,
+        page: int,
+        per_page: int,
+        after: str | None,
+        before: str | None,
+        total_count: int | None,
+    ) -> dict:
+        """
+        Load one page of confirmed withdrawals, newest first.
 
-        # Calculate pagination
-        total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
-        offset = (page - 1) * per_page
+        The count is only run when not passed in (first page), pages
+        themselves are keyset ranges over (created_at, id).
+        """
+        where = [
+            Transaction.type == "withdrawal",
+            Transaction.status == TransactionStatus.CONFIRMED.value,
+            *conditions,
+        ]
+
+        if total_count is None:
+            count_stmt = (
+                select(func.count(Transaction.id))
+                .join(User, Transaction.user_id == User.id)
+                .where(*where)
+            )
+            count_result = await self.session.execute(count_stmt)
+            total_count = count_result.scalar() or 0
 
-        # Get matching withdrawals
         withdrawals_stmt = (
             select(
+                Transaction.id,
                 User.username,
                 User.telegram_id,
                 Transaction.amount,
@@ -223,17 +206,16 @@ class WithdrawalStatisticsService:
                 Transaction.created_at,
             )
             .join(User, Transaction.user_id == User.id)
-            .where(
-                Transaction.type == "withdrawal",
-                Transaction.status == TransactionStatus.CONFIRMED.value,
-                or_(*search_conditions),
-            )
-            .order_by(Transaction.created_at.desc())
-            .offset(offset)
-            .limit(per_page)
+            .where(*where)
+        )
+        result = await keyset_paginate(
+            self.session,
+            withdrawals_stmt,
+            (Transaction.created_at, Transaction.id),
+            after=after,
+            before=before,
+            limit=per_page,
         )
-        result = await self.session.execute(withdrawals_stmt)
-        rows = result.all()
 
         withdrawals = [
             {
@@ -243,16 +225,19 @@ class WithdrawalStatisticsService:
                 "tx_hash": row.tx_hash,
                 "created_at": row.created_at,
             }
-            for row in rows
+            for row in result.items
         ]
 
+        total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
+
         return {
             "withdrawals": withdrawals,
             "page": page,
             "per_page": per_page,
             "total_count": total_count,
-            "total_pages": total_pages,
-            "has_prev": page > 1,
-            "has_next": page < total_pages,
-            "search_query": query,
+            "total_pages": max(total_pages, page),
+            "has_prev": result.has_prev,
+            "has_next": result.has_next,
+            "first_cursor": result.first_cursor,
+            "last_cursor": result.last_cursor,
         }
@@ -240,38 +240,55 @@ class WithdrawalService(BaseService):
         return await self.statistics_service.get_platform_withdrawal_stats()
 
     async def get_detailed_withdrawals(
-        self, page: int = 1, per_page: int = 5
+        self,
+        page: int = 1,
+        per_page: int = 5,
+        after: str | None = None,
+        before: str | None = None,
+        total_count: int | None = None,
     ) -> dict:
         """
-        Get detailed withdrawal transactions with pagination.
+        Get detailed withdrawal transactions with keyset pagination.
 
         Args:
-            page: Page number (1-based)
+            page: Page number (1-based, for display)
             per_page: Items per page
+            after: Cursor of the previous page's last item (next page)
+            before: Cursor of the next page's first item (previous page)
+            total_count: Count from an earlier page (skips COUNT)
 
         Returns:
             Dictionary with withdrawals list and pagination info
         """
         return await self.statistics_service.get_detailed_withdrawals(
-            page, per_page
+            page, per_page, after, before, total_count
         )
 
     async def search_withdrawals(
-        self, query: str, page: int = 1, per_page: int = 5
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 5,
+        after: str | None = None,
+        before: str | None = None,
+        total_count: int | None = None,
     ) -> dict:
         """
         Search withdrawal transactions by username, telegram_id or tx_hash.
 
         Args:
             query: Search query (username, telegram_id, or tx_hash prefix)
-            page: Page number (1-based)
+            page: Page number (1-based, for display)
             per_page: Items per page
+            after: Cursor of the previous page's last item (next page)
+            before: Cursor of the next page's first item (previous page)
+            total_count: Count from an earlier page (skips COUNT)
 
         Returns:
             Dictionary with withdrawals list and pagination info
         """
         return await self.statistics_service.search_withdrawals(
-            query, page, per_page
+            query, page, per_page, after, before, total_count
         )
 
     # ========================================================================
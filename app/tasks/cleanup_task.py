@@ -4,35 +4,35 @@ Cleanup Task.
 Cleans up old data to maintain database performance.
 """
 
-from datetime import UTC, datetime, timedelta
-
 from loguru import logger
-from sqlalchemy import delete
 
 from app.config.database import async_session_maker
-from app.models.admin_action import AdminAction
+from app.services.partition_maintenance_service import (
+    PartitionMaintenanceService,
+)
 
 
 async def run_cleanup_task() -> None:
     """
-    Clean up logs older than 30 days.
+    Apply retention to partitioned log tables.
+
+    Expired monthly partitions are dropped (admin actions are detached
+    for archiving) and upcoming months are created ahead of time.
     """
     logger.info("Starting cleanup task...")
 
-    cutoff_date = datetime.now(UTC) - timedelta(days=30)
-
     async with async_session_maker() as session:
         try:
             async with session.begin():
-                # Delete old admin actions
-                stmt = delete(AdminAction).where(AdminAction.created_at < cutoff_date)
-                result = await session.execute(stmt)
-                deleted_count = result.rowcount
-
-            # Commit handled by context manager session.begin() or explicit commit if needed?
-            # session.begin() handles commit on exit.
-
-            logger.info(f"Cleanup completed. Deleted {deleted_count} old admin logs.")
+                report = await PartitionMaintenanceService(session).maintain()
+
+            removed = sum(len(r.get("removed", [])) for r in report.values())
+            failed = [table for table, r in report.items() if "error" in r]
+            logger.info(
+                f"Cleanup completed. Removed {removed} expired partitions."
+            )
+            if failed:
+                raise RuntimeError(f"Partition maintenance failed for {failed}")
 
         except Exception as e:
             logger.error(f"Cleanup task failed: {e}", exc_info=True)
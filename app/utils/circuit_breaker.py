@@ -2,6 +2,7 @@
 Circuit Breaker for Database Operations.
 
 R11-1: Implements circuit breaker pattern for gradual recovery after database failures.
+Also used per RPC provider (see app.services.blockchain.provider_health).
 """
 
 from datetime import UTC, datetime
@@ -40,6 +41,7 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         success_threshold: int = 3,
+        name: str = "database",
     ) -> None:
         """
         Initialize circuit breaker.
@@ -48,7 +50,9 @@ class CircuitBreaker:
             failure_threshold: Number of failures before opening circuit
             recovery_timeout: Time to wait before trying half-open
             success_threshold: Number of successes to close circuit
+            name: Guarded resource (for logs)
         """
+        self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.success_threshold = success_threshold
@@ -64,7 +68,7 @@ class CircuitBreaker:
         if self.state == CircuitState.HALF_OPEN:
             self.success_count += 1
             if self.success_count >= self.success_threshold:
-                logger.info("R11-1: Circuit breaker closed - database recovered")
+                logger.info(f"R11-1: Circuit breaker closed - {self.name} recovered")
                 self.state = CircuitState.CLOSED
                 self.failure_count = 0
                 self.success_count = 0
@@ -82,14 +86,14 @@ class CircuitBreaker:
             if self.state == CircuitState.CLOSED:
                 logger.warning(
                     f"R11-1: Circuit breaker opened - "
-                    f"{self.failure_count} failures detected"
+                    f"{self.failure_count} {self.name} failures detected"
                 )
                 self.state = CircuitState.OPEN
                 self.recovery_start_time = datetime.now(UTC)
             elif self.state == CircuitState.HALF_OPEN:
                 # Failed during recovery, go back to open
                 logger.warning(
-                    "R11-1: Circuit breaker reopened - recovery failed"
+                    f"R11-1: Circuit breaker reopened - {self.name} recovery failed"
                 )
                 self.state = CircuitState.OPEN
                 self.success_count = 0
@@ -118,7 +122,7 @@ class CircuitBreaker:
                     self.state = CircuitState.HALF_OPEN
                     self.success_count = 0
                 else:
-                    return False, "Circuit breaker is open - database unavailable"
+                    return False, f"Circuit breaker is open - {self.name} unavailable"
 
         # Phase-based recovery
         if self.state == CircuitState.HALF_OPEN or (
@@ -0,0 +1,212 @@
+"""
+Bounded CPU offload pool.
+
+CPU-heavy calls (bcrypt, Fernet, QR rendering, XLSX/CSV building) run in a
+shared thread pool instead of on the event loop. Admission is bounded:
+
+- at most CPU_OFFLOAD_MAX_PENDING calls are queued or running; further
+  callers wait (backpressure) and fail with OffloadBusyError after
+  CPU_OFFLOAD_QUEUE_TIMEOUT seconds;
+- each operation kind has its own concurrency cap
+  (CPU_OFFLOAD_KIND_LIMITS), so e.g. a burst of exports cannot occupy
+  every worker needed for password checks.
+
+Per-kind metrics (queue wait and execution time, rejections, failures)
+are available from get_stats().
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from app.config.constants import (
+    CPU_OFFLOAD_DEFAULT_KIND_LIMIT,
+    CPU_OFFLOAD_KIND_LIMITS,
+    CPU_OFFLOAD_MAX_PENDING,
+    CPU_OFFLOAD_MAX_WORKERS,
+    CPU_OFFLOAD_QUEUE_TIMEOUT,
+    CPU_OFFLOAD_SLOW_WAIT_SECONDS,
+)
+
+
+T = TypeVar("T")
+
+
+class OffloadBusyError(Exception):
+    """Raised when an offloaded call could not be admitted in time."""
+    pass
+
+
+@dataclass
+class OffloadKindStats:
+    """Counters of one operation kind."""
+
+    calls: int = 0
+    failures: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    exec_total: float = 0.0
+    exec_max: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters with average wait and execution times."""
+        stats = asdict(self)
+        stats["queue_wait_avg"] = self.queue_wait_total / self.calls if self.calls else 0.0
+        stats["exec_avg"] = self.exec_total / self.calls if self.calls else 0.0
+        return stats
+
+
+class CpuOffloadPool:
+    """Shared thread pool with admission control for CPU-bound calls."""
+
+    def __init__(
+        self,
+        max_workers: int = CPU_OFFLOAD_MAX_WORKERS,
+        max_pending: int = CPU_OFFLOAD_MAX_PENDING,
+        kind_limits: dict[str, int] | None = None,
+        queue_timeout: float = CPU_OFFLOAD_QUEUE_TIMEOUT,
+    ) -> None:
+        """
+        Initialize offload pool.
+
+        Args:
+            max_workers: Worker threads
+            max_pending: Calls admitted at once (queued + running)
+            kind_limits: Concurrency cap per operation kind
+            queue_timeout: Max seconds a caller waits for admission
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.kind_limits = dict(
+            CPU_OFFLOAD_KIND_LIMITS if kind_limits is None else kind_limits
+        )
+        self.queue_timeout = queue_timeout
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cpu-offload"
+        )
+        self._pending = asyncio.Semaphore(max_pending)
+        self._kind_slots: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, OffloadKindStats] = {}
+
+    def _slots(self, kind: str) -> asyncio.Semaphore:
+        if kind not in self._kind_slots:
+            limit = self.kind_limits.get(kind, CPU_OFFLOAD_DEFAULT_KIND_LIMIT)
+            self._kind_slots[kind] = asyncio.Semaphore(min(limit, self.max_workers))
+            self._stats[kind] = OffloadKindStats()
+        return self._kind_slots[kind]
+
+    async def run(
+        self, kind: str, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Run func(*args, **kwargs) in the pool.
+
+        Args:
+            kind: Operation kind (e.g. "bcrypt", "fernet", "qr", "xlsx")
+            func: Blocking callable
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of func
+
+        Raises:
+            OffloadBusyError: Not admitted within queue_timeout
+        """
+        slots = self._slots(kind)
+        stats = self._stats[kind]
+        queued_at = time.monotonic()
+        started_at = queued_at
+
+        def call() -> T:
+            nonlocal started_at
+            started_at = time.monotonic()
+            return func(*args, **kwargs)
+
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                # Kind slot first: callers waiting on a saturated kind must
+                # not hold pending slots other kinds need
+                await slots.acquire()
+                try:
+                    await self._pending.acquire()
+                except BaseException:
+                    slots.release()
+                    raise
+        except TimeoutError:
+            stats.rejected += 1
+            logger.warning(
+                f"CPU offload busy: {kind} not admitted in {self.queue_timeout}s"
+            )
+            raise OffloadBusyError(f"CPU offload pool busy ({kind})") from None
+
+        stats.in_flight += 1
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(call)
+
+        def finish(done: Future) -> None:
+            # Slots are held until the thread is done, even if the caller
+            # was cancelled meanwhile
+            finished_at = time.monotonic()
+            slots.release()
+            self._pending.release()
+            stats.in_flight -= 1
+            if done.cancelled():
+                stats.failures += 1
+                return
+            stats.calls += 1
+            if done.exception() is not None:
+                stats.failures += 1
+            wait = started_at - queued_at
+            execution = finished_at - started_at
+            stats.queue_wait_total += wait
+            stats.queue_wait_max = max(stats.queue_wait_max, wait)
+            stats.exec_total += execution
+            stats.exec_max = max(stats.exec_max, execution)
+            if wait >= CPU_OFFLOAD_SLOW_WAIT_SECONDS:
+                logger.warning(f"CPU offload {kind} waited {wait:.2f}s in queue")
+
+        future.add_done_callback(
+            lambda done: loop.call_soon_threadsafe(finish, done)
+        )
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Get metrics per operation kind."""
+        return {kind: stats.as_dict() for kind, stats in self._stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop worker threads."""
+        self._executor.shutdown(wait=wait)
+
+
+# Global pool instance
+_offload_pool: CpuOffloadPool | None = None
+
+
+def get_offload_pool() -> CpuOffloadPool:
+    """
+    Get global CPU offload pool instance.
+
+    Returns:
+        CpuOffloadPool instance
+    """
+    global _offload_pool
+    if _offload_pool is None:
+        _offload_pool = CpuOffloadPool()
+    return _offload_pool
+
+
+async def offload(
+    kind: str, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a blocking callable in the global CPU offload pool."""
+    return await get_offload_pool().run(kind, func, *args, **kwargs)
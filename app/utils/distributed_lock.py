@@ -2,17 +2,35 @@
 Distributed lock utility using Redis with PostgreSQL fallback.
 
 R15-4, R15-5: Prevents race conditions between roles and concurrent operations.
+
+Every acquisition returns a lease with a unique owner token and a fencing
+token that increases by one per acquisition of the key:
+
+- Redis: SET NX PX + INCR of the fence counter in one script, release is
+  compare-and-delete (a holder whose TTL expired cannot drop the lock of
+  the next holder) and publishes a notification that wakes waiters
+  immediately instead of polling. Long jobs can renew the lease in the
+  background.
+- PostgreSQL: session-level advisory lock on a dedicated connection, so
+  commits on the caller's session cannot move it to another pooled
+  connection; blocking waits are done by the server (pg_advisory_lock
+  with lock_timeout). The fence counter is kept in distributed_lock_fences.
 """
 
 import asyncio
 import hashlib
-import time
+import uuid
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
 
 from loguru import logger
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.operational_constants import LOCK_FENCE_TTL, LOCK_WAKEUP_MAX_WAIT
+
 
 try:
     import redis.asyncio as redis
@@ -20,6 +38,100 @@ except ImportError:
     redis = None  # type: ignore
 
 
+LOCK_KEY_PREFIX = "lock:"
+FENCE_KEY_PREFIX = "lock_fence:"
+RELEASE_CHANNEL_PREFIX = "lock_released:"
+
+# KEYS: lock, fence counter
+# ARGV: owner token, TTL (ms), fence TTL (ms)
+# Returns {fence, 0} if acquired, {0, remaining lock TTL in ms} otherwise
+ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    local fence = redis.call('INCR', KEYS[2])
+    redis.call('PEXPIRE', KEYS[2], ARGV[3])
+    return {fence, 0}
+end
+return {0, redis.call('PTTL', KEYS[1])}
+"""
+
+# KEYS: lock
+# ARGV: owner token, release channel
+# Returns 1 if released, 0 if the lock is not ours
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# KEYS: lock
+# ARGV: owner token, TTL (ms)
+# Returns 1 if extended, 0 if the lock is not ours
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+POSTGRESQL_FENCE_SQL = text("""
+    INSERT INTO distributed_lock_fences (lock_key, fence, updated_at)
+    VALUES (:lock_key, 1, now())
+    ON CONFLICT (lock_key) DO UPDATE
+    SET fence = distributed_lock_fences.fence + 1, updated_at = now()
+    RETURNING fence
+""")
+
+# PostgreSQL error code of lock_timeout
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class LockLostError(RuntimeError):
+    """Raised when a lease expired or was taken over by another holder."""
+
+
+@dataclass
+class LockLease:
+    """
+    Held distributed lock.
+
+    Attributes:
+        key: Lock key
+        token: Unique owner token
+        fence: Fencing token, one higher than the previous holder's
+            (None if the backend could not provide one)
+        backend: "redis", "postgresql" or "local"
+        ttl: Lease TTL in seconds (Redis only)
+        lost: Set when renewal found the lock expired or taken over
+    """
+
+    key: str
+    token: str
+    fence: int | None
+    backend: str
+    ttl: float = 0.0
+    lost: bool = False
+    _renewal: asyncio.Task | None = field(default=None, repr=False)
+    _connection: Any = field(default=None, repr=False)
+
+    def ensure_held(self) -> None:
+        """
+        Check that the lease is still ours.
+
+        Call before side effects that must not run twice (broadcasts,
+        payouts) in long critical sections.
+
+        Raises:
+            LockLostError: If the lease was lost
+        """
+        if self.lost:
+            raise LockLostError(
+                f"Distributed lock lost: {self.key} (fence {self.fence})"
+            )
+
+
 class DistributedLock:
     """
     R15-4, R15-5: Distributed lock using Redis with PostgreSQL fallback.
@@ -45,6 +157,14 @@ class DistributedLock:
         self.redis_client = redis_client
         self.session = session
         self.default_timeout = default_timeout
+        self._leases: dict[str, LockLease] = {}
+        self._acquire_script = None
+        self._release_script = None
+        self._renew_script = None
+        if redis_client is not None:
+            self._acquire_script = redis_client.register_script(ACQUIRE_SCRIPT)
+            self._release_script = redis_client.register_script(RELEASE_SCRIPT)
+            self._renew_script = redis_client.register_script(RENEW_SCRIPT)
 
     def _key_to_advisory_id(self, key: str) -> int:
         """
@@ -69,123 +189,160 @@ class DistributedLock:
         # Ensure it's within PostgreSQL int8 range
         return advisory_id % (2**63 - 1)
 
-    async def _acquire_postgresql_lock(
+    async def _acquire_postgresql_lease(
         self,
         key: str,
         blocking: bool = False,
         blocking_timeout: float | None = None,
-    ) -> bool:
+    ) -> LockLease | None:
         """
         Acquire PostgreSQL advisory lock (fallback).
 
-        R15-4, R15-5: Uses pg_try_advisory_lock for non-blocking,
-        pg_advisory_lock for blocking.
+        R15-4, R15-5: The lock is taken on a dedicated connection that is
+        held until release. Blocking mode waits in pg_advisory_lock with
+        lock_timeout, so the server hands the lock over on release.
 
         Args:
             key: Lock key
             blocking: If True, wait for lock
-            blocking_timeout: Max time to wait
+            blocking_timeout: Max time to wait (None = no limit)
 
         Returns:
-            True if lock acquired
+            Lease if lock acquired, None otherwise
         """
         if not self.session:
             logger.warning("Database session not available for PostgreSQL lock")
-            return False
+            return None
 
         advisory_id = self._key_to_advisory_id(key)
 
+        try:
+            connection = await self.session.bind.connect()
+        except Exception as error:
+            logger.error(f"Error acquiring PostgreSQL advisory lock {key}: {error}")
+            return None
+
         try:
             if blocking:
-                # Use pg_advisory_lock (blocking) with timeout
                 if blocking_timeout:
-                    # Set statement timeout
-                    await self.session.execute(
-                        text(f"SET LOCAL statement_timeout = {int(blocking_timeout * 1000)}")
+                    await connection.execute(
+                        text("SELECT set_config('lock_timeout', :timeout, true)"),
+                        {"timeout": f"{max(int(blocking_timeout * 1000), 1)}ms"},
                     )
-
-                # Try to acquire lock (blocking)
-                result = await self.session.execute(
-                    text("SELECT pg_try_advisory_lock(:lock_id)"),
+                await connection.execute(
+                    text("SELECT pg_advisory_lock(:lock_id)"),
                     {"lock_id": advisory_id},
                 )
-                acquired = result.scalar()
-
-                if not acquired and blocking_timeout:
-                    # If blocking with timeout, wait with retries
-                    end_time = time.time() + blocking_timeout
-                    while time.time() < end_time:
-                        await asyncio.sleep(0.1)
-                        result = await self.session.execute(
-                            text("SELECT pg_try_advisory_lock(:lock_id)"),
-                            {"lock_id": advisory_id},
-                        )
-                        acquired = result.scalar()
-                        if acquired:
-                            break
-
-                if acquired:
-                    logger.debug(f"PostgreSQL advisory lock acquired: {key} (id={advisory_id})")
-                    return True
-                else:
-                    logger.warning(f"PostgreSQL advisory lock timeout: {key}")
-                    return False
+                acquired = True
             else:
-                # Non-blocking: use pg_try_advisory_lock
-                result = await self.session.execute(
+                result = await connection.execute(
                     text("SELECT pg_try_advisory_lock(:lock_id)"),
                     {"lock_id": advisory_id},
                 )
-                acquired = result.scalar()
+                acquired = bool(result.scalar())
 
-                if acquired:
-                    logger.debug(f"PostgreSQL advisory lock acquired: {key} (id={advisory_id})")
-                else:
-                    logger.debug(f"PostgreSQL advisory lock not available: {key}")
+            fence = (
+                await self._next_postgresql_fence(connection, key)
+                if acquired
+                else None
+            )
+            await connection.commit()
+        except DBAPIError as error:
+            if getattr(error.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE:
+                logger.warning(f"PostgreSQL advisory lock timeout: {key}")
+                await connection.close()
+            else:
+                logger.error(
+                    f"Error acquiring PostgreSQL advisory lock {key}: {error}"
+                )
+                await connection.invalidate()
+            return None
+        except BaseException:
+            # The lock may be held by the connection - never return it to the pool
+            await connection.invalidate()
+            raise
+
+        if not acquired:
+            logger.debug(f"PostgreSQL advisory lock not available: {key}")
+            await connection.close()
+            return None
+
+        logger.debug(
+            f"PostgreSQL advisory lock acquired: {key} "
+            f"(id={advisory_id}, fence={fence})"
+        )
+        return LockLease(
+            key=key,
+            token=uuid.uuid4().hex,
+            fence=fence,
+            backend="postgresql",
+            _connection=connection,
+        )
 
-                return bool(acquired)
+    async def _next_postgresql_fence(self, connection: Any, key: str) -> int | None:
+        """
+        Increment the key's fence counter on the lock connection.
 
-        except Exception as error:
-            logger.error(f"Error acquiring PostgreSQL advisory lock {key}: {error}")
-            return False
+        Args:
+            connection: Connection holding the advisory lock
+            key: Lock key
+
+        Returns:
+            New fence, or None if the counter table is unavailable
+        """
+        try:
+            async with connection.begin_nested():
+                result = await connection.execute(
+                    POSTGRESQL_FENCE_SQL, {"lock_key": key}
+                )
+                return result.scalar()
+        except DBAPIError as error:
+            logger.warning(f"Lock fence unavailable for {key}: {error}")
+            return None
 
-    async def _release_postgresql_lock(self, key: str) -> bool:
+    async def _release_postgresql_lease(self, lease: LockLease) -> bool:
         """
-        Release PostgreSQL advisory lock.
+        Release PostgreSQL advisory lock and its connection.
 
         Args:
-            key: Lock key
+            lease: PostgreSQL lease
 
         Returns:
             True if released
         """
-        if not self.session:
-            return False
-
-        advisory_id = self._key_to_advisory_id(key)
+        connection = lease._connection
+        advisory_id = self._key_to_advisory_id(lease.key)
 
         try:
-            result = await self.session.execute(
+            result = await connection.execute(
                 text("SELECT pg_advisory_unlock(:lock_id)"),
                 {"lock_id": advisory_id},
             )
-            released = result.scalar()
-
-            if released:
-                logger.debug(f"PostgreSQL advisory lock released: {key} (id={advisory_id})")
-            return bool(released)
-
+            released = bool(result.scalar())
+            await connection.commit()
+            await connection.close()
         except Exception as error:
-            logger.error(f"Error releasing PostgreSQL advisory lock {key}: {error}")
-            return False
+            # Closing the server connection frees the lock
+            logger.error(
+                f"Error releasing PostgreSQL advisory lock {lease.key}: {error}"
+            )
+            await connection.invalidate()
+            return True
 
-    async def acquire(
+        if released:
+            logger.debug(
+                f"PostgreSQL advisory lock released: {lease.key} (id={advisory_id})"
+            )
+        return released
+
+    async def acquire_lease(
         self,
         key: str,
         timeout: int | None = None,
         blocking: bool = False,
         blocking_timeout: float | None = None,
-    ) -> bool:
+        auto_renew: bool = False,
+    ) -> LockLease | None:
         """
         Acquire distributed lock.
 
@@ -196,16 +353,23 @@ class DistributedLock:
             timeout: Lock timeout in seconds (default: self.default_timeout)
             blocking: If True, wait for lock to be available
             blocking_timeout: Max time to wait for lock (seconds)
+            auto_renew: Extend the Redis TTL in the background until
+                release (for jobs that may outlive the timeout)
 
         Returns:
-            True if lock acquired, False otherwise
+            Lease if lock acquired, None otherwise
         """
         # Try Redis first
         if self.redis_client:
             try:
-                return await self._acquire_redis_lock(
+                lease = await self._acquire_redis_lease(
                     key, timeout, blocking, blocking_timeout
                 )
+                if lease and auto_renew:
+                    lease._renewal = asyncio.create_task(
+                        self._renew_redis_lease(lease)
+                    )
+                return lease
             except Exception as error:
                 logger.warning(
                     f"Redis lock failed for {key}, falling back to PostgreSQL: {error}"
@@ -213,14 +377,14 @@ class DistributedLock:
 
         # Fallback to PostgreSQL
         if self.session:
-            return await self._acquire_postgresql_lock(key, blocking, blocking_timeout)
+            return await self._acquire_postgresql_lease(key, blocking, blocking_timeout)
 
         logger.warning(
             "Neither Redis nor database session available, lock not acquired"
         )
-        return False
+        return None
 
-    async def _acquire_redis_lock(
+    async def acquire(
         self,
         key: str,
         timeout: int | None = None,
@@ -228,78 +392,196 @@ class DistributedLock:
         blocking_timeout: float | None = None,
     ) -> bool:
         """
-        Acquire Redis lock (internal method).
+        Acquire distributed lock, keeping the lease for release(key).
 
         Args:
-            key: Lock key
-            timeout: Lock timeout
-            blocking: If True, wait
-            blocking_timeout: Max wait time
+            key: Lock key (e.g., "user:123:operation")
+            timeout: Lock timeout in seconds (default: self.default_timeout)
+            blocking: If True, wait for lock to be available
+            blocking_timeout: Max time to wait for lock (seconds)
 
         Returns:
-            True if acquired
+            True if lock acquired, False otherwise
         """
-        if not self.redis_client:
+        lease = await self.acquire_lease(key, timeout, blocking, blocking_timeout)
+        if lease is None:
             return False
+        self._leases[key] = lease
+        return True
 
-        timeout = timeout or self.default_timeout
-        lock_key = f"lock:{key}"
-        lock_value = f"{time.time()}:{id(self)}"  # Unique value
+    async def _acquire_redis_lease(
+        self,
+        key: str,
+        timeout: int | None = None,
+        blocking: bool = False,
+        blocking_timeout: float | None = None,
+    ) -> LockLease | None:
+        """
+        Acquire Redis lock (internal method).
 
-        try:
-            if blocking:
-                # Wait for lock with timeout
-                end_time = (
-                    time.time() + blocking_timeout
-                    if blocking_timeout
-                    else None
-                )
+        Blocked waiters subscribe to the key's release channel and retry
+        when the holder releases or its TTL runs out.
 
-                while True:
-                    acquired = await self.redis_client.set(
-                        lock_key,
-                        lock_value,
-                        nx=True,  # Only set if not exists
-                        ex=timeout,  # Expire after timeout
-                    )
+        Args:
+            key: Lock key
+            timeout: Lock timeout
+            blocking: If True, wait
+            blocking_timeout: Max wait time
 
-                    if acquired:
-                        logger.debug(f"Distributed lock acquired: {key}")
-                        return True
+        Returns:
+            Lease if acquired
 
-                    if end_time and time.time() >= end_time:
+        Raises:
+            redis.RedisError: On Redis errors (caller falls back)
+        """
+        ttl = timeout or self.default_timeout
+        token = uuid.uuid4().hex
+
+        fence, remaining_ms = await self._try_redis_acquire(key, token, ttl)
+        if fence:
+            return self._redis_lease(key, token, fence, ttl)
+        if not blocking:
+            logger.debug(f"Distributed lock not available: {key}")
+            return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + blocking_timeout if blocking_timeout else None
+        pubsub = self.redis_client.pubsub()
+        try:
+            # Subscribe before retrying so a release in between is not missed
+            await pubsub.subscribe(RELEASE_CHANNEL_PREFIX + key)
+            while True:
+                fence, remaining_ms = await self._try_redis_acquire(key, token, ttl)
+                if fence:
+                    return self._redis_lease(key, token, fence, ttl)
+
+                wait = LOCK_WAKEUP_MAX_WAIT
+                if remaining_ms >= 0:
+                    wait = min(wait, remaining_ms / 1000)
+                if deadline is not None:
+                    left = deadline - loop.time()
+                    if left <= 0:
                         logger.warning(
                             f"Distributed lock timeout: {key} "
                             f"(waited {blocking_timeout}s)"
                         )
-                        return False
+                        return None
+                    wait = min(wait, left)
 
-                    # Wait before retry
-                    await asyncio.sleep(0.1)
+                await self._wait_for_release(pubsub, wait)
+        finally:
+            await pubsub.aclose()
 
-            else:
-                # Try once, don't wait
-                acquired = await self.redis_client.set(
-                    lock_key,
-                    lock_value,
-                    nx=True,
-                    ex=timeout,
+    async def _try_redis_acquire(
+        self, key: str, token: str, ttl: float
+    ) -> tuple[int, int]:
+        """
+        One acquisition attempt.
+
+        Returns:
+            (fence, 0) if acquired, (0, remaining lock TTL in ms) otherwise
+        """
+        fence, remaining_ms = await self._acquire_script(
+            keys=[LOCK_KEY_PREFIX + key, FENCE_KEY_PREFIX + key],
+            args=[token, int(ttl * 1000), LOCK_FENCE_TTL * 1000],
+        )
+        return int(fence), int(remaining_ms)
+
+    def _redis_lease(
+        self, key: str, token: str, fence: int, ttl: float
+    ) -> LockLease:
+        """Build lease for an acquired Redis lock."""
+        logger.debug(f"Distributed lock acquired: {key} (fence={fence})")
+        return LockLease(
+            key=key, token=token, fence=fence, backend="redis", ttl=ttl
+        )
+
+    @staticmethod
+    async def _wait_for_release(pubsub: Any, timeout: float) -> None:
+        """Wait for a release notification or timeout."""
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout
+        while (left := end - loop.time()) > 0:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=left
+            )
+            if message is not None:
+                return
+
+    async def _renew_redis_lease(self, lease: LockLease) -> None:
+        """
+        Extend lease TTL every third of it until release.
+
+        Marks the lease lost if the lock was taken over, or if Redis was
+        unreachable for a whole TTL.
+        """
+        loop = asyncio.get_running_loop()
+        last_renewed = loop.time()
+        while True:
+            await asyncio.sleep(lease.ttl / 3)
+            try:
+                renewed = await self._renew_script(
+                    keys=[LOCK_KEY_PREFIX + lease.key],
+                    args=[lease.token, int(lease.ttl * 1000)],
+                )
+            except Exception as error:
+                logger.warning(f"Lock renewal failed for {lease.key}: {error}")
+                if loop.time() - last_renewed < lease.ttl:
+                    continue
+                renewed = 0
+
+            if not renewed:
+                lease.lost = True
+                logger.error(
+                    f"Distributed lock lost: {lease.key} (fence {lease.fence})"
                 )
+                return
+            last_renewed = loop.time()
 
-                if acquired:
-                    logger.debug(f"Distributed lock acquired: {key}")
-                    return True
+    async def release_lease(self, lease: LockLease) -> bool:
+        """
+        Release a lease.
+
+        Redis locks are only deleted if still owned by the lease, and
+        waiters are notified.
 
-                logger.debug(f"Distributed lock not available: {key}")
-                return False
+        Args:
+            lease: Lease from acquire_lease()
 
+        Returns:
+            True if released, False if the lock was no longer ours
+        """
+        if lease._renewal is not None:
+            lease._renewal.cancel()
+            lease._renewal = None
+
+        if lease.backend == "postgresql":
+            return await self._release_postgresql_lease(lease)
+        if lease.backend != "redis":
+            return True
+
+        try:
+            released = await self._release_script(
+                keys=[LOCK_KEY_PREFIX + lease.key],
+                args=[lease.token, RELEASE_CHANNEL_PREFIX + lease.key],
+            )
         except Exception as error:
-            logger.error(f"Error acquiring distributed lock {key}: {error}")
-            return False  # Fail open
+            # The lock expires by TTL
+            logger.warning(f"Redis lock release failed for {lease.key}: {error}")
+            return False
+
+        if released:
+            logger.debug(f"Distributed lock released: {lease.key}")
+        else:
+            logger.warning(
+                f"Distributed lock {lease.key} expired before release "
+                f"(fence {lease.fence})"
+            )
+        return bool(released)
 
     async def release(self, key: str) -> bool:
         """
-        Release distributed lock.
+        Release distributed lock taken with acquire().
 
         R15-4, R15-5: Releases Redis or PostgreSQL lock depending on what was used.
 
@@ -309,24 +591,11 @@ class DistributedLock:
         Returns:
             True if released, False otherwise
         """
-        # Try Redis first
-        if self.redis_client:
-            try:
-                lock_key = f"lock:{key}"
-                deleted = await self.redis_client.delete(lock_key)
-                if deleted:
-                    logger.debug(f"Distributed lock released: {key}")
-                    return deleted > 0
-            except Exception as error:
-                logger.warning(
-                    f"Redis lock release failed for {key}, trying PostgreSQL: {error}"
-                )
-
-        # Fallback to PostgreSQL
-        if self.session:
-            return await self._release_postgresql_lock(key)
-
-        return False
+        lease = self._leases.pop(key, None)
+        if lease is None:
+            logger.warning(f"Release of lock not held by this instance: {key}")
+            return False
+        return await self.release_lease(lease)
 
     async def is_locked(self, key: str) -> bool:
         """
@@ -343,8 +612,7 @@ class DistributedLock:
         # Try Redis first
         if self.redis_client:
             try:
-                lock_key = f"lock:{key}"
-                exists = await self.redis_client.exists(lock_key)
+                exists = await self.redis_client.exists(LOCK_KEY_PREFIX + key)
                 return exists == 1
             except Exception as error:
                 logger.warning(
@@ -360,10 +628,12 @@ class DistributedLock:
                     {"lock_id": advisory_id},
                 )
                 # If we can acquire it, it wasn't locked
-                acquired = result.scalar()
-                if acquired:
+                if result.scalar():
                     # Release immediately since we just checked
-                    await self._release_postgresql_lock(key)
+                    await self.session.execute(
+                        text("SELECT pg_advisory_unlock(:lock_id)"),
+                        {"lock_id": advisory_id},
+                    )
                     return False
                 return True  # Couldn't acquire, so it's locked
             except Exception as error:
@@ -378,6 +648,7 @@ class DistributedLock:
         timeout: int | None = None,
         blocking: bool = False,
         blocking_timeout: float | None = None,
+        auto_renew: bool = False,
     ):
         """
         Context manager for distributed lock.
@@ -385,7 +656,9 @@ class DistributedLock:
         R15-4, R15-5: Use this for critical operations.
 
         Example:
-            async with distributed_lock.lock("user:123:withdrawal"):
+            async with distributed_lock.lock("user:123:withdrawal") as lease:
+                if not lease:
+                    return
                 # Critical operation
                 await process_withdrawal(user_id=123)
 
@@ -394,22 +667,24 @@ class DistributedLock:
             timeout: Lock timeout in seconds
             blocking: If True, wait for lock
             blocking_timeout: Max time to wait
+            auto_renew: Renew the lease until the block exits
 
         Yields:
-            True if lock acquired, False otherwise
+            Lease if lock acquired (truthy), None otherwise
         """
-        acquired = await self.acquire(
+        lease = await self.acquire_lease(
             key=key,
             timeout=timeout,
             blocking=blocking,
             blocking_timeout=blocking_timeout,
+            auto_renew=auto_renew,
         )
 
         try:
-            yield acquired
+            yield lease
         finally:
-            if acquired:
-                await self.release(key)
+            if lease:
+                await self.release_lease(lease)
 
 
 # Global instance (will be initialized with Redis client)
@@ -117,6 +117,18 @@ class EncryptionService:
             from app.utils.exceptions import SecurityError
             raise SecurityError("Decryption failed: invalid ciphertext or key mismatch")
 
+    async def encrypt_async(self, plaintext: str) -> str | None:
+        """Encrypt plaintext in the CPU offload pool (see encrypt)."""
+        from app.utils.cpu_offload import offload
+
+        return await offload("fernet", self.encrypt, plaintext)
+
+    async def decrypt_async(self, ciphertext: str) -> str | None:
+        """Decrypt ciphertext in the CPU offload pool (see decrypt)."""
+        from app.utils.cpu_offload import offload
+
+        return await offload("fernet", self.decrypt, ciphertext)
+
     @staticmethod
     def generate_key() -> str:
         """
@@ -4,7 +4,12 @@ Provides helper functions for creating Redis connections with configuration
 from settings to avoid code duplication.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 import redis.asyncio as redis
+from loguru import logger
 
 from app.config.settings import settings
 
@@ -30,6 +35,43 @@ async def get_redis_client() -> redis.Redis:
     )
 
 
+@asynccontextmanager
+async def redis_or_short_lived(
+    redis_client: Any | None, purpose: str
+) -> AsyncIterator[Any | None]:
+    """
+    Yield redis_client, or a short-lived client if it is None.
+
+    For services that take an optional shared client: the short-lived
+    client is closed on exit.
+
+    Args:
+        redis_client: Shared Redis client, if the caller has one
+        purpose: What Redis is used for (logged when it is unavailable)
+
+    Yields:
+        Redis client, or None if Redis is unavailable
+
+    Example:
+        >>> async with redis_or_short_lived(self.redis_client, "Quotas") as client:
+        ...     if client is not None:
+        ...         await client.get("key")
+    """
+    if redis_client is not None:
+        yield redis_client
+        return
+    try:
+        client = await get_redis_client()
+    except Exception as e:
+        logger.debug(f"{purpose} without Redis: {e}")
+        yield None
+        return
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
 def get_redis_url() -> str:
     """
     Build Redis URL from settings.
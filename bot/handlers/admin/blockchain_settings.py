@@ -46,6 +46,15 @@ async def get_status_text() -> str:
         if name.lower() == "nodereal2":
             name_display = "NODEREAL2 (резерв)"
         text += f"{icon} *{name_display}*{active_mark}: Block {block}{error}\n"
+        health = data.get("health")
+        if health:
+            latency = health["latency_ms"]
+            latency_text = "—" if latency is None else f"{latency} мс"
+            circuit = " ⛔ отключён" if health["circuit"] != "closed" else ""
+            text += (
+                f"    ⏱ {latency_text}, ошибки {health['error_rate']:.0%}, "
+                f"рейтинг {health['score']}{circuit}\n"
+            )
 
     return text
 
@@ -12,8 +12,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.global_settings_repository import (
-    GlobalSettingsRepository,
+from app.services.runtime_flags import (
+    EMERGENCY_STOP_DEPOSITS,
+    EMERGENCY_STOP_ROI,
+    EMERGENCY_STOP_WITHDRAWALS,
+    get_runtime_flags,
 )
 from app.utils.cache_invalidation import invalidate_global_settings_cache
 from bot.keyboards.admin.emergency_keyboards import emergency_stops_keyboard
@@ -27,22 +30,36 @@ def _format_status_flag(enabled: bool) -> str:
     return "⏸ Остановлено" if enabled else "▶ Активно"
 
 
+async def _toggle_flag(message: Message, name: str) -> bool:
+    """Flip an emergency stop flag on behalf of the admin, return new value."""
+    flags = get_runtime_flags()
+    new_value = not await flags.get(name)
+    await flags.set(
+        name, new_value,
+        changed_by=f"admin:{message.from_user.id}",
+        reason="Admin emergency menu",
+    )
+    return new_value
+
+
 async def show_emergency_menu(
     message: Message,
     session: AsyncSession,
     data: dict,
 ) -> None:
     """Show emergency stops menu with current status."""
-    repo = GlobalSettingsRepository(session)
-    settings = await repo.get_settings()
+    flags = await get_runtime_flags().get_all()
+    deposits_stopped = flags[EMERGENCY_STOP_DEPOSITS]
+    withdrawals_stopped = flags[EMERGENCY_STOP_WITHDRAWALS]
+    roi_stopped = flags[EMERGENCY_STOP_ROI]
 
     text = (
         "🚨 **Аварийные стопы платформы**\n\n"
         "Используйте эти флаги только при инцидентах (ошибка блокчейна, "
         "подозрение на взлом, критические баги).\n\n"
-        f"💰 Депозиты: {_format_status_flag(settings.emergency_stop_deposits)}\n"
-        f"💸 Выводы: {_format_status_flag(settings.emergency_stop_withdrawals)}\n"
-        f"📈 Начисление ROI: {_format_status_flag(settings.emergency_stop_roi)}\n\n"
+        f"💰 Депозиты: {_format_status_flag(deposits_stopped)}\n"
+        f"💸 Выводы: {_format_status_flag(withdrawals_stopped)}\n"
+        f"📈 Начисление ROI: {_format_status_flag(roi_stopped)}\n\n"
         "Нажмите кнопку для переключения статуса."
     )
 
@@ -50,9 +67,9 @@ async def show_emergency_menu(
         text,
         parse_mode="Markdown",
         reply_markup=emergency_stops_keyboard(
-            deposits_stopped=settings.emergency_stop_deposits,
-            withdrawals_stopped=settings.emergency_stop_withdrawals,
-            roi_stopped=settings.emergency_stop_roi,
+            deposits_stopped=deposits_stopped,
+            withdrawals_stopped=withdrawals_stopped,
+            roi_stopped=roi_stopped,
         ),
     )
 
@@ -93,12 +110,7 @@ async def handle_toggle_deposits(
         await message.answer("❌ Доступ только для супер-админа")
         return
 
-    redis_client = data.get("redis_client")
-    repo = GlobalSettingsRepository(session, redis_client)
-    settings = await repo.get_settings()
-
-    new_value = not settings.emergency_stop_deposits
-    await repo.update_settings(emergency_stop_deposits=new_value)
+    new_value = await _toggle_flag(message, EMERGENCY_STOP_DEPOSITS)
 
     status = "остановлены" if new_value else "запущены"
     await message.answer(f"✅ Депозиты {status}")
@@ -117,12 +129,7 @@ async def handle_toggle_withdrawals(
         await message.answer("❌ Доступ только для супер-админа")
         return
 
-    redis_client = data.get("redis_client")
-    repo = GlobalSettingsRepository(session, redis_client)
-    settings = await repo.get_settings()
-
-    new_value = not settings.emergency_stop_withdrawals
-    await repo.update_settings(emergency_stop_withdrawals=new_value)
+    new_value = await _toggle_flag(message, EMERGENCY_STOP_WITHDRAWALS)
 
     status = "остановлены" if new_value else "запущены"
     await message.answer(f"✅ Выводы {status}")
@@ -141,12 +148,7 @@ async def handle_toggle_roi(
         await message.answer("❌ Доступ только для супер-админа")
         return
 
-    redis_client = data.get("redis_client")
-    repo = GlobalSettingsRepository(session, redis_client)
-    settings = await repo.get_settings()
-
-    new_value = not settings.emergency_stop_roi
-    await repo.update_settings(emergency_stop_roi=new_value)
+    new_value = await _toggle_flag(message, EMERGENCY_STOP_ROI)
 
     status = "остановлено" if new_value else "запущено"
     await message.answer(f"✅ Начисление ROI {status}")
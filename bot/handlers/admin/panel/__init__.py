@@ -11,7 +11,7 @@ Submodules:
 - statistics: Platform statistics (users, deposits, referrals, withdrawals)
 - withdrawals: Withdrawal history with pagination
 - navigation: Navigation handlers for various admin menus
-- export: Data export functionality (CSV)
+- export: Data export functionality (CSV.gz / XLSX)
 
 Structure:
 ----------
@@ -22,7 +22,7 @@ The original panel.py (893 lines) has been refactored into smaller, focused modu
 - statistics.py (~170 lines) - Statistics display
 - withdrawals.py (~130 lines) - Withdrawal history
 - navigation.py (~130 lines) - Menu navigation
-- export.py (~60 lines) - Data export
+- export.py (~190 lines) - Data export
 
 Usage:
 ------
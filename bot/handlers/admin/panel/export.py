@@ -2,25 +2,102 @@
 Admin Export Handler
 
 Provides data export functionality for admins:
-- /export - Export all users to CSV file
+- /export - Export users, transactions or deposits (CSV.gz or XLSX)
 """
 
-from datetime import UTC, datetime
-from typing import Any
+import time
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+from datetime import date
+from typing import IO, Any
 
-from aiogram import Router
+from aiogram import Bot, Router
 from aiogram.enums import ChatAction
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import Command
-from aiogram.types import BufferedInputFile, Message
+from aiogram.types import InputFile, Message
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.constants import (
+    EXPORT_MAX_UPLOAD_BYTES,
+    EXPORT_PROGRESS_INTERVAL_SECONDS,
+)
 from bot.handlers.admin.utils.admin_checks import get_admin_or_deny
+from bot.utils.formatters import escape_md
 
 
 router = Router(name="admin_panel_export")
 
 
+EXPORT_USAGE = (
+    "📊 *Экспорт данных*\n\n"
+    "Использование:\n"
+    "`/export [users|transactions|deposits] [csv|xlsx] "
+    "[ГГГГ-ММ-ДД] [ГГГГ-ММ-ДД] [cols=col1,col2]`\n\n"
+    "По умолчанию: `users csv`, все даты и все колонки.\n"
+    "Даты - период по дате создания (включительно).\n"
+    "CSV отправляется сжатым (`.csv.gz`)."
+)
+
+
+class StreamedInputFile(InputFile):
+    """Upload a file object in chunks instead of loading it as bytes."""
+
+    def __init__(self, file: IO[bytes], filename: str) -> None:
+        super().__init__(filename=filename)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+def parse_export_args(text: str | None) -> dict[str, Any]:
+    """
+    Parse /export arguments.
+
+    Args:
+        text: Full command text
+
+    Returns:
+        Dict with dataset, file_format, start, end and columns
+
+    Raises:
+        ValueError: Unrecognized argument
+    """
+    from app.services.report_export_service import EXPORT_DATASETS, EXPORT_FORMATS
+
+    options: dict[str, Any] = {
+        "dataset": "users",
+        "file_format": "csv",
+        "start": None,
+        "end": None,
+        "columns": None,
+    }
+    dates: list[date] = []
+    for arg in (text or "").split()[1:]:
+        lowered = arg.lower()
+        if lowered in EXPORT_DATASETS:
+            options["dataset"] = lowered
+        elif lowered in EXPORT_FORMATS:
+            options["file_format"] = lowered
+        elif lowered.startswith("cols="):
+            options["columns"] = [c for c in lowered[5:].split(",") if c]
+        else:
+            try:
+                dates.append(date.fromisoformat(arg))
+            except ValueError:
+                raise ValueError(f"Неизвестный параметр: {arg}") from None
+    if len(dates) > 2:
+        raise ValueError("Укажите не больше двух дат")
+    if dates:
+        options["start"] = dates[0]
+        options["end"] = dates[1] if len(dates) > 1 else None
+    return options
+
+
 @router.message(Command("export"))
 async def cmd_export_users(
     message: Message,
@@ -28,38 +105,81 @@ async def cmd_export_users(
     **data: Any,
 ) -> None:
     """
-    Export all users to CSV file for admins.
-    Usage: /export
+    Export data to a file for admins.
+    Usage: /export [dataset] [format] [start] [end] [cols=...]
     """
     admin = await get_admin_or_deny(message, session, **data)
     if not admin:
         return
 
-    from app.services.financial_report_service import FinancialReportService
-
-    # Send typing indicator
-    await message.bot.send_chat_action(
-        chat_id=message.chat.id,
-        action=ChatAction.UPLOAD_DOCUMENT
+    from app.services.report_export_service import (
+        EXPORT_DATASETS,
+        ReportExportService,
     )
 
     try:
-        report_service = FinancialReportService(session)
-        csv_data = await report_service.export_all_users_csv()
-
-        # Create file
-        file_bytes = csv_data.encode('utf-8-sig')  # BOM for Excel compatibility
-        file = BufferedInputFile(
-            file_bytes,
-            filename=f"users_export_{datetime.now(UTC).strftime('%Y%m%d_%H%M')}.csv"
+        options = parse_export_args(message.text)
+        ReportExportService.resolve_columns(
+            options["dataset"], options["columns"]
         )
+    except ValueError as e:
+        columns = ", ".join(
+            f"`{dataset}`: " + ", ".join(f"`{col}`" for col in cols)
+            for dataset, (_, cols) in EXPORT_DATASETS.items()
+        )
+        await message.answer(
+            f"❌ {escape_md(str(e))}\n\n{EXPORT_USAGE}\n\nКолонки:\n{columns}",
+            parse_mode="Markdown",
+        )
+        return
+
+    status = await message.answer("⏳ Экспорт: подготовка...")
+    last_update = time.monotonic()
 
+    async def report_progress(rows: int) -> None:
+        nonlocal last_update
+        if time.monotonic() - last_update < EXPORT_PROGRESS_INTERVAL_SECONDS:
+            return
+        last_update = time.monotonic()
+        with suppress(TelegramAPIError):
+            await status.edit_text(f"⏳ Экспорт: записано строк: {rows:,}")
+
+    try:
+        result = await ReportExportService(session).export(
+            progress=report_progress, **options
+        )
+    except Exception as e:
+        logger.error(f"Error exporting {options['dataset']}: {e}")
+        await status.edit_text("❌ Ошибка при экспорте данных.")
+        return
+
+    try:
+        if result.size > EXPORT_MAX_UPLOAD_BYTES:
+            await status.edit_text(
+                f"❌ Файл слишком большой ({result.size // (1024 * 1024)} МБ). "
+                "Сузьте период или выберите меньше колонок."
+            )
+            return
+
+        await status.edit_text(
+            f"📤 Экспорт: отправка файла ({result.rows:,} строк)..."
+        )
+        await message.bot.send_chat_action(
+            chat_id=message.chat.id,
+            action=ChatAction.UPLOAD_DOCUMENT
+        )
         await message.answer_document(
-            file,
-            caption="📊 *Экспорт пользователей*\n\nФайл содержит данные всех пользователей.",
+            StreamedInputFile(result.file, result.filename),
+            caption=(
+                f"📊 *Экспорт: {options['dataset']}*\n\n"
+                f"Строк: {result.rows:,}"
+            ),
             parse_mode="Markdown"
         )
-
+        with suppress(TelegramAPIError):
+            await status.delete()
     except Exception as e:
-        logger.error(f"Error exporting users: {e}")
-        await message.answer("❌ Ошибка при экспорте пользователей.")
+        logger.error(f"Error sending {options['dataset']} export: {e}")
+        await message.answer("❌ Ошибка при отправке файла экспорта.")
+    finally:
+        result.file.close()
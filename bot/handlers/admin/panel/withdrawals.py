@@ -42,31 +42,48 @@ async def handle_withdrawal_history(
     if not admin:
         return
 
-    # Clear any search state and reset to page 1
-    await state.update_data(wd_history_page=1, wd_search_query=None)
-
     withdrawal_service = WithdrawalService(session)
-    await show_withdrawal_page(message, withdrawal_service, page=1)
+    await show_withdrawal_page(message, withdrawal_service, state, page=1)
 
 
 async def show_withdrawal_page(
     message: Message,
     withdrawal_service,
+    state: FSMContext,
     page: int = 1,
     search_query: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    """Show withdrawal history page with optional search."""
+    """
+    Show withdrawal history page with optional search.
+
+    Pages are keyset ranges continuing from the edge cursors kept in FSM
+    data; the total is counted once per listing and reused.
+    """
+    state_data = await state.get_data()
+    total_count = state_data.get("wd_total_count") if page > 1 else None
     if search_query:
         detailed = await withdrawal_service.search_withdrawals(
-            query=search_query, page=page, per_page=5
+            query=search_query, page=page, per_page=5,
+            after=after, before=before, total_count=total_count,
         )
         text = f"🔍 **Поиск: {search_query}**\n\n"
     else:
         detailed = await withdrawal_service.get_detailed_withdrawals(
-            page=page, per_page=5
+            page=page, per_page=5,
+            after=after, before=before, total_count=total_count,
         )
         text = "📋 **История выводов на кошельки**\n\n"
 
+    await state.update_data(
+        wd_history_page=page,
+        wd_search_query=search_query,
+        wd_total_count=detailed["total_count"],
+        wd_first_cursor=detailed["first_cursor"],
+        wd_last_cursor=detailed["last_cursor"],
+    )
+
     if not detailed["withdrawals"]:
         if search_query:
             text += "_Ничего не найдено по запросу_"
@@ -99,7 +116,7 @@ async def show_withdrawal_page(
     # Reply keyboard with pagination
     keyboard = admin_withdrawal_history_pagination_keyboard(
         page=page,
-        total_pages=detailed["total_pages"],
+        total_pages=page + 1 if detailed["has_next"] else page,
         is_search_mode=bool(search_query),
     )
 
@@ -159,8 +176,7 @@ async def handle_search_query(
             )
         else:
             withdrawal_service = WithdrawalService(session)
-            await state.update_data(wd_history_page=1, wd_search_query=None)
-            await show_withdrawal_page(message, withdrawal_service, page=1)
+            await show_withdrawal_page(message, withdrawal_service, state, page=1)
         return
 
     # Check for empty query
@@ -172,12 +188,13 @@ async def handle_search_query(
         )
         return
 
-    # Store search query and show results
-    await state.update_data(wd_history_page=1, wd_search_query=query)
+    # Show results (search query is kept in FSM data for paging)
     await state.set_state(None)
 
     withdrawal_service = WithdrawalService(session)
-    await show_withdrawal_page(message, withdrawal_service, page=1, search_query=query)
+    await show_withdrawal_page(
+        message, withdrawal_service, state, page=1, search_query=query
+    )
 
 
 @router.message(F.text == "🗑 Сбросить поиск")
@@ -194,9 +211,8 @@ async def handle_clear_search(
     if not admin:
         return
 
-    await state.update_data(wd_history_page=1, wd_search_query=None)
     withdrawal_service = WithdrawalService(session)
-    await show_withdrawal_page(message, withdrawal_service, page=1)
+    await show_withdrawal_page(message, withdrawal_service, state, page=1)
 
 
 @router.message(F.text == "⬅️ Пред. страница выводов")
@@ -216,13 +232,18 @@ async def handle_wd_prev_page(
     state_data = await state.get_data()
     current_page = state_data.get("wd_history_page", 1)
     search_query = state_data.get("wd_search_query")
-    new_page = max(1, current_page - 1)
-    await state.update_data(wd_history_page=new_page)
+    first_cursor = state_data.get("wd_first_cursor")
 
     withdrawal_service = WithdrawalService(session)
+    if current_page <= 2 or not first_cursor:
+        await show_withdrawal_page(
+            message, withdrawal_service, state,
+            page=1, search_query=search_query
+        )
+        return
     await show_withdrawal_page(
-        message, withdrawal_service,
-        page=new_page, search_query=search_query
+        message, withdrawal_service, state,
+        page=current_page - 1, search_query=search_query, before=first_cursor
     )
 
 
@@ -243,11 +264,16 @@ async def handle_wd_next_page(
     state_data = await state.get_data()
     current_page = state_data.get("wd_history_page", 1)
     search_query = state_data.get("wd_search_query")
-    new_page = current_page + 1
-    await state.update_data(wd_history_page=new_page)
+    last_cursor = state_data.get("wd_last_cursor")
 
     withdrawal_service = WithdrawalService(session)
+    if not last_cursor:
+        await show_withdrawal_page(
+            message, withdrawal_service, state,
+            page=1, search_query=search_query
+        )
+        return
     await show_withdrawal_page(
-        message, withdrawal_service,
-        page=new_page, search_query=search_query
+        message, withdrawal_service, state,
+        page=current_page + 1, search_query=search_query, after=last_cursor
     )
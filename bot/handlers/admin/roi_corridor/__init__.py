@@ -17,6 +17,7 @@ Module Structure:
 - corridor_confirmation.py: Confirmation and saving
 - history.py: History viewing
 - period_setup.py: Period setup
+- projection.py: Liability projection and change impact
 - utils.py: Utility functions and notifications
 
 This module refactors the original large roi_corridor.py file (1321 lines)
@@ -52,6 +53,9 @@ from bot.handlers.admin.roi_corridor.menu import register_menu_handlers
 from bot.handlers.admin.roi_corridor.period_setup import (
     register_period_setup_handlers,
 )
+from bot.handlers.admin.roi_corridor.projection import (
+    register_projection_handlers,
+)
 
 
 # Register all handlers to the router
@@ -63,6 +67,7 @@ register_corridor_input_handlers(router)
 register_corridor_confirmation_handlers(router)
 register_history_handlers(router)
 register_period_setup_handlers(router)
+register_projection_handlers(router)
 
 # Re-export public functions for backward compatibility
 # These imports ensure that existing code using these functions continues to work
@@ -105,6 +110,9 @@ from bot.handlers.admin.roi_corridor.period_setup import (
     process_period_input,
     start_period_setup,
 )
+from bot.handlers.admin.roi_corridor.projection import (
+    show_liability_projection,
+)
 from bot.handlers.admin.roi_corridor.utils import (
     check_cancel_or_back,
     notify_other_admins,
@@ -147,6 +155,8 @@ __all__ = [
     "start_period_setup",
     "process_period_input",
     "process_period_confirmation",
+    # Projection functions
+    "show_liability_projection",
     # Utility functions
     "check_cancel_or_back",
     "notify_other_admins",
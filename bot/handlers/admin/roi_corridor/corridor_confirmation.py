@@ -15,6 +15,7 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.roi_corridor_service import RoiCorridorService
+from bot.handlers.admin.roi_corridor.projection import format_change_impact
 from bot.handlers.admin.roi_corridor.utils import notify_other_admins
 from bot.keyboards.reply import admin_roi_confirmation_keyboard
 from bot.states.admin import AdminRoiCorridorStates
@@ -82,6 +83,15 @@ async def show_confirmation(
     if reason:
         reason_block = f"\n**Причина:** {reason}"
 
+    if mode == "custom":
+        new_spec = (
+            Decimal(str(state_data["roi_min"])),
+            Decimal(str(state_data["roi_max"])),
+        )
+    else:
+        new_spec = Decimal(str(state_data["roi_fixed"]))
+    impact = await format_change_impact(session, level, new_spec)
+
     text = (
         "📋 **Подтверждение настроек**\n\n"
         f"**Уровень:** {level}\n"
@@ -89,6 +99,7 @@ async def show_confirmation(
         f"{config_text}\n"
         f"**Применить к:** {applies_text}"
         f"{reason_block}"
+        f"{impact}"
         f"{warning}\n\n"
         "Подтвердите изменения:"
     )
@@ -0,0 +1,108 @@
+"""
+ROI Corridor liability projection.
+
+Shows projected ROI payouts of the active deposit book and the effect of
+a pending corridor change.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from aiogram import F
+from aiogram.types import Message
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.roi_projection_service import RoiProjectionService
+from bot.handlers.admin.utils.admin_checks import get_admin_or_deny
+from bot.keyboards.reply import admin_roi_corridor_menu_keyboard
+from calculator import format_currency
+
+
+async def show_liability_projection(
+    message: Message,
+    session: AsyncSession,
+    **data: Any,
+) -> None:
+    """
+    Show projected ROI liability with current corridor settings.
+
+    Args:
+        message: Message object
+        session: Database session
+        data: Handler data
+    """
+    admin = await get_admin_or_deny(message, session, **data)
+    if not admin:
+        return
+
+    projection = await RoiProjectionService(session).project()
+    baseline = projection["baseline"]
+
+    text = (
+        f"📈 **Прогноз обязательств на {projection['days']} дн.**\n\n"
+        f"Активных депозитов: {projection['deposits_count']}\n"
+        f"Начислений: {projection['periods']} "
+        f"(каждые {projection['period_hours']} ч)\n\n"
+        f"💰 Остаток ROI сейчас: "
+        f"{format_currency(baseline['outstanding_now'])}\n"
+        f"📤 Выплаты за период (медиана): "
+        f"{format_currency(baseline['paid_p50'])}\n"
+        f"   P5–P95: {format_currency(baseline['paid_p5'])} – "
+        f"{format_currency(baseline['paid_p95'])}\n"
+        f"💼 Остаток ROI через {projection['days']} дн.: "
+        f"{format_currency(baseline['outstanding_after'])}\n"
+        f"🏁 Депозитов достигнут лимита: {baseline['completed_p50']}\n\n"
+        f"_Сценариев: {baseline['runs']}, расчёт {projection['elapsed_ms']} мс_"
+    )
+
+    await message.answer(
+        text,
+        parse_mode="Markdown",
+        reply_markup=admin_roi_corridor_menu_keyboard(),
+    )
+
+
+async def format_change_impact(
+    session: AsyncSession,
+    level: int,
+    spec: Decimal | tuple[Decimal, Decimal],
+) -> str:
+    """
+    Format projected payout impact of a corridor change.
+
+    Args:
+        session: Database session
+        level: Deposit level
+        spec: New fixed rate or (min, max) corridor
+
+    Returns:
+        Markdown block (empty if projection failed)
+    """
+    try:
+        projection = await RoiProjectionService(session).project({level: spec})
+    except Exception as e:
+        logger.warning(f"[ROI_CORRIDOR] Projection failed: {e}")
+        return ""
+
+    before = projection["baseline"]["paid_p50"]
+    after = projection["scenario"]["paid_p50"]
+    delta = after - before
+    sign = "+" if delta >= 0 else "−"
+
+    return (
+        f"\n\n📈 **Выплаты за {projection['days']} дн. (медиана):**\n"
+        f"{format_currency(before)} → {format_currency(after)} "
+        f"({sign}{format_currency(abs(delta))})"
+    )
+
+
+# Handler registration function
+def register_projection_handlers(router):
+    """Register projection handlers to the router."""
+    router.message.register(
+        show_liability_projection,
+        F.text == "📈 Прогноз обязательств"
+    )
@@ -8,10 +8,9 @@ from typing import Any
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
-from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
+from app.repositories.user_repository import UserRepository
 from app.services.user_service import UserService
 from bot.handlers.admin.utils.admin_checks import get_admin_or_deny
 from bot.keyboards.reply import admin_user_list_keyboard, admin_users_keyboard
@@ -20,34 +19,51 @@ from bot.keyboards.reply import admin_user_list_keyboard, admin_users_keyboard
 router = Router(name="admin_users_list")
 
 
+USERS_PER_PAGE = 10
+
+
 @router.message(F.text == "👥 Список пользователей")
 async def handle_list_users(
     message: Message,
     session: AsyncSession,
     state: FSMContext,
     page: int = 1,
+    after: str | None = None,
+    before: str | None = None,
     **data: Any,
 ) -> None:
-    """Show paginated list of users"""
+    """
+    Show paginated list of users (newest first).
+
+    Pages are loaded by keyset from the edge cursors of the current page,
+    which are kept in FSM data, so deep pages cost the same as the first.
+    """
     admin = await get_admin_or_deny(message, session, **data)
     if not admin:
         return
 
-    user_service = UserService(session)
-    limit = 10
-    offset = (page - 1) * limit
-
-    # Fetch users sorted by created_at desc
-    stmt = select(User).order_by(desc(User.created_at)).limit(limit).offset(offset)
-    result = await session.execute(stmt)
-    users = result.scalars().all()
-
-    total_users = await user_service.get_total_users()
-    total_pages = (total_users + limit - 1) // limit if total_users > 0 else 1
-
-    await state.update_data(current_user_list_page=page)
+    user_repo = UserRepository(session)
+    result = await user_repo.find_keyset(
+        after=after, before=before, limit=USERS_PER_PAGE
+    )
+    if not result.items and page > 1:
+        # Page emptied meanwhile: start over
+        page, after, before = 1, None, None
+        result = await user_repo.find_keyset(limit=USERS_PER_PAGE)
+
+    total_users = await user_repo.estimate_count()
+    total_pages = max(1, (total_users + USERS_PER_PAGE - 1) // USERS_PER_PAGE)
+    # Navigation follows the cursors, the estimate is only shown
+    total_pages = max(total_pages, page + 1) if result.has_next else page
+
+    await state.update_data(
+        current_user_list_page=page,
+        user_list_cursor={"after": after, "before": before},
+        user_list_first=result.first_cursor,
+        user_list_last=result.last_cursor,
+    )
 
-    if not users:
+    if not result.items:
         await message.answer(
             "👥 Пользователи не найдены.",
             reply_markup=admin_users_keyboard(),
@@ -60,7 +76,7 @@ async def handle_list_users(
     await message.answer(
         text,
         parse_mode="Markdown",
-        reply_markup=admin_user_list_keyboard(users, page, total_pages),
+        reply_markup=admin_user_list_keyboard(result.items, page, total_pages),
     )
 
 
@@ -77,11 +93,25 @@ async def handle_user_list_pagination(
     current_page = state_data.get("current_user_list_page", 1)
 
     if message.text == "⬅ Предыдущая":
-        page = max(1, current_page - 1)
+        if current_page <= 2 or not state_data.get("user_list_first"):
+            await handle_list_users(message, session, state, page=1, **data)
+            return
+        await handle_list_users(
+            message, session, state,
+            page=current_page - 1,
+            before=state_data["user_list_first"],
+            **data,
+        )
     else:
-        page = current_page + 1
-
-    await handle_list_users(message, session, state, page=page, **data)
+        if not state_data.get("user_list_last"):
+            await handle_list_users(message, session, state, page=1, **data)
+            return
+        await handle_list_users(
+            message, session, state,
+            page=current_page + 1,
+            after=state_data["user_list_last"],
+            **data,
+        )
 
 
 @router.message(F.text.regexp(r"^🆔 (\d+):"))
@@ -119,4 +149,11 @@ async def handle_back_to_list(
     """Return to list"""
     state_data = await state.get_data()
     page = state_data.get("current_user_list_page", 1)
-    await handle_list_users(message, session, state, page=page, **data)
+    cursor = state_data.get("user_list_cursor") or {}
+    await handle_list_users(
+        message, session, state,
+        page=page,
+        after=cursor.get("after"),
+        before=cursor.get("before"),
+        **data,
+    )
@@ -13,7 +13,6 @@ from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.user_service import UserService
 from bot.handlers.admin.utils.admin_checks import get_admin_or_deny
 from bot.states.admin_states import AdminStates
 from bot.utils.admin_utils import clear_state_preserve_admin_token
@@ -55,7 +54,8 @@ async def cmd_search_user(
             "Использование:\n"
             "`/search @username` - по юзернейму\n"
             "`/search 123456789` - по Telegram ID\n"
-            "`/search 0x...` - по адресу кошелька\n",
+            "`/search 0x...` - по адресу кошелька\n"
+            "`/search КОД` - по реферальному коду\n",
             parse_mode="Markdown",
         )
         return
@@ -137,14 +137,9 @@ async def process_find_user_input(
 
     identifier = message.text.strip()
 
-    # Try multiple search strategies using UserLoader
+    # Telegram ID, User ID, wallet, username or referral code in one query
     user = await UserLoader.search_user(session, identifier)
 
-    # If not found by standard search, try as User ID (database primary key)
-    if not user and identifier.isdigit():
-        user_service = UserService(session)
-        user = await user_service.get_by_id(int(identifier))
-
     if not user:
         await message.reply(
             "❌ **Пользователь не найден**\nПроверьте введенные данные и попробуйте снова.",
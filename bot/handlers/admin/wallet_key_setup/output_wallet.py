@@ -118,7 +118,7 @@ async def process_output_key(message: Message, state: FSMContext):
                     secure_zero_memory(text)
                     return
 
-                encrypted_seed = encryption_service.encrypt(text)
+                encrypted_seed = await encryption_service.encrypt_async(text)
                 if not encrypted_seed:
                     error_msg = (
                         "❌ **КРИТИЧЕСКАЯ ОШИБКА**\n"
@@ -189,7 +189,7 @@ async def process_output_key(message: Message, state: FSMContext):
         secure_zero_memory(text)
         return
 
-    encrypted_key = encryption_service.encrypt(private_key)
+    encrypted_key = await encryption_service.encrypt_async(private_key)
     if not encrypted_key:
         error_msg = (
             "❌ **КРИТИЧЕСКАЯ ОШИБКА**\n"
@@ -286,7 +286,7 @@ async def process_derivation_index(message: Message, state: FSMContext):
         await handle_wallet_menu(message, state)
         return
 
-    seed_phrase = encryption_service.decrypt(encrypted_seed)
+    seed_phrase = await encryption_service.decrypt_async(encrypted_seed)
     if not seed_phrase:
         await message.answer(
             "❌ Ошибка: Не удалось расшифровать "
@@ -330,7 +330,7 @@ async def process_derivation_index(message: Message, state: FSMContext):
             await handle_wallet_menu(message, state)
             return
 
-        encrypted_key = encryption_service.encrypt(private_key)
+        encrypted_key = await encryption_service.encrypt_async(private_key)
         if not encrypted_key:
             await message.answer(
                 "❌ Ошибка шифрования ключа. "
@@ -438,7 +438,7 @@ async def confirm_output_wallet(message: Message, state: FSMContext):
         await handle_wallet_menu(message, state)
         return
 
-    private_key = encryption_service.decrypt(encrypted_key)
+    private_key = await encryption_service.decrypt_async(encrypted_key)
     if not private_key:
         await message.answer("❌ Ошибка расшифровки ключа.")
         await state.update_data(
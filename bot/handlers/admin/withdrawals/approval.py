@@ -101,8 +101,12 @@ async def handle_confirm_withdrawal_action(
         if action == "approve":
             # Check maintenance mode
             from app.config.settings import settings
+            from app.services.runtime_flags import (
+                MAINTENANCE_MODE,
+                get_runtime_flags,
+            )
 
-            if settings.blockchain_maintenance_mode:
+            if await get_runtime_flags().get(MAINTENANCE_MODE):
                 await message.answer(
                     "⚠️ **Blockchain в режиме обслуживания**\n\n"
                     "Операции с блокчейном временно недоступны.",
@@ -167,11 +171,18 @@ async def handle_confirm_withdrawal_action(
             # CRITICAL: Send net_amount (amount - fee) to user, not gross amount
             # User requested 'amount', we deducted 'amount', but send 'amount - fee'
             net_amount = withdrawal.amount - withdrawal.fee
-            payment_result = await blockchain_service.send_payment(
-                withdrawal.to_address, net_amount
+            payment_result = await blockchain_service.send_withdrawal_payout(
+                withdrawal.to_address, net_amount, f"withdrawal:{withdrawal_id}"
             )
 
-            if not payment_result["success"]:
+            tx_hash = payment_result.get("tx_hash")
+            # Broadcast but not mined yet: record it, never send it again
+            pending = (
+                not payment_result["success"]
+                and bool(tx_hash)
+                and payment_result.get("status") == "pending"
+            )
+            if not payment_result["success"] and not pending:
                 error_msg = payment_result.get("error", "Неизвестная ошибка")
                 await message.answer(
                     f"❌ Ошибка отправки: {error_msg}",
@@ -179,7 +190,6 @@ async def handle_confirm_withdrawal_action(
                 )
                 return
 
-            tx_hash = payment_result["tx_hash"]
             admin_id = admin.id if admin else None
             success, error_msg = await withdrawal_service.approve_withdrawal(
                 withdrawal_id, tx_hash, admin_id
@@ -211,7 +221,11 @@ async def handle_confirm_withdrawal_action(
                 f"✅ **Заявка #{withdrawal_id} одобрена!**\n\n"
                 f"💰 Сумма: {format_usdt(withdrawal.amount)} USDT\n"
                 f"🔗 TX: `{tx_hash}`\n\n"
-                "Средства отправлены пользователю.",
+                + (
+                    "⏳ Транзакция отправлена, ожидает подтверждения в сети."
+                    if pending
+                    else "Средства отправлены пользователю."
+                ),
                 parse_mode="Markdown",
                 reply_markup=admin_withdrawals_keyboard(),
             )
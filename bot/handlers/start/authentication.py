@@ -31,7 +31,7 @@ from bot.keyboards.reply import (
     auth_wallet_input_keyboard,
     main_menu_reply_keyboard,
 )
-from bot.middlewares.session_middleware import SESSION_KEY_PREFIX, SESSION_TTL
+from bot.middlewares.update_gate import SESSION_KEY_PREFIX, SESSION_TTL
 from bot.states.auth import AuthStates
 
 
@@ -367,17 +367,20 @@ async def handle_wallet_input(
     )
 
     # Send QR code as photo
-    from aiogram.types import BufferedInputFile
-
-    from bot.utils.qr_generator import generate_payment_qr
-
-    qr_bytes = generate_payment_qr(system_wallet)
-    if qr_bytes:
-        qr_file = BufferedInputFile(qr_bytes, filename="payment_qr.png")
-        await message.answer_photo(
-            photo=qr_file,
-            caption=_('auth.qr_caption', system_wallet=system_wallet),
-            parse_mode="Markdown"
-        )
+    # The system wallet QR is the same for everyone: upload it once and
+    # resend it by file_id
+    from app.utils.cpu_offload import offload
+    from bot.utils.media_cache import MediaCache
+    from bot.utils.qr_generator import generate_payment_qr, payment_qr_media_key
+
+    media_cache = MediaCache(data.get("redis_client"), data.get("session"))
+    await media_cache.send_photo(
+        message,
+        payment_qr_media_key(system_wallet),
+        lambda: offload("qr", generate_payment_qr, system_wallet),
+        filename="payment_qr.png",
+        caption=_('auth.qr_caption', system_wallet=system_wallet),
+        parse_mode="Markdown"
+    )
 
     await state.set_state(AuthStates.waiting_for_payment)
@@ -22,7 +22,7 @@ from app.services.daily_payment_check_service import (
 )
 from bot.i18n.loader import get_translator, get_user_language
 from bot.keyboards.reply import main_menu_reply_keyboard
-from bot.middlewares.session_middleware import SESSION_KEY_PREFIX
+from bot.middlewares.update_gate import SESSION_KEY_PREFIX
 from bot.states.registration import RegistrationStates
 
 from . import messages
@@ -199,29 +199,35 @@ async def cmd_start(
 
                     # If not paid, send QR code for payment
                     if not payment_status.get("is_paid"):
-                        from aiogram.types import BufferedInputFile
-
-                        from bot.utils.qr_generator import generate_payment_qr
+                        from app.utils.cpu_offload import offload
+                        from bot.utils.media_cache import MediaCache
+                        from bot.utils.qr_generator import (
+                            generate_payment_qr,
+                            payment_qr_media_key,
+                        )
 
                         wallet_address = payment_status.get(
                             "wallet_address", ""
                         )
                         required_plex = payment_status.get("required_plex", 0)
 
-                        qr_bytes = generate_payment_qr(wallet_address)
-                        if qr_bytes:
-                            qr_file = BufferedInputFile(
-                                qr_bytes, filename="payment_qr.png"
-                            )
-                            await message.answer_photo(
-                                photo=qr_file,
-                                caption=(
-                                    f"📱 **QR-код для оплаты**\n\n"
-                                    f"Кошелёк:\n`{wallet_address}`\n\n"
-                                    f"Сумма: **{int(required_plex):,}** PLEX"
-                                ),
-                                parse_mode="Markdown",
-                            )
+                        media_cache = MediaCache(
+                            data.get("redis_client"), session
+                        )
+                        await media_cache.send_photo(
+                            message,
+                            payment_qr_media_key(wallet_address),
+                            lambda: offload(
+                                "qr", generate_payment_qr, wallet_address
+                            ),
+                            filename="payment_qr.png",
+                            caption=(
+                                f"📱 **QR-код для оплаты**\n\n"
+                                f"Кошелёк:\n`{wallet_address}`\n\n"
+                                f"Сумма: **{int(required_plex):,}** PLEX"
+                            ),
+                            parse_mode="Markdown",
+                        )
                         logger.info(
                             f"[START] Sent daily payment reminder to user "
                             f"{user.telegram_id}, required: {required_plex} "
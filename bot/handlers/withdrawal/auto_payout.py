@@ -61,8 +61,10 @@ async def process_auto_payout(
         f"amount {amount} to {masked_addr}"
     )
 
-    # Send payment (keep Decimal for precision)
-    result = await blockchain_service.send_payment(to_address, amount)
+    # Send payment (keep Decimal for precision), batched with concurrent payouts
+    result = await blockchain_service.send_withdrawal_payout(
+        to_address, amount, f"withdrawal:{tx_id}"
+    )
 
     async with async_session_maker() as session:
         stmt = select(Transaction).where(Transaction.id == tx_id)
@@ -99,6 +101,16 @@ async def process_auto_payout(
             except Exception as e:
                 logger.error(f"Failed to send auto-payout notification to {telegram_id}: {e}")
 
+        elif result.get("tx_hash") and result.get("status") == "pending":
+            # Broadcast but not mined yet: never revert it to PENDING (it
+            # would be paid again), the stuck transaction monitor follows up
+            logger.warning(
+                f"Auto-payout for tx {tx_id} broadcast, receipt pending: "
+                f"{result['tx_hash']}"
+            )
+            tx.tx_hash = result["tx_hash"]
+            tx.status = TransactionStatus.PROCESSING.value
+
         else:
             logger.error(f"Auto-payout failed for tx {tx_id}: {result.get('error')}")
             # Revert to PENDING for manual admin review
@@ -10,6 +10,7 @@ from aiogram import Dispatcher
 from loguru import logger
 
 from bot.middlewares.admin_auth_middleware import AdminAuthMiddleware
+from bot.middlewares.text_route_index import TextRouteIndex
 
 
 def register_user_handlers(dp: Dispatcher) -> None:
@@ -230,3 +231,7 @@ def register_all_handlers(dp: Dispatcher) -> None:
     register_user_handlers(dp)
     register_admin_handlers(dp)
     register_fallback_handlers(dp)
+
+    # Exact-text dispatch table for reply keyboard buttons.
+    # MUST be built after all routers are included
+    dp.message.outer_middleware(TextRouteIndex.build(dp))
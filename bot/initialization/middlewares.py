@@ -18,9 +18,9 @@ from bot.middlewares.error_handler import ErrorHandlerMiddleware
 from bot.middlewares.logger_middleware import LoggerMiddleware
 from bot.middlewares.menu_state_clear import MenuStateClearMiddleware
 from bot.middlewares.message_log_middleware import MessageLogMiddleware
-from bot.middlewares.rate_limit_middleware import RateLimitMiddleware
 from bot.middlewares.redis_middleware import RedisMiddleware
 from bot.middlewares.request_id import RequestIDMiddleware
+from bot.middlewares.update_gate import UpdateGateMiddleware
 
 
 def register_middlewares(dp: Dispatcher, redis_client) -> None:
@@ -31,15 +31,15 @@ def register_middlewares(dp: Dispatcher, redis_client) -> None:
     1. RequestID (PART5: must be first)
     2. Error handler
     3. Logger
-    4. Rate limiting (BEFORE Database to reduce DB load on spam)
+    4. Update gate: rate limiting, button cooldown, session and PLEX
+       check throttle in one Redis round trip (BEFORE Database to
+       reduce DB load on spam)
     5. Database
     6. Redis (if available)
-    7. Button spam protection (if Redis available)
-    8. Session (if Redis available)
-    9. Menu state clear
-    10. Auth
-    11. Ban
-    12. Message logging
+    7. Menu state clear
+    8. Auth
+    9. Ban
+    10. Message logging
 
     Args:
         dp: Dispatcher instance
@@ -53,40 +53,29 @@ def register_middlewares(dp: Dispatcher, redis_client) -> None:
 
     dp.update.middleware(LoggerMiddleware())
 
-    # Rate limiting (optional, requires Redis) - BEFORE Database
+    # Update gate - BEFORE Database
     # This prevents spam requests from hitting the database
-    # R11-2: RateLimitMiddleware now supports fallback to in-memory counters
+    # R11-2: Without Redis only in-memory rate limiting applies
     try:
         dp.update.middleware(
-            RateLimitMiddleware(
+            UpdateGateMiddleware(
                 redis_client=redis_client,  # Can be None for in-memory fallback
                 user_limit=USER_RATE_LIMIT,
                 user_window=RATE_LIMIT_WINDOW,
             )
         )
         if redis_client:
-            logger.info("Rate limiting enabled with Redis (before Database)")
+            logger.info("Update gate enabled with Redis (before Database)")
         else:
-            logger.info("Rate limiting enabled with in-memory fallback (before Database)")
+            logger.info("Update gate enabled with in-memory rate limit fallback (before Database)")
     except Exception as e:
-        logger.warning(f"Rate limiting disabled: {e}")
+        logger.warning(f"Update gate disabled: {e}")
 
     dp.update.middleware(DatabaseMiddleware(session_pool=async_session_maker))
 
     # Add Redis client to data for handlers that need it
     if redis_client:
         dp.update.middleware(RedisMiddleware(redis_client=redis_client))
-        # R13-2: Button spam protection (requires Redis)
-        from bot.middlewares.button_spam_protection import (
-            ButtonSpamProtectionMiddleware,
-        )
-        dp.update.middleware(
-            ButtonSpamProtectionMiddleware(redis_client=redis_client)
-        )
-
-        # Pay-to-Use Authorization Middleware
-        from bot.middlewares.session_middleware import SessionMiddleware
-        dp.update.middleware(SessionMiddleware(redis=redis_client))
 
     # Menu state clear must be after DatabaseMiddleware (needs session)
     # but before AuthMiddleware to clear state early
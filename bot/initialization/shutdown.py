@@ -3,14 +3,20 @@ Bot Initialization - Shutdown Module.
 
 Module: shutdown.py
 Handles graceful shutdown of the bot.
-Stops scheduler and closes database connections.
+Stops scheduler, flushes FSM storage and closes database connections.
 """
 
+from aiogram.fsm.storage.base import BaseStorage
 from loguru import logger
 
 
-async def shutdown_handler() -> None:
-    """Handle graceful shutdown."""
+async def shutdown_handler(storage: BaseStorage | None = None) -> None:
+    """
+    Handle graceful shutdown.
+
+    Args:
+        storage: FSM storage to close (flushes pending PostgreSQL writes)
+    """
     logger.info("Graceful shutdown initiated...")
 
     # Stop scheduler if running
@@ -22,6 +28,14 @@ async def shutdown_handler() -> None:
     except Exception as e:
         logger.warning(f"Error stopping scheduler: {e}")
 
+    # Close FSM storage before the database goes away
+    if storage is not None:
+        try:
+            await storage.close()
+            logger.info("FSM storage closed")
+        except Exception as e:
+            logger.warning(f"Error closing FSM storage: {e}")
+
     # Close database connections
     try:
         from app.config.database import engine
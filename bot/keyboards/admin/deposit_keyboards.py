@@ -145,6 +145,7 @@ def admin_roi_corridor_menu_keyboard() -> ReplyKeyboardMarkup:
     builder.row(KeyboardButton(text="📊 Текущие настройки"))
     builder.row(KeyboardButton(text="📜 История изменений"))
     builder.row(KeyboardButton(text="⏱ Настроить период начисления"))
+    builder.row(KeyboardButton(text="📈 Прогноз обязательств"))
     builder.row(
         KeyboardButton(text="◀️ Назад в управление депозитами")
     )
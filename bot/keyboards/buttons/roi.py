@@ -10,6 +10,7 @@ class ROICorridorButtons:
     CURRENT_SETTINGS = "📊 Текущие настройки"
     CHANGE_HISTORY = "📜 История изменений"
     CONFIGURE_ACCRUAL_PERIOD = "⏱ Настроить период начисления"
+    LIABILITY_PROJECTION = "📈 Прогноз обязательств"
 
     # Mode selection
     MODE_CUSTOM = "🎲 Custom (случайный из коридора)"
@@ -81,6 +81,14 @@ async def main() -> None:  # noqa: C901
     from app.services.bot_provider import set_bot_getter
     set_bot_getter(lambda: bot_instance)
 
+    # Shared Redis for wallet snapshots (user, admin and AI wallet views)
+    from app.services.wallet_snapshot_cache import set_snapshot_redis
+    set_snapshot_redis(redis_client)
+
+    # Shared Redis for ARIA tool quotas
+    from app.services.aria_security.rate_limiter import set_rate_limiter_redis
+    set_rate_limiter_redis(redis_client)
+
     # Initialize dispatcher with storage
     dp = Dispatcher(storage=storage)
 
@@ -169,6 +177,10 @@ async def main() -> None:  # noqa: C901
     except Exception as e:
         logger.warning(f"Failed to start health check server: {e}")
 
+    # Keep runtime flags (maintenance mode, emergency stops) in sync
+    from app.services.runtime_flags import get_runtime_flags
+    flags_task = asyncio.create_task(get_runtime_flags().listen())
+
     # Graceful shutdown event
 
     try:
@@ -178,7 +190,8 @@ async def main() -> None:  # noqa: C901
         logger.exception(f"Polling error: {e}")
         raise
     finally:
-        await shutdown_handler()
+        flags_task.cancel()
+        await shutdown_handler(storage)
         if redis_client:
             await redis_client.aclose()
         await bot.session.close()
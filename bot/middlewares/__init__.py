@@ -10,8 +10,8 @@ from bot.middlewares.ban_middleware import BanMiddleware
 from bot.middlewares.database import DatabaseMiddleware
 from bot.middlewares.logger_middleware import LoggerMiddleware
 from bot.middlewares.markdown_error_handler import MarkdownErrorHandlerMiddleware
-from bot.middlewares.rate_limit_middleware import RateLimitMiddleware
 from bot.middlewares.request_id import RequestIDMiddleware
+from bot.middlewares.update_gate import UpdateGateMiddleware
 
 
 __all__ = [
@@ -21,6 +21,6 @@ __all__ = [
     "DatabaseMiddleware",
     "LoggerMiddleware",
     "MarkdownErrorHandlerMiddleware",
-    "RateLimitMiddleware",
     "RequestIDMiddleware",
+    "UpdateGateMiddleware",
 ]
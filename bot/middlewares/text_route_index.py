@@ -0,0 +1,369 @@
+"""
+Text route index middleware.
+
+Precompiled dispatch table for reply-keyboard buttons. aiogram checks
+message handlers router by router, filter by filter; with hundreds of
+F.text == "..." filters a button press walks most of them. The index is
+built once at startup from the registered routers and maps exact button
+text (and FSM state) to the first handler that can match it, so the
+handler is called directly. Everything else goes through the regular
+router walk.
+
+Correctness rules:
+- Handlers are visited in aiogram propagation order; the first candidate
+  for (text, state) wins, as in the linear walk.
+- Handlers that may match a text without an exact literal (regexp,
+  startswith, commands, custom filters, state-only handlers) shadow that
+  text for their states: such updates use the regular walk.
+- The indexed handler's filters are still checked; if they fail or the
+  handler raises SkipHandler, the update falls back to the regular walk.
+"""
+
+import operator
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from inspect import isclass
+from types import SimpleNamespace
+from typing import Any
+
+from aiogram import BaseMiddleware, Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.dispatcher.event.handler import FilterObject, HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.filters import Command, StateFilter
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import Message, TelegramObject
+from loguru import logger
+from magic_filter.operations import (
+    ComparatorOperation,
+    FunctionOperation,
+    GetAttributeOperation,
+)
+from magic_filter.util import in_op
+
+
+# Message attributes that are never set on a plain text message
+NON_TEXT_CONTENT = frozenset(
+    {
+        "animation",
+        "audio",
+        "contact",
+        "document",
+        "location",
+        "photo",
+        "sticker",
+        "video",
+        "video_note",
+        "voice",
+    }
+)
+
+ANY_STATE = None  # states value of handlers without a state filter
+
+
+@dataclass(frozen=True)
+class TextRoute:
+    """Indexed handler with everything needed to call it directly."""
+
+    router: Router
+    handler: HandlerObject
+    middlewares: tuple[Any, ...]
+
+
+@dataclass
+class _HandlerSpec:
+    """What a message handler can match, derived from its filters."""
+
+    states: frozenset[str | None] | None = ANY_STATE
+    literals: frozenset[str] | None = None
+    predicates: list[Callable[[str], bool]] = field(default_factory=list)
+    never_text: bool = False
+
+    def may_match(self, text: str) -> bool:
+        """Whether the handler may match a message with this text."""
+        if self.literals is not None and text not in self.literals:
+            return False
+        return all(predicate(text) for predicate in self.predicates)
+
+
+@dataclass
+class _Entry:
+    """Candidate for a text in propagation order (route=None: shadowing)."""
+
+    states: frozenset[str | None] | None
+    route: TextRoute | None
+
+    def applies(self, state: str | None) -> bool:
+        return self.states is ANY_STATE or state in self.states
+
+
+class TextRouteIndex(BaseMiddleware):
+    """
+    Message outer middleware dispatching button presses by exact text.
+
+    Build with TextRouteIndex.build(dp) after all routers are included
+    and register on dp.message.outer_middleware.
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, tuple[dict[str | None, TextRoute | None], TextRoute | None]],
+    ) -> None:
+        """
+        Initialize index.
+
+        Args:
+            routes: Text -> (route per FSM state, route for other states);
+                None route means the regular walk must be used
+        """
+        super().__init__()
+        self.routes = routes
+
+    def __len__(self) -> int:
+        """Number of indexed texts."""
+        return len(self.routes)
+
+    def lookup(self, text: str, raw_state: str | None) -> TextRoute | None:
+        """
+        Find indexed handler for text in FSM state.
+
+        Args:
+            text: Message text
+            raw_state: Current FSM state
+
+        Returns:
+            Route or None if the regular walk must be used
+        """
+        entry = self.routes.get(text)
+        if entry is None:
+            return None
+        by_state, default = entry
+        return by_state.get(raw_state, default)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Call indexed handler directly or continue with the router walk."""
+        if not isinstance(event, Message) or event.text is None:
+            return await handler(event, data)
+
+        route = self.lookup(event.text, data.get("raw_state"))
+        if route is None:
+            return await handler(event, data)
+
+        kwargs = {**data, "event_router": route.router, "handler": route.handler}
+        passed, filter_data = await route.handler.check(event, **kwargs)
+        if not passed:
+            return await handler(event, data)
+        kwargs.update(filter_data)
+
+        wrapped = route.router.message.outer_middleware.wrap_middlewares(
+            route.middlewares, route.handler.call
+        )
+        try:
+            return await wrapped(event, kwargs)
+        except SkipHandler:
+            return await handler(event, data)
+
+    @classmethod
+    def build(cls, root: Router) -> "TextRouteIndex":
+        """
+        Build index from the message handlers of a router tree.
+
+        Args:
+            root: Dispatcher (or root router) with all routers included
+
+        Returns:
+            TextRouteIndex
+        """
+        entries: dict[str, list[_Entry]] = {}
+        # Handlers that may match texts without literals, in order
+        shadows: list[_HandlerSpec] = []
+
+        def add_entry(text: str, entry: _Entry) -> None:
+            if text not in entries:
+                # Text seen for the first time: earlier shadows still apply
+                entries[text] = [
+                    _Entry(spec.states, None)
+                    for spec in shadows
+                    if spec.may_match(text)
+                ]
+            entries[text].append(entry)
+
+        for router, handler, routable in _walk_message_handlers(root):
+            spec = _analyze(handler.filters or [])
+            if spec.never_text:
+                continue
+
+            if spec.literals is None or not routable:
+                shadows.append(spec)
+                for text, text_entries in entries.items():
+                    if spec.may_match(text):
+                        text_entries.append(_Entry(spec.states, None))
+                continue
+
+            route = TextRoute(
+                router=router,
+                handler=handler,
+                middlewares=tuple(router.message._resolve_middlewares()),
+            )
+            for text in spec.literals:
+                if spec.may_match(text):
+                    add_entry(text, _Entry(spec.states, route))
+
+        routes = {
+            text: _resolve(text_entries)
+            for text, text_entries in entries.items()
+        }
+        # Texts shadowed in every state gain nothing from the index
+        routes = {
+            text: entry
+            for text, entry in routes.items()
+            if entry[1] is not None or any(entry[0].values())
+        }
+
+        index = cls(routes)
+        logger.info(
+            f"Text route index: {len(index)} button texts, "
+            f"{len(shadows)} non-literal message handlers"
+        )
+        return index
+
+
+def _walk_message_handlers(
+    router: Router, routable: bool = True, root: bool = True
+) -> Iterable[tuple[Router, HandlerObject, bool]]:
+    """
+    Yield message handlers in aiogram propagation order.
+
+    Handlers below routers with their own message filters or outer
+    middlewares are not routable: those can skip the whole subtree.
+    """
+    observer: TelegramEventObserver = router.message
+    if observer._handler.filters or (observer.outer_middleware and not root):
+        routable = False
+
+    for handler in observer.handlers:
+        yield router, handler, routable
+    for sub_router in router.sub_routers:
+        yield from _walk_message_handlers(sub_router, routable, root=False)
+
+
+def _analyze(filters: list[FilterObject]) -> _HandlerSpec:
+    """Derive what a handler can match from its filters."""
+    spec = _HandlerSpec()
+
+    for filter_object in filters:
+        callback = filter_object.callback
+        magic = filter_object.magic
+
+        if magic is not None:
+            operations = magic._operations
+            first = operations[0] if operations else None
+            if not isinstance(first, GetAttributeOperation):
+                continue
+            if first.name == "text":
+                literals = _literals(operations)
+                if literals is not None:
+                    spec.literals = (
+                        literals
+                        if spec.literals is None
+                        else spec.literals & literals
+                    )
+                spec.predicates.append(_text_predicate(magic))
+            elif first.name in NON_TEXT_CONTENT and len(operations) == 1:
+                spec.never_text = True
+        elif isinstance(callback, Command):
+            prefixes = tuple(callback.prefix)
+            spec.predicates.append(lambda text, p=prefixes: text.startswith(p))
+        elif isinstance(callback, StateFilter | State) or (
+            isclass(callback) and issubclass(callback, StatesGroup)
+        ):
+            states = _states(callback)
+            if states is not ANY_STATE:
+                spec.states = (
+                    states if spec.states is ANY_STATE else spec.states & states
+                )
+        # Other filters may pass for any text: literal handlers are still
+        # candidates (filters are checked on dispatch), others shadow
+
+    return spec
+
+
+def _literals(operations: tuple[Any, ...]) -> frozenset[str] | None:
+    """Exact texts of F.text == "..." and F.text.in_(...) filters."""
+    if len(operations) != 2:
+        return None
+    operation = operations[1]
+    if (
+        isinstance(operation, ComparatorOperation)
+        and operation.comparator is operator.eq
+        and isinstance(operation.right, str)
+    ):
+        return frozenset({operation.right})
+    if (
+        isinstance(operation, FunctionOperation)
+        and operation.function is in_op
+        and not operation.kwargs
+        and isinstance(operation.args[0], list | tuple | set | frozenset)
+        and all(isinstance(item, str) for item in operation.args[0])
+    ):
+        return frozenset(operation.args[0])
+    return None
+
+
+def _text_predicate(magic: Any) -> Callable[[str], bool]:
+    """Evaluate a text-only magic filter on a bare text."""
+
+    def predicate(text: str) -> bool:
+        try:
+            return bool(magic.resolve(SimpleNamespace(text=text)))
+        except Exception:
+            # Filter needs more than text: assume it may match
+            return True
+
+    return predicate
+
+
+def _states(callback: Any) -> frozenset[str | None] | None:
+    """FSM states a state filter accepts (None = any state)."""
+    items = callback.states if isinstance(callback, StateFilter) else (callback,)
+    states: set[str | None] = set()
+    for item in items:
+        if isinstance(item, State):
+            item = item.state
+        if item == "*":
+            return ANY_STATE
+        if isinstance(item, str) or item is None:
+            states.add(item)
+        elif isinstance(item, StatesGroup) or (
+            isclass(item) and issubclass(item, StatesGroup)
+        ):
+            states.update(item.__all_states_names__)
+        else:
+            return ANY_STATE
+    return frozenset(states)
+
+
+def _resolve(
+    entries: list[_Entry],
+) -> tuple[dict[str | None, TextRoute | None], TextRoute | None]:
+    """Collapse ordered candidates into a per-state lookup table."""
+    default = next(
+        (entry.route for entry in entries if entry.states is ANY_STATE), None
+    )
+    mentioned = {
+        state
+        for entry in entries
+        if entry.states is not ANY_STATE
+        for state in entry.states
+    }
+    by_state = {
+        state: next(entry.route for entry in entries if entry.applies(state))
+        for state in mentioned
+    }
+    # States resolving like the default need no entry
+    return {s: r for s, r in by_state.items() if r is not default}, default
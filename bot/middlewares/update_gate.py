@@ -0,0 +1,438 @@
+"""
+Update gate middleware.
+
+Admission control for every update in a single Redis round trip: one Lua
+script (EVALSHA) atomically applies the per-user rate limit, the button
+cooldown, the Pay-to-Use session check with sliding TTL and the PLEX
+balance check throttle, and returns a compact verdict.
+
+Replaces the separate rate limit, button spam protection and session
+middlewares (6-8 sequential Redis commands per update).
+
+R11-2: Falls back to in-memory rate limiting when Redis is unavailable.
+"""
+
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from enum import IntEnum
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update
+from loguru import logger
+
+from app.config.operational_constants import RATE_LIMIT_WINDOW, USER_RATE_LIMIT
+from app.config.timing_constants import (
+    BUTTON_COOLDOWN_CRITICAL_SECONDS,
+    BUTTON_COOLDOWN_FINANCIAL_SECONDS,
+    BUTTON_COOLDOWN_NORMAL_SECONDS,
+    PLEX_BALANCE_CHECK_INTERVAL_SECONDS,
+    SESSION_TTL_SECONDS,
+)
+
+
+SESSION_TTL = SESSION_TTL_SECONDS  # 25 minutes
+SESSION_KEY_PREFIX = "auth_session:"
+PLEX_CHECK_INTERVAL = PLEX_BALANCE_CHECK_INTERVAL_SECONDS  # 1 hour between PLEX balance checks
+PLEX_CHECK_KEY_PREFIX = "plex_check:"
+RATE_LIMIT_KEY_PREFIX = "ratelimit:user:"
+BUTTON_COOLDOWN_KEY_PREFIX = "button_cooldown:"
+
+# KEYS: rate limit, button cooldown, session, PLEX check
+# ARGV: user limit, window (s), cooldown (ms, 0 = none),
+#       check session (0/1), session TTL (s), PLEX interval (s, 0 = skip)
+# Returns {verdict, request count, PLEX check due (0/1)}
+UPDATE_GATE_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count >= tonumber(ARGV[1]) then
+    return {1, count, 0}
+end
+count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+
+if tonumber(ARGV[3]) > 0 then
+    if not redis.call('SET', KEYS[2], '1', 'PX', ARGV[3], 'NX') then
+        return {2, count, 0}
+    end
+end
+
+if ARGV[4] == '1' then
+    -- EXPIRE doubles as the existence check
+    if redis.call('EXPIRE', KEYS[3], ARGV[5]) == 0 then
+        return {3, count, 0}
+    end
+end
+
+local plex_due = 0
+if tonumber(ARGV[6]) > 0 then
+    if redis.call('SET', KEYS[4], '1', 'EX', ARGV[6], 'NX') then
+        plex_due = 1
+    end
+end
+return {0, count, plex_due}
+"""
+
+
+class GateVerdict(IntEnum):
+    """Update gate script verdicts."""
+
+    ALLOW = 0
+    RATE_LIMITED = 1
+    COOLDOWN = 2
+    NO_SESSION = 3
+
+
+class UpdateGateMiddleware(BaseMiddleware):
+    """
+    Single round-trip admission middleware.
+
+    Responsibilities:
+    - Per-user rate limit (fixed window)
+    - R13-2: Cooldown on repeated clicks of the same button
+    - Pay-to-Use session check with sliding TTL
+    - Hourly PLEX balance check throttle
+
+    Without Redis only the rate limit applies (in-memory), as before.
+
+    Note: This middleware is registered on dp.update, so it receives
+    Update objects, not Message/CallbackQuery directly.
+    """
+
+    # Cooldown periods (in seconds)
+    COOLDOWN_NORMAL = BUTTON_COOLDOWN_NORMAL_SECONDS  # 500ms for normal actions
+    COOLDOWN_FINANCIAL = BUTTON_COOLDOWN_FINANCIAL_SECONDS  # 2 seconds for financial actions
+    COOLDOWN_CRITICAL = BUTTON_COOLDOWN_CRITICAL_SECONDS  # 3 seconds for critical operations
+
+    # Financial action patterns
+    FINANCIAL_PATTERNS = [
+        "withdrawal",
+        "deposit",
+        "balance",
+        "withdraw",
+        "finpass",
+        "financial",
+    ]
+
+    # Critical action patterns
+    CRITICAL_PATTERNS = [
+        "confirm",
+        "approve",
+        "delete",
+        "terminate",
+        "block",
+    ]
+
+    # Authorization buttons (Reply keyboard) allowed without session
+    AUTH_BUTTONS = {
+        "✅ Я оплатил",
+        "🔄 Проверить снова",
+        "❌ Отмена",
+        "🚀 Начать работу",
+        "🔄 Обновить депозит",
+    }
+
+    # Authorization callbacks allowed without session
+    AUTH_CALLBACKS = {"check_payment", "start_after_auth"}
+
+    def __init__(
+        self,
+        redis_client: Any | None = None,
+        user_limit: int = USER_RATE_LIMIT,
+        user_window: int = RATE_LIMIT_WINDOW,
+    ) -> None:
+        """
+        Initialize update gate middleware.
+
+        Args:
+            redis_client: Redis client (optional)
+            user_limit: Max requests per user
+            user_window: Time window in seconds
+        """
+        super().__init__()
+        self.redis_client = redis_client
+        self.user_limit = user_limit
+        self.user_window = user_window
+        self._script = (
+            redis_client.register_script(UPDATE_GATE_SCRIPT)
+            if redis_client
+            else None
+        )
+
+        # R11-2: In-memory fallback counters
+        # Structure: {user_id: [(timestamp, ...), ...]}
+        self._user_counts: dict[int, list[datetime]] = defaultdict(list)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Admit or drop update."""
+        user = data.get("event_from_user")
+        if not user:
+            return await handler(event, data)
+
+        actual_event = self._extract_event(event)
+
+        if not self._script:
+            if not self._check_in_memory_limit(user.id):
+                return None
+            return await handler(event, data)
+
+        callback_data = (
+            actual_event.data
+            if isinstance(actual_event, CallbackQuery)
+            else None
+        )
+        check_session = not self._is_session_exempt(actual_event)
+
+        try:
+            verdict, count, plex_due = await self._script(
+                keys=[
+                    f"{RATE_LIMIT_KEY_PREFIX}{user.id}",
+                    f"{BUTTON_COOLDOWN_KEY_PREFIX}{user.id}:{callback_data}",
+                    f"{SESSION_KEY_PREFIX}{user.id}",
+                    f"{PLEX_CHECK_KEY_PREFIX}{user.id}",
+                ],
+                args=[
+                    self.user_limit,
+                    self.user_window,
+                    self._get_cooldown_ms(callback_data),
+                    1 if check_session else 0,
+                    SESSION_TTL,
+                    PLEX_CHECK_INTERVAL if check_session else 0,
+                ],
+            )
+        except Exception as e:
+            # R11-2: Redis failed, fall back to in-memory rate limit
+            logger.warning(
+                f"R11-2: Redis error in update gate, using in-memory fallback: {e}"
+            )
+            if not self._check_in_memory_limit(user.id):
+                return None
+            return await handler(event, data)
+
+        if verdict == GateVerdict.RATE_LIMITED:
+            logger.warning(
+                f"R11-2: Rate limit exceeded for user {user.id}: "
+                f"{count}/{self.user_limit}"
+            )
+            # Silently ignore (don't waste resources responding)
+            return None
+
+        if verdict == GateVerdict.COOLDOWN:
+            logger.debug(
+                f"Button spam protection: user {user.id} clicked "
+                f"{callback_data} too soon"
+            )
+            # Answer callback to prevent loading state
+            try:
+                await actual_event.answer("⏳ Подождите немного", show_alert=False)
+            except Exception as e:
+                logger.debug(f"Operation failed: {e}")
+            return None
+
+        if verdict == GateVerdict.NO_SESSION:
+            if await self._in_auth_state(data):
+                return await handler(event, data)
+            logger.debug(f"UpdateGate: no session for user {user.id}")
+            await self._handle_session_expired(actual_event, data)
+            return None
+
+        if plex_due:
+            await self._check_plex_balance(actual_event, user.id)
+
+        return await handler(event, data)
+
+    def _extract_event(
+        self, event: TelegramObject
+    ) -> Message | CallbackQuery | None:
+        """
+        Extract Message or CallbackQuery from Update object.
+
+        If event is already Message/CallbackQuery, return as-is.
+        If event is Update, extract the inner message or callback.
+        """
+        if isinstance(event, Message | CallbackQuery):
+            return event
+        if isinstance(event, Update):
+            if event.message:
+                return event.message
+            if event.callback_query:
+                return event.callback_query
+            # Handle edited messages too
+            if event.edited_message:
+                return event.edited_message
+        return None
+
+    def _is_session_exempt(
+        self, actual_event: Message | CallbackQuery | None
+    ) -> bool:
+        """Whether the update is part of the authorization flow."""
+        if isinstance(actual_event, Message) and actual_event.text:
+            # Allow /start command always
+            if actual_event.text.startswith("/start"):
+                return True
+            return actual_event.text in self.AUTH_BUTTONS
+
+        if isinstance(actual_event, CallbackQuery):
+            return actual_event.data in self.AUTH_CALLBACKS
+
+        return False
+
+    async def _in_auth_state(self, data: dict[str, Any]) -> bool:
+        """Whether the user is in an auth or registration FSM state."""
+        state: FSMContext | None = data.get("state")
+        if not state:
+            return False
+
+        current_state = await state.get_state()
+        if not current_state:
+            return False
+
+        from bot.states.auth import AuthStates
+        from bot.states.registration import RegistrationStates
+
+        # Also allow registration states for new users completing registration
+        return current_state in {
+            AuthStates.waiting_for_wallet.state,
+            AuthStates.waiting_for_payment.state,
+            AuthStates.waiting_for_payment_wallet.state,
+            RegistrationStates.waiting_for_financial_password.state,
+            RegistrationStates.waiting_for_password_confirmation.state,
+        }
+
+    def _get_cooldown_ms(self, callback_data: str | None) -> int:
+        """
+        Get button cooldown for callback data.
+
+        Args:
+            callback_data: Callback data string (None for non-buttons)
+
+        Returns:
+            Cooldown in milliseconds (0 = no cooldown)
+        """
+        if not callback_data:
+            return 0
+
+        callback_lower = callback_data.lower()
+
+        if any(pattern in callback_lower for pattern in self.CRITICAL_PATTERNS):
+            cooldown = self.COOLDOWN_CRITICAL
+        elif any(pattern in callback_lower for pattern in self.FINANCIAL_PATTERNS):
+            cooldown = self.COOLDOWN_FINANCIAL
+        else:
+            cooldown = self.COOLDOWN_NORMAL
+
+        return int(cooldown * 1000)
+
+    def _check_in_memory_limit(self, user_id: int) -> bool:
+        """
+        Check rate limit using in-memory counters.
+
+        R11-2: Fallback when Redis is unavailable.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if within limit, False if exceeded
+        """
+        now = datetime.now(UTC)
+        cutoff = now - timedelta(seconds=self.user_window)
+        timestamps = [ts for ts in self._user_counts[user_id] if ts > cutoff]
+        self._user_counts[user_id] = timestamps
+
+        if len(timestamps) >= self.user_limit:
+            logger.warning(
+                f"R11-2: Rate limit exceeded for user {user_id} "
+                f"(in-memory fallback): {len(timestamps)}/{self.user_limit}"
+            )
+            return False
+
+        timestamps.append(now)
+        return True
+
+    async def _handle_session_expired(
+        self,
+        actual_event: Message | CallbackQuery | None,
+        data: dict[str, Any],
+    ) -> None:
+        """Handle expired session."""
+        if not actual_event:
+            logger.debug("UpdateGate: cannot send session expired - no actual event")
+            return
+
+        # Reset FSM
+        state: FSMContext | None = data.get("state")
+        if state:
+            await state.clear()
+
+        msg_text = (
+            "⏳ Сессия истекла\n\n"
+            "Для продолжения работы необходимо оплатить доступ.\n"
+            "Пожалуйста, введите /start для начала."
+        )
+
+        try:
+            if isinstance(actual_event, Message):
+                await actual_event.answer(msg_text)
+            elif isinstance(actual_event, CallbackQuery):
+                if actual_event.message:
+                    await actual_event.message.answer(msg_text)
+                await actual_event.answer()
+        except Exception as e:
+            logger.warning(f"Failed to send session expiration message: {e}")
+
+    async def _check_plex_balance(
+        self,
+        actual_event: Message | CallbackQuery | None,
+        user_id: int,
+    ) -> None:
+        """
+        Warn about insufficient PLEX (throttled by the gate script).
+
+        Only runs once per hour per user to avoid excessive blockchain calls.
+        The gate runs before the Database and Auth middlewares, so the user
+        is looked up in a session of its own.
+        """
+        if not actual_event:
+            return
+
+        try:
+            # Import here to avoid circular imports
+            from app.config.database import async_session_maker
+            from app.repositories.user_repository import UserRepository
+            from app.services.plex_payment_service import PlexPaymentService
+
+            async with async_session_maker() as session:
+                db_user = await UserRepository(session).get_by_telegram_id(
+                    user_id
+                )
+                if not db_user:
+                    return
+
+                # Get warning message if PLEX is insufficient
+                warning = await PlexPaymentService(
+                    session
+                ).get_insufficient_plex_message(db_user.id)
+
+            if warning:
+                # Send warning
+                try:
+                    if isinstance(actual_event, Message):
+                        await actual_event.answer(warning)
+                    elif isinstance(actual_event, CallbackQuery) and actual_event.message:
+                        await actual_event.message.answer(warning)
+                except Exception as e:
+                    logger.warning(f"Failed to send PLEX warning: {e}")
+
+                logger.warning(f"Insufficient PLEX balance for user {user_id}")
+
+        except Exception as e:
+            logger.error(f"PLEX balance check failed for user {user_id}: {e}")
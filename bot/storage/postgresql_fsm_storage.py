@@ -3,18 +3,37 @@ PostgreSQL FSM storage for aiogram.
 
 R11-3: Custom FSM storage using PostgreSQL when Redis is unavailable.
 Stores FSM states in user_fsm_states table.
+
+aiogram reads and writes state/data several times per update, so the
+storage keeps an in-process LRU of records and writes back: changed
+records are upserted in bulk every FSM_FLUSH_INTERVAL seconds and on
+close(). Reads within the process always see the latest writes. Rows are
+keyed by telegram_id, so no user lookup is needed (and users that are
+still registering keep their state).
 """
 
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Any
 
 from aiogram.fsm.state import State
 from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.config.constants import FSM_CACHE_SIZE, FSM_FLUSH_INTERVAL
 from app.config.database import async_session_maker
 from app.models.user_fsm_state import UserFsmState
-from app.repositories.user_repository import UserRepository
+
+
+@dataclass
+class _FsmRecord:
+    """Cached state and data of one user (data is replaced, never mutated)."""
+
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
 
 
 class PostgreSQLFSMStorage(BaseStorage):
@@ -25,13 +44,38 @@ class PostgreSQLFSMStorage(BaseStorage):
     Uses user_fsm_states table to persist states across restarts.
     """
 
-    def __init__(self) -> None:
-        """Initialize PostgreSQL FSM storage."""
-        self._session_factory = async_session_maker
+    def __init__(
+        self,
+        session_factory: Any = async_session_maker,
+        cache_size: int = FSM_CACHE_SIZE,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Initialize PostgreSQL FSM storage.
+
+        Args:
+            session_factory: Session factory
+            cache_size: Max storage keys kept in memory
+            flush_interval: Seconds between bulk upserts
+        """
+        self._session_factory = session_factory
+        self._cache_size = cache_size
+        self._flush_interval = flush_interval
+        self._cache: OrderedDict[StorageKey, _FsmRecord] = OrderedDict()
+        # Changed records by telegram_id, kept until flushed even if evicted
+        self._dirty: dict[int, _FsmRecord] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._closing = asyncio.Event()
 
     async def close(self) -> None:
-        """Close storage (no-op for PostgreSQL)."""
-        pass
+        """Stop periodic flushing and write pending changes."""
+        self._closing.set()
+        if self._flush_task is not None:
+            # Not cancelled: a flush in progress must finish its batch
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
 
     async def set_state(
         self,
@@ -45,55 +89,15 @@ class PostgreSQLFSMStorage(BaseStorage):
             key: Storage key (contains chat_id, user_id, etc.)
             state: State to set (None to clear)
         """
-        try:
-            async with self._session_factory() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_telegram_id(key.user_id)
-
-                if not user:
-                    logger.warning(
-                        f"R11-3: Cannot set FSM state for unknown user {key.user_id}"
-                    )
-                    return
-
-                # Get or create FSM state record
-                stmt = select(UserFsmState).where(
-                    UserFsmState.user_id == user.id
-                )
-                result = await session.execute(stmt)
-                fsm_state = result.scalar_one_or_none()
-
-                state_str = (
-                    state.state
-                    if isinstance(state, State)
-                    else str(state)
-                    if state
-                    else None
-                )
-
-                if fsm_state:
-                    # Update existing
-                    fsm_state.state = state_str
-                    await session.flush()
-                else:
-                    # Create new
-                    fsm_state = UserFsmState(
-                        user_id=user.id,
-                        state=state_str,
-                    )
-                    session.add(fsm_state)
-                    await session.flush()
-
-                await session.commit()
-                logger.debug(
-                    f"R11-3: Set FSM state for user {key.user_id}: {state_str}"
-                )
-
-        except Exception as e:
-            logger.error(
-                f"R11-3: Failed to set FSM state for user {key.user_id}: {e}",
-                exc_info=True,
-            )
+        record = await self._get_record(key)
+        record.state = (
+            state.state
+            if isinstance(state, State)
+            else str(state)
+            if state
+            else None
+        )
+        self._mark_dirty(key, record)
 
     async def get_state(
         self,
@@ -108,31 +112,7 @@ class PostgreSQLFSMStorage(BaseStorage):
         Returns:
             State string or None
         """
-        try:
-            async with self._session_factory() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_telegram_id(key.user_id)
-
-                if not user:
-                    return None
-
-                stmt = select(UserFsmState).where(
-                    UserFsmState.user_id == user.id
-                )
-                result = await session.execute(stmt)
-                fsm_state = result.scalar_one_or_none()
-
-                if fsm_state and fsm_state.state:
-                    return fsm_state.state
-
-                return None
-
-        except Exception as e:
-            logger.error(
-                f"R11-3: Failed to get FSM state for user {key.user_id}: {e}",
-                exc_info=True,
-            )
-            return None
+        return (await self._get_record(key)).state
 
     async def set_data(
         self,
@@ -146,50 +126,9 @@ class PostgreSQLFSMStorage(BaseStorage):
             key: Storage key
             data: Data dictionary
         """
-        try:
-            async with self._session_factory() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_telegram_id(key.user_id)
-
-                if not user:
-                    logger.warning(
-                        f"R11-3: Cannot set FSM data for unknown user {key.user_id}"
-                    )
-                    return
-
-                # Get or create FSM state record
-                stmt = select(UserFsmState).where(
-                    UserFsmState.user_id == user.id
-                )
-                result = await session.execute(stmt)
-                fsm_state = result.scalar_one_or_none()
-
-                if fsm_state:
-                    # Update existing
-                    if fsm_state.data:
-                        fsm_state.data.update(data)
-                    else:
-                        fsm_state.data = data
-                    await session.flush()
-                else:
-                    # Create new
-                    fsm_state = UserFsmState(
-                        user_id=user.id,
-                        data=data,
-                    )
-                    session.add(fsm_state)
-                    await session.flush()
-
-                await session.commit()
-                logger.debug(
-                    f"R11-3: Set FSM data for user {key.user_id}: {len(data)} keys"
-                )
-
-        except Exception as e:
-            logger.error(
-                f"R11-3: Failed to set FSM data for user {key.user_id}: {e}",
-                exc_info=True,
-            )
+        record = await self._get_record(key)
+        record.data = dict(data)
+        self._mark_dirty(key, record)
 
     async def get_data(
         self,
@@ -202,87 +141,145 @@ class PostgreSQLFSMStorage(BaseStorage):
             key: Storage key
 
         Returns:
-            Data dictionary
+            Data dictionary (copy)
         """
-        try:
-            async with self._session_factory() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_telegram_id(key.user_id)
-
-                if not user:
-                    return {}
-
-                stmt = select(UserFsmState).where(
-                    UserFsmState.user_id == user.id
-                )
-                result = await session.execute(stmt)
-                fsm_state = result.scalar_one_or_none()
-
-                if fsm_state and fsm_state.data:
-                    return fsm_state.data
-
-                return {}
-
-        except Exception as e:
-            logger.error(
-                f"R11-3: Failed to get FSM data for user {key.user_id}: {e}",
-                exc_info=True,
-            )
-            return {}
+        return dict((await self._get_record(key)).data)
 
     async def update_data(
         self,
         key: StorageKey,
         data: dict[str, Any],
-    ) -> None:
+    ) -> dict[str, Any]:
         """
         Update FSM data for user (merge with existing).
 
         Args:
             key: Storage key
             data: Data dictionary to merge
-        """
-        try:
-            async with self._session_factory() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_telegram_id(key.user_id)
 
-                if not user:
-                    logger.warning(
-                        f"R11-3: Cannot update FSM data for unknown user {key.user_id}"
+        Returns:
+            Merged data (copy)
+        """
+        record = await self._get_record(key)
+        record.data = {**record.data, **data}
+        self._mark_dirty(key, record)
+        return dict(record.data)
+
+    async def flush(self) -> None:
+        """Upsert all changed records in one statement."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            batch, self._dirty = self._dirty, {}
+            rows = [
+                {
+                    "telegram_id": telegram_id,
+                    "state": record.state,
+                    "data": record.data or None,
+                }
+                for telegram_id, record in batch.items()
+            ]
+
+            try:
+                async with self._session_factory() as session:
+                    stmt = pg_insert(UserFsmState).values(rows)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[UserFsmState.telegram_id],
+                        set_={
+                            "state": stmt.excluded.state,
+                            "data": stmt.excluded.data,
+                            "updated_at": func.now(),
+                        },
                     )
-                    return
-
-                # Get or create FSM state record
-                stmt = select(UserFsmState).where(
-                    UserFsmState.user_id == user.id
+                    await session.execute(stmt)
+                    await session.commit()
+            except Exception as e:
+                logger.error(
+                    f"R11-3: Failed to flush {len(rows)} FSM states: {e}",
+                    exc_info=True,
                 )
-                result = await session.execute(stmt)
-                fsm_state = result.scalar_one_or_none()
-
-                if fsm_state:
-                    # Update existing
-                    if fsm_state.data:
-                        fsm_state.data.update(data)
-                    else:
-                        fsm_state.data = data
-                    await session.flush()
-                else:
-                    # Create new
-                    fsm_state = UserFsmState(
-                        user_id=user.id,
-                        data=data,
-                    )
-                    session.add(fsm_state)
-                    await session.flush()
+                self._requeue(batch)
+                return
+            except BaseException:
+                # Cancelled mid-flush: the batch is not lost either
+                self._requeue(batch)
+                raise
+
+            logger.debug(f"R11-3: Flushed {len(rows)} FSM states")
+
+    async def _get_record(self, key: StorageKey) -> _FsmRecord:
+        """Cached record, loading it from the database on miss."""
+        record = self._cache.get(key)
+        if record is not None:
+            self._cache.move_to_end(key)
+            return record
+
+        record = self._dirty.get(key.user_id)
+        if record is None:
+            record = await self._load(key.user_id)
+            # A write may have landed while loading
+            record = (
+                self._cache.get(key)
+                or self._dirty.get(key.user_id)
+                or record
+            )
 
-                await session.commit()
-                logger.debug(
-                    f"R11-3: Updated FSM data for user {key.user_id}: {len(data)} keys"
-                )
+        self._remember(key, record)
+        return record
+
+    async def _load(self, telegram_id: int) -> _FsmRecord:
+        """
+        Load record from the database.
+
+        Returns:
+            Record (empty if no row)
 
+        Raises:
+            Exception: On database error. No record is handed out, so the
+                stored row is never overwritten with an empty one.
+        """
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(UserFsmState.state, UserFsmState.data).where(
+                        UserFsmState.telegram_id == telegram_id
+                    )
+                )
+                row = result.one_or_none()
         except Exception as e:
             logger.error(
-                f"R11-3: Failed to update FSM data for user {key.user_id}: {e}",
+                f"R11-3: Failed to load FSM state for user {telegram_id}: {e}",
                 exc_info=True,
             )
+            raise
+
+        if row is None:
+            return _FsmRecord()
+        return _FsmRecord(state=row.state, data=dict(row.data or {}))
+
+    def _remember(self, key: StorageKey, record: _FsmRecord) -> None:
+        """Put record into the LRU, evicting the least recently used."""
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _requeue(self, batch: dict[int, _FsmRecord]) -> None:
+        """Retry a batch with the next flush unless changed again meanwhile."""
+        for telegram_id, record in batch.items():
+            self._dirty.setdefault(telegram_id, record)
+
+    def _mark_dirty(self, key: StorageKey, record: _FsmRecord) -> None:
+        """Schedule record for the next flush."""
+        self._remember(key, record)
+        self._dirty[key.user_id] = record
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        """Flush changes every flush interval until the storage is closed."""
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), self._flush_interval)
+            except TimeoutError:
+                await self.flush()
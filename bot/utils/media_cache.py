@@ -0,0 +1,184 @@
+"""
+Telegram media cache.
+
+Generated and static media (payment QR codes, images) are uploaded once;
+the returned file_id is stored in Redis with the telegram_media table as
+durable fallback, and later sends reuse the file_id. Assets are keyed by
+a hash of their inputs (or content), so an asset is rendered again only
+when its inputs change.
+"""
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.constants import MEDIA_CACHE_REDIS_TTL
+from app.repositories.telegram_media_repository import TelegramMediaRepository
+
+
+MEDIA_CACHE_PREFIX = "media:file_id:"
+
+
+def media_key(kind: str, *inputs: Any) -> str:
+    """
+    Build the cache key of an asset.
+
+    Args:
+        kind: Asset kind (e.g. "payment_qr", "static")
+        *inputs: Everything the rendered asset depends on (or its bytes)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256(kind.encode())
+    for value in inputs:
+        data = value if isinstance(value, bytes) else repr(value).encode()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class MediaCache:
+    """Cache of Telegram file_ids of uploaded media."""
+
+    def __init__(
+        self,
+        redis_client: Any | None = None,
+        session: AsyncSession | None = None,
+    ) -> None:
+        """
+        Initialize media cache.
+
+        Args:
+            redis_client: Optional Redis client
+            session: Optional database session (durable fallback)
+        """
+        self.redis_client = redis_client
+        self.session = session
+
+    async def get_file_id(self, key: str) -> str | None:
+        """
+        Get the cached file_id of an asset (Redis, then database).
+
+        Args:
+            key: Asset key
+
+        Returns:
+            File_id or None if the asset was not uploaded yet
+        """
+        if self.redis_client:
+            try:
+                file_id = await self.redis_client.get(MEDIA_CACHE_PREFIX + key)
+                if file_id:
+                    return file_id.decode() if isinstance(file_id, bytes) else file_id
+            except Exception as e:
+                logger.debug(f"Media cache Redis read failed: {e}")
+
+        if self.session:
+            try:
+                async with self.session.begin_nested():
+                    file_id = await TelegramMediaRepository(
+                        self.session
+                    ).get_file_id(key)
+            except Exception as e:
+                logger.debug(f"Media cache DB read failed: {e}")
+                return None
+            if file_id:
+                await self._set_redis(key, file_id)
+            return file_id
+
+        return None
+
+    async def remember(self, key: str, media_type: str, file_id: str) -> None:
+        """
+        Store the file_id of an uploaded asset.
+
+        Args:
+            key: Asset key
+            media_type: Telegram media type
+            file_id: File_id returned by Telegram
+        """
+        await self._set_redis(key, file_id)
+        if self.session:
+            try:
+                async with self.session.begin_nested():
+                    await TelegramMediaRepository(self.session).save_file_id(
+                        key, media_type, file_id
+                    )
+            except Exception as e:
+                logger.warning(f"Media cache DB write failed: {e}")
+
+    async def forget(self, key: str) -> None:
+        """
+        Drop a cached file_id (e.g. rejected by Telegram).
+
+        Args:
+            key: Asset key
+        """
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(MEDIA_CACHE_PREFIX + key)
+            except Exception as e:
+                logger.debug(f"Media cache Redis delete failed: {e}")
+        if self.session:
+            try:
+                async with self.session.begin_nested():
+                    await TelegramMediaRepository(self.session).delete_file_id(key)
+            except Exception as e:
+                logger.warning(f"Media cache DB delete failed: {e}")
+
+    async def send_photo(
+        self,
+        message: Message,
+        key: str,
+        render: Callable[[], Awaitable[bytes | None]],
+        filename: str,
+        **kwargs: Any,
+    ) -> Message | None:
+        """
+        Answer with a cached photo, uploading it on first use.
+
+        Args:
+            message: Message to answer
+            key: Asset key (see media_key)
+            render: Produces the image bytes; only called on a cache miss
+            filename: Upload filename
+            **kwargs: Passed to answer_photo (caption, parse_mode, ...)
+
+        Returns:
+            Sent message, or None if the image could not be rendered
+        """
+        file_id = await self.get_file_id(key)
+        if file_id:
+            try:
+                return await message.answer_photo(photo=file_id, **kwargs)
+            except TelegramBadRequest as e:
+                if "file" not in str(e).lower():
+                    raise
+                logger.warning(f"Cached photo {key[:12]} rejected, re-uploading: {e}")
+                await self.forget(key)
+
+        image = await render()
+        if not image:
+            return None
+        sent = await message.answer_photo(
+            photo=BufferedInputFile(image, filename=filename), **kwargs
+        )
+        if sent.photo:
+            await self.remember(key, "photo", sent.photo[-1].file_id)
+        return sent
+
+    async def _set_redis(self, key: str, file_id: str) -> None:
+        if not self.redis_client:
+            return
+        try:
+            await self.redis_client.setex(
+                MEDIA_CACHE_PREFIX + key, MEDIA_CACHE_REDIS_TTL, file_id
+            )
+        except Exception as e:
+            logger.debug(f"Media cache Redis write failed: {e}")
@@ -11,10 +11,14 @@ from loguru import logger
 from qrcode.image.pil import PilImage
 
 
+QR_BOX_SIZE = 10  # Size of each box in pixels
+QR_BORDER = 2  # Border size in boxes
+
+
 def generate_wallet_qr(
     wallet_address: str,
-    box_size: int = 10,
-    border: int = 2,
+    box_size: int = QR_BOX_SIZE,
+    border: int = QR_BORDER,
 ) -> bytes | None:
     """
     Generate QR code image for a wallet address.
@@ -51,6 +55,25 @@ def generate_wallet_qr(
         return None
 
 
+def payment_qr_media_key(wallet_address: str) -> str:
+    """
+    Media cache key of the payment QR code of a wallet.
+
+    Includes the rendering parameters, so changing them re-renders.
+
+    Args:
+        wallet_address: Destination wallet address
+
+    Returns:
+        Media cache key
+    """
+    from bot.utils.media_cache import media_key
+
+    return media_key(
+        "payment_qr", wallet_address, QR_BOX_SIZE, QR_BORDER, "M", "png"
+    )
+
+
 def generate_payment_qr(
     wallet_address: str,
     token_address: str | None = None,
@@ -51,7 +51,7 @@ class SecureRedisStorage:
         try:
             # Encrypt value
             if self.encryption and self.encryption.enabled:
-                encrypted = self.encryption.encrypt(value)
+                encrypted = await self.encryption.encrypt_async(value)
                 if not encrypted:
                     logger.error(
                         f"Failed to encrypt secret for key: {key}"
@@ -99,7 +99,7 @@ class SecureRedisStorage:
 
             # Decrypt value
             if self.encryption and self.encryption.enabled:
-                decrypted = self.encryption.decrypt(encrypted)
+                decrypted = await self.encryption.decrypt_async(encrypted)
                 if not decrypted:
                     logger.error(
                         f"Failed to decrypt secret for key: {key}"
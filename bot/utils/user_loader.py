@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.admin import Admin
 from app.models.user import User
+from app.repositories.user_repository import UserRepository
 
 
 class UserLoader:
@@ -71,38 +72,21 @@ class UserLoader:
         query: str
     ) -> User | None:
         """
-        Search user by telegram_id, wallet address, or username.
+        Search user by exact telegram_id, user ID, wallet, username or referral code.
 
-        Tries multiple search strategies:
-        1. If starts with "0x" and length 42: search by wallet address
-        2. If numeric: search by telegram_id
-        3. Otherwise: search by username (strips @ if present)
+        One ranked query (telegram_id wins over user ID for numbers),
+        case-insensitive for text.
 
         Args:
             session: Database session
-            query: Search query (telegram_id, wallet, or username)
+            query: Search query (telegram_id, user ID, wallet, username or
+                referral code)
 
         Returns:
             User object or None if not found
         """
-        query = query.strip()
-
-        # Search by wallet address (BSC/BEP-20 format)
-        if query.startswith("0x") and len(query) == 42:
-            stmt = select(User).where(User.wallet_address == query)
-            result = await session.execute(stmt)
-            return result.scalar_one_or_none()
-
-        # Search by telegram_id (numeric)
-        if query.isdigit():
-            telegram_id = int(query)
-            return await UserLoader.get_user_by_telegram_id(session, telegram_id)
-
-        # Search by username (strip @ if present)
-        username = query.lstrip("@")
-        stmt = select(User).where(User.username == username)
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        users = await UserRepository(session).search(query, limit=1, exact=True)
+        return users[0] if users else None
 
     @staticmethod
     async def get_admin_by_telegram_id(
@@ -0,0 +1,326 @@
+"""
+Vectorized ROI projection for a whole deposit book.
+
+Simulates accruals of all active deposits at once with NumPy: every
+accrual period each deposit earns amount * rate / 100, capped to its
+remaining ROI - the same rule as ProfitabilityCalculator
+(calculate_daily_reward + cap_reward_to_remaining). Rates are fixed or
+drawn per deposit and period from the level corridor (Monte Carlo runs).
+
+Money is held as int64 fixed point in 1e-8 USDT (ledger precision,
+DECIMAL(18,8)) and rates in 1e-4 percent, so results are exact - equal
+to the Decimal single-deposit path - whenever the Decimal reward fits
+into 8 decimal places (always for amounts with up to 2 and rates with up
+to 4 decimals); finer remainders are truncated.
+
+Requires numpy (not imported by the calculator package itself).
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+
+MONEY_SCALE = 10**8  # 1e-8 USDT
+RATE_SCALE = 10**4  # 1e-4 percent
+CORRIDOR_QUANTUM = 100  # corridor rates are quantized to 0.01%
+
+# reward units = amount units * rate units / _REWARD_DIVISOR
+_REWARD_DIVISOR = 100 * RATE_SCALE
+
+# Corridor draw, as RoiCorridorService.generate_rate_from_corridor:
+# 60% lower third, 30% middle third, 10% upper third
+_BAND_MIDDLE = np.float32(0.6)
+_BAND_UPPER = np.float32(0.9)
+
+# Rate of a level: fixed percent or (min, max) corridor
+RateSpec = Decimal | tuple[Decimal, Decimal]
+
+
+def to_units(value: Decimal, scale: int) -> int:
+    """
+    Convert Decimal to fixed-point units.
+
+    Args:
+        value: Decimal value
+        scale: Units per 1 (MONEY_SCALE or RATE_SCALE)
+
+    Returns:
+        Integer units
+
+    Raises:
+        ValueError: If value has more precision than the scale
+    """
+    scaled = value * scale
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"{value} is not representable at 1/{scale}")
+    return int(scaled)
+
+
+def from_units(units: int | np.integer, scale: int = MONEY_SCALE) -> Decimal:
+    """
+    Convert fixed-point units to Decimal.
+
+    Args:
+        units: Integer units
+        scale: Units per 1
+
+    Returns:
+        Decimal value
+    """
+    return Decimal(int(units)) / scale
+
+
+@dataclass(frozen=True)
+class DepositBook:
+    """
+    Active deposits as parallel arrays (money in 1e-8 USDT units).
+
+    Attributes:
+        amount: Deposit amounts
+        level: Deposit levels
+        roi_paid: ROI already paid
+        roi_cap: ROI cap amounts
+    """
+
+    amount: np.ndarray
+    level: np.ndarray
+    roi_paid: np.ndarray
+    roi_cap: np.ndarray
+
+    @classmethod
+    def from_decimals(
+        cls, rows: Iterable[tuple[Decimal, int, Decimal, Decimal]]
+    ) -> "DepositBook":
+        """
+        Build book from Decimal rows.
+
+        Args:
+            rows: (amount, level, roi_paid, roi_cap) tuples
+
+        Returns:
+            DepositBook
+        """
+        amounts, levels, paid, caps = [], [], [], []
+        for amount, level, roi_paid, roi_cap in rows:
+            amounts.append(to_units(amount, MONEY_SCALE))
+            levels.append(level)
+            paid.append(to_units(roi_paid, MONEY_SCALE))
+            caps.append(to_units(roi_cap, MONEY_SCALE))
+
+        return cls(
+            amount=np.array(amounts, dtype=np.int64),
+            level=np.array(levels, dtype=np.int16),
+            roi_paid=np.array(paid, dtype=np.int64),
+            roi_cap=np.array(caps, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        """Number of deposits."""
+        return len(self.amount)
+
+
+@dataclass(frozen=True)
+class ProjectionResult:
+    """
+    Outcome of a book projection.
+
+    Attributes:
+        paid: Cumulative ROI paid since start, shape (runs, periods)
+        completion_period: Period (1-based) each deposit reaches its cap,
+            shape (runs, deposits); 0 = capped at start, -1 = not within
+            the horizon
+        outstanding_at_start: Remaining ROI of the book at start
+    """
+
+    paid: np.ndarray
+    completion_period: np.ndarray
+    outstanding_at_start: int
+
+    @property
+    def runs(self) -> int:
+        """Number of Monte Carlo runs."""
+        return self.paid.shape[0]
+
+    @property
+    def periods(self) -> int:
+        """Number of simulated accrual periods."""
+        return self.paid.shape[1]
+
+    def liability_curve(self) -> np.ndarray:
+        """
+        Remaining ROI obligations after each period.
+
+        Returns:
+            Array of shape (runs, periods) in money units
+        """
+        return self.outstanding_at_start - self.paid
+
+    def payout_percentiles(
+        self, percentiles: Sequence[float] = (5, 50, 95)
+    ) -> np.ndarray:
+        """
+        Percentiles of cumulative payouts across runs.
+
+        Args:
+            percentiles: Percentiles to compute (0-100)
+
+        Returns:
+            Array of shape (len(percentiles), periods) in money units
+        """
+        return np.percentile(
+            self.paid, percentiles, axis=0, method="lower"
+        ).astype(np.int64)
+
+    def completion_dates(
+        self, start: datetime, period_hours: int, run: int = 0
+    ) -> list[datetime | None]:
+        """
+        Cap completion time of every deposit in one run.
+
+        Args:
+            start: Projection start (period 0)
+            period_hours: Accrual period length
+            run: Run index
+
+        Returns:
+            Completion time per deposit (None if not within the horizon)
+        """
+        return [
+            start + timedelta(hours=period_hours * int(period))
+            if period >= 0 else None
+            for period in self.completion_period[run]
+        ]
+
+
+class PortfolioProjector:
+    """
+    Batch ROI simulator over a DepositBook.
+
+    Example:
+        >>> book = DepositBook.from_decimals(
+        ...     [(Decimal("1000"), 1, Decimal("0"), Decimal("5000"))]
+        ... )
+        >>> result = PortfolioProjector(book).project(
+        ...     {1: Decimal("1.117")}, periods=448
+        ... )
+        >>> int(result.completion_period[0, 0])
+        448
+    """
+
+    def __init__(self, book: DepositBook) -> None:
+        """
+        Initialize projector.
+
+        Args:
+            book: Deposits to simulate
+        """
+        self.book = book
+
+    def project(
+        self,
+        rates: Mapping[int, RateSpec],
+        periods: int,
+        runs: int = 1,
+        seed: int | None = None,
+    ) -> ProjectionResult:
+        """
+        Simulate accruals of the whole book.
+
+        Args:
+            rates: Rate per level - fixed percent or (min, max) corridor
+            periods: Number of accrual periods
+            runs: Monte Carlo runs (only matters with corridors)
+            seed: Random seed
+
+        Returns:
+            ProjectionResult
+
+        Raises:
+            ValueError: If a deposit level has no rate
+        """
+        book = self.book
+        missing = set(np.unique(book.level).tolist()) - set(rates)
+        if missing:
+            raise ValueError(f"No rate for levels {sorted(missing)}")
+
+        rng = np.random.default_rng(seed)
+        amount_high, amount_low = np.divmod(book.amount, _REWARD_DIVISOR)
+
+        # Per-deposit rate parameters in rate units
+        fixed_rate = np.zeros(len(book), dtype=np.int64)
+        corridor_min = np.zeros(len(book), dtype=np.float32)
+        corridor_span = np.zeros(len(book), dtype=np.float32)
+        is_corridor = np.zeros(len(book), dtype=bool)
+        for level, spec in rates.items():
+            columns = book.level == level
+            if isinstance(spec, tuple):
+                rate_min = to_units(spec[0], RATE_SCALE)
+                corridor_min[columns] = rate_min
+                corridor_span[columns] = to_units(spec[1], RATE_SCALE) - rate_min
+                is_corridor |= columns
+            else:
+                fixed_rate[columns] = max(to_units(spec, RATE_SCALE), 0)
+
+        remaining = np.broadcast_to(
+            np.maximum(book.roi_cap - book.roi_paid, 0), (runs, len(book))
+        ).copy()
+        completion = np.where(remaining == 0, 0, -1).astype(np.int32)
+        paid = np.zeros((runs, periods), dtype=np.int64)
+        total = np.zeros(runs, dtype=np.int64)
+        rate = np.broadcast_to(fixed_rate, remaining.shape)
+
+        for period in range(periods):
+            if not remaining.any():
+                paid[:, period:] = total[:, None]
+                break
+
+            if is_corridor.any():
+                rate = np.where(
+                    is_corridor,
+                    self._draw_corridor(
+                        rng, remaining.shape, corridor_min, corridor_span
+                    ),
+                    fixed_rate,
+                )
+
+            # amount * rate / 100 without int64 overflow
+            reward = amount_high * rate + amount_low * rate // _REWARD_DIVISOR
+            np.minimum(reward, remaining, out=reward)
+
+            remaining -= reward
+            total += reward.sum(axis=1)
+            paid[:, period] = total
+            completion[(remaining == 0) & (completion < 0)] = period + 1
+
+        return ProjectionResult(
+            paid=paid,
+            completion_period=completion,
+            outstanding_at_start=int(
+                np.maximum(book.roi_cap - book.roi_paid, 0).sum()
+            ),
+        )
+
+    @staticmethod
+    def _draw_corridor(
+        rng: np.random.Generator,
+        shape: tuple[int, int],
+        corridor_min: np.ndarray,
+        corridor_span: np.ndarray,
+    ) -> np.ndarray:
+        """Draw corridor rates in rate units, quantized to 0.01%."""
+        band = rng.random(shape, dtype=np.float32)
+        middle = band >= _BAND_MIDDLE
+        upper = band >= _BAND_UPPER
+        # Band starts 0 / 0.33 / 0.67, widths 0.33 / 0.34 / 0.33
+        fraction = middle * np.float32(0.33) + upper * np.float32(0.34)
+        fraction += rng.random(shape, dtype=np.float32) * (
+            np.float32(0.33) + (middle & ~upper) * np.float32(0.01)
+        )
+
+        raw = corridor_min + corridor_span * fraction
+        quantized = np.rint(raw / CORRIDOR_QUANTUM) * CORRIDOR_QUANTUM
+        return np.maximum(quantized, 0).astype(np.int64)
@@ -0,0 +1,55 @@
+# @version 0.3.10
+"""
+@title MultiTransfer
+@notice Batched ERC-20 payouts: one transaction fans the payout wallet's
+        tokens out to many recipients via transferFrom.
+@dev Deploy once, then approve this contract from the payout wallet
+     (USDT.approve(multisend, limit)) and set PAYOUT_MULTISEND_ENABLED=true
+     and PAYOUT_MULTISEND_CONTRACT_ADDRESS in .env.
+
+     Every leg carries an id (keccak of the bot's payout reference, e.g.
+     "withdrawal:123"). A leg id can be paid only once per sender: a batch
+     containing an already paid leg reverts, so a re-sent batch can never
+     pay twice. LegPaid links each leg id to its transaction.
+"""
+
+from vyper.interfaces import ERC20
+
+MAX_LEGS: constant(uint256) = 200
+
+event LegPaid:
+    legId: indexed(bytes32)
+    sender: indexed(address)
+    recipient: address
+    amount: uint256
+
+paid: public(HashMap[address, HashMap[bytes32, bool]])
+
+
+@view
+@external
+def paidMany(sender: address, legIds: DynArray[bytes32, MAX_LEGS]) -> DynArray[bool, MAX_LEGS]:
+    result: DynArray[bool, MAX_LEGS] = []
+    for legId in legIds:
+        result.append(self.paid[sender][legId])
+    return result
+
+
+@external
+def multiTransfer(
+    token: address,
+    legIds: DynArray[bytes32, MAX_LEGS],
+    recipients: DynArray[address, MAX_LEGS],
+    amounts: DynArray[uint256, MAX_LEGS],
+):
+    assert len(legIds) > 0, "empty batch"
+    assert len(legIds) == len(recipients), "length mismatch"
+    assert len(legIds) == len(amounts), "length mismatch"
+
+    for i in range(MAX_LEGS):
+        if i >= len(legIds):
+            break
+        assert not self.paid[msg.sender][legIds[i]], "leg already paid"
+        self.paid[msg.sender][legIds[i]] = True
+        assert ERC20(token).transferFrom(msg.sender, recipients[i], amounts[i]), "transfer failed"
+        log LegPaid(legIds[i], msg.sender, recipients[i], amounts[i])
@@ -63,6 +63,10 @@ case "$1" in
         echo -e "${GREEN}Starting Task Scheduler...${NC}"
         exec python -m jobs.scheduler
         ;;
+    chain_head)
+        echo -e "${GREEN}Starting Chain Head Tracker...${NC}"
+        exec python -m jobs.chain_head_tracker
+        ;;
     alembic)
         # Allow direct alembic command execution
         shift
@@ -80,7 +84,7 @@ case "$1" in
         ;;
     *)
         echo -e "${RED}Unknown command: $1${NC}"
-        echo "Usage: $0 {bot|worker|scheduler|alembic|python|dramatiq} [args...]"
+        echo "Usage: $0 {bot|worker|scheduler|chain_head|alembic|python|dramatiq} [args...]"
         exit 1
         ;;
 esac
@@ -0,0 +1,49 @@
+"""
+Chain head tracker process.
+
+Follows new BSC blocks and publishes them to the shared chain head
+stream (see app/services/blockchain/chain_head.py) for every scanner.
+Several instances may run; only the lease holder publishes.
+"""
+
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config.settings import settings  # noqa: E402
+from app.services.blockchain.chain_head import ChainHeadTracker  # noqa: E402
+from app.utils.redis_utils import get_redis_client  # noqa: E402
+
+
+async def main() -> None:
+    """Run the tracker until SIGTERM/SIGINT."""
+    shutdown_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, shutdown_event.set)
+
+    redis_client = await get_redis_client()
+    tracker = ChainHeadTracker(
+        redis_client,
+        http_url=settings.rpc_quicknode_http or settings.rpc_url,
+        wss_url=settings.rpc_quicknode_wss,
+    )
+    task = asyncio.create_task(tracker.run())
+    try:
+        await shutdown_event.wait()
+    finally:
+        logger.info("Shutting down chain head tracker...")
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
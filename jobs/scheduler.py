@@ -371,6 +371,10 @@ if __name__ == "__main__":
         # Health check server components
         health_runner = None
 
+        # Keep runtime flags (maintenance mode, emergency stops) in sync
+        from app.services.runtime_flags import get_runtime_flags
+        flags_task = asyncio.create_task(get_runtime_flags().listen())
+
         try:
             # Start scheduler
             scheduler.start()
@@ -394,6 +398,7 @@ if __name__ == "__main__":
         finally:
             # Graceful shutdown
             logger.info("Shutting down scheduler...")
+            flags_task.cancel()
 
             # Stop health check server
             if health_runner is not None:
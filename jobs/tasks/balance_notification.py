@@ -45,8 +45,9 @@ def send_balance_notifications() -> dict:
 
     This task:
     1. Gets all users with active work status and confirmed deposits
-    2. For each user, calculates their statistics
-    3. Sends a formatted notification with earnings info
+    2. Calculates statistics for the whole cohort
+    3. Sends formatted notifications through the rate-shaped delivery
+       queue (a retry within the same hour resumes the run)
 
     Returns:
         {
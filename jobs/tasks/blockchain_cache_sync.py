@@ -12,6 +12,9 @@ from loguru import logger
 from web3 import Web3
 
 from app.config.settings import settings
+from app.services.blockchain.chain_head import follow_head
+from app.services.runtime_flags import MAINTENANCE_MODE, get_runtime_flags
+from app.utils.redis_utils import redis_or_short_lived
 from jobs.async_runner import run_async
 from jobs.utils.database import task_engine, task_session_maker
 
@@ -21,7 +24,8 @@ def sync_blockchain_cache() -> None:
     """
     Sync new blocks to local transaction cache.
 
-    Runs every 30 seconds to keep cache up-to-date.
+    Runs every 30 seconds to keep cache up-to-date; a run without a new
+    chain head since the last one does nothing.
     """
     logger.debug("Starting blockchain cache sync...")
     try:
@@ -35,7 +39,7 @@ async def _sync_cache_async() -> None:
     """Async implementation of cache sync."""
 
     # Check maintenance mode
-    if settings.blockchain_maintenance_mode:
+    if await get_runtime_flags().get(MAINTENANCE_MODE):
         logger.warning("Blockchain maintenance mode active. Skipping cache sync.")
         return
 
@@ -46,24 +50,36 @@ async def _sync_cache_async() -> None:
         rpc_url = settings.rpc_quicknode_http or settings.rpc_url
         w3 = Web3(Web3.HTTPProvider(rpc_url))
 
-        if not w3.is_connected():
-            logger.error("[RT Sync] Failed to connect to RPC")
-            return
-
-        try:
-            async with task_session_maker() as session:
-                sync_service = BlockchainRealtimeSyncService(session, w3)
-                results = await sync_service.sync_all_tokens()
-
-                total = sum(results.values())
-                if total > 0:
-                    logger.info(f"[RT Sync] Cached {total} new transactions: {results}")
-
-                    # Sync user deposits if new USDT transactions found
-                    if results.get("USDT", 0) > 0:
+        async with redis_or_short_lived(None, "Cache sync") as redis_client:
+            # Follows the chain head stream: saves eth_blockNumber and
+            # skips the run (no DB, no RPC) when no block arrived
+            cursor, head = await follow_head(redis_client, "blockchain_cache_sync")
+            if cursor is not None and head is None:
+                logger.debug("[RT Sync] No new chain head since last run")
+                return
+            if head is None and not w3.is_connected():
+                logger.error("[RT Sync] Failed to connect to RPC")
+                return
+
+            try:
+                async with task_session_maker() as session:
+                    sync_service = BlockchainRealtimeSyncService(session, w3)
+                    results = await sync_service.sync_all_tokens(current_block=head)
+
+                    total = sum(results.values())
+                    if total > 0:
+                        logger.info(f"[RT Sync] Cached {total} new transactions: {results}")
+
+                    # User totals count confirmed transfers only: resync when
+                    # transfers were confirmed or rolled back by a reorg
+                    guard = sync_service.reorg_guard
+                    if guard.finalized > 0 or guard.last_fork is not None:
                         await _sync_user_deposits(task_session_maker)
-        finally:
-            await task_engine.dispose()
+            finally:
+                await task_engine.dispose()
+
+            if cursor:
+                await cursor.commit()
 
     except asyncio.CancelledError:
         logger.info("[RT Sync] Task cancelled")
@@ -74,7 +90,7 @@ async def _sync_cache_async() -> None:
 
 
 async def _sync_user_deposits(session_maker) -> None:
-    """Sync users' total_deposited_usdt with cache after new transactions."""
+    """Sync users' total_deposited_usdt with confirmed cached transactions."""
     from decimal import Decimal
 
     from sqlalchemy import func, select
@@ -96,6 +112,7 @@ async def _sync_user_deposits(session_maker) -> None:
                     func.lower(BlockchainTxCache.from_address) == wallet,
                     BlockchainTxCache.token_type == "USDT",
                     BlockchainTxCache.direction == "incoming",
+                    BlockchainTxCache.status == "confirmed",
                 )
                 result = await session.execute(sum_query)
                 cache_total = result.scalar() or Decimal("0")
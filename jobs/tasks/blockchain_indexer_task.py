@@ -15,7 +15,9 @@ import asyncio
 from loguru import logger
 
 from app.config.database import async_session_maker
+from app.services.blockchain.chain_head import follow_head
 from app.services.blockchain_indexer_service import BlockchainIndexerService
+from app.utils.redis_utils import redis_or_short_lived
 
 
 async def run_blockchain_indexer() -> dict:
@@ -23,7 +25,8 @@ async def run_blockchain_indexer() -> dict:
     Main indexer task - monitors new blocks.
 
     Should run every 30 seconds for near real-time updates.
-    Very cheap after initial indexing (typically 0-5 new txs per run).
+    Very cheap after initial indexing (typically 0-5 new txs per run);
+    a run without a new chain head since the last one does nothing.
 
     Returns:
         Dict with indexing results
@@ -36,7 +39,16 @@ async def run_blockchain_indexer() -> dict:
     }
 
     try:
-        async with async_session_maker() as session:
+        async with (
+            redis_or_short_lived(None, "Blockchain indexer") as redis_client,
+            async_session_maker() as session,
+        ):
+            # Triggered by new heads: nothing to index if no block arrived
+            cursor, head = await follow_head(redis_client, "blockchain_indexer")
+            if cursor is not None and head is None:
+                results["success"] = True
+                return results
+
             # Get Web3 instance
             from app.services.blockchain_service import get_blockchain_service
 
@@ -62,7 +74,9 @@ async def run_blockchain_indexer() -> dict:
                     results["errors"].append(usdt_result.get("error", "USDT failed"))
             else:
                 # Just monitor new blocks
-                monitor_result = await indexer.monitor_new_blocks()
+                monitor_result = await indexer.monitor_new_blocks(
+                    latest_block=head
+                )
                 results["usdt"] = monitor_result.get("usdt", 0)
                 results["plex"] = monitor_result.get("plex", 0)
                 if monitor_result.get("errors"):
@@ -77,6 +91,8 @@ async def run_blockchain_indexer() -> dict:
                     results["errors"].append(plex_result.get("error", "PLEX failed"))
 
             results["success"] = len(results["errors"]) == 0
+            if cursor and results["success"]:
+                await cursor.commit()
 
             total = results["usdt"] + results["plex"]
             if total > 0:
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import dramatiq
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 try:
@@ -16,6 +17,10 @@ except ImportError:
 from app.config.database import async_session_maker
 from app.config.operational_constants import DRAMATIQ_TIME_LIMIT_STANDARD
 from app.config.settings import settings
+from app.repositories.deposit_repository import DepositRepository
+from app.services.partition_maintenance_service import (
+    PartitionMaintenanceService,
+)
 from app.utils.datetime_utils import utc_now
 from app.utils.distributed_lock import DistributedLock
 from app.utils.redis_utils import get_redis_client
@@ -28,8 +33,8 @@ def cleanup_logs_and_data() -> None:
     Cleanup old logs and orphaned data.
 
     - Deletes old log files (>7 days)
-    - Removes orphaned pending deposits (>24 hours)
-    - Cleans up old sessions
+    - Removes pending deposits abandoned before payment (>24 hours)
+    - Drops expired log partitions and creates upcoming ones
     """
     logger.info("Starting cleanup task...")
 
@@ -97,32 +102,14 @@ async def _cleanup_log_files() -> None:
 
 
 async def _cleanup_database() -> None:
-    """Cleanup orphaned database records."""
+    """Cleanup abandoned deposits and expired log partitions."""
     session = None
     try:
         async with async_session_maker() as session:
-            # Cleanup orphaned pending deposits (>24 hours old)
-            from app.repositories.deposit_repository import DepositRepository
+            await _delete_abandoned_deposits(session)
 
-            deposit_repo = DepositRepository(session)
-
-            cutoff_time = utc_now() - timedelta(hours=24)
-
-            # Find old pending deposits
-            deposits = await deposit_repo.get_pending_deposits()
-
-            deleted_count = 0
-
-            for deposit in deposits:
-                if deposit.created_at < cutoff_time:
-                    # FIXED: Use session.delete for direct deletion (sync method)
-                    session.delete(deposit)
-                    deleted_count += 1
-
-            if deleted_count > 0:
-                logger.info(
-                    f"Deleted {deleted_count} orphaned pending deposits"
-                )
+            # Retention of log tables: drop/detach whole partitions
+            await PartitionMaintenanceService(session).maintain()
 
             await session.commit()
 
@@ -131,3 +118,32 @@ async def _cleanup_database() -> None:
             await session.rollback()
         logger.error(f"Database cleanup error: {e}")
         raise  # For dramatiq retry
+
+
+
+async def _delete_abandoned_deposits(session: AsyncSession) -> int:
+    """
+    Delete pending deposits abandoned before payment (>24 hours old).
+
+    Runs in its own savepoint: a failure is logged and does not roll back
+    partition maintenance.
+
+    Args:
+        session: Database session (the caller commits)
+
+    Returns:
+        Number of deleted deposits
+    """
+    cutoff_time = utc_now() - timedelta(hours=24)
+    try:
+        async with session.begin_nested():
+            deleted_count = await DepositRepository(
+                session
+            ).delete_abandoned_pending(cutoff_time)
+    except Exception as e:
+        logger.error(f"Abandoned deposit cleanup failed: {e}")
+        return 0
+
+    if deleted_count > 0:
+        logger.info(f"Deleted {deleted_count} abandoned pending deposits")
+    return deleted_count
@@ -74,76 +74,92 @@ async def _process_daily_rewards_async(
             logger.warning(f"Failed to create Redis client for lock: {e}")
 
     # Use distributed lock to prevent concurrent reward processing
-    lock = DistributedLock(redis_client=redis_client)
-
-    # Use different lock keys for specific session vs all sessions
-    lock_key = f"daily_rewards_session_{session_id}" if session_id else "daily_rewards_processing"
-
-    async with lock.lock(lock_key, timeout=60):
-        try:
-            async with async_session_maker() as session:
-                reward_service = RewardService(session)
-
-                # If session_id provided, process that session
-                if session_id:
-                    (
-                        success,
-                        calculated,
-                        total,
-                        error,
-                    ) = await reward_service.calculate_rewards_for_session(session_id)
+    # (PostgreSQL fallback so that a Redis outage cannot run it twice)
+    async with async_session_maker() as lock_session:
+        lock = DistributedLock(redis_client=redis_client, session=lock_session)
+
+        # Use different lock keys for specific session vs all sessions
+        lock_key = f"daily_rewards_session_{session_id}" if session_id else "daily_rewards_processing"
+
+        # Renewed while rewards are processed, however long it takes
+        async with lock.lock(lock_key, timeout=60, auto_renew=True) as lease:
+            if not lease:
+                logger.warning(
+                    f"Daily rewards already running ({lock_key}), skipping"
+                )
+                if redis_client:
+                    await redis_client.close()
+                return {
+                    "success": True,
+                    "rewards_calculated": 0,
+                    "total_amount": 0,
+                    "skipped": True,
+                }
 
-                    return {
-                        "success": success,
-                        "rewards_calculated": calculated,
-                        "total_amount": float(total),
-                        "error": error,
-                    }
+            try:
+                async with async_session_maker() as session:
+                    reward_service = RewardService(session)
+
+                    # If session_id provided, process that session
+                    if session_id:
+                        (
+                            success,
+                            calculated,
+                            total,
+                            error,
+                        ) = await reward_service.calculate_rewards_for_session(session_id)
+
+                        return {
+                            "success": success,
+                            "rewards_calculated": calculated,
+                            "total_amount": float(total),
+                            "error": error,
+                        }
+
+                    # Otherwise, process all active sessions
+                    active_sessions = await reward_service.get_active_sessions()
+
+                    if not active_sessions:
+                        logger.info("No active reward sessions found")
+                        return {
+                            "success": True,
+                            "rewards_calculated": 0,
+                            "total_amount": 0,
+                        }
+
+                    total_calculated = 0
+                    total_amount_sum = 0.0
+
+                    for session_obj in active_sessions:
+                        (
+                            success,
+                            calculated,
+                            total,
+                            error,
+                        ) = await reward_service.calculate_rewards_for_session(
+                            session_obj.id
+                        )
 
-                # Otherwise, process all active sessions
-                active_sessions = await reward_service.get_active_sessions()
+                        if success:
+                            total_calculated += calculated
+                            total_amount_sum += float(total)
+                        else:
+                            logger.error(
+                                f"Failed to process session {session_obj.id}: {error}"
+                            )
 
-                if not active_sessions:
-                    logger.info("No active reward sessions found")
                     return {
                         "success": True,
-                        "rewards_calculated": 0,
-                        "total_amount": 0,
+                        "rewards_calculated": total_calculated,
+                        "total_amount": total_amount_sum,
                     }
-
-                total_calculated = 0
-                total_amount_sum = 0.0
-
-                for session_obj in active_sessions:
-                    (
-                        success,
-                        calculated,
-                        total,
-                        error,
-                    ) = await reward_service.calculate_rewards_for_session(
-                        session_obj.id
-                    )
-
-                    if success:
-                        total_calculated += calculated
-                        total_amount_sum += float(total)
-                    else:
-                        logger.error(
-                            f"Failed to process session {session_obj.id}: {error}"
-                        )
-
-                return {
-                    "success": True,
-                    "rewards_calculated": total_calculated,
-                    "total_amount": total_amount_sum,
-                }
-        except asyncio.CancelledError:
-            logger.info("Daily rewards task cancelled")
-            raise
-        except Exception as e:
-            logger.exception(f"Daily rewards task failed: {e}")
-            raise
-        finally:
-            # Close Redis client
-            if redis_client:
-                await redis_client.close()
+            except asyncio.CancelledError:
+                logger.info("Daily rewards task cancelled")
+                raise
+            except Exception as e:
+                logger.exception(f"Daily rewards task failed: {e}")
+                raise
+            finally:
+                # Close Redis client
+                if redis_client:
+                    await redis_client.close()
@@ -25,6 +25,7 @@ from app.repositories.deposit_repository import DepositRepository
 from app.services.blockchain_service import get_blockchain_service
 from app.services.deposit import DepositService
 from app.services.notification_service import NotificationService
+from app.services.runtime_flags import MAINTENANCE_MODE, get_runtime_flags
 from app.utils.distributed_lock import DistributedLock
 from jobs.async_runner import run_async
 from jobs.utils.database import task_engine, task_session_maker
@@ -36,7 +37,7 @@ def monitor_deposits() -> None:
     Monitor pending deposits for blockchain confirmations.
 
     Checks all pending deposits against blockchain, confirms deposits
-    with sufficient confirmations (e.g., 12 blocks on BSC).
+    with sufficient confirmations (settings.blockchain_confirmation_depth).
     """
     logger.info("Starting deposit monitoring...")
 
@@ -85,7 +86,7 @@ async def _monitor_deposits_async() -> None:
                     recovery_confirmed = 0
                     recovery_still_pending = 0
 
-                    if not settings.blockchain_maintenance_mode:
+                    if not await get_runtime_flags().get(MAINTENANCE_MODE):
                         from sqlalchemy import select
                         from sqlalchemy.orm import selectinload
 
@@ -339,7 +340,8 @@ async def _monitor_deposits_async() -> None:
                             # If confirmed with sufficient confirmations
                             if (
                                 tx_status.get("status") == "confirmed"
-                                and tx_status.get("confirmations", 0) >= 12
+                                and tx_status.get("confirmations", 0)
+                                >= settings.blockchain_confirmation_depth
                             ):
                                 # Confirm deposit
                                 block_number = tx_status.get("block_number", 0)
@@ -3,6 +3,8 @@ Incoming transfer monitor task.
 
 Scans blockchain for all incoming transfers to system wallet.
 Runs frequently (e.g. every minute) to catch deposits without explicit user action.
+Only blocks at or below the confirmation watermark are scanned, so a
+deposit is never created from a transfer a reorg can still remove.
 """
 
 from decimal import Decimal
@@ -19,8 +21,11 @@ except ImportError:
     redis = None  # type: ignore
 
 from app.config.settings import settings
+from app.services.blockchain.chain_head import follow_head
+from app.services.blockchain.reorg_guard import get_confirmation_watermark
 from app.services.blockchain_service import get_blockchain_service
 from app.services.incoming_deposit_service import IncomingDepositService
+from app.services.runtime_flags import MAINTENANCE_MODE, get_runtime_flags
 from app.utils.distributed_lock import DistributedLock
 
 
@@ -41,7 +46,7 @@ async def _monitor_incoming_async() -> None:
     """Async implementation."""
 
     # Check if maintenance mode is active
-    if settings.blockchain_maintenance_mode:
+    if await get_runtime_flags().get(MAINTENANCE_MODE):
         logger.warning("Blockchain maintenance mode active. Skipping incoming monitor.")
         return
 
@@ -64,6 +69,12 @@ async def _monitor_incoming_async() -> None:
 
     async with lock.lock("incoming_transfer_monitoring", timeout=300):
         try:
+            # Triggered by new heads: nothing to scan if no block arrived
+            cursor, head = await follow_head(redis_client, "incoming_transfer_monitor")
+            if cursor is not None and head is None:
+                logger.debug("No new chain head since last run")
+                return
+
             # Use global engine and session maker
             from app.config.database import async_session_maker
 
@@ -81,9 +92,16 @@ async def _monitor_incoming_async() -> None:
                     except Exception as e:
                         logger.warning(f"Failed to get last_scanned_block from Redis: {e}")
 
-                current_block = await blockchain.get_block_number()
+                if head is None:
+                    head = await blockchain.get_block_number()
+                current_block = get_confirmation_watermark(head)
 
                 # Determine scan range
+                if last_scanned and int(last_scanned) >= current_block:
+                    logger.debug("No new blocks since last scan")
+                    if cursor:
+                        await cursor.commit()
+                    return
                 if last_scanned:
                     from_block = int(last_scanned) + 1
                     logger.info(f"Resuming from block {from_block}")
@@ -177,6 +195,9 @@ async def _monitor_incoming_async() -> None:
                     except Exception as e:
                         logger.warning(f"Failed to update last_scanned_block in Redis: {e}")
 
+                if cursor:
+                    await cursor.commit()
+
         except asyncio.CancelledError:
             logger.info("Incoming transfer monitoring task cancelled")
             raise
@@ -15,9 +15,13 @@ from app.config.database import async_session_maker
 from app.config.settings import settings
 from app.services.blockchain_service import get_blockchain_service
 from app.services.notification_service import NotificationService
+from app.services.runtime_flags import MAINTENANCE_MODE, get_runtime_flags
 from jobs.async_runner import run_async
 
 
+_CHANGED_BY = "system:node_health_monitor"
+
+
 @dramatiq.actor(max_retries=3, time_limit=60_000)  # 1 min timeout
 def monitor_node_health() -> None:
     """
@@ -37,6 +41,7 @@ def monitor_node_health() -> None:
 async def _monitor_node_health_async() -> None:
     """Async implementation of node health monitoring."""
     blockchain_service = get_blockchain_service()
+    flags = get_runtime_flags()
 
     try:
         # Check provider health
@@ -48,16 +53,21 @@ async def _monitor_node_health_async() -> None:
         # If healthy, we're good
         if is_healthy:
             # If maintenance mode was active, deactivate it
-            if settings.blockchain_maintenance_mode:
-                settings.blockchain_maintenance_mode = False
+            if await flags.get(MAINTENANCE_MODE):
+                await flags.set(
+                    MAINTENANCE_MODE, False, _CHANGED_BY,
+                    reason="Blockchain nodes available again",
+                )
                 logger.info("Blockchain maintenance mode deactivated")
             return
 
         # HTTP is down - activate maintenance mode
         logger.warning("Blockchain node health check failed (HTTP down)")
 
-        if not settings.blockchain_maintenance_mode:
-            settings.blockchain_maintenance_mode = True
+        if await flags.set(
+            MAINTENANCE_MODE, True, _CHANGED_BY,
+            reason="All blockchain nodes unavailable",
+        ):
             logger.critical(
                 "Blockchain node unavailable. "
                 "Maintenance mode activated."
@@ -72,11 +82,16 @@ async def _monitor_node_health_async() -> None:
         logger.exception(f"Node health monitoring task failed: {e}")
 
         # Activate maintenance mode on error
-        if not settings.blockchain_maintenance_mode:
-            settings.blockchain_maintenance_mode = True
-            logger.critical(
-                "Error checking node health. Maintenance mode activated."
-            )
+        try:
+            if await flags.set(
+                MAINTENANCE_MODE, True, _CHANGED_BY,
+                reason=f"Node health check error: {e}",
+            ):
+                logger.critical(
+                    "Error checking node health. Maintenance mode activated."
+                )
+        except Exception as flag_error:
+            logger.error(f"Failed to activate maintenance mode: {flag_error}")
         return
 
 
@@ -27,7 +27,6 @@ from app.config.operational_constants import DRAMATIQ_TIME_LIMIT_LONG
 from app.config.settings import settings
 from app.models.notification_queue_fallback import NotificationQueueFallback
 from app.models.user_fsm_state import UserFsmState
-from app.repositories.user_repository import UserRepository
 from jobs.async_runner import run_async
 
 
@@ -141,18 +140,15 @@ async def _migrate_notifications(session, redis_client):
     return notifications_migrated
 
 
-async def _migrate_single_fsm_state(fsm_state, user_repo, redis_storage):
+async def _migrate_single_fsm_state(fsm_state, redis_storage):
     """Migrate a single FSM state to Redis."""
-    user = await user_repo.get_by_id(fsm_state.user_id)
-    if not user:
-        return False
-
-    # Create storage key
+    # Rows are keyed by telegram_id; user_id is not set by the FSM
+    # storage (the user may not be registered yet)
     from aiogram.fsm.storage.base import StorageKey
 
     storage_key = StorageKey(
-        chat_id=user.telegram_id,
-        user_id=user.telegram_id,
+        chat_id=fsm_state.telegram_id,
+        user_id=fsm_state.telegram_id,
         bot_id=int(settings.telegram_bot_token.split(":")[0]),
     )
 
@@ -164,15 +160,11 @@ async def _migrate_single_fsm_state(fsm_state, user_repo, redis_storage):
     if fsm_state.data:
         await redis_storage.set_data(storage_key, data=fsm_state.data)
 
-    return True
-
 
 async def _migrate_fsm_states(session, redis_client):
     """Migrate FSM states from PostgreSQL to Redis."""
     from sqlalchemy import select
 
-    user_repo = UserRepository(session)
-
     # Get active FSM states (updated in last 24 hours)
     cutoff_time = datetime.now(UTC) - timedelta(hours=24)
     stmt = (
@@ -197,15 +189,12 @@ async def _migrate_fsm_states(session, redis_client):
 
     for fsm_state in active_fsm_states:
         try:
-            success = await _migrate_single_fsm_state(
-                fsm_state, user_repo, redis_storage
-            )
-            if success:
-                fsm_states_migrated += 1
+            await _migrate_single_fsm_state(fsm_state, redis_storage)
+            fsm_states_migrated += 1
         except Exception as e:
             logger.error(
                 f"R11-3: Failed to migrate FSM state "
-                f"for user {fsm_state.user_id}: {e}"
+                f"for telegram user {fsm_state.telegram_id}: {e}"
             )
 
     logger.info(f"R11-3: Migrated {fsm_states_migrated} FSM states")
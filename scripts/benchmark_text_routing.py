@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Text routing micro-benchmark.
+
+Measures message dispatch time per update through the router tree with
+and without the exact-text route index (bot/middlewares/text_route_index.py)
+on a synthetic mix of button presses, free text and commands.
+
+Usage:
+    python scripts/benchmark_text_routing.py            # synthetic tree
+    python scripts/benchmark_text_routing.py --real     # bot routers
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiogram import Dispatcher, F, Router
+from aiogram.filters import Command, StateFilter
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, User
+from loguru import logger
+
+from bot.middlewares.text_route_index import TextRouteIndex
+
+
+# Shape of the production tree
+ROUTERS = 73
+TEXT_HANDLERS = 327
+STATE_HANDLERS = 60
+
+TG_USER = User(id=1, is_bot=False, first_name="Bench")
+TG_BOT = User(id=2, is_bot=True, first_name="Bot", username="bench_bot")
+
+
+class BenchStates(StatesGroup):
+    """States of synthetic FSM handlers."""
+
+    step_1 = State()
+    step_2 = State()
+    step_3 = State()
+
+
+async def _noop(message: Message) -> bool:
+    return True
+
+
+def build_synthetic() -> tuple[Dispatcher, list[str], list[str]]:
+    """
+    Dispatcher shaped like the bot: text buttons, FSM and regexp handlers.
+
+    Returns:
+        Dispatcher, buttons without state, buttons of BenchStates.step_1
+    """
+    dp = Dispatcher(storage=MemoryStorage())
+    routers = [Router(name=f"router_{i}") for i in range(ROUTERS)]
+    states = [BenchStates.step_1, BenchStates.step_2, BenchStates.step_3]
+    buttons = [f"🔘 Кнопка {i}" for i in range(TEXT_HANDLERS)]
+
+    for i, router in enumerate(routers):
+        if i == 0:
+            router.message.register(_noop, Command("start"))
+    menu_buttons, step_buttons = [], []
+    for i, text in enumerate(buttons):
+        router = routers[i * ROUTERS // TEXT_HANDLERS]
+        if i % 10 == 0:
+            router.message.register(_noop, states[i % 3], F.text == text)
+            if states[i % 3] is BenchStates.step_1:
+                step_buttons.append(text)
+        else:
+            router.message.register(_noop, F.text == text)
+            menu_buttons.append(text)
+    for i in range(STATE_HANDLERS):
+        routers[i * ROUTERS // STATE_HANDLERS].message.register(
+            _noop, StateFilter(states[i % 3])
+        )
+    routers[ROUTERS // 2].message.register(_noop, F.text.regexp(r"^#\d+$"))
+    routers[-1].message.register(_noop, F.text)
+
+    for router in routers:
+        dp.include_router(router)
+    return dp, menu_buttons, step_buttons
+
+
+def build_real() -> tuple[Dispatcher, list[str], list[str]]:
+    """Dispatcher with the bot's routers; buttons taken from the index."""
+    from bot.initialization.handlers import (
+        register_admin_handlers,
+        register_fallback_handlers,
+        register_user_handlers,
+    )
+
+    dp = Dispatcher(storage=MemoryStorage())
+    register_user_handlers(dp)
+    register_admin_handlers(dp)
+    register_fallback_handlers(dp)
+    routes = TextRouteIndex.build(dp).routes
+    menu_buttons = sorted(text for text, (_, default) in routes.items() if default)
+    return dp, menu_buttons, []
+
+
+def make_updates(
+    menu_buttons: list[str],
+    step_buttons: list[str],
+    count: int,
+    seed: int = 1,
+) -> dict[str, list[tuple[Message, str | None]]]:
+    """
+    Synthetic traffic by kind.
+
+    Mix: 80% button presses (10% of them inside an FSM flow), 15% free
+    text, 5% commands.
+    """
+    rng = random.Random(seed)
+    updates: dict[str, list[tuple[Message, str | None]]] = {
+        "button": [],
+        "button in FSM state": [],
+        "free text": [],
+        "command": [],
+    }
+    for i in range(count):
+        roll = rng.random()
+        raw_state = None
+        if roll < 0.72 or (roll < 0.8 and not step_buttons):
+            kind, text = "button", rng.choice(menu_buttons)
+        elif roll < 0.8:
+            kind, text = "button in FSM state", rng.choice(step_buttons)
+            raw_state = BenchStates.step_1.state
+        elif roll < 0.95:
+            kind, text = "free text", f"произвольный текст {i}"
+        else:
+            kind, text = "command", "/start"
+        message = Message(
+            message_id=i,
+            date=datetime.now(UTC),
+            chat=Chat(id=TG_USER.id, type="private"),
+            from_user=TG_USER,
+            text=text,
+        )
+        updates[kind].append((message, raw_state))
+    return updates
+
+
+async def measure(
+    dp: Dispatcher, updates: list[tuple[Message, str | None]], rounds: int
+) -> float:
+    """Best mean dispatch time per update in microseconds."""
+    bot = MagicMock()
+    bot.me = AsyncMock(return_value=TG_BOT)
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for message, raw_state in updates:
+            await dp.propagate_event(
+                "message",
+                message,
+                bot=bot,
+                raw_state=raw_state,
+                event_from_user=TG_USER,
+            )
+        best = min(best, time.perf_counter() - started)
+    return best / len(updates) * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--real", action="store_true", help="use bot routers")
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logger.remove()
+    dp, menu_buttons, step_buttons = (
+        build_real() if args.real else build_synthetic()
+    )
+    updates = make_updates(menu_buttons, step_buttons, args.updates)
+
+    mix = [update for kind in updates.values() for update in kind]
+    random.Random(2).shuffle(mix)
+    workloads = {kind: batch for kind, batch in updates.items() if batch}
+    workloads["mix"] = mix
+
+    before = {
+        name: await measure(dp, workload, args.rounds)
+        for name, workload in workloads.items()
+    }
+    index = TextRouteIndex.build(dp)
+    dp.message.outer_middleware(index)
+    after = {
+        name: await measure(dp, workload, args.rounds)
+        for name, workload in workloads.items()
+    }
+
+    print(f"Indexed button texts: {len(index)}")
+    print(f"{'workload':<22}{'updates':>8}{'walk µs':>11}{'index µs':>11}{'speedup':>9}")
+    for name, workload in workloads.items():
+        print(
+            f"{name:<22}{len(workload):>8}{before[name]:>11.1f}"
+            f"{after[name]:>11.1f}{before[name] / after[name]:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,269 @@
+"""
+Integration tests for reorg protection of the transaction cache.
+
+Runs the blockchain indexer against a local in-process EVM
+(eth-tester/py-evm) with an ERC-20 USDT stand-in; reorgs are simulated
+by reverting the chain to a snapshot and mining a different branch.
+The cache and block repositories are kept in memory.
+
+Covers:
+- Transfers stay pending until below the confirmation watermark
+- A transfer in an orphaned block is rolled back
+- A transfer re-included on the new branch is replayed with its new block
+- Parent-hash continuity of recorded blocks
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+pytest.importorskip("eth_tester")
+
+from eth_account import Account  # noqa: E402
+from eth_tester import EthereumTester  # noqa: E402
+from web3 import EthereumTesterProvider, Web3  # noqa: E402
+
+from app.services.blockchain_indexer import BlockchainIndexerService  # noqa: E402
+
+
+ARTIFACTS = json.loads(
+    (Path(__file__).parent / "contracts" / "artifacts.json").read_text()
+)
+SENDER_KEY = "0x" + "33" * 32
+SYSTEM_WALLET = Web3.to_checksum_address(
+    "0x742d35cc6634c0532925a3b844bc9e7595f0beb0"
+)
+CONFIRMATIONS = 3
+WEI = 10**18
+
+
+class _BlockStore:
+    """In-memory BlockchainBlockRepository."""
+
+    def __init__(self) -> None:
+        self.blocks: dict[int, SimpleNamespace] = {}
+
+    async def get_recent(self, limit):
+        return sorted(self.blocks.values(), key=lambda b: -b.number)[:limit]
+
+    async def get_by(self, number):
+        return self.blocks.get(number)
+
+    async def record(self, number, block_hash, parent_hash=None):
+        block = self.blocks.get(number)
+        if block is None:
+            self.blocks[number] = SimpleNamespace(
+                number=number, hash=block_hash, parent_hash=parent_hash
+            )
+        elif parent_hash is not None and block.hash == block_hash:
+            block.parent_hash = parent_hash
+
+    async def delete_from(self, number):
+        for key in [n for n in self.blocks if n >= number]:
+            del self.blocks[key]
+
+    async def prune_below(self, number):
+        for key in [n for n in self.blocks if n < number]:
+            del self.blocks[key]
+
+
+class _TxCache:
+    """In-memory BlockchainTxCacheRepository."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, SimpleNamespace] = {}
+
+    async def tx_exists(self, tx_hash):
+        return tx_hash in self.rows
+
+    async def cache_transaction(self, **values):
+        self.rows[values["tx_hash"]] = SimpleNamespace(**values)
+
+    async def get_latest_block(self, token_type):
+        return max((r.block_number for r in self.rows.values()), default=0)
+
+    async def delete_from_block(self, block_number):
+        removed = [r for r in self.rows.values() if r.block_number >= block_number]
+        for row in removed:
+            del self.rows[row.tx_hash]
+        return [(r.tx_hash, r.status) for r in removed]
+
+    async def confirm_up_to(self, block_number):
+        pending = [
+            r for r in self.rows.values()
+            if r.status == "pending" and r.block_number <= block_number
+        ]
+        for row in pending:
+            row.status = "confirmed"
+        return len(pending)
+
+
+class _Chain:
+    """Local chain with a token holder sending USDT to the system wallet."""
+
+    def __init__(self) -> None:
+        self.tester = EthereumTester()
+        self.w3 = Web3(EthereumTesterProvider(self.tester))
+        funder = self.w3.eth.accounts[0]
+        self.sender = Account.from_key(SENDER_KEY)
+
+        self.w3.eth.send_transaction(
+            {"from": funder, "to": self.sender.address, "value": WEI}
+        )
+        contract = self.w3.eth.contract(
+            abi=ARTIFACTS["TestToken"]["abi"],
+            bytecode=ARTIFACTS["TestToken"]["bytecode"],
+        )
+        tx_hash = contract.constructor(1_000_000 * WEI).transact({"from": funder})
+        self.token_address = self.w3.eth.wait_for_transaction_receipt(
+            tx_hash
+        )["contractAddress"]
+        self.token = self.w3.eth.contract(
+            address=self.token_address, abi=ARTIFACTS["TestToken"]["abi"]
+        )
+        self.token.functions.transfer(self.sender.address, 1_000 * WEI).transact(
+            {"from": funder}
+        )
+
+    def signed_transfer(self, amount: int) -> bytes:
+        """Signed USDT transfer to the system wallet (replayable after a reorg)."""
+        tx = self.token.functions.transfer(SYSTEM_WALLET, amount).build_transaction({
+            "from": self.sender.address,
+            "nonce": self.w3.eth.get_transaction_count(self.sender.address),
+            "gasPrice": self.w3.eth.gas_price,
+        })
+        return self.sender.sign_transaction(tx).rawTransaction
+
+    def send(self, raw_tx: bytes) -> str:
+        return self.w3.eth.send_raw_transaction(raw_tx).hex()
+
+    def mine(self, blocks: int = 1) -> None:
+        self.tester.mine_blocks(blocks)
+
+    def fork(self, snapshot) -> None:
+        """Drop blocks above the snapshot and start a different branch."""
+        timestamp = self.w3.eth.get_block("latest")["timestamp"]
+        self.tester.revert_to_snapshot(snapshot)
+        self.tester.time_travel(timestamp + 60)
+
+
+def _indexer(chain: _Chain) -> BlockchainIndexerService:
+    indexer = BlockchainIndexerService(AsyncMock(), chain.w3)
+    indexer.system_wallet = SYSTEM_WALLET.lower()
+    indexer.usdt_address = chain.token_address.lower()
+    indexer.plex_address = None
+    indexer.user_repo = MagicMock(find_by_wallet_address=AsyncMock(return_value=None))
+    indexer.cache_repo = indexer.reorg_guard.cache_repo = _TxCache()
+    indexer.reorg_guard.block_repo = _BlockStore()
+    indexer.reorg_guard.confirmations = CONFIRMATIONS
+    return indexer
+
+
+async def _seed(indexer: BlockchainIndexerService, chain: _Chain) -> str:
+    """Index an initial transfer so monitor_new_blocks has a cursor."""
+    tx_hash = chain.send(chain.signed_transfer(WEI))
+    result = await indexer.full_index_system_wallet("USDT", from_block=0)
+    assert result["success"] and result["indexed"] == 1
+    return tx_hash
+
+
+class TestChainReorg:
+    """Reorg handling of the indexer on a local chain."""
+
+    @pytest.mark.asyncio
+    async def test_transfer_confirmed_at_depth(self):
+        """A cached transfer is pending until CONFIRMATIONS blocks deep."""
+        chain = _Chain()
+        indexer = _indexer(chain)
+        await _seed(indexer, chain)
+
+        tx_hash = chain.send(chain.signed_transfer(2 * WEI))
+        await indexer.monitor_new_blocks()
+        assert indexer.cache_repo.rows[tx_hash].status == "pending"
+        assert indexer.cache_repo.rows[tx_hash].amount == Decimal(2)
+
+        chain.mine(CONFIRMATIONS)
+        await indexer.monitor_new_blocks()
+        assert indexer.cache_repo.rows[tx_hash].status == "confirmed"
+
+    @pytest.mark.asyncio
+    async def test_orphaned_transfer_rolled_back(self):
+        """A transfer whose block leaves the chain is removed from the cache."""
+        chain = _Chain()
+        indexer = _indexer(chain)
+        seed_hash = await _seed(indexer, chain)
+        snapshot = chain.tester.take_snapshot()
+
+        tx_hash = chain.send(chain.signed_transfer(5 * WEI))
+        await indexer.monitor_new_blocks()
+        orphaned_block = indexer.cache_repo.rows[tx_hash].block_number
+
+        chain.fork(snapshot)
+        chain.mine(3)
+        result = await indexer.monitor_new_blocks()
+
+        assert result["reorg_from"] == orphaned_block
+        assert tx_hash not in indexer.cache_repo.rows
+        assert seed_hash in indexer.cache_repo.rows
+
+    @pytest.mark.asyncio
+    async def test_reincluded_transfer_replayed(self):
+        """A transfer mined again on the new branch is re-cached with its new block."""
+        chain = _Chain()
+        indexer = _indexer(chain)
+        await _seed(indexer, chain)
+        snapshot = chain.tester.take_snapshot()
+
+        raw_tx = chain.signed_transfer(5 * WEI)
+        tx_hash = chain.send(raw_tx)
+        await indexer.monitor_new_blocks()
+        old = indexer.cache_repo.rows[tx_hash]
+
+        chain.fork(snapshot)
+        chain.mine(2)
+        assert chain.send(raw_tx) == tx_hash
+        result = await indexer.monitor_new_blocks()
+
+        new = indexer.cache_repo.rows[tx_hash]
+        assert result["reorg_from"] == old.block_number
+        assert new.block_number > old.block_number
+        assert new.block_hash != old.block_hash
+        assert new.block_hash == Web3.to_hex(
+            chain.w3.eth.get_block(new.block_number)["hash"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_no_reorg_keeps_cache(self):
+        """Rechecking an unchanged chain rolls nothing back."""
+        chain = _Chain()
+        indexer = _indexer(chain)
+        seed_hash = await _seed(indexer, chain)
+        await indexer.monitor_new_blocks()
+
+        chain.mine(2)
+        result = await indexer.monitor_new_blocks()
+
+        assert "reorg_from" not in result
+        assert seed_hash in indexer.cache_repo.rows
+
+    @pytest.mark.asyncio
+    async def test_parent_hash_continuity(self):
+        """A block not extending the recorded block below it is not recorded."""
+        chain = _Chain()
+        guard = _indexer(chain).reorg_guard
+        snapshot = chain.tester.take_snapshot()
+        chain.mine(1)
+        number = chain.w3.eth.block_number
+        assert await guard.record_block(number) is True
+
+        chain.fork(snapshot)
+        chain.mine(2)
+
+        assert await guard.record_block(number + 1) is False
+        assert await guard.check() == number
+        assert await guard.record_block(number + 1) is True
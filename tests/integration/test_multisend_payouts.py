@@ -0,0 +1,216 @@
+"""
+Integration tests for multisend (contract-level batched) payouts.
+
+Runs MultisendManager against a local in-process EVM (eth-tester/py-evm)
+with the real MultiTransfer contract and an ERC-20 USDT stand-in.
+Contract bytecode comes from tests/integration/contracts/artifacts.json
+(compiled from contracts/MultiTransfer.vy and TestToken.vy with vyper 0.3.10).
+
+Covers:
+- All legs paid in one transaction and verified from Transfer logs
+- Re-sending the same leg refs pays nothing twice
+- Partially paid batches send only the new legs
+- Insufficient allowance sends nothing
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("eth_tester")
+
+from eth_account import Account  # noqa: E402
+from web3 import EthereumTesterProvider, Web3  # noqa: E402
+
+from app.services.blockchain.gas_operations import GasManager  # noqa: E402
+from app.services.blockchain.multisend_operations import (  # noqa: E402
+    MultisendManager,
+    verify_multisend_legs,
+)
+from app.services.blockchain.transaction_operations import (  # noqa: E402
+    TransactionManager,
+)
+
+
+ARTIFACTS = json.loads(
+    (Path(__file__).parent / "contracts" / "artifacts.json").read_text()
+)
+PAYOUT_KEY = "0x" + "22" * 32
+RECIPIENTS = [
+    "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0",
+    "0x55d398326f99059fF775485246999027B3197955",
+    "0x0000000000000000000000000000000000000001",
+]
+WEI = 10**18
+
+
+class _TesterGasManager(GasManager):
+    """Gas manager using the node price (eth-tester base fee is above the BSC cap)."""
+
+    def get_optimal_gas_price(self, w3: Web3, gas_price: int | None = None) -> int:
+        return w3.eth.gas_price
+
+
+def _deploy(w3: Web3, name: str, *args) -> str:
+    contract = w3.eth.contract(
+        abi=ARTIFACTS[name]["abi"], bytecode=ARTIFACTS[name]["bytecode"]
+    )
+    tx_hash = contract.constructor(*args).transact({"from": w3.eth.accounts[0]})
+    return w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+
+
+class _Chain:
+    """Local chain with a funded payout wallet, token and multisend contract."""
+
+    def __init__(self, allowance: int = 1_000 * WEI) -> None:
+        self.w3 = Web3(EthereumTesterProvider())
+        funder = self.w3.eth.accounts[0]
+        self.payout = Account.from_key(PAYOUT_KEY)
+
+        self.w3.eth.send_transaction(
+            {"from": funder, "to": self.payout.address, "value": WEI}
+        )
+        self.token_address = _deploy(self.w3, "TestToken", 1_000_000 * WEI)
+        self.multisend_address = _deploy(self.w3, "MultiTransfer")
+        self.token = self.w3.eth.contract(
+            address=self.token_address, abi=ARTIFACTS["TestToken"]["abi"]
+        )
+        self.token.functions.transfer(self.payout.address, 1_000 * WEI).transact(
+            {"from": funder}
+        )
+
+        approve = self.token.functions.approve(
+            self.multisend_address, allowance
+        ).build_transaction({
+            "from": self.payout.address,
+            "nonce": self.w3.eth.get_transaction_count(self.payout.address),
+            "gasPrice": self.w3.eth.gas_price,
+        })
+        self.w3.eth.send_raw_transaction(
+            self.payout.sign_transaction(approve).rawTransaction
+        )
+
+        self.transaction_manager = TransactionManager(
+            self.token_address,
+            self.payout,
+            self.payout.address,
+            _TesterGasManager(self.token_address),
+        )
+        self.manager = MultisendManager(
+            self.multisend_address, self.transaction_manager
+        )
+
+    def balance(self, address: str) -> int:
+        checksum_address = Web3.to_checksum_address(address)
+        return self.token.functions.balanceOf(checksum_address).call()
+
+    def nonce(self) -> int:
+        return self.w3.eth.get_transaction_count(self.payout.address)
+
+    async def send(self, payments, leg_refs):
+        return await self.manager.send_usdt_multisend(
+            self.w3, payments, leg_refs, None
+        )
+
+
+class TestMultisendPayouts:
+    """Multisend payouts on a local chain."""
+
+    @pytest.mark.asyncio
+    async def test_pays_all_legs_in_one_transaction(self):
+        """Every leg is paid by one tx and verified from its Transfer log."""
+        chain = _Chain()
+        nonce_before = chain.nonce()
+        payments = [
+            (RECIPIENTS[0], Decimal("10.5")),
+            (RECIPIENTS[1], Decimal("2")),
+            (RECIPIENTS[2], Decimal("0.000001")),
+        ]
+
+        results = await chain.send(
+            payments, ["withdrawal:1", "withdrawal:2", "withdrawal:3"]
+        )
+
+        assert all(r["success"] for r in results)
+        assert len({r["tx_hash"] for r in results}) == 1
+        assert len({r["log_index"] for r in results}) == 3
+        assert chain.balance(RECIPIENTS[0]) == 10 * WEI + WEI // 2
+        assert chain.balance(RECIPIENTS[1]) == 2 * WEI
+        assert chain.balance(RECIPIENTS[2]) == 10**12
+        assert chain.nonce() == nonce_before + 1
+
+    @pytest.mark.asyncio
+    async def test_resend_is_idempotent(self):
+        """Re-sending paid leg refs pays nothing and reports the original tx."""
+        chain = _Chain()
+        payments = [(RECIPIENTS[0], Decimal("5")), (RECIPIENTS[1], Decimal("7"))]
+        refs = ["withdrawal:10", "withdrawal:11"]
+
+        first = await chain.send(payments, refs)
+        nonce_after_first = chain.nonce()
+        second = await chain.send(payments, refs)
+
+        assert all(r["success"] and r["already_paid"] for r in second)
+        assert [r["tx_hash"] for r in second] == [r["tx_hash"] for r in first]
+        assert [r["log_index"] for r in second] != [None, None]
+        assert chain.balance(RECIPIENTS[0]) == 5 * WEI
+        assert chain.balance(RECIPIENTS[1]) == 7 * WEI
+        assert chain.nonce() == nonce_after_first
+
+    @pytest.mark.asyncio
+    async def test_partially_paid_batch_sends_only_new_legs(self):
+        """Already paid legs are skipped, the rest go out in a new tx."""
+        chain = _Chain()
+        first = await chain.send([(RECIPIENTS[0], Decimal("1"))], ["payment_retry:1"])
+
+        results = await chain.send(
+            [(RECIPIENTS[0], Decimal("1")), (RECIPIENTS[1], Decimal("3"))],
+            ["payment_retry:1", "payment_retry:2"],
+        )
+
+        assert results[0]["already_paid"] is True
+        assert results[0]["tx_hash"] == first[0]["tx_hash"]
+        assert results[1]["success"] is True
+        assert results[1]["already_paid"] is False
+        assert results[1]["tx_hash"] != first[0]["tx_hash"]
+        assert chain.balance(RECIPIENTS[0]) == WEI
+        assert chain.balance(RECIPIENTS[1]) == 3 * WEI
+
+    @pytest.mark.asyncio
+    async def test_insufficient_allowance_sends_nothing(self):
+        """A batch above the approved allowance is not broadcast."""
+        chain = _Chain(allowance=WEI)
+        nonce_before = chain.nonce()
+
+        results = await chain.send(
+            [(RECIPIENTS[0], Decimal("1")), (RECIPIENTS[1], Decimal("1"))],
+            ["withdrawal:20", "withdrawal:21"],
+        )
+
+        assert not any(r["success"] for r in results)
+        assert "allowance" in results[0]["error"]
+        assert chain.balance(RECIPIENTS[0]) == 0
+        assert chain.nonce() == nonce_before
+
+    @pytest.mark.asyncio
+    async def test_verify_rejects_mismatched_leg(self):
+        """A leg whose amount differs from its Transfer log is not verified."""
+        chain = _Chain()
+        results = await chain.send(
+            [(RECIPIENTS[0], Decimal("4")), (RECIPIENTS[1], Decimal("6"))],
+            ["withdrawal:30", "withdrawal:31"],
+        )
+        receipt = chain.w3.eth.get_transaction_receipt(results[0]["tx_hash"])
+
+        matched = verify_multisend_legs(
+            receipt,
+            chain.token_address,
+            chain.payout.address,
+            [(RECIPIENTS[0], 4 * WEI), (RECIPIENTS[1], 5 * WEI)],
+        )
+
+        assert matched[0] == results[0]["log_index"]
+        assert matched[1] is None
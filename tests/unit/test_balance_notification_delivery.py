@@ -0,0 +1,186 @@
+"""
+Tests for batched balance notifications and the delivery queue.
+
+Covers:
+- Partner statistics for the whole cohort in one grouped query
+- Rate shaping, flood control pause and requeue
+- Blocked users collected and marked in one update
+- Resuming a run from the delivered set
+"""
+
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from sqlalchemy.dialects import postgresql
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.balance_notification_service import (  # noqa: E402
+    BalanceNotificationService,
+)
+from app.services.notification.delivery_queue import (  # noqa: E402
+    Delivery,
+    DeliveryQueue,
+)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _user(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        telegram_id=1000 + user_id,
+        total_deposited_usdt=Decimal("100"),
+        bonus_balance=Decimal("0"),
+        last_plex_balance=Decimal("5000"),
+        required_daily_plex=Decimal("1000"),
+        balance=Decimal("12.5"),
+    )
+
+
+def _bot(errors: dict | None = None) -> MagicMock:
+    """Bot whose send_message raises queued errors per chat."""
+    errors = {chat: list(queued) for chat, queued in (errors or {}).items()}
+    bot = MagicMock()
+
+    async def send_message(chat_id, text, parse_mode=None):
+        queued = errors.get(chat_id)
+        if queued:
+            raise queued.pop(0)
+
+    bot.send_message = AsyncMock(side_effect=send_message)
+    return bot
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+class TestDeliveryQueue:
+    """Test rate shaping and flood control."""
+
+    async def test_sends_at_rate(self, redis):
+        """Messages beyond the burst wait for tokens."""
+        queue = DeliveryQueue(_bot(), "t", redis_client=redis, rate=20, workers=4)
+        deliveries = [Delivery(key=i, chat_id=i, text="hi") for i in range(30)]
+
+        started = time.monotonic()
+        result = await queue.run(deliveries)
+
+        assert sorted(result.sent) == list(range(30))
+        # 20 in the initial burst, 10 more at 20/s
+        assert time.monotonic() - started >= 0.45
+
+    async def test_retry_after_pauses_and_requeues(self, redis):
+        """Flood control pauses the queue and the message is resent."""
+        flood = TelegramRetryAfter(MagicMock(), "flood", retry_after=5)
+        bot = _bot({1: [flood]})
+        queue = DeliveryQueue(
+            bot, "t", redis_client=redis, rate=100, max_retry_after=0.05
+        )
+
+        result = await queue.run(
+            [Delivery(key=1, chat_id=1, text="hi"), Delivery(key=2, chat_id=2, text="hi")]
+        )
+
+        assert sorted(result.sent) == [1, 2]
+        assert bot.send_message.await_count == 3
+
+    async def test_retry_after_gives_up(self, redis):
+        """A message still flood-limited after max_attempts fails."""
+        bot = _bot({1: [TelegramRetryAfter(MagicMock(), "flood", 1)] * 2})
+        queue = DeliveryQueue(
+            bot, "t", redis_client=redis, rate=100,
+            max_attempts=2, max_retry_after=0.01,
+        )
+
+        result = await queue.run([Delivery(key=1, chat_id=1, text="hi")])
+
+        assert result.failed == [1]
+        assert result.sent == []
+
+    async def test_resume_skips_delivered(self, redis):
+        """A second run with the same ID only sees undelivered keys."""
+        bot = _bot({2: [TelegramForbiddenError(MagicMock(), "blocked")]})
+        queue = DeliveryQueue(bot, "t", redis_client=redis, rate=100)
+        result = await queue.run(
+            [Delivery(key=i, chat_id=i, text="hi") for i in (1, 2, 3)]
+        )
+        assert result.blocked == [2]
+
+        again = DeliveryQueue(bot, "t", redis_client=redis)
+        assert await again.pending([1, 2, 3, 4]) == [2, 4]
+        other = DeliveryQueue(bot, "other", redis_client=redis)
+        assert await other.pending([1, 2]) == [1, 2]
+
+
+class TestBalanceNotifications:
+    """Test the batched hourly run."""
+
+    async def test_partner_stats_grouped(self, mock_session):
+        """One grouped query covers the cohort; users without partners get zeros."""
+        result = MagicMock()
+        result.all.return_value = [(1, Decimal("3"), Decimal("40"))]
+        mock_session.execute = AsyncMock(return_value=result)
+
+        stats = await BalanceNotificationService(mock_session).get_partners_statistics(
+            [1, 2]
+        )
+
+        assert stats[1] == {
+            "partners_earnings": Decimal("40"),
+            "income_from_partners": Decimal("3"),
+        }
+        assert stats[2]["partners_earnings"] == Decimal("0")
+        (query,), _ = mock_session.execute.call_args
+        sql = _sql(query)
+        assert "GROUP BY referrals.referrer_id" in sql
+        assert "referrals.referrer_id IN" in sql
+        mock_session.execute.assert_awaited_once()
+
+    async def test_run_marks_blocked_and_resumes(self, mock_session, redis):
+        """Blocked users are marked in bulk; a rerun sends to no one twice."""
+        service = BalanceNotificationService(mock_session)
+        users = [_user(1), _user(2), _user(3)]
+        service.get_eligible_users = AsyncMock(return_value=users)
+        service.get_partners_statistics = AsyncMock(
+            side_effect=lambda ids: {
+                user_id: {
+                    "partners_earnings": Decimal("0"),
+                    "income_from_partners": Decimal("0"),
+                }
+                for user_id in ids
+            }
+        )
+        bot = _bot({1002: [TelegramForbiddenError(MagicMock(), "blocked")]})
+
+        stats = await service.send_notifications_to_all_eligible(
+            bot, run_id="2025122410", redis_client=redis
+        )
+
+        assert stats == {
+            "total": 3, "sent": 2, "failed": 0, "blocked": 1, "skipped": 0,
+        }
+        (blocked_update,), _ = mock_session.execute.call_args
+        assert _sql(blocked_update).startswith("UPDATE users SET bot_blocked=")
+        mock_session.commit.assert_awaited_once()
+
+        bot.send_message.reset_mock()
+        stats = await service.send_notifications_to_all_eligible(
+            bot, run_id="2025122410", redis_client=redis
+        )
+
+        assert stats["skipped"] == 2
+        assert stats["sent"] == 1
+        bot.send_message.assert_awaited_once()
+        assert bot.send_message.call_args.kwargs["chat_id"] == 1002
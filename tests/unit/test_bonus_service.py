@@ -0,0 +1,196 @@
+"""
+Tests for set-based bonus ROI processing and bonus statistics.
+
+Covers:
+- One accrual statement per window with cap handling in SQL
+- Per-user balance credits in one bulk update, same transaction
+- Per-credit corridor rates in custom mode
+- Statistics from aggregates and maintained counters
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.bonus_totals import BonusTotals
+from app.services.bonus_service import BonusService
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _accrued(bonus_id, user_id, reward, completed=False):
+    return SimpleNamespace(
+        id=bonus_id,
+        user_id=user_id,
+        reward=Decimal(reward),
+        roi_paid_amount=Decimal("50"),
+        is_roi_completed=completed,
+    )
+
+
+def _service(mock_session, accrued, config, due_ids=()):
+    """BonusService whose session answers accrual and due-id queries."""
+    statements = []
+
+    async def execute(statement, *args, **kwargs):
+        statements.append(statement)
+        result = MagicMock()
+        result.all.return_value = accrued
+        result.scalars.return_value.all.return_value = list(due_ids)
+        return result
+
+    mock_session.execute = AsyncMock(side_effect=execute)
+    service = BonusService(mock_session)
+
+    corridor = MagicMock()
+    corridor.get_accrual_period_hours = AsyncMock(return_value=6)
+    corridor.get_corridor_config = AsyncMock(return_value=config)
+    corridor.generate_rate_from_corridor.side_effect = [
+        Decimal("1.10"), Decimal("1.20"), Decimal("1.30"),
+    ]
+    settings_repo = MagicMock()
+    settings_repo.get_project_start_at = AsyncMock(
+        return_value=datetime.now(UTC) - timedelta(days=30)
+    )
+    patches = (
+        patch(
+            "app.services.roi_corridor_service.RoiCorridorService",
+            return_value=corridor,
+        ),
+        patch(
+            "app.services.bonus_service.GlobalSettingsRepository",
+            return_value=settings_repo,
+        ),
+    )
+    return service, statements, corridor, patches
+
+
+class TestBonusAccrual:
+    """Test set-based bonus ROI accrual."""
+
+    @pytest.mark.asyncio
+    async def test_fixed_rate_accrued_in_bulk(self, mock_session):
+        """One accrual statement and one balance update per window."""
+        accrued = [
+            _accrued(1, 10, "2.5"),
+            _accrued(2, 10, "1.5", completed=True),
+            _accrued(3, 11, "4"),
+        ]
+        service, statements, _, patches = _service(
+            mock_session, accrued, {"mode": "fixed", "roi_fixed": Decimal("1.117")}
+        )
+
+        with patches[0], patches[1]:
+            stats = await service.process_bonus_rewards()
+
+        assert stats == {
+            "processed": 3,
+            "total_rewards": Decimal("8"),
+            "completed": 1,
+            "errors": 0,
+        }
+        accrual, credit = statements[1], statements[2]
+        accrual_sql = _sql(accrual)
+        assert accrual_sql.startswith("WITH due_bonuses AS")
+        assert "least(round(" in accrual_sql
+        assert "FOR UPDATE OF bonus_credits" in accrual_sql
+        assert "RETURNING" in accrual_sql
+
+        credit_sql = _sql(credit)
+        assert credit_sql.startswith("UPDATE users SET")
+        assert "bonus_roi_earned=(users.bonus_roi_earned + bonus_rewards.amount)" in credit_sql
+        literal_sql = str(credit.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+        assert "VALUES (10, 4.0), (11, 4)" in literal_sql
+        assert len(statements) == 3
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_custom_rates_per_credit(self, mock_session):
+        """Each due credit gets its own corridor rate in the same statement."""
+        service, statements, corridor, patches = _service(
+            mock_session,
+            [_accrued(7, 10, "1"), _accrued(8, 11, "1")],
+            {"mode": "custom", "roi_min": Decimal("1"), "roi_max": Decimal("2")},
+            due_ids=[7, 8],
+        )
+
+        with patches[0], patches[1]:
+            stats = await service.process_bonus_rewards()
+
+        assert stats["processed"] == 2
+        assert corridor.generate_rate_from_corridor.call_count == 2
+        accrual_sql = _sql(statements[2])
+        assert "bonus_rates" in accrual_sql
+        assert "bonus_credits.id = bonus_rates.id" in accrual_sql
+
+    @pytest.mark.asyncio
+    async def test_nothing_due(self, mock_session):
+        """An already processed window accrues and commits nothing."""
+        service, statements, _, patches = _service(
+            mock_session, [], {"mode": "fixed", "roi_fixed": Decimal("1")}
+        )
+
+        with patches[0], patches[1]:
+            stats = await service.process_bonus_rewards()
+
+        assert stats["processed"] == 0
+        assert len(statements) == 2
+        mock_session.commit.assert_not_awaited()
+
+
+class TestBonusStats:
+    """Test bonus statistics."""
+
+    @pytest.mark.asyncio
+    async def test_global_stats_from_counters(self, mock_session):
+        """Totals come from bonus_totals, last 24h from a range sum."""
+        mock_session.get = AsyncMock(
+            return_value=BonusTotals(
+                total_count=40, total_granted=Decimal("1200"), active_count=7
+            )
+        )
+        result = MagicMock()
+        result.scalar.return_value = Decimal("150")
+        mock_session.execute = AsyncMock(return_value=result)
+
+        stats = await BonusService(mock_session).get_global_bonus_stats()
+
+        assert stats == {
+            "total_granted": Decimal("1200"),
+            "active_count": 7,
+            "last_24h": Decimal("150"),
+            "total_count": 40,
+        }
+        (query,), _ = mock_session.execute.call_args
+        assert "bonus_credits.created_at >=" in _sql(query)
+
+    @pytest.mark.asyncio
+    async def test_user_stats_aggregated(self, mock_session):
+        """User counters come from one aggregate query."""
+        service = BonusService(mock_session)
+        service.user_repo.get_by_id = AsyncMock(
+            return_value=SimpleNamespace(bonus_balance=Decimal("300"))
+        )
+        service.bonus_repo.get_active_by_user = AsyncMock(return_value=["b1"])
+        result = MagicMock()
+        result.one.return_value = (5, 1, Decimal("42"))
+        mock_session.execute = AsyncMock(return_value=result)
+
+        stats = await service.get_user_bonus_stats(3)
+
+        assert stats["total_bonuses_count"] == 5
+        assert stats["active_bonuses_count"] == 1
+        assert stats["total_bonus_roi_earned"] == Decimal("42")
+        assert stats["active_bonuses"] == ["b1"]
+        (query,), _ = mock_session.execute.call_args
+        sql = _sql(query)
+        assert "count(bonus_credits.id) FILTER (WHERE" in sql
+        assert "sum(bonus_credits.roi_paid_amount)" in sql
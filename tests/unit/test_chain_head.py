@@ -0,0 +1,228 @@
+"""
+Unit tests for the shared chain head tracker.
+
+Covers publishing with gap backfill, consumer cursors, periodic jobs
+triggered by new heads and the tracker lease.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.blockchain import chain_head  # noqa: E402
+from app.services.blockchain.chain_head import (  # noqa: E402
+    CHAIN_HEAD_STREAM,
+    ChainHead,
+    ChainHeadTracker,
+    HeadCursor,
+    follow_head,
+    get_head_number,
+    get_latest_head,
+)
+
+
+def _head(number: int, fork: str = "") -> ChainHead:
+    """Head whose hash chain is derived from its number."""
+    return ChainHead(
+        number=number,
+        hash=f"0x{fork}{number:x}",
+        parent_hash=f"0x{number - 1:x}",
+    )
+
+
+def _block(number: int) -> dict:
+    """web3 block as returned by eth.get_block."""
+    head = _head(number)
+    return {
+        "number": number,
+        "hash": bytes.fromhex(head.hash[2:].rjust(2, "0")),
+        "parentHash": bytes.fromhex(head.parent_hash[2:].rjust(2, "0")),
+        "timestamp": 1700000000 + number,
+    }
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(autouse=True)
+def _reset_head_cache():
+    chain_head._cached_head = None
+    yield
+    chain_head._cached_head = None
+
+
+def _tracker(redis) -> ChainHeadTracker:
+    tracker = ChainHeadTracker(redis, http_url="http://node")
+    w3 = MagicMock()
+    w3.eth.get_block = AsyncMock(side_effect=lambda number: _block(number))
+    tracker._web3 = MagicMock(return_value=w3)
+    return tracker
+
+
+class TestChainHeadPublishing:
+    """Test the tracker's stream."""
+
+    async def test_publish_sets_latest_head(self, redis):
+        """A new head is appended and becomes the latest head."""
+        tracker = _tracker(redis)
+
+        assert await tracker.publish(_head(100)) == 1
+
+        assert await redis.xlen(CHAIN_HEAD_STREAM) == 1
+        latest = await get_latest_head(redis)
+        assert latest == _head(100)
+        assert await get_head_number(redis) == 100
+
+    async def test_same_head_not_republished(self, redis):
+        """Polling an unchanged head adds nothing to the stream."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+
+        assert await tracker.publish(_head(100)) == 0
+        assert await redis.xlen(CHAIN_HEAD_STREAM) == 1
+
+    async def test_gap_is_backfilled(self, redis):
+        """Heights skipped between two heads are fetched and published."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+
+        assert await tracker.publish(_head(104)) == 4
+
+        entries = await redis.xrange(CHAIN_HEAD_STREAM)
+        assert [int(f["number"]) for _, f in entries] == [
+            100, 101, 102, 103, 104,
+        ]
+
+    async def test_reorg_is_published(self, redis):
+        """A replacement head at the same height is still published."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+
+        assert await tracker.publish(_head(100, fork="f")) == 1
+        assert (await get_latest_head(redis)).hash == "0xf64"
+
+    async def test_head_number_without_tracker(self, redis):
+        """Without a published head callers fall back to the node."""
+        assert await get_head_number(redis) is None
+
+
+class TestHeadCursor:
+    """Test consumer positions in the stream."""
+
+    async def test_new_consumer_starts_at_head(self, redis):
+        """A consumer without a position gets the current head only."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+        await tracker.publish(_head(101))
+
+        heads = await HeadCursor(redis, "scanner").read()
+
+        assert [h.number for h in heads] == [101]
+
+    async def test_committed_position_survives_restart(self, redis):
+        """After commit() a new cursor continues where the last stopped."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+        cursor = HeadCursor(redis, "scanner")
+        await cursor.read()
+        await cursor.commit()
+
+        await tracker.publish(_head(101))
+        await tracker.publish(_head(102))
+
+        restarted = HeadCursor(redis, "scanner")
+        assert [h.number for h in await restarted.read()] == [101, 102]
+        assert await restarted.read() == []
+
+    async def test_consumers_are_independent(self, redis):
+        """Each consumer has its own position."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+        fast = HeadCursor(redis, "fast")
+        slow = HeadCursor(redis, "slow")
+        await fast.read()
+        await slow.read()
+
+        await tracker.publish(_head(101))
+        assert [h.number for h in await fast.read()] == [101]
+        await tracker.publish(_head(102))
+
+        assert [h.number for h in await fast.read()] == [102]
+        assert [h.number for h in await slow.read()] == [101, 102]
+
+
+class TestFollowHead:
+    """Test periodic jobs driven by the head stream."""
+
+    async def test_without_tracker_node_is_queried(self, redis):
+        """No published head (or no Redis): no cursor, no head."""
+        assert await follow_head(redis, "job") == (None, None)
+        assert await follow_head(None, "job") == (None, None)
+
+    async def test_run_skipped_until_new_head(self, redis):
+        """After a committed run the next one waits for a new block."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+
+        cursor, head = await follow_head(redis, "job")
+        assert head == 100
+        await cursor.commit()
+
+        cursor, head = await follow_head(redis, "job")
+        assert cursor is not None and head is None
+
+        await tracker.publish(_head(101))
+        await tracker.publish(_head(102))
+        assert (await follow_head(redis, "job"))[1] == 102
+
+    async def test_uncommitted_run_retriggered(self, redis):
+        """A failed run (no commit) is triggered again by the same heads."""
+        tracker = _tracker(redis)
+        await tracker.publish(_head(100))
+        cursor, _ = await follow_head(redis, "job")
+        await cursor.commit()
+        await tracker.publish(_head(101))
+
+        await follow_head(redis, "job")
+
+        assert (await follow_head(redis, "job"))[1] == 101
+
+    async def test_cache_sync_skips_without_new_head(self):
+        """The cache sync opens no session when no block arrived."""
+        from jobs.tasks import blockchain_cache_sync
+
+        session_maker = MagicMock()
+        with (
+            patch.object(
+                blockchain_cache_sync, "get_runtime_flags",
+                return_value=MagicMock(get=AsyncMock(return_value=False)),
+            ),
+            patch.object(
+                blockchain_cache_sync, "follow_head",
+                AsyncMock(return_value=(MagicMock(), None)),
+            ),
+            patch.object(blockchain_cache_sync, "task_session_maker", session_maker),
+        ):
+            await blockchain_cache_sync._sync_cache_async()
+
+        session_maker.assert_not_called()
+
+
+class TestTrackerLeadership:
+    """Test the tracker lease."""
+
+    async def test_single_leader(self, redis):
+        """Only one tracker holds the lease; the holder renews it."""
+        first = ChainHeadTracker(redis, http_url="http://node")
+        second = ChainHeadTracker(redis, http_url="http://node")
+
+        assert await first.hold_leadership() is True
+        assert await second.hold_leadership() is False
+        assert await first.hold_leadership() is True
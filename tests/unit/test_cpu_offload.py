@@ -0,0 +1,99 @@
+"""
+Unit tests for the CPU offload pool.
+
+Covers execution in worker threads, per-kind concurrency caps,
+backpressure with admission timeout, isolation of saturated kinds and
+metrics.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.cpu_offload import CpuOffloadPool, OffloadBusyError
+
+
+@pytest.fixture
+def pool():
+    """Small pool with a cap of one for kind "slow"."""
+    pool = CpuOffloadPool(
+        max_workers=2, max_pending=2, kind_limits={"slow": 1}, queue_timeout=0.2
+    )
+    yield pool
+    pool.shutdown()
+
+
+class TestCpuOffloadPool:
+    """Test CpuOffloadPool."""
+
+    async def test_runs_in_worker_thread(self, pool):
+        """The callable runs outside the event loop thread."""
+        thread_name = await pool.run("fast", lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("cpu-offload")
+        assert pool.get_stats()["fast"]["calls"] == 1
+
+    async def test_kind_cap_serializes_calls(self, pool):
+        """Calls of a capped kind never run concurrently."""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work() -> None:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.02)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(pool.run("slow", work), pool.run("slow", work))
+
+        assert peak == 1
+        assert pool.get_stats()["slow"]["queue_wait_max"] > 0
+
+    async def test_backpressure_rejects_after_timeout(self, pool):
+        """Callers beyond max_pending fail with OffloadBusyError."""
+        release = threading.Event()
+        blockers = [
+            asyncio.create_task(pool.run("fast", release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(OffloadBusyError):
+            await pool.run("fast", lambda: None)
+
+        release.set()
+        await asyncio.gather(*blockers)
+        assert pool.get_stats()["fast"]["rejected"] == 1
+        assert await pool.run("fast", lambda: 42) == 42
+
+    async def test_saturated_kind_does_not_block_others(self, pool):
+        """Callers queued on a capped kind hold no pending slots."""
+        release = threading.Event()
+        slow = [
+            asyncio.create_task(pool.run("slow", release.wait)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+
+        assert await pool.run("fast", lambda: 42) == 42
+
+        release.set()
+        await asyncio.gather(*slow)
+        assert pool.get_stats()["slow"]["rejected"] == 0
+
+    async def test_failures_are_counted_and_raised(self, pool):
+        """Exceptions propagate to the caller and free the slot."""
+        def fail() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await pool.run("slow", fail)
+        await asyncio.sleep(0)
+
+        stats = pool.get_stats()["slow"]
+        assert stats["failures"] == 1
+        assert stats["in_flight"] == 0
+        assert await pool.run("slow", lambda: "ok") == "ok"
@@ -0,0 +1,84 @@
+"""
+Tests for cleanup of abandoned pending deposits.
+
+Covers:
+- Only unpaid, unreferenced pending deposits are deleted
+- Cleanup task: a failed deposit delete does not block maintenance
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.repositories.deposit_repository import DepositRepository
+from jobs.tasks.cleanup import _cleanup_database
+
+
+class TestDeleteAbandonedPending:
+    """Statement deleting abandoned deposits."""
+
+    async def test_deletes_only_abandoned_deposits(self, mock_session):
+        """Paid or referenced pending deposits are kept."""
+        mock_session.execute.return_value = MagicMock(rowcount=2)
+
+        deleted = await DepositRepository(mock_session).delete_abandoned_pending(
+            datetime(2025, 12, 18, tzinfo=UTC)
+        )
+
+        assert deleted == 2
+        statement = str(mock_session.execute.await_args.args[0])
+        assert statement.startswith("DELETE FROM deposits")
+        assert "deposits.tx_hash IS NULL" in statement
+        assert "deposits.created_at <" in statement
+        assert statement.count("NOT (EXISTS") == 3
+        for table in (
+            "deposit_rewards",
+            "plex_payment_requirements",
+            "deposit_amount_discrepancies",
+        ):
+            assert f"FROM {table}" in statement
+
+
+class TestCleanupDatabase:
+    """Cleanup task run of abandoned deposits and maintenance."""
+
+    @pytest.fixture
+    def cleanup(self, mock_session):
+        mock_session.begin_nested = MagicMock()
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = mock_session
+        service = MagicMock(maintain=AsyncMock(return_value={}))
+        with (
+            patch("jobs.tasks.cleanup.async_session_maker", session_maker),
+            patch(
+                "jobs.tasks.cleanup.PartitionMaintenanceService",
+                return_value=service,
+            ),
+        ):
+            yield service
+
+    async def test_deposits_deleted_in_savepoint(self, mock_session, cleanup):
+        """The delete runs in its own savepoint before maintenance."""
+        mock_session.execute.return_value = MagicMock(rowcount=1)
+
+        await _cleanup_database()
+
+        mock_session.begin_nested.assert_called_once()
+        assert str(mock_session.execute.await_args.args[0]).startswith(
+            "DELETE FROM deposits"
+        )
+        cleanup.maintain.assert_awaited_once()
+        mock_session.commit.assert_awaited_once()
+
+    async def test_deposit_failure_does_not_stop_maintenance(
+        self, mock_session, cleanup
+    ):
+        """A failed delete is rolled back to its savepoint only."""
+        mock_session.execute.side_effect = RuntimeError("foreign key violation")
+
+        await _cleanup_database()
+
+        cleanup.maintain.assert_awaited_once()
+        mock_session.commit.assert_awaited_once()
+        mock_session.rollback.assert_not_awaited()
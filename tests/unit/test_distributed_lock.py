@@ -0,0 +1,118 @@
+"""
+Tests for the fenced distributed lock (Redis backend).
+
+Covers:
+- Fencing tokens per key
+- Compare-and-delete release after TTL expiry
+- Pub/sub wake-up of blocked waiters
+- Lease auto-renewal and loss detection
+"""
+
+import asyncio
+
+import pytest
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.utils.distributed_lock import DistributedLock, LockLostError  # noqa: E402
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+class TestFencedLock:
+    """Ownership and fencing."""
+
+    async def test_fence_increases_per_acquisition(self, redis):
+        """Each holder gets a token one higher than the previous one."""
+        lock = DistributedLock(redis_client=redis)
+
+        first = await lock.acquire_lease("job")
+        assert await lock.acquire_lease("job") is None
+        await lock.release_lease(first)
+        second = await lock.acquire_lease("job")
+
+        assert (first.fence, second.fence) == (1, 2)
+        assert first.token != second.token
+
+    async def test_expired_holder_cannot_release_next_lock(self, redis):
+        """Release after TTL expiry leaves the new holder's lock intact."""
+        lock = DistributedLock(redis_client=redis)
+        stale = await lock.acquire_lease("job", timeout=30)
+        await redis.delete("lock:job")  # TTL ran out
+        current = await lock.acquire_lease("job", timeout=30)
+
+        assert await lock.release_lease(stale) is False
+        assert await redis.get("lock:job") == current.token
+        assert await lock.release_lease(current) is True
+
+    async def test_acquire_release_by_key(self, redis):
+        """acquire()/release(key) keep working with owner tokens."""
+        lock = DistributedLock(redis_client=redis)
+
+        assert await lock.acquire("job") is True
+        assert await lock.is_locked("job") is True
+        assert await lock.release("job") is True
+        assert await lock.release("job") is False
+
+
+class TestLockWaiting:
+    """Blocked waiters and long-held leases."""
+
+    async def test_waiter_woken_by_release(self, redis):
+        """A blocked waiter takes over right after release, not on a poll tick."""
+        holder = DistributedLock(redis_client=redis)
+        waiter = DistributedLock(redis_client=redis)
+        lease = await holder.acquire_lease("job", timeout=60)
+        loop = asyncio.get_running_loop()
+
+        async def release_soon():
+            await asyncio.sleep(0.05)
+            released_at.append(loop.time())
+            await holder.release_lease(lease)
+
+        released_at: list[float] = []
+        release_task = asyncio.create_task(release_soon())
+        taken = await waiter.acquire_lease("job", blocking=True, blocking_timeout=5)
+        await release_task
+
+        assert taken.fence == lease.fence + 1
+        assert loop.time() - released_at[0] < 0.5
+
+    async def test_blocking_timeout(self, redis):
+        """Waiting gives up after blocking_timeout."""
+        lock = DistributedLock(redis_client=redis)
+        await lock.acquire_lease("job", timeout=60)
+
+        assert await lock.acquire_lease(
+            "job", blocking=True, blocking_timeout=0.1
+        ) is None
+
+    async def test_auto_renew_outlives_ttl(self, redis):
+        """Renewed leases survive past their TTL until released."""
+        lock = DistributedLock(redis_client=redis)
+
+        async with lock.lock("job", timeout=0.3, auto_renew=True) as lease:
+            await asyncio.sleep(0.6)
+            assert await redis.get("lock:job") == lease.token
+            lease.ensure_held()
+
+        assert await redis.exists("lock:job") == 0
+
+    async def test_takeover_marks_lease_lost(self, redis):
+        """Renewal detects a lock taken over by another holder."""
+        lock = DistributedLock(redis_client=redis)
+        lease = await lock.acquire_lease("job", timeout=0.3, auto_renew=True)
+
+        await redis.set("lock:job", "other-holder")
+        await asyncio.sleep(0.2)
+
+        with pytest.raises(LockLostError):
+            lease.ensure_held()
+        assert await lock.release_lease(lease) is False
+        assert await redis.get("lock:job") == "other-holder"
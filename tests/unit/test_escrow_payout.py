@@ -0,0 +1,127 @@
+"""
+Tests for withdrawal approval via escrow (dual control).
+
+Covers:
+- Sent payout recorded on the escrow and withdrawal
+- Broadcast payout with a timed-out receipt recorded as processing
+- Failed broadcast leaves the escrow pending
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.enums import TransactionStatus
+from app.services.withdrawal.withdrawal_lifecycle_handler import (
+    WithdrawalLifecycleHandler,
+)
+
+
+TO_ADDRESS = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0"
+MODULE = "app.services.withdrawal.withdrawal_lifecycle_handler"
+
+
+@pytest.fixture
+def withdrawal():
+    return SimpleNamespace(
+        id=5,
+        user_id=1,
+        amount=Decimal("1000"),
+        fee=Decimal("10"),
+        status=TransactionStatus.PENDING.value,
+        tx_hash=None,
+    )
+
+
+@pytest.fixture
+def escrow_repo():
+    repo = MagicMock()
+    repo.get_by_id = AsyncMock(
+        return_value=SimpleNamespace(
+            status="PENDING",
+            operation_type="WITHDRAWAL_APPROVAL",
+            initiator_admin_id=1,
+            operation_data={
+                "transaction_id": 5,
+                "amount": "1000",
+                "to_address": TO_ADDRESS,
+            },
+        )
+    )
+    repo.approve = AsyncMock(return_value=SimpleNamespace(status="APPROVED"))
+    return repo
+
+
+@pytest.fixture
+def handler(mock_session, withdrawal, escrow_repo):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = withdrawal
+    mock_session.execute = AsyncMock(return_value=result)
+
+    flags = MagicMock(get=AsyncMock(return_value=False))
+    with (
+        patch(f"{MODULE}.AdminActionEscrowRepository", return_value=escrow_repo),
+        patch(f"{MODULE}.get_runtime_flags", return_value=flags),
+    ):
+        yield WithdrawalLifecycleHandler(mock_session)
+
+
+def _blockchain(payment_result: dict) -> MagicMock:
+    return MagicMock(
+        send_withdrawal_payout=AsyncMock(return_value=payment_result)
+    )
+
+
+class TestEscrowPayout:
+    """Test recording of escrow payouts."""
+
+    async def test_sent_payout_recorded(self, handler, withdrawal, escrow_repo):
+        """A sent payout approves the escrow and moves the withdrawal on."""
+        blockchain = _blockchain({"success": True, "tx_hash": "0xabc"})
+
+        result = await handler.approve_withdrawal_via_escrow(9, 2, blockchain)
+
+        assert result == (True, None, "0xabc")
+        blockchain.send_withdrawal_payout.assert_awaited_once_with(
+            TO_ADDRESS, Decimal("990"), "withdrawal:5"
+        )
+        escrow_repo.approve.assert_awaited_once_with(9, 2)
+        assert withdrawal.status == TransactionStatus.PROCESSING.value
+        assert withdrawal.tx_hash == "0xabc"
+
+    async def test_receipt_timeout_recorded_as_processing(
+        self, handler, withdrawal, escrow_repo, mock_session
+    ):
+        """A broadcast payout without receipt is not dropped or resent."""
+        blockchain = _blockchain({
+            "success": False,
+            "tx_hash": "0xdef",
+            "status": "pending",
+            "error": "Receipt not available before timeout",
+        })
+
+        result = await handler.approve_withdrawal_via_escrow(9, 2, blockchain)
+
+        assert result == (True, None, "0xdef")
+        escrow_repo.approve.assert_awaited_once_with(9, 2)
+        assert withdrawal.status == TransactionStatus.PROCESSING.value
+        assert withdrawal.tx_hash == "0xdef"
+        mock_session.commit.assert_awaited()
+
+    async def test_failed_broadcast_keeps_escrow_pending(
+        self, handler, withdrawal, escrow_repo
+    ):
+        """A payout that never left the wallet changes nothing."""
+        blockchain = _blockchain({"success": False, "error": "insufficient funds"})
+
+        success, error, tx_hash = await handler.approve_withdrawal_via_escrow(
+            9, 2, blockchain
+        )
+
+        assert success is False
+        assert "insufficient funds" in error
+        assert tx_hash is None
+        escrow_repo.approve.assert_not_awaited()
+        assert withdrawal.status == TransactionStatus.PENDING.value
@@ -0,0 +1,215 @@
+"""
+Tests for the write-back PostgreSQL FSM storage.
+
+Covers:
+- Read-your-writes from the in-process cache
+- Bulk upsert of changed records on flush and close
+- Eviction of unflushed records and retry after a failed flush
+- No lost batch when a flush is cancelled or runs during close
+- Failed loads never overwrite the stored row
+- Recovery of fallback rows to Redis
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from bot.storage.postgresql_fsm_storage import PostgreSQLFSMStorage
+
+
+def _key(user_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+
+
+@pytest.fixture
+def rows():
+    """Stored rows by telegram_id returned by loads."""
+    return {}
+
+
+@pytest.fixture
+async def storage(mock_session, rows):
+    def _execute(stmt, *args, **kwargs):
+        if isinstance(stmt, Insert):
+            return MagicMock()
+        telegram_id = stmt.compile().params["telegram_id_1"]
+        result = MagicMock()
+        result.one_or_none.return_value = rows.get(telegram_id)
+        return result
+
+    mock_session.execute = AsyncMock(side_effect=_execute)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield mock_session
+
+    storage = PostgreSQLFSMStorage(
+        session_factory=session_factory, cache_size=2, flush_interval=3600
+    )
+    yield storage
+    await storage.close()
+
+
+def _upserts(mock_session) -> list[Insert]:
+    return [
+        call.args[0]
+        for call in mock_session.execute.await_args_list
+        if isinstance(call.args[0], Insert)
+    ]
+
+
+class TestCachedFsmStorage:
+    """Reads are served from memory, writes are batched."""
+
+    async def test_read_your_writes_without_db_writes(self, storage, mock_session, rows):
+        """Writes are visible immediately; the row is loaded once."""
+        rows[1] = SimpleNamespace(state="Flow:amount", data={"step": 1})
+        key = _key(1)
+
+        assert await storage.get_state(key) == "Flow:amount"
+        await storage.set_state(key, "Flow:confirm")
+        merged = await storage.update_data(key, {"amount": "10"})
+
+        assert await storage.get_state(key) == "Flow:confirm"
+        assert await storage.get_data(key) == merged == {"step": 1, "amount": "10"}
+        assert mock_session.execute.await_count == 1
+        assert _upserts(mock_session) == []
+
+    async def test_flush_upserts_all_changes_at_once(self, storage, mock_session):
+        """One upsert statement per flush, keyed by telegram_id."""
+        for user_id in (1, 2, 3):
+            await storage.set_state(_key(user_id), "Flow:amount")
+
+        await storage.flush()
+
+        [upsert] = _upserts(mock_session)
+        compiled = upsert.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (telegram_id) DO UPDATE" in str(compiled)
+        assert {
+            value for name, value in compiled.params.items()
+            if name.startswith("telegram_id")
+        } == {1, 2, 3}
+        mock_session.commit.assert_awaited_once()
+
+        await storage.flush()
+        assert len(_upserts(mock_session)) == 1
+
+    async def test_evicted_unflushed_record_still_readable(self, storage, mock_session):
+        """Records pushed out of the LRU before flush keep their writes."""
+        await storage.set_data(_key(1), {"amount": "5"})
+        await storage.get_state(_key(2))
+        await storage.get_state(_key(3))
+
+        assert await storage.get_data(_key(1)) == {"amount": "5"}
+
+    async def test_failed_flush_retried(self, storage, mock_session):
+        """Changes survive a failed flush and are written on close."""
+        await storage.set_state(_key(1), "Flow:amount")
+        mock_session.commit.side_effect = [ConnectionError("db down"), None]
+
+        await storage.flush()
+        await storage.close()
+
+        assert len(_upserts(mock_session)) == 2
+        assert mock_session.commit.await_count == 2
+
+    async def test_cancelled_flush_keeps_batch(self, storage, mock_session):
+        """A flush cancelled during the upsert leaves its changes dirty."""
+        await storage.set_state(_key(1), "Flow:amount")
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def _commit():
+            started.set()
+            await release.wait()
+
+        mock_session.commit.side_effect = _commit
+        flush = asyncio.create_task(storage.flush())
+        await started.wait()
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        mock_session.commit.side_effect = None
+        await storage.close()
+        assert len(_upserts(mock_session)) == 2
+
+    async def test_close_waits_for_running_flush(self, mock_session):
+        """close() lets a periodic flush in progress finish its batch."""
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def _commit():
+            started.set()
+            await release.wait()
+
+        result = MagicMock()
+        result.one_or_none.return_value = None
+        mock_session.execute = AsyncMock(return_value=result)
+        mock_session.commit.side_effect = _commit
+
+        @asynccontextmanager
+        async def session_factory():
+            yield mock_session
+
+        storage = PostgreSQLFSMStorage(
+            session_factory=session_factory, flush_interval=0.01
+        )
+        await storage._get_record(_key(1))  # cached, no load during the flush
+        await storage.set_state(_key(1), "Flow:amount")
+        await started.wait()
+
+        close = asyncio.create_task(storage.close())
+        await asyncio.sleep(0)
+        assert not close.done()
+        release.set()
+        await close
+
+        assert mock_session.commit.await_count == 1
+        assert storage._dirty == {}
+
+    async def test_failed_load_never_overwrites_row(self, storage, mock_session):
+        """A record that could not be loaded is neither handed out nor flushed."""
+        mock_session.execute = AsyncMock(side_effect=ConnectionError("db down"))
+
+        with pytest.raises(ConnectionError):
+            await storage.set_state(_key(1), "Flow:amount")
+
+        await storage.close()
+        assert _upserts(mock_session) == []
+
+
+class TestRedisRecovery:
+    """Test migration of fallback FSM rows back to Redis."""
+
+    async def test_row_without_user_id_recovered(self, mock_session):
+        """Rows written by the storage have no user_id and are still restored."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        from jobs.tasks.redis_recovery import _migrate_fsm_states
+
+        row = SimpleNamespace(
+            telegram_id=555, user_id=None, state="Form:amount", data={"step": 2}
+        )
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [row]
+        mock_session.execute = AsyncMock(return_value=result)
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+        with patch(
+            "jobs.tasks.redis_recovery.settings",
+            SimpleNamespace(telegram_bot_token="42:token"),
+        ):
+            migrated = await _migrate_fsm_states(mock_session, redis)
+
+        storage = RedisStorage(redis=redis)
+        key = StorageKey(bot_id=42, chat_id=555, user_id=555)
+        assert migrated == 1
+        assert await storage.get_state(key) == "Form:amount"
+        assert await storage.get_data(key) == {"step": 2}
+        await redis.aclose()
@@ -0,0 +1,316 @@
+"""
+Unit tests for the shared gas price oracle.
+
+Covers fee history percentiles, the per-block snapshot shared between
+processes, the eth_gasPrice fallback, the transfer gas limit memo,
+quotes for payouts sent from executor threads and single-flight
+coalescing per event loop.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from web3 import Web3
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.blockchain import chain_head  # noqa: E402
+from app.services.blockchain.chain_head import CHAIN_HEAD_LATEST_KEY  # noqa: E402
+from app.services.blockchain.facade_helpers import (  # noqa: E402
+    BlockchainServiceMixin,
+)
+from app.services.blockchain.gas_oracle import (  # noqa: E402
+    GAS_PROBE_ADDRESS,
+    GAS_TIER_FAST,
+    GAS_TIER_SLOW,
+    GasOracle,
+)
+from app.services.blockchain.transaction_operations import (  # noqa: E402
+    TransactionManager,
+)
+from app.services.wallet_snapshot_cache import single_flight  # noqa: E402
+
+
+GWEI = 10**9
+TOKEN = "0x55d398326f99059fF775485246999027B3197955"
+SENDER = Web3.to_checksum_address("0x742d35cc6634c0532925a3b844bc9e7595f0beb0")
+
+
+async def _value(value):
+    return value
+
+
+class _Eth:
+    """AsyncWeb3 eth namespace stub."""
+
+    def __init__(self, gas_price: int = GWEI, history: dict | None = None) -> None:
+        self._gas_price = gas_price
+        self.gas_price_calls = 0
+        self.fee_history = AsyncMock(return_value=history)
+        self.estimate_gas = AsyncMock(return_value=51_000)
+        self.contract = MagicMock()
+        self.contract.return_value.functions.transfer.return_value.estimate_gas = (
+            self.estimate_gas
+        )
+
+    @property
+    def gas_price(self):
+        self.gas_price_calls += 1
+        if isinstance(self._gas_price, Exception):
+            raise self._gas_price
+        return _value(self._gas_price)
+
+    @property
+    def block_number(self):
+        return _value(123)
+
+
+def _history(oldest: int = 100) -> dict:
+    """Fee history of three blocks, the middle one empty."""
+    return {
+        "oldestBlock": oldest,
+        "baseFeePerGas": [0, 0, 0, GWEI // 10],
+        "gasUsedRatio": [0.5, 0.0, 0.7],
+        "reward": [
+            [1 * GWEI, 2 * GWEI, 5 * GWEI],
+            [0, 0, 0],
+            [3 * GWEI, 4 * GWEI, 9 * GWEI],
+        ],
+    }
+
+
+def _oracle(redis, eth: _Eth) -> GasOracle:
+    return GasOracle(redis, web3=MagicMock(eth=eth))
+
+
+async def _publish_head(redis, number: int) -> None:
+    chain_head._cached_head = None
+    await redis.set(
+        CHAIN_HEAD_LATEST_KEY,
+        json.dumps({"number": number, "hash": "0x1", "parent_hash": "0x0"}),
+    )
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(autouse=True)
+def _reset_head_cache():
+    chain_head._cached_head = None
+    yield
+    chain_head._cached_head = None
+
+
+class TestGasOracleSampling:
+    """Test fee history sampling."""
+
+    async def test_tiers_from_fee_history_percentiles(self, redis):
+        """Tier = next base fee + median tip of non-empty blocks."""
+        eth = _Eth(gas_price=GWEI, history=_history())
+
+        quote = await _oracle(redis, eth).get_quote()
+
+        assert quote.block == 102
+        assert quote.slow == 2 * GWEI + GWEI // 10
+        assert quote.standard == 3 * GWEI + GWEI // 10
+        assert quote.fast == 7 * GWEI + GWEI // 10
+        assert quote.price(GAS_TIER_FAST) == quote.fast
+
+    async def test_tiers_floored_at_node_price(self, redis):
+        """No tier is below eth_gasPrice (zero-priced system transactions)."""
+        eth = _Eth(gas_price=4 * GWEI, history=_history())
+
+        quote = await _oracle(redis, eth).get_quote()
+
+        assert quote.slow == 4 * GWEI
+        assert quote.standard == 4 * GWEI
+        assert quote.fast > quote.standard
+
+    async def test_fallback_without_fee_history(self, redis):
+        """Every tier is eth_gasPrice when fee history is unsupported."""
+        eth = _Eth(gas_price=3 * GWEI)
+        eth.fee_history.side_effect = ValueError("method not found")
+
+        quote = await _oracle(redis, eth).get_quote()
+
+        assert quote.block == 123
+        assert (quote.slow, quote.standard, quote.fast) == (3 * GWEI,) * 3
+
+    async def test_unreachable_node_returns_none(self, redis):
+        """Callers fall back to their own RPC when nothing can be sampled."""
+        eth = _Eth(gas_price=ConnectionError("down"))
+
+        assert await _oracle(redis, eth).get_gas_price(GAS_TIER_SLOW) is None
+
+
+class TestGasOracleSharing:
+    """Test the snapshot shared through Redis."""
+
+    async def test_snapshot_shared_between_processes(self, redis):
+        """A second oracle reuses the published sample for the same block."""
+        await _publish_head(redis, 102)
+        first = _Eth(history=_history())
+        second = _Eth(history=_history())
+
+        quote = await _oracle(redis, first).get_quote()
+        shared = await _oracle(redis, second).get_quote()
+
+        assert shared == quote
+        assert second.fee_history.await_count == 0
+        assert second.gas_price_calls == 0
+
+    async def test_resampled_on_new_block(self, redis):
+        """A newer published head makes the snapshot stale."""
+        await _publish_head(redis, 102)
+        eth = _Eth(history=_history())
+        oracle = _oracle(redis, eth)
+        await oracle.get_quote()
+        await oracle.get_quote()
+        assert eth.fee_history.await_count == 1
+
+        await _publish_head(redis, 103)
+        eth.fee_history.return_value = _history(oldest=101)
+        quote = await oracle.get_quote()
+
+        assert eth.fee_history.await_count == 2
+        assert quote.block == 103
+
+    async def test_stale_snapshot_served_while_resampling(self, redis):
+        """Only the process holding the sampling lock queries the node."""
+        await _publish_head(redis, 102)
+        await _oracle(redis, _Eth(history=_history())).get_quote()
+        await _publish_head(redis, 103)
+        await redis.set("gas:oracle:sampling", "1")
+        eth = _Eth(history=_history(oldest=101))
+
+        quote = await _oracle(redis, eth).get_quote()
+
+        assert quote.block == 102
+        assert eth.fee_history.await_count == 0
+
+
+class TestTransferGasMemo:
+    """Test the standard transfer gas limit memo."""
+
+    async def test_probed_once_for_new_holder(self, redis):
+        """The worst-case probe runs once and is shared via Redis."""
+        eth = _Eth()
+
+        assert await _oracle(redis, eth).get_transfer_gas(TOKEN, SENDER) == 51_000
+        assert await _oracle(redis, _Eth()).get_transfer_gas(TOKEN, SENDER) == 51_000
+
+        eth.estimate_gas.assert_awaited_once_with({"from": SENDER})
+        eth.contract.return_value.functions.transfer.assert_called_once_with(
+            GAS_PROBE_ADDRESS, 1
+        )
+
+    async def test_failed_probe_not_memoized(self, redis):
+        """A reverting probe returns None and is retried next time."""
+        eth = _Eth()
+        eth.estimate_gas.side_effect = ValueError("execution reverted")
+        oracle = _oracle(redis, eth)
+
+        assert await oracle.get_transfer_gas(TOKEN, SENDER) is None
+
+        eth.estimate_gas.side_effect = None
+        assert await oracle.get_transfer_gas(TOKEN, SENDER) == 51_000
+
+
+class _Facade(BlockchainServiceMixin):
+    """Facade whose pinned calls run on an executor thread."""
+
+    def __init__(self, manager: TransactionManager, w3: MagicMock) -> None:
+        self.transaction_manager = manager
+
+        async def run_pinned(func):
+            return await asyncio.to_thread(func, w3)
+
+        self.async_executor = MagicMock(_executor=None, run_pinned=run_pinned)
+
+    async def validate_wallet_address(self, address: str) -> bool:
+        return True
+
+
+class TestPayoutQuotes:
+    """Test oracle quotes for payouts sent in executor threads."""
+
+    async def test_quotes_resolved_on_main_loop(self):
+        """The oracle is only awaited on the caller's loop."""
+        from eth_account import Account
+
+        main_loop = asyncio.get_running_loop()
+        loops = []
+
+        async def _quote(*args):
+            loops.append(asyncio.get_running_loop())
+            return 3 * GWEI if not args else 40_000
+
+        oracle = MagicMock(
+            get_gas_price=AsyncMock(side_effect=_quote),
+            get_transfer_gas=AsyncMock(side_effect=_quote),
+        )
+        account = Account.from_key("0x" + "22" * 32)
+        gas_manager = MagicMock()
+        gas_manager.get_optimal_gas_price.return_value = 3 * GWEI
+        manager = TransactionManager(
+            usdt_contract_address=TOKEN,
+            wallet_account=account,
+            wallet_address=account.address,
+            gas_manager=gas_manager,
+            gas_oracle=oracle,
+        )
+
+        w3 = MagicMock()
+        w3.eth.get_transaction_count.return_value = 4
+        w3.eth.chain_id = 56
+        w3.eth.send_raw_transaction.side_effect = Web3.keccak
+        transfer = w3.eth.contract.return_value.functions.transfer
+        transfer.return_value.build_transaction.side_effect = lambda params: {
+            "to": TOKEN, "value": 0, "data": "0x",
+            **{k: v for k, v in params.items() if k != "from"},
+        }
+
+        result = await _Facade(manager, w3).send_payment(SENDER, 1)
+
+        assert result["success"] is True
+        assert loops == [main_loop, main_loop]
+        gas_manager.get_optimal_gas_price.assert_called_once_with(w3, 3 * GWEI)
+        transfer.return_value.estimate_gas.assert_not_called()
+        params = transfer.return_value.build_transaction.call_args.args[0]
+        assert params["gas"] > 40_000
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent oracle refreshes."""
+
+    async def test_coalesced_per_event_loop(self):
+        """Callers share a fetch on one loop; other loops run their own."""
+        release = asyncio.Event()
+
+        async def _main_fetch():
+            await release.wait()
+            return "main"
+
+        async def _thread_fetch():
+            return "thread"
+
+        first = asyncio.ensure_future(single_flight("gas", _main_fetch))
+        second = asyncio.ensure_future(single_flight("gas", _thread_fetch))
+        await asyncio.sleep(0)
+
+        # A dramatiq actor thread with its own loop must not await our task
+        in_thread = await asyncio.wait_for(
+            asyncio.to_thread(asyncio.run, single_flight("gas", _thread_fetch)),
+            timeout=5,
+        )
+        release.set()
+
+        assert in_thread == "thread"
+        assert await first == await second == "main"
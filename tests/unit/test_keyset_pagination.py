@@ -0,0 +1,133 @@
+"""
+Tests for keyset pagination helpers.
+
+Covers:
+- Cursor encoding round trip (aware/naive datetimes, ints)
+- Next/previous page queries and edge flags
+- Approximate counts from planner statistics
+"""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.user import User
+from app.repositories.base import (
+    EXACT_COUNT_THRESHOLD,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+)
+from app.repositories.user_repository import UserRepository
+
+
+def _users(*ids: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(id=i, created_at=datetime(2025, 1, 1, 0, 0, i, tzinfo=UTC))
+        for i in ids
+    ]
+
+
+def _returning(mock_session, items: list) -> None:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = items
+    mock_session.execute.return_value = result
+
+
+def _sql(mock_session) -> str:
+    stmt = mock_session.execute.await_args.args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+KEYS = (User.created_at, User.id)
+
+
+class TestCursor:
+    """Cursors are short and lossless."""
+
+    def test_round_trip(self):
+        """Microseconds and timezone awareness survive."""
+        values = [datetime(2025, 12, 19, 10, 11, 12, 345678, tzinfo=UTC), 42]
+        naive = [datetime(2025, 12, 19, 10, 11, 12, 345678), 7]
+
+        assert decode_cursor(encode_cursor(values)) == values
+        assert decode_cursor(encode_cursor(naive)) == naive
+        assert len(encode_cursor(values).encode()) < 64
+
+    def test_malformed_cursor(self):
+        """Unknown value kinds are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor("x123")
+
+
+class TestKeysetPaginate:
+    """Pages are index range scans from a cursor."""
+
+    async def test_first_page(self, mock_session):
+        """One extra row tells whether a next page exists."""
+        _returning(mock_session, _users(5, 4, 3))
+
+        page = await keyset_paginate(mock_session, select(User), KEYS, limit=2)
+
+        assert [u.id for u in page.items] == [5, 4]
+        assert page.has_next and not page.has_prev
+        assert decode_cursor(page.last_cursor)[1] == 4
+        sql = _sql(mock_session)
+        assert "OFFSET" not in sql
+        assert "ORDER BY users.created_at DESC, users.id DESC" in sql
+
+    async def test_next_page_after_cursor(self, mock_session):
+        """Next page continues below the last item of the current one."""
+        cursor = encode_cursor([datetime(2025, 1, 1, 0, 0, 4, tzinfo=UTC), 4])
+        _returning(mock_session, _users(3, 2))
+
+        page = await keyset_paginate(
+            mock_session, select(User), KEYS, after=cursor, limit=2
+        )
+
+        assert [u.id for u in page.items] == [3, 2]
+        assert page.has_prev and not page.has_next
+        assert "(users.created_at, users.id) < (" in _sql(mock_session)
+
+    async def test_previous_page_before_cursor(self, mock_session):
+        """Previous page is read ascending and returned newest first."""
+        cursor = encode_cursor([datetime(2025, 1, 1, 0, 0, 3, tzinfo=UTC), 3])
+        _returning(mock_session, _users(4, 5))
+
+        page = await keyset_paginate(
+            mock_session, select(User), KEYS, before=cursor, limit=2
+        )
+
+        assert [u.id for u in page.items] == [5, 4]
+        assert page.has_next and not page.has_prev
+        sql = _sql(mock_session)
+        assert "(users.created_at, users.id) > (" in sql
+        assert "ORDER BY users.created_at ASC, users.id ASC" in sql
+
+
+class TestEstimateCount:
+    """Counts come from pg_class for large tables."""
+
+    async def test_large_table_uses_reltuples(self, mock_session):
+        """No COUNT(*) when the estimate is large."""
+        result = MagicMock()
+        result.scalar.return_value = EXACT_COUNT_THRESHOLD * 10
+        mock_session.execute.return_value = result
+
+        assert await UserRepository(mock_session).estimate_count() == (
+            EXACT_COUNT_THRESHOLD * 10
+        )
+        assert mock_session.execute.await_count == 1
+
+    async def test_small_table_counted_exactly(self, mock_session):
+        """Small or unanalyzed tables fall back to COUNT(*)."""
+        estimate, exact = MagicMock(), MagicMock()
+        estimate.scalar.return_value = -1
+        exact.scalar.return_value = 12
+        mock_session.execute.side_effect = [estimate, exact]
+
+        assert await UserRepository(mock_session).estimate_count() == 12
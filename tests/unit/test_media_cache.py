@@ -0,0 +1,95 @@
+"""
+Unit tests for the Telegram media cache.
+
+Covers upload-once behaviour, resending by file_id, the database
+fallback and re-upload of rejected file_ids.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from bot.utils.media_cache import MEDIA_CACHE_PREFIX, MediaCache, media_key  # noqa: E402
+from bot.utils.qr_generator import payment_qr_media_key  # noqa: E402
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+def _message(file_id: str = "FILE1") -> MagicMock:
+    """Message whose answer_photo returns a photo with file_id."""
+    sent = MagicMock()
+    sent.photo = [MagicMock(file_id="small"), MagicMock(file_id=file_id)]
+    message = MagicMock()
+    message.answer_photo = AsyncMock(return_value=sent)
+    return message
+
+
+class TestMediaKey:
+    """Test asset keys."""
+
+    def test_key_depends_on_inputs(self):
+        """Different inputs give different keys, same inputs the same."""
+        assert media_key("qr", "0xabc") == media_key("qr", "0xabc")
+        assert media_key("qr", "0xabc") != media_key("qr", "0xabd")
+        assert media_key("qr", "ab", "c") != media_key("qr", "a", "bc")
+        assert payment_qr_media_key("0xabc") != media_key("payment_qr", "0xabc")
+
+
+class TestMediaCache:
+    """Test MediaCache.send_photo."""
+
+    async def test_uploads_once_then_sends_file_id(self, redis):
+        """The first send uploads, later sends reuse the file_id."""
+        cache = MediaCache(redis)
+        render = AsyncMock(return_value=b"png")
+        message = _message()
+
+        await cache.send_photo(message, "k", render, "qr.png", caption="c")
+        await cache.send_photo(message, "k", render, "qr.png", caption="c")
+
+        render.assert_awaited_once()
+        first, second = message.answer_photo.await_args_list
+        assert isinstance(first.kwargs["photo"], BufferedInputFile)
+        assert second.kwargs == {"photo": "FILE1", "caption": "c"}
+        assert await redis.get(MEDIA_CACHE_PREFIX + "k") == "FILE1"
+
+    async def test_database_fallback(self, redis, mock_session):
+        """A file_id found in the database is used and copied to Redis."""
+        mock_session.begin_nested = MagicMock()
+        row = MagicMock()
+        row.scalar_one_or_none.return_value = "DBFILE"
+        mock_session.execute.return_value = row
+        cache = MediaCache(redis, mock_session)
+        render = AsyncMock()
+        message = _message()
+
+        await cache.send_photo(message, "k", render, "qr.png")
+
+        render.assert_not_awaited()
+        assert message.answer_photo.await_args.kwargs["photo"] == "DBFILE"
+        assert await redis.get(MEDIA_CACHE_PREFIX + "k") == "DBFILE"
+
+    async def test_rejected_file_id_is_reuploaded(self, redis):
+        """An invalid cached file_id is dropped and the asset uploaded again."""
+        await redis.set(MEDIA_CACHE_PREFIX + "k", "STALE")
+        cache = MediaCache(redis)
+        message = _message("FRESH")
+        sent = message.answer_photo.return_value
+        message.answer_photo.side_effect = [
+            TelegramBadRequest(MagicMock(), "wrong file identifier"),
+            sent,
+        ]
+
+        await cache.send_photo(message, "k", AsyncMock(return_value=b"png"), "qr.png")
+
+        assert await redis.get(MEDIA_CACHE_PREFIX + "k") == "FRESH"
@@ -0,0 +1,188 @@
+"""
+Tests for monthly partition maintenance.
+
+Covers:
+- Month arithmetic and partition naming
+- Creation of missing upcoming partitions only
+- Retention by dropping/detaching whole expired months
+- Dropping detached partitions past their archive retention
+- Database cleanup task runs maintenance and commits
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.repositories.partition_repository import (
+    PartitionRepository,
+    add_months,
+    month_start,
+    partition_name,
+    retention_cutoff,
+)
+from app.services.partition_maintenance_service import (
+    PartitionMaintenanceService,
+)
+from jobs.tasks.cleanup import _cleanup_database
+
+
+def _partitions_result(names: list[str]) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = names
+    return result
+
+
+def _ddl(mock_session) -> list[str]:
+    return [
+        str(call.args[0])
+        for call in mock_session.execute.await_args_list
+        if not str(call.args[0]).startswith("SELECT")
+    ]
+
+
+class TestMonthMath:
+    """Helpers used to name and bound partitions."""
+
+    def test_month_start_and_add_months(self):
+        """Month starts are UTC and wrap over years."""
+        month = month_start(datetime(2025, 12, 19, 15, 30, tzinfo=UTC))
+
+        assert month == datetime(2025, 12, 1, tzinfo=UTC)
+        assert add_months(month, 1) == datetime(2026, 1, 1, tzinfo=UTC)
+        assert add_months(month, -12) == datetime(2024, 12, 1, tzinfo=UTC)
+        assert partition_name("user_actions", month) == "user_actions_p202512"
+
+
+class TestPartitionRepository:
+    """DDL generated for configured tables."""
+
+    async def test_creates_only_missing_months(self, mock_session):
+        """Existing partitions are not recreated."""
+        mock_session.execute.return_value = _partitions_result(
+            ["user_actions_p202512", "user_actions_default"]
+        )
+
+        created = await PartitionRepository(mock_session).create_partitions(
+            "user_actions", datetime(2025, 12, 5, tzinfo=UTC), 3
+        )
+
+        assert created == ["user_actions_p202601", "user_actions_p202602"]
+        [first, _] = _ddl(mock_session)
+        assert "PARTITION OF user_actions" in first
+        assert "FROM ('2026-01-01T00:00:00+00:00') TO ('2026-02-01T00:00:00+00:00')" in first
+
+    async def test_removes_only_fully_expired_months(self, mock_session):
+        """A month is removed only once all of it is older than cutoff."""
+        mock_session.execute.return_value = _partitions_result(
+            ["admin_actions_p202510", "admin_actions_p202511", "admin_actions_p202512"]
+        )
+
+        removed = await PartitionRepository(mock_session).remove_partitions_before(
+            "admin_actions", datetime(2025, 12, 1, 12, tzinfo=UTC), detach=True
+        )
+
+        assert removed == ["admin_actions_p202510", "admin_actions_p202511"]
+        assert all("DETACH PARTITION" in ddl for ddl in _ddl(mock_session))
+
+    async def test_drops_only_expired_detached_months(self, mock_session):
+        """Detached partitions go once their whole month is past cutoff."""
+        mock_session.execute.return_value = _partitions_result(
+            ["admin_actions_p202411", "admin_actions_p202412", "admin_actions_archive"]
+        )
+
+        dropped = await PartitionRepository(mock_session).drop_detached_before(
+            "admin_actions", datetime(2024, 12, 15, tzinfo=UTC)
+        )
+
+        assert dropped == ["admin_actions_p202411"]
+        [lookup] = [
+            str(call.args[0]) for call in mock_session.execute.await_args_list
+            if str(call.args[0]).startswith("SELECT")
+        ]
+        assert "NOT c.relispartition" in lookup
+        assert _ddl(mock_session) == ["DROP TABLE IF EXISTS admin_actions_p202411"]
+
+    async def test_unknown_table_rejected(self, mock_session):
+        """Only configured tables are used in generated DDL."""
+        with pytest.raises(ValueError):
+            await PartitionRepository(mock_session).get_partitions("users")
+
+
+class TestPartitionMaintenanceService:
+    """Maintenance across all partitioned tables."""
+
+    async def test_failure_of_one_table_does_not_stop_others(self, mock_session):
+        """Each table runs in its own savepoint."""
+        service = PartitionMaintenanceService(mock_session)
+        service.repo = MagicMock()
+
+        async def create(table, first, months):
+            if table == "user_actions":
+                raise RuntimeError("not partitioned")
+            return []
+
+        async def remove(table, cutoff, detach=False):
+            return [f"{table}_p202501"] if detach else []
+
+        service.repo.create_partitions = create
+        service.repo.remove_partitions_before = remove
+        service.repo.drop_detached_before = AsyncMock(return_value=[])
+        mock_session.begin_nested = MagicMock()
+
+        report = await service.maintain(datetime(2025, 12, 19, tzinfo=UTC))
+
+        assert report["user_actions"] == {"error": "not partitioned"}
+        assert report["admin_actions"]["removed"] == ["admin_actions_p202501"]
+        assert report["user_activities"] == {"created": [], "removed": []}
+
+    async def test_archived_partitions_dropped_after_archive_retention(
+        self, mock_session
+    ):
+        """Detached partitions are kept for the archive retention only."""
+        service = PartitionMaintenanceService(mock_session)
+        service.repo = MagicMock(
+            create_partitions=AsyncMock(return_value=[]),
+            remove_partitions_before=AsyncMock(return_value=[]),
+            drop_detached_before=AsyncMock(return_value=["admin_actions_p202410"]),
+        )
+        mock_session.begin_nested = MagicMock()
+        now = datetime(2025, 12, 19, tzinfo=UTC)
+
+        with patch(
+            "app.services.partition_maintenance_service.PARTITION_ARCHIVED_TABLES",
+            {"admin_actions": 365},
+        ):
+            report = await service.maintain(now)
+
+        service.repo.drop_detached_before.assert_awaited_once_with(
+            "admin_actions",
+            retention_cutoff("admin_actions", now) - timedelta(days=365),
+        )
+        assert report["admin_actions"]["archive_dropped"] == ["admin_actions_p202410"]
+        assert "archive_dropped" not in report["user_actions"]
+
+
+class TestCleanupDatabase:
+    """Cleanup task run of partition maintenance."""
+
+    async def test_runs_maintenance_and_commits(self, mock_session):
+        """Maintenance runs in the cleanup session, which is committed."""
+        mock_session.begin_nested = MagicMock()
+        mock_session.execute.return_value = MagicMock(rowcount=0)
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = mock_session
+        service = MagicMock(maintain=AsyncMock(return_value={}))
+
+        with (
+            patch("jobs.tasks.cleanup.async_session_maker", session_maker),
+            patch(
+                "jobs.tasks.cleanup.PartitionMaintenanceService",
+                return_value=service,
+            ) as service_cls,
+        ):
+            await _cleanup_database()
+
+        service_cls.assert_called_once_with(mock_session)
+        service.maintain.assert_awaited_once()
+        mock_session.commit.assert_awaited_once()
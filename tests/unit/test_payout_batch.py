@@ -0,0 +1,441 @@
+"""
+Tests for batch payouts with consecutive nonces.
+
+Covers:
+- LocalNonceTracker reservation and chain reconciliation
+- Recovery from dropped transactions
+- BlockGasPriceCache expiry
+- TransactionManager batch broadcast with consecutive nonces
+- Nonce recovery after a failed broadcast
+- Broadcasts stop once the wallet lock is lost
+- Receipt tracking and replacement of stuck transfers
+- Coalescing of concurrent payouts into one batch
+- Withdrawal batches routed through multisend when enabled
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from eth_account import Account
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+from app.services.blockchain.facade_helpers import BlockchainServiceMixin
+from app.services.blockchain.payment_sender.gas_estimator import BlockGasPriceCache
+from app.services.blockchain.payment_sender.nonce_manager import LocalNonceTracker
+from app.services.blockchain.payout_batcher import PayoutBatcher
+from app.services.blockchain.transaction_operations import TransactionManager
+from app.utils.distributed_lock import LockLease
+
+
+TRACKING = "app.services.blockchain.receipt_tracking"
+PRIVATE_KEY = "0x" + "11" * 32
+USDT_ADDRESS = "0x55d398326f99059fF775485246999027B3197955"
+RECIPIENTS = [
+    "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0",
+    "0x0000000000000000000000000000000000000001",
+    "0x0000000000000000000000000000000000000002",
+]
+
+
+def _make_w3(pending_nonce: int = 7) -> MagicMock:
+    """Sync Web3 stand-in whose transfer() builds a signable tx dict."""
+    w3 = MagicMock()
+    w3.eth.get_transaction_count.return_value = pending_nonce
+    w3.eth.chain_id = 56
+    w3.eth.send_raw_transaction.side_effect = Web3.keccak
+
+    def _transfer(to_address, amount_wei):
+        function = MagicMock()
+        function.estimate_gas.return_value = 50000
+        function.build_transaction.side_effect = lambda params: {
+            "to": USDT_ADDRESS,
+            "value": 0,
+            "data": "0xa9059cbb" + to_address[2:].lower().rjust(64, "0")
+            + hex(amount_wei)[2:].rjust(64, "0"),
+            **{k: v for k, v in params.items() if k != "from"},
+        }
+        return function
+
+    w3.eth.contract.return_value.functions.transfer.side_effect = _transfer
+    w3.eth.get_transaction_receipt.side_effect = lambda tx_hash: {
+        "status": 1, "transactionHash": tx_hash,
+    }
+    return w3
+
+
+def _make_manager(gas_price: int = 10**9) -> TransactionManager:
+    account = Account.from_key(PRIVATE_KEY)
+    gas_manager = MagicMock()
+    gas_manager.get_optimal_gas_price.return_value = gas_price
+    return TransactionManager(
+        usdt_contract_address=USDT_ADDRESS,
+        wallet_account=account,
+        wallet_address=account.address,
+        gas_manager=gas_manager,
+    )
+
+
+class TestLocalNonceTracker:
+    """Test local nonce bookkeeping."""
+
+    def test_reserve_requires_sync(self):
+        """Reserving before the first sync is an error."""
+        tracker = LocalNonceTracker()
+
+        with pytest.raises(RuntimeError):
+            tracker.reserve(1)
+
+    def test_reserve_consecutive_nonces(self):
+        """Nonces are handed out consecutively without chain calls."""
+        tracker = LocalNonceTracker()
+        tracker.sync(10, 10)
+
+        assert tracker.reserve(3) == [10, 11, 12]
+        assert tracker.reserve(1) == [13]
+
+    def test_dropped_transactions_reset_counter(self):
+        """A full check with an empty mempool recovers dropped nonces."""
+        tracker = LocalNonceTracker(reconcile_interval=60)
+        tracker.sync(10, 10)
+        tracker.reserve(5)
+        reserved_at = tracker._last_reserved_at
+
+        # Our broadcasts may not be visible yet: the counter is kept
+        assert tracker.sync(12) == 15
+        assert tracker.sync(10, 10, now=reserved_at + 1) == 15
+
+        # Still not mined or pending an interval later: they were dropped
+        assert tracker.sync(10, 10, now=reserved_at + 61) == 10
+        assert tracker.reserve(1) == [10]
+
+    def test_sync_jumps_forward(self):
+        """Another sender using the wallet pushes the counter forward."""
+        tracker = LocalNonceTracker()
+        tracker.sync(10)
+
+        assert tracker.sync(20) == 20
+
+    def test_release_unused_tail(self):
+        """Unused tail of a reservation is given back."""
+        tracker = LocalNonceTracker()
+        tracker.sync(10)
+        nonces = tracker.reserve(4)
+
+        tracker.release_unused(nonces[2:])
+
+        assert tracker.next_nonce == 12
+
+    def test_release_with_gap_invalidates(self):
+        """A gap in the middle cannot be reused and forces a resync."""
+        tracker = LocalNonceTracker()
+        tracker.sync(10)
+        nonces = tracker.reserve(4)
+        tracker.reserve(1)
+
+        tracker.release_unused(nonces[2:])
+
+        assert tracker.next_nonce is None
+        assert tracker.needs_full_check() is True
+
+    def test_full_check_interval(self):
+        """Full reconciliation is due only after the interval."""
+        tracker = LocalNonceTracker(reconcile_interval=60)
+        tracker.sync(1, 1)
+
+        assert tracker.needs_full_check() is False
+        assert tracker.needs_full_check(now=tracker._last_full_check + 61) is True
+
+    def test_fence_gap_forces_full_check(self):
+        """Another holder of the wallet lock in between forces a full check."""
+        tracker = LocalNonceTracker(reconcile_interval=60)
+        tracker.observe_fence(7)
+        tracker.sync(1, 1)
+
+        tracker.observe_fence(8)
+        assert tracker.needs_full_check() is False
+
+        tracker.observe_fence(10)
+        assert tracker.needs_full_check() is True
+
+
+class TestBlockGasPriceCache:
+    """Test per-block gas price cache."""
+
+    def test_fresh_quote_is_reused(self):
+        """Quote is returned within TTL."""
+        cache = BlockGasPriceCache(ttl=3)
+        cache.put(5, now=100.0)
+
+        assert cache.get(now=102.9) == 5
+
+    def test_quote_expires(self):
+        """Quote expires after TTL."""
+        cache = BlockGasPriceCache(ttl=3)
+        cache.put(5, now=100.0)
+
+        assert cache.get(now=103.0) is None
+
+
+class TestBatchSend:
+    """Test TransactionManager batch sending."""
+
+    async def test_batch_uses_consecutive_nonces(self):
+        """One nonce sync and one gas price quote serve the whole batch."""
+        w3 = _make_w3(pending_nonce=7)
+        manager = _make_manager()
+
+        results = await manager.send_usdt_payment_batch(
+            w3, [(address, 1) for address in RECIPIENTS], None
+        )
+
+        assert [r["nonce"] for r in results] == [7, 8, 9]
+        assert all(r["success"] for r in results)
+        assert {r["status"] for r in results} == {"confirmed"}
+        assert len({r["tx_hash"] for r in results}) == 3
+        # First batch runs the full pending/latest check: two calls
+        assert w3.eth.get_transaction_count.call_count == 2
+        manager.gas_manager.get_optimal_gas_price.assert_called_once()
+
+    async def test_second_batch_continues_local_counter(self):
+        """Later batches sync with one call and keep counting locally."""
+        w3 = _make_w3(pending_nonce=7)
+        manager = _make_manager()
+
+        await manager.send_usdt_payment_batch(w3, [(RECIPIENTS[0], 2)], None)
+        results = await manager.send_usdt_payment_batch(
+            w3, [(RECIPIENTS[1], 2)], None
+        )
+
+        assert results[0]["nonce"] == 8
+        assert w3.eth.get_transaction_count.call_count == 3
+
+    async def test_failed_broadcast_aborts_rest_and_returns_nonces(self):
+        """A rejected transfer stops the batch and frees its nonces."""
+        w3 = _make_w3(pending_nonce=7)
+        calls = {"count": 0}
+
+        def _send(raw):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise ValueError("insufficient funds for gas")
+            return Web3.keccak(raw)
+
+        w3.eth.send_raw_transaction.side_effect = _send
+        manager = _make_manager()
+
+        results = await manager.send_usdt_payment_batch(
+            w3, [(address, 3) for address in RECIPIENTS], None
+        )
+
+        assert results[0]["success"] is True
+        assert results[1]["success"] is False
+        assert "aborted" in results[2]["error"]
+        assert manager.nonce_tracker.next_nonce == 8
+
+    async def test_lost_lock_stops_broadcast(self):
+        """Nothing is broadcast once the wallet lease is lost."""
+        w3 = _make_w3(pending_nonce=7)
+        lease = LockLease(key="nonce_lock", token="t", fence=3, backend="redis")
+
+        def _send(raw):
+            lease.lost = True  # Renewal failed while the first tx was sent
+            return Web3.keccak(raw)
+
+        w3.eth.send_raw_transaction.side_effect = _send
+        manager = _make_manager()
+
+        @asynccontextmanager
+        async def _lock():
+            yield lease
+
+        with patch.object(manager, "batch_send_lock", _lock):
+            results = await manager.send_usdt_payment_batch(
+                w3, [(address, 6) for address in RECIPIENTS], None
+            )
+
+        assert results[0]["success"] is True
+        assert [r["success"] for r in results[1:]] == [False, False]
+        assert "lock lost" in results[1]["error"]
+        assert w3.eth.send_raw_transaction.call_count == 1
+        assert manager.nonce_tracker.next_nonce is None
+
+    async def test_invalid_address_skipped(self):
+        """An invalid address fails alone and does not consume a nonce."""
+        w3 = _make_w3(pending_nonce=7)
+        manager = _make_manager()
+
+        results = await manager.send_usdt_payment_batch(
+            w3, [("not-an-address", 4), (RECIPIENTS[0], 4)], None
+        )
+
+        assert results[0]["success"] is False
+        assert results[1]["nonce"] == 7
+
+    async def test_without_wallet(self):
+        """Nothing is sent without a signing account."""
+        w3 = _make_w3()
+        manager = _make_manager()
+        manager.wallet_account = None
+
+        results = await manager.send_usdt_payment_batch(
+            w3, [(RECIPIENTS[0], 5)], None
+        )
+
+        assert results[0]["success"] is False
+        w3.eth.send_raw_transaction.assert_not_called()
+
+
+class TestReceiptTracking:
+    """Test receipt tracking and replacement of stuck batch transfers."""
+
+    @pytest.fixture(autouse=True)
+    def fast_tracking(self):
+        with (
+            patch(f"{TRACKING}.PAYOUT_RECEIPT_POLL_INTERVAL", 0),
+            patch(f"{TRACKING}.PAYOUT_STUCK_AFTER", 0),
+            patch(f"{TRACKING}.PAYOUT_RECEIPT_TIMEOUT", 0.05),
+        ):
+            yield
+
+    async def test_stuck_transfer_replaced(self):
+        """An unmined transfer is re-sent with the same nonce, higher gas."""
+        w3 = _make_w3(pending_nonce=7)
+        sent: list[dict] = []
+
+        def _send(raw):
+            sent.append(Account.recover_transaction(raw))
+            return Web3.keccak(raw)
+
+        def _receipt(tx_hash):
+            if len(sent) < 2:
+                raise TransactionNotFound("not mined")
+            return {"status": 1, "transactionHash": tx_hash}
+
+        w3.eth.send_raw_transaction.side_effect = _send
+        w3.eth.get_transaction_receipt.side_effect = _receipt
+        manager = _make_manager(gas_price=5 * 10**7)
+
+        [result] = await manager.send_usdt_payment_batch(
+            w3, [(RECIPIENTS[0], 7)], None
+        )
+
+        assert result["success"] is True
+        assert result["nonce"] == 7
+        assert len(result["replaced_tx_hashes"]) == 1
+        assert result["tx_hash"] not in result["replaced_tx_hashes"]
+        assert w3.eth.send_raw_transaction.call_count == 2
+
+    async def test_used_nonce_not_replaced(self):
+        """A nonce already used on-chain is only waited for."""
+        w3 = _make_w3(pending_nonce=7)
+        w3.eth.get_transaction_receipt.side_effect = TransactionNotFound("no")
+        manager = _make_manager(gas_price=5 * 10**7)
+
+        def _send(raw):
+            # Mined, but the node has not indexed the receipt yet
+            w3.eth.get_transaction_count.return_value = 8
+            return Web3.keccak(raw)
+
+        w3.eth.send_raw_transaction.side_effect = _send
+
+        [result] = await manager.send_usdt_payment_batch(
+            w3, [(RECIPIENTS[0], 8)], None
+        )
+
+        assert result["status"] == "pending"
+        assert result["success"] is False
+        assert result["replaced_tx_hashes"] == []
+        w3.eth.send_raw_transaction.assert_called_once()
+
+    async def test_reverted_transfer_reported(self):
+        """A mined but reverted transfer is a failure with its hash."""
+        w3 = _make_w3(pending_nonce=7)
+        w3.eth.get_transaction_receipt.side_effect = lambda tx_hash: {
+            "status": 0, "transactionHash": tx_hash,
+        }
+        manager = _make_manager()
+
+        [result] = await manager.send_usdt_payment_batch(
+            w3, [(RECIPIENTS[0], 9)], None
+        )
+
+        assert result["success"] is False
+        assert result["status"] == "failed"
+        assert result["tx_hash"]
+
+
+class TestPayoutBatcher:
+    """Test coalescing of concurrent payouts."""
+
+    async def test_concurrent_payouts_share_batch(self):
+        """Payouts submitted within the window are sent together."""
+        send_batch = AsyncMock(side_effect=lambda payments, refs: [
+            {"success": True, "tx_hash": ref} for ref in refs
+        ])
+        batcher = PayoutBatcher(send_batch, window=0.01)
+
+        results = await asyncio.gather(*(
+            batcher.submit(address, Decimal(1), f"withdrawal:{i}")
+            for i, address in enumerate(RECIPIENTS)
+        ))
+
+        send_batch.assert_awaited_once()
+        assert [r["tx_hash"] for r in results] == [
+            "withdrawal:0", "withdrawal:1", "withdrawal:2",
+        ]
+
+    async def test_full_batch_sent_at_once(self):
+        """A batch reaching max_size does not wait for the window."""
+        send_batch = AsyncMock(side_effect=lambda payments, refs: [
+            {"success": True} for _ in refs
+        ])
+        batcher = PayoutBatcher(send_batch, window=60, max_size=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit(RECIPIENTS[0], Decimal(1), "withdrawal:1"),
+                batcher.submit(RECIPIENTS[1], Decimal(1), "withdrawal:2"),
+            ),
+            timeout=1,
+        )
+
+        assert len(results) == 2
+        send_batch.assert_awaited_once()
+
+    async def test_send_error_reported_to_every_caller(self):
+        """An unexpected error fails every payout of the batch."""
+        batcher = PayoutBatcher(
+            AsyncMock(side_effect=RuntimeError("boom")), window=0
+        )
+
+        result = await batcher.submit(RECIPIENTS[0], Decimal(1), "withdrawal:1")
+
+        assert result == {"success": False, "error": "boom"}
+
+
+class TestPayoutRouting:
+    """Test which sender a batch of withdrawal payouts goes through."""
+
+    @pytest.mark.parametrize("multisend", [True, False])
+    async def test_batch_uses_multisend_when_enabled(self, multisend):
+        """Multisend is used when enabled, plain transfers otherwise."""
+        service = BlockchainServiceMixin()
+        service.multisend_enabled = multisend
+        service.send_payment_multisend = AsyncMock(return_value=[{"success": True}])
+        service.send_payment_batch = AsyncMock(return_value=[{"success": True}])
+        payments = [(RECIPIENTS[0], Decimal(1))]
+
+        await service._send_payout_batch(payments, ["withdrawal:1"])
+
+        if multisend:
+            service.send_payment_multisend.assert_awaited_once_with(
+                payments, ["withdrawal:1"]
+            )
+            service.send_payment_batch.assert_not_awaited()
+        else:
+            service.send_payment_batch.assert_awaited_once_with(payments)
+            service.send_payment_multisend.assert_not_awaited()
@@ -0,0 +1,240 @@
+"""
+Tests for latency-scored RPC provider routing.
+
+Covers:
+- Ranking by rolling latency and error rate
+- Hedged reads and failover
+- Per-provider thread pools of the executor
+- Per-provider circuit breaker
+- Pinned writes and deduplicated broadcasts
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from app.services.blockchain.async_executor import AsyncBlockchainExecutor
+from app.services.blockchain.provider_health import ProviderRouter
+from app.services.blockchain.rpc_wrapper import send_raw_transaction_once
+
+
+def _provider(delays: dict, errors: dict | None = None, calls: list | None = None):
+    """Call factory answering per provider after a delay."""
+    errors = errors or {}
+
+    async def call(name):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delays.get(name, 0))
+        if name in errors:
+            raise errors[name]
+        return name
+
+    return call
+
+
+class TestProviderRanking:
+    """Test provider scores."""
+
+    def test_ranked_by_latency_and_errors(self):
+        """A fast provider with errors can rank below a slower healthy one."""
+        router = ProviderRouter(["quicknode", "nodereal"])
+        for _ in range(10):
+            router.health["quicknode"].record(0.1)
+            router.health["nodereal"].record(0.15)
+        assert router.rank("quicknode") == ["quicknode", "nodereal"]
+
+        router.health["quicknode"].record(0.1, ok=False)
+        router.health["quicknode"].record(0.1, ok=False)
+
+        assert router.rank("quicknode") == ["nodereal", "quicknode"]
+        assert router.snapshot()["quicknode"]["error_rate"] == pytest.approx(0.167)
+
+    def test_manual_only_provider_last(self):
+        """The reserve node is ranked last unless it is the active one."""
+        router = ProviderRouter(["quicknode", "nodereal2"])
+        router.health["nodereal2"].record(0.01)
+        router.health["quicknode"].record(0.5)
+
+        assert router.rank("quicknode") == ["quicknode", "nodereal2"]
+        assert router.rank("nodereal2")[0] == "nodereal2"
+
+    def test_auto_switch_off_pins_active(self):
+        """With auto-switch disabled only the active provider is used."""
+        router = ProviderRouter(["quicknode", "nodereal"])
+        router.health["quicknode"].record(5.0)
+
+        assert router.rank("quicknode", auto_switch=False) == ["quicknode"]
+
+    def test_circuit_opens_after_failures(self):
+        """Consecutive failures open the circuit and demote the provider."""
+        router = ProviderRouter(["quicknode", "nodereal"])
+        for _ in range(5):
+            router.health["quicknode"].record(0.01, ok=False)
+
+        assert router.snapshot()["quicknode"]["circuit"] == "open"
+        assert router.rank("quicknode")[0] == "nodereal"
+        assert router.writer("quicknode") == "nodereal"
+        assert router.writer("quicknode", auto_switch=False) == "quicknode"
+
+
+class TestHedgedReads:
+    """Test read routing."""
+
+    async def test_fast_primary_not_hedged(self):
+        """An answer within the hedge delay uses one provider."""
+        calls = []
+        router = ProviderRouter(["quicknode", "nodereal"], hedge_delay=0.2)
+
+        result = await router.read(_provider({}, calls=calls), "quicknode")
+
+        assert result == "quicknode"
+        assert calls == ["quicknode"]
+
+    async def test_slow_primary_hedged(self):
+        """A slow read is also sent to the next provider; first answer wins."""
+        calls = []
+        router = ProviderRouter(["quicknode", "nodereal"], hedge_delay=0.05)
+
+        result = await router.read(
+            _provider({"quicknode": 1.0, "nodereal": 0.01}, calls=calls),
+            "quicknode",
+        )
+
+        assert result == "nodereal"
+        assert calls == ["quicknode", "nodereal"]
+        # The abandoned call still counts as slow
+        assert router.health["quicknode"].latency >= 0.05
+        assert router.rank("quicknode")[0] == "nodereal"
+
+    async def test_failover_on_error(self):
+        """A failed read is retried on the next provider."""
+        router = ProviderRouter(["quicknode", "nodereal"], hedge_delay=1.0)
+
+        result = await router.read(
+            _provider({}, errors={"quicknode": ConnectionError("down")}),
+            "quicknode",
+        )
+
+        assert result == "nodereal"
+        assert router.snapshot()["quicknode"]["error_rate"] == 1.0
+
+    async def test_revert_not_failed_over(self):
+        """A contract revert is the answer, not a provider failure."""
+        calls = []
+        router = ProviderRouter(["quicknode", "nodereal"])
+
+        with pytest.raises(ContractLogicError):
+            await router.read(
+                _provider(
+                    {}, errors={"quicknode": ContractLogicError("revert")}, calls=calls
+                ),
+                "quicknode",
+            )
+
+        assert calls == ["quicknode"]
+        assert router.snapshot()["quicknode"]["error_rate"] == 0.0
+
+    async def test_all_failed_raises_last_error(self):
+        """Every provider failing raises the last error."""
+        router = ProviderRouter(["quicknode", "nodereal"])
+
+        with pytest.raises(TimeoutError):
+            await router.read(
+                _provider({}, errors={
+                    "quicknode": ConnectionError("down"),
+                    "nodereal": TimeoutError("slow"),
+                }),
+                "quicknode",
+            )
+
+
+class TestProviderPools:
+    """Test executor thread pools."""
+
+    async def test_hung_provider_does_not_starve_hedge(self):
+        """Hedges still run while one provider holds all its threads."""
+        release = threading.Event()
+        manager = MagicMock(
+            providers={"quicknode": "quicknode", "nodereal": "nodereal"},
+            router=ProviderRouter(["quicknode", "nodereal"], hedge_delay=0.01),
+            active_provider_name="quicknode",
+            is_auto_switch_enabled=True,
+            _update_settings_from_db=AsyncMock(),
+        )
+        executor = AsyncBlockchainExecutor(
+            manager, asyncio.Semaphore(10), max_workers=2
+        )
+
+        def call(w3):
+            if w3 == "quicknode":
+                release.wait(5)
+            return w3
+
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(executor.run_with_failover(call) for _ in range(4))
+                ),
+                timeout=2,
+            )
+        finally:
+            release.set()
+            executor.cleanup()
+
+        assert results == ["nodereal"] * 4
+
+
+class TestPinnedWrites:
+    """Test write routing and broadcast deduplication."""
+
+    async def test_write_not_failed_over(self):
+        """A failed write is not retried on another provider."""
+        calls = []
+        router = ProviderRouter(["quicknode", "nodereal"])
+
+        with pytest.raises(ConnectionError):
+            await router.write(
+                _provider({}, errors={"quicknode": ConnectionError("down")}, calls=calls),
+                "quicknode",
+            )
+
+        assert calls == ["quicknode"]
+
+    def test_same_transaction_broadcast_once(self):
+        """Resending the same signed bytes does not reach the node."""
+        raw = b"\x01signed-transfer-once"
+        w3 = MagicMock()
+        w3.eth.send_raw_transaction.return_value = Web3.keccak(raw)
+
+        first = send_raw_transaction_once(w3, raw)
+        second = send_raw_transaction_once(w3, raw)
+
+        assert first == second == Web3.keccak(raw)
+        w3.eth.send_raw_transaction.assert_called_once_with(raw)
+
+    def test_already_known_is_success(self):
+        """A node that already has the transaction returns its hash."""
+        raw = b"\x01signed-transfer-known"
+        w3 = MagicMock()
+        w3.eth.send_raw_transaction.side_effect = ValueError(
+            {"code": -32000, "message": "already known"}
+        )
+
+        assert send_raw_transaction_once(w3, raw) == Web3.keccak(raw)
+
+    def test_failed_broadcast_can_be_retried(self):
+        """A rejected broadcast is not remembered."""
+        raw = b"\x01signed-transfer-retry"
+        w3 = MagicMock()
+        w3.eth.send_raw_transaction.side_effect = [
+            ValueError("underpriced"), Web3.keccak(raw),
+        ]
+
+        with pytest.raises(ValueError):
+            send_raw_transaction_once(w3, raw)
+        assert send_raw_transaction_once(w3, raw) == Web3.keccak(raw)
@@ -0,0 +1,151 @@
+"""
+Tests for ledger-based reconciliation.
+
+Covers:
+- Current totals from closed running totals plus open deltas
+- Range reconciliation from two closed-day lookups
+- First diverging day and entry type
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.enums import LedgerEntryType
+from app.services.reconciliation_service import ReconciliationService
+
+
+def _totals(**amounts) -> dict:
+    totals = {t: (Decimal("0"), 0) for t in LedgerEntryType}
+    for name, amount in amounts.items():
+        totals[LedgerEntryType(name)] = (Decimal(amount), 1)
+    return totals
+
+
+def _day_rows(day: date, deltas: dict, cumulative: dict) -> list:
+    return [
+        SimpleNamespace(
+            day=day,
+            entry_type=entry_type,
+            amount=Decimal(deltas.get(entry_type, "0")),
+            cumulative_amount=Decimal(cumulative.get(entry_type, "0")),
+            cumulative_count=1,
+        )
+        for entry_type in sorted(cumulative)
+    ]
+
+
+@pytest.fixture
+def service(mock_session):
+    service = ReconciliationService(mock_session)
+    service.ledger = AsyncMock()
+    service.ledger.close_days.return_value = 0
+    service.ledger.get_last_closed_day.return_value = date(2025, 12, 20)
+    return service
+
+
+class TestCurrentTotals:
+    """Reconciliation reads rollups instead of summing tables."""
+
+    async def test_closed_plus_open_totals(self, service):
+        """Open deltas are added to the last closed running totals."""
+        service.ledger.get_closed_totals.return_value = _totals(
+            deposit_confirmed="100", user_balance="100"
+        )
+        service.ledger.get_open_totals.return_value = _totals(
+            deposit_confirmed="50",
+            withdrawal_confirmed="20",
+            user_balance="25",
+            withdrawal_pending="5",
+        )
+
+        totals = await service._get_current_totals()
+
+        assert service._calculate_expected_balance(totals) == Decimal("130")
+        assert service._calculate_actual_balance(totals) == Decimal("130")
+        service.ledger.get_closed_totals.assert_awaited_once_with(date(2025, 12, 20))
+        breakdown = service._get_breakdown(totals)
+        assert breakdown["deposits"] == {"count": 2, "total": 150.0}
+        assert breakdown["user_balances"]["user_count"] == 2
+
+    async def test_nothing_closed_uses_open_totals(self, service):
+        """Before the first closed day only open deltas exist."""
+        service.ledger.get_last_closed_day.return_value = None
+        service.ledger.get_open_totals.return_value = _totals(deposit_confirmed="10")
+
+        totals = await service._get_current_totals()
+
+        assert service._calculate_expected_balance(totals) == Decimal("10")
+        service.ledger.get_closed_totals.assert_not_awaited()
+
+
+class TestRangeReconciliation:
+    """Ranges are reconciled from running totals at both ends."""
+
+    async def test_range_is_difference_of_running_totals(self, service):
+        """Change over a range = totals at end - totals before start."""
+        service.ledger.get_closed_totals.side_effect = [
+            _totals(deposit_confirmed="100", user_balance="100"),
+            _totals(deposit_confirmed="160", user_balance="150"),
+        ]
+
+        result = await service.reconcile_range(date(2025, 12, 10), date(2025, 12, 15))
+
+        assert result["expected_change"] == 60.0
+        assert result["actual_change"] == 50.0
+        assert result["discrepancy"] == -10.0
+        assert [c.args[0] for c in service.ledger.get_closed_totals.await_args_list] == [
+            date(2025, 12, 9), date(2025, 12, 15),
+        ]
+
+    async def test_open_range_rejected(self, service):
+        """Days that are not closed yet cannot be range-reconciled."""
+        with pytest.raises(ValueError):
+            await service.reconcile_range(date(2025, 12, 10), date(2025, 12, 21))
+
+
+class TestFirstDivergence:
+    """The first day out of tolerance is reported with its main type."""
+
+    async def test_reports_first_diverging_day(self, service):
+        """Balanced days are skipped; the largest mover is reported."""
+        service.ledger.get_day_totals.return_value = [
+            *_day_rows(
+                date(2025, 12, 1),
+                {"deposit_confirmed": "100", "user_balance": "100"},
+                {"deposit_confirmed": "100", "user_balance": "100"},
+            ),
+            *_day_rows(
+                date(2025, 12, 2),
+                {"deposit_confirmed": "10", "user_balance": "40"},
+                {"deposit_confirmed": "110", "user_balance": "140"},
+            ),
+            *_day_rows(
+                date(2025, 12, 3),
+                {},
+                {"deposit_confirmed": "110", "user_balance": "140"},
+            ),
+        ]
+
+        result = await service.find_first_divergence(
+            date(2025, 12, 1), date(2025, 12, 3)
+        )
+
+        assert result["day"] == "2025-12-02"
+        assert result["entry_type"] == "user_balance"
+        assert result["discrepancy"] == 30.0
+
+    async def test_no_divergence(self, service):
+        """None when every closed day is within tolerance."""
+        service.ledger.get_day_totals.return_value = _day_rows(
+            date(2025, 12, 1),
+            {"deposit_confirmed": "100", "user_balance": "101"},
+            {"deposit_confirmed": "100", "user_balance": "101"},
+        )
+
+        assert await service.find_first_divergence(
+            date(2025, 12, 1), date(2025, 12, 1)
+        ) is None
@@ -0,0 +1,135 @@
+"""
+Tests for the referral ancestor cache and batched referral rewards.
+
+Covers:
+- ReferralAncestorCache span bookkeeping and depth filtering
+- Per-referrer / per-relationship aggregation of a batch of accruals
+- Bulk writes: one balance update, one relationship update, one insert
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.referral.ancestor_cache import ReferralAncestorCache
+from app.services.referral.referral_reward_processor import (
+    ReferralRewardProcessor,
+)
+
+
+# (user_id, referrer_id, level, relationship_id)
+CLOSURE_ROWS = [
+    (10, 5, 1, 101),
+    (10, 3, 2, 102),
+    (10, 1, 3, 103),
+    (11, 5, 1, 104),
+    (11, 3, 2, 105),
+]
+
+
+def _make_cache() -> ReferralAncestorCache:
+    cache = ReferralAncestorCache()
+    cache.add_rows(CLOSURE_ROWS)
+    return cache
+
+
+class TestReferralAncestorCache:
+    """Test array-backed ancestor lookups."""
+
+    def test_ancestors_nearest_first(self):
+        """Ancestors come back in level order with relationship ids."""
+        cache = _make_cache()
+
+        assert cache.ancestors(10) == [(5, 1, 101), (3, 2, 102), (1, 3, 103)]
+        assert cache.ancestors(11) == [(5, 1, 104), (3, 2, 105)]
+        assert len(cache) == 5
+
+    def test_user_without_referrer(self):
+        """Unknown users have no ancestors."""
+        cache = _make_cache()
+
+        assert cache.ancestors(99) == []
+        assert 99 not in cache
+        assert 10 in cache
+
+    def test_depth_limit(self):
+        """Links deeper than the configured depth are dropped."""
+        cache = ReferralAncestorCache(depth=2)
+        cache.add_rows(CLOSURE_ROWS)
+
+        assert cache.ancestors(10) == [(5, 1, 101), (3, 2, 102)]
+
+    def test_rows_must_be_grouped_by_user(self):
+        """Interleaved rows would corrupt spans and are rejected."""
+        cache = ReferralAncestorCache()
+        cache.add_rows([(10, 5, 1, 101), (11, 5, 1, 104)])
+
+        with pytest.raises(ValueError):
+            cache.add_rows([(10, 3, 2, 102)])
+
+
+class TestReferralRewardBatch:
+    """Test batched referral reward processing."""
+
+    def test_aggregate_per_referrer_and_relationship(self):
+        """Rewards of all accruals are summed per referrer and per link."""
+        processor = ReferralRewardProcessor(MagicMock())
+
+        per_relationship, per_referrer = processor.aggregate_rewards(
+            [(10, Decimal("100")), (11, Decimal("20")), (10, Decimal("10"))],
+            _make_cache(),
+        )
+
+        assert per_relationship == {
+            101: Decimal("5.50"),
+            102: Decimal("5.50"),
+            103: Decimal("5.50"),
+            104: Decimal("1.00"),
+            105: Decimal("1.00"),
+        }
+        assert per_referrer == {
+            5: Decimal("6.50"),
+            3: Decimal("6.50"),
+            1: Decimal("5.50"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_writes_in_bulk_without_commit(self, mock_session):
+        """Three statements regardless of batch size, commit left to caller."""
+        mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=3))
+        processor = ReferralRewardProcessor(mock_session)
+
+        result = await processor.process_rewards_batch(
+            [(10, Decimal("100")), (11, Decimal("20"))],
+            "roi",
+            ancestor_cache=_make_cache(),
+        )
+
+        assert result.success is True
+        assert result.total_rewards == Decimal("17.00")
+        assert result.rewards_count == 5
+        assert mock_session.execute.await_count == 3
+        mock_session.commit.assert_not_awaited()
+
+        balance_update = mock_session.execute.await_args_list[0].args[0]
+        sql = str(balance_update.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE users SET balance=(users.balance + referrer_rewards.amount)")
+        assert "FROM (VALUES" in sql
+
+        earnings_rows = mock_session.execute.await_args_list[2].args[1]
+        assert {row["referral_id"] for row in earnings_rows} == {101, 102, 103, 104, 105}
+        assert all(row["tx_hash"] == "internal_balance_roi" for row in earnings_rows)
+
+    @pytest.mark.asyncio
+    async def test_batch_without_referrers(self, mock_session):
+        """Users without ancestors produce no writes."""
+        processor = ReferralRewardProcessor(mock_session)
+
+        result = await processor.process_rewards_batch(
+            [(99, Decimal("100"))], "roi", ancestor_cache=_make_cache()
+        )
+
+        assert result.total_rewards == Decimal("0")
+        mock_session.execute.assert_not_awaited()
@@ -0,0 +1,155 @@
+"""
+Tests for pre-aggregated referral statistics.
+
+Covers:
+- Per-user stats read from the referral_stats row
+- Leaderboards as top-k queries on referral_stats
+- Leaderboard ranks counted with row comparisons on the index key
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.referral_stats import ReferralStats
+from app.services.referral.statistics import ReferralStatisticsManager
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _stats(**overrides) -> ReferralStats:
+    values = {
+        "referrer_id": 5,
+        "direct_count": 3,
+        "level2_count": 2,
+        "level3_count": 1,
+        "total_count": 6,
+        "total_earned": Decimal("12.5"),
+        "paid_earned": Decimal("10"),
+        "pending_earned": Decimal("2.5"),
+    }
+    values.update(overrides)
+    return ReferralStats(**values)
+
+
+def _scalar_result(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+class TestReferralStatsReads:
+    """Test per-user stats and ranks."""
+
+    @pytest.mark.asyncio
+    async def test_stats_from_counters(self, mock_session):
+        """Counts and earnings come from one referral_stats lookup."""
+        mock_session.execute = AsyncMock(return_value=_scalar_result(_stats()))
+        manager = ReferralStatisticsManager(mock_session)
+
+        stats = await manager.get_referral_stats(5)
+
+        assert stats == {
+            "direct_referrals": 3,
+            "level2_referrals": 2,
+            "level3_referrals": 1,
+            "total_earned": Decimal("12.5"),
+            "pending_earnings": Decimal("2.5"),
+            "paid_earnings": Decimal("10"),
+        }
+        assert mock_session.execute.await_count == 1
+        sql = _sql(mock_session.execute.await_args.args[0])
+        assert "FROM referral_stats" in sql
+
+    @pytest.mark.asyncio
+    async def test_stats_without_referrals(self, mock_session):
+        """Users without a counters row get zeros."""
+        mock_session.execute = AsyncMock(return_value=_scalar_result(None))
+        manager = ReferralStatisticsManager(mock_session)
+
+        stats = await manager.get_referral_stats(5)
+
+        assert stats["direct_referrals"] == 0
+        assert stats["total_earned"] == Decimal("0")
+
+    @pytest.mark.asyncio
+    async def test_position_counts_rows_ahead(self, mock_session):
+        """Rank is one plus the referrers sorting strictly ahead."""
+        mock_session.execute = AsyncMock(return_value=_scalar_result(_stats()))
+        mock_session.scalar = AsyncMock(side_effect=[40, 3, 7])
+        manager = ReferralStatisticsManager(mock_session)
+
+        position = await manager.get_user_leaderboard_position(5)
+
+        assert position == {
+            "referral_rank": 4,
+            "earnings_rank": 8,
+            "total_users": 40,
+        }
+        referral_ahead = _sql(mock_session.scalar.await_args_list[1].args[0])
+        assert (
+            "(referral_stats.total_count, referral_stats.total_earned) > "
+            in referral_ahead
+        )
+
+    @pytest.mark.asyncio
+    async def test_position_without_referrals(self, mock_session):
+        """Users without referrals are unranked."""
+        mock_session.execute = AsyncMock(return_value=_scalar_result(None))
+        mock_session.scalar = AsyncMock(return_value=40)
+        manager = ReferralStatisticsManager(mock_session)
+
+        position = await manager.get_user_leaderboard_position(5)
+
+        assert position == {
+            "referral_rank": None,
+            "earnings_rank": None,
+            "total_users": 40,
+        }
+
+
+class TestReferralLeaderboard:
+    """Test leaderboard queries."""
+
+    @pytest.mark.asyncio
+    async def test_leaderboards_are_top_k_queries(self, mock_session):
+        """Each board is one ordered, limited query."""
+        row = SimpleNamespace(
+            user_id=5,
+            telegram_id=555,
+            username="alice",
+            referral_count=6,
+            total_earnings=Decimal("12.5"),
+        )
+        result = MagicMock()
+        result.all.return_value = [row]
+        mock_session.execute = AsyncMock(return_value=result)
+        manager = ReferralStatisticsManager(mock_session)
+
+        leaderboard = await manager.get_referral_leaderboard(limit=3)
+
+        assert leaderboard["by_referrals"] == [{
+            "rank": 1,
+            "user_id": 5,
+            "telegram_id": 555,
+            "username": "alice",
+            "referral_count": 6,
+            "total_earnings": Decimal("12.5"),
+        }]
+        by_referrals, by_earnings = (
+            _sql(call.args[0]) for call in mock_session.execute.await_args_list
+        )
+        assert (
+            "ORDER BY referral_stats.total_count DESC, "
+            "referral_stats.total_earned DESC" in by_referrals
+        )
+        assert (
+            "ORDER BY referral_stats.total_earned DESC, "
+            "referral_stats.total_count DESC" in by_earnings
+        )
+        assert "LIMIT" in by_earnings
@@ -0,0 +1,123 @@
+"""
+Unit tests for ReportExportService.
+
+Covers column selection, date-range filtering and streaming of cursor
+partitions into gzip CSV and XLSX files.
+"""
+
+import csv
+import gzip
+import io
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import openpyxl
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.report_export_service import ReportExportService
+
+
+def _stream_result(*chunks):
+    """Streamed result yielding the given partitions."""
+
+    async def partitions():
+        for chunk in chunks:
+            yield chunk
+
+    result = MagicMock()
+    result.partitions = partitions
+    return result
+
+
+class TestExportQuery:
+    """Test column selection and query building."""
+
+    def test_all_columns_by_default(self, mock_session):
+        """No selection exports every column of the dataset."""
+        columns = ReportExportService.resolve_columns("deposits", None)
+        assert columns[0] == "id"
+        assert "amount" in columns
+
+    def test_unknown_column_rejected(self, mock_session):
+        """Unknown columns and datasets raise ValueError."""
+        with pytest.raises(ValueError, match="secret"):
+            ReportExportService.resolve_columns("users", ["id", "secret"])
+        with pytest.raises(ValueError):
+            ReportExportService.resolve_columns("payments", None)
+
+    def test_query_selects_columns_and_range(self, mock_session):
+        """Only selected columns are queried, filtered by created_at."""
+        service = ReportExportService(mock_session)
+        stmt = service.build_query(
+            "users", ["id", "balance"], date(2025, 1, 1), date(2025, 1, 31)
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "users.balance" in sql
+        assert "deposits" not in sql
+        assert "users.created_at >=" in sql
+        assert "users.created_at <" in sql
+        params = stmt.compile().params
+        assert datetime(2025, 2, 1, tzinfo=UTC) in params.values()
+
+
+class TestExportWriting:
+    """Test streaming rows into files."""
+
+    async def test_csv_is_gzipped_and_streamed(self, mock_session):
+        """Every partition is written and progress is reported."""
+        mock_session.stream = AsyncMock(return_value=_stream_result(
+            [(1, Decimal("10.5"), True)],
+            [(2, None, False)],
+        ))
+        progress = AsyncMock()
+        service = ReportExportService(mock_session)
+
+        result = await service.export(
+            "users",
+            columns=["id", "balance", "verified"],
+            start=date(2025, 1, 1),
+            progress=progress,
+        )
+
+        text = gzip.decompress(result.file.read()).decode("utf-8-sig")
+        assert list(csv.reader(io.StringIO(text))) == [
+            ["ID", "Balance", "Verified"],
+            ["1", "10.5", "Yes"],
+            ["2", "", "No"],
+        ]
+        assert result.rows == 2
+        assert result.filename == "users_export_2025-01-01_now.csv.gz"
+        assert [c.args[0] for c in progress.await_args_list] == [1, 2]
+
+    async def test_xlsx_export(self, mock_session):
+        """XLSX exports contain the header and formatted rows."""
+        created = datetime(2025, 3, 4, 5, 6, tzinfo=UTC)
+        mock_session.stream = AsyncMock(
+            return_value=_stream_result([(7, created)])
+        )
+        service = ReportExportService(mock_session)
+
+        result = await service.export(
+            "transactions", "xlsx", columns=["id", "created_at"]
+        )
+
+        sheet = openpyxl.load_workbook(result.file).active
+        assert [[c.value for c in row] for row in sheet.iter_rows()] == [
+            ["ID", "Created At"],
+            [7, "2025-03-04 05:06"],
+        ]
+        assert result.filename == "transactions_export.xlsx"
+
+    async def test_invalid_range_rejected(self, mock_session):
+        """A start date after the end date is rejected before querying."""
+        mock_session.stream = AsyncMock()
+        service = ReportExportService(mock_session)
+
+        with pytest.raises(ValueError):
+            await service.export(
+                "users", start=date(2025, 2, 1), end=date(2025, 1, 1)
+            )
+        mock_session.stream.assert_not_called()
@@ -0,0 +1,133 @@
+"""
+Tests for the vectorized ROI projection.
+
+Covers:
+- Exact agreement with the Decimal ProfitabilityCalculator path
+- Cap completion periods and partially paid deposits
+- Corridor Monte Carlo bounds and reproducibility
+"""
+
+from decimal import Decimal
+
+import pytest
+
+
+np = pytest.importorskip("numpy")
+
+from calculator import ProfitabilityCalculator  # noqa: E402
+from calculator.core.projection import (  # noqa: E402
+    DepositBook,
+    PortfolioProjector,
+    from_units,
+)
+
+
+# (amount, level, roi_paid, rate_percent)
+DEPOSITS = [
+    (Decimal("1000"), 1, Decimal("0"), Decimal("1.117")),
+    (Decimal("5000"), 2, Decimal("1234.56"), Decimal("0.85")),
+    (Decimal("70.5"), 3, Decimal("300"), Decimal("2.3456")),
+    (Decimal("25000"), 4, Decimal("124999.99"), Decimal("1.5")),
+]
+CAP_PERCENT = Decimal("500")
+
+
+def _decimal_paths(periods: int) -> list[list[Decimal]]:
+    """Cumulative payouts per deposit via the single-deposit Decimal path."""
+    calc = ProfitabilityCalculator()
+    paths = []
+    for amount, _, roi_paid, rate in DEPOSITS:
+        cap = calc.calculate_roi_cap(amount, CAP_PERCENT)
+        paid, total, path = roi_paid, Decimal("0"), []
+        for _ in range(periods):
+            reward = calc.cap_reward_to_remaining(
+                calc.calculate_daily_reward(amount, rate),
+                calc.calculate_remaining_roi(cap, paid),
+            )
+            paid += reward
+            total += reward
+            path.append(total)
+        paths.append(path)
+    return paths
+
+
+def _book() -> DepositBook:
+    calc = ProfitabilityCalculator()
+    return DepositBook.from_decimals(
+        (amount, level, paid, calc.calculate_roi_cap(amount, CAP_PERCENT))
+        for amount, level, paid, _ in DEPOSITS
+    )
+
+
+class TestFixedRateProjection:
+    """Fixed rates must match the Decimal calculator exactly."""
+
+    def test_matches_decimal_path(self):
+        """Book payouts equal the sum of Decimal single-deposit paths."""
+        periods = 500
+        rates = {level: rate for _, level, _, rate in DEPOSITS}
+
+        result = PortfolioProjector(_book()).project(rates, periods)
+
+        paths = _decimal_paths(periods)
+        expected = [sum(path[t] for path in paths) for t in range(periods)]
+        assert [from_units(v) for v in result.paid[0]] == expected
+
+    def test_days_to_cap(self):
+        """Completion period equals calculate_days_to_cap for fresh deposits."""
+        calc = ProfitabilityCalculator()
+        amount, rate = Decimal("1000"), Decimal("1.117")
+        book = DepositBook.from_decimals(
+            [(amount, 1, Decimal("0"), calc.calculate_roi_cap(amount, CAP_PERCENT))]
+        )
+
+        result = PortfolioProjector(book).project({1: rate}, periods=600)
+
+        assert result.completion_period[0, 0] == calc.calculate_days_to_cap(
+            amount, rate, CAP_PERCENT
+        )
+        assert from_units(result.paid[0, -1]) == Decimal("5000")
+        assert result.liability_curve()[0, -1] == 0
+
+    def test_completion_of_partially_paid(self):
+        """Nearly capped deposits finish first; unfinished ones stay -1."""
+        result = PortfolioProjector(_book()).project(
+            {level: rate for _, level, _, rate in DEPOSITS}, periods=10
+        )
+
+        assert result.completion_period[0].tolist() == [-1, -1, -1, 1]
+
+    def test_missing_level_rate(self):
+        """Levels without a rate are rejected."""
+        with pytest.raises(ValueError):
+            PortfolioProjector(_book()).project({1: Decimal("1")}, periods=1)
+
+
+class TestCorridorProjection:
+    """Corridor rates are drawn per deposit and period."""
+
+    def test_payouts_within_corridor_bounds(self):
+        """Monte Carlo payouts lie between the min-rate and max-rate runs."""
+        projector = PortfolioProjector(_book())
+        corridor = (Decimal("0.5"), Decimal("2"))
+        periods = 30
+
+        low = projector.project(dict.fromkeys(range(1, 5), corridor[0]), periods)
+        high = projector.project(dict.fromkeys(range(1, 5), corridor[1]), periods)
+        result = projector.project(
+            dict.fromkeys(range(1, 5), corridor), periods, runs=64, seed=7
+        )
+
+        p5, p50, p95 = result.payout_percentiles()[:, -1]
+        assert low.paid[0, -1] <= p5 <= p50 <= p95 <= high.paid[0, -1]
+        assert p5 < p95
+
+    def test_seed_reproducible(self):
+        """Same seed gives identical runs."""
+        projector = PortfolioProjector(_book())
+        rates = dict.fromkeys(range(1, 5), (Decimal("0.5"), Decimal("2")))
+
+        first = projector.project(rates, 20, runs=8, seed=1)
+        second = projector.project(rates, 20, runs=8, seed=1)
+
+        assert np.array_equal(first.paid, second.paid)
@@ -0,0 +1,156 @@
+"""
+Unit tests for runtime operational flags.
+
+Covers snapshot reads with bounded staleness, environment overrides,
+audited flips and push invalidation between processes.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.models.runtime_flag import RuntimeFlagChange  # noqa: E402
+from app.services.runtime_flags import (  # noqa: E402
+    EMERGENCY_STOP_ROI,
+    MAINTENANCE_MODE,
+    RuntimeFlags,
+)
+
+
+def _factory(session):
+    """Session factory yielding the given session."""
+    @asynccontextmanager
+    async def factory():
+        yield session
+    return factory
+
+
+def _states(*rows):
+    """Result of RuntimeFlagRepository.get_states' query."""
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    return result
+
+
+def _current(value):
+    """Result of RuntimeFlagRepository.set_flag's locking read."""
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+class TestRuntimeFlagsSnapshot:
+    """Test snapshot reads."""
+
+    async def test_get_reloads_only_when_stale(self, mock_session):
+        """Reads within max_age are served from the snapshot."""
+        mock_session.execute.return_value = _states((MAINTENANCE_MODE, True))
+        flags = RuntimeFlags(_factory(mock_session), max_age=60)
+
+        assert await flags.get(MAINTENANCE_MODE) is True
+        assert await flags.get(EMERGENCY_STOP_ROI) is False
+        assert mock_session.execute.await_count == 1
+
+        flags.max_age = 0
+        mock_session.execute.return_value = _states((MAINTENANCE_MODE, False))
+        assert await flags.get(MAINTENANCE_MODE) is False
+        assert mock_session.execute.await_count == 2
+
+    async def test_failed_reload_keeps_snapshot(self, mock_session):
+        """A database error keeps serving the last known state."""
+        mock_session.execute.return_value = _states((MAINTENANCE_MODE, True))
+        flags = RuntimeFlags(_factory(mock_session), max_age=0)
+        await flags.refresh()
+
+        mock_session.execute.side_effect = ConnectionError("db down")
+        assert await flags.get(MAINTENANCE_MODE) is True
+
+    async def test_environment_forces_flag_on(self, mock_session):
+        """A flag enabled in the environment is on regardless of the table."""
+        mock_session.execute.return_value = _states()
+        flags = RuntimeFlags(_factory(mock_session))
+
+        with patch("app.services.runtime_flags.settings") as settings:
+            settings.emergency_stop_roi = True
+            settings.blockchain_maintenance_mode = False
+            assert await flags.get(EMERGENCY_STOP_ROI) is True
+            assert await flags.get(MAINTENANCE_MODE) is False
+
+    async def test_unknown_flag_rejected(self):
+        """Typos in flag names fail loudly."""
+        with pytest.raises(ValueError):
+            RuntimeFlags().is_set("maintenance")
+
+
+class TestRuntimeFlagsChanges:
+    """Test flips and their propagation."""
+
+    async def test_set_audits_and_publishes(self, mock_session, redis):
+        """A flip is committed with an audit record and published."""
+        mock_session.add = MagicMock()
+        mock_session.execute.return_value = _current(False)
+        flags = RuntimeFlags(_factory(mock_session), redis_client=redis)
+        pubsub = redis.pubsub()
+        await pubsub.subscribe("runtime_flags:changed")
+        await pubsub.get_message(timeout=0.1)
+
+        changed = await flags.set(
+            MAINTENANCE_MODE, True, "system:test", reason="nodes down"
+        )
+
+        assert changed is True
+        mock_session.commit.assert_awaited_once()
+        audit = mock_session.add.call_args.args[0]
+        assert isinstance(audit, RuntimeFlagChange)
+        assert (audit.old_value, audit.new_value) == (False, True)
+        assert audit.changed_by == "system:test"
+        assert flags.is_set(MAINTENANCE_MODE) is True
+        message = await pubsub.get_message(timeout=0.5)
+        assert '"enabled": true' in message["data"]
+        await pubsub.aclose()
+
+    async def test_unchanged_flag_is_not_audited(self, mock_session, redis):
+        """Setting a flag to its current value records nothing."""
+        mock_session.add = MagicMock()
+        mock_session.execute.return_value = _current(True)
+        flags = RuntimeFlags(_factory(mock_session), redis_client=redis)
+
+        assert await flags.set(MAINTENANCE_MODE, True, "system:test") is False
+        mock_session.add.assert_not_called()
+
+    async def test_listener_applies_remote_change(self, mock_session, redis):
+        """Another process sees a flip without waiting for max_age."""
+        mock_session.execute.return_value = _states()
+        listener = RuntimeFlags(
+            _factory(mock_session), redis_client=redis, max_age=60
+        )
+        task = asyncio.create_task(listener.listen())
+        await asyncio.sleep(0.05)
+        assert listener.is_set(EMERGENCY_STOP_ROI) is False
+
+        mock_session.execute.return_value = _states((EMERGENCY_STOP_ROI, True))
+        await redis.publish(
+            "runtime_flags:changed",
+            '{"name": "emergency_stop_roi", "enabled": true}',
+        )
+        for _ in range(50):
+            if listener.is_set(EMERGENCY_STOP_ROI):
+                break
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert listener.is_set(EMERGENCY_STOP_ROI) is True
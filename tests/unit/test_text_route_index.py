@@ -0,0 +1,157 @@
+"""
+Tests for the exact-text route index.
+
+Covers:
+- Lookup by text and FSM state in propagation order
+- Shadowing by state-only, regexp and custom-filter handlers
+- Direct dispatch with inner middlewares and fallback to the router walk
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+from aiogram import Dispatcher, F, Router
+from aiogram.filters import StateFilter
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import Chat, Message, User
+
+from bot.middlewares.text_route_index import TextRouteIndex
+
+
+TG_USER = User(id=1, is_bot=False, first_name="Test")
+
+
+class FlowStates(StatesGroup):
+    """States used by test handlers."""
+
+    amount = State()
+    confirm = State()
+
+
+def _message(text: str) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.now(UTC),
+        chat=Chat(id=TG_USER.id, type="private"),
+        from_user=TG_USER,
+        text=text,
+    )
+
+
+def _handler(name: str):
+    async def handler(message: Message) -> str:
+        return name
+
+    handler.__name__ = name
+    return handler
+
+
+def _build(*routers: Router) -> tuple[Dispatcher, TextRouteIndex]:
+    dp = Dispatcher()
+    for router in routers:
+        dp.include_router(router)
+    index = TextRouteIndex.build(dp)
+    dp.message.outer_middleware(index)
+    return dp, index
+
+
+def _target(index: TextRouteIndex, text: str, state: str | None = None):
+    route = index.lookup(text, state)
+    return route.handler.callback.__name__ if route else None
+
+
+async def _dispatch(dp: Dispatcher, text: str, state: str | None = None):
+    return await dp.propagate_event(
+        "message", _message(text), raw_state=state, event_from_user=TG_USER
+    )
+
+
+class TestTextRouteIndexBuild:
+    """Index contents follow aiogram first-match semantics."""
+
+    def test_first_literal_wins(self):
+        """Earlier routers take precedence; in_() literals are indexed."""
+        first, second = Router(), Router()
+        first.message.register(_handler("balance"), F.text == "📊 Баланс")
+        second.message.register(
+            _handler("balance_late"), F.text.in_({"📊 Баланс", "💸 Вывод"})
+        )
+
+        _, index = _build(first, second)
+
+        assert _target(index, "📊 Баланс") == "balance"
+        assert _target(index, "💸 Вывод") == "balance_late"
+        assert _target(index, "unknown") is None
+
+    def test_state_specific_routes(self):
+        """State filters select routes per FSM state."""
+        router = Router()
+        router.message.register(
+            _handler("cancel_amount"), FlowStates.amount, F.text == "❌ Отмена"
+        )
+        router.message.register(_handler("cancel"), F.text == "❌ Отмена")
+
+        _, index = _build(router)
+
+        assert _target(index, "❌ Отмена", FlowStates.amount.state) == "cancel_amount"
+        assert _target(index, "❌ Отмена", FlowStates.confirm.state) == "cancel"
+        assert _target(index, "❌ Отмена") == "cancel"
+
+    def test_state_only_handler_shadows(self):
+        """FSM input handlers shadow later buttons in their states only."""
+        router = Router()
+        router.message.register(_handler("input"), StateFilter(FlowStates))
+        router.message.register(_handler("menu"), F.text == "📊 Баланс")
+
+        _, index = _build(router)
+
+        assert _target(index, "📊 Баланс", FlowStates.confirm.state) is None
+        assert _target(index, "📊 Баланс") == "menu"
+
+    def test_text_predicates_shadow_matching_texts(self):
+        """Regexp handlers shadow matching texts, custom filters all texts."""
+        router = Router()
+        router.message.register(_handler("by_id"), F.text.regexp(r"^#\d+$"))
+        router.message.register(
+            _handler("admin"), FlowStates.confirm, lambda m: True
+        )
+        router.message.register(_handler("id"), F.text.in_({"#12", "📊 Баланс"}))
+
+        _, index = _build(router)
+
+        assert _target(index, "#12") is None
+        assert _target(index, "📊 Баланс") == "id"
+        assert _target(index, "📊 Баланс", FlowStates.confirm.state) is None
+
+
+class TestTextRouteIndexDispatch:
+    """Dispatch through the index matches the router walk."""
+
+    async def test_direct_dispatch_runs_inner_middlewares(self):
+        """Indexed handlers still pass through router inner middlewares."""
+        parent, child = Router(), Router()
+        parent.include_router(child)
+        child.message.register(_handler("menu"), F.text == "📊 Баланс")
+        calls = []
+
+        async def middleware(handler, event, data):
+            calls.append(data["event_router"])
+            return await handler(event, data)
+
+        parent.message.middleware(middleware)
+        dp, _ = _build(parent)
+
+        assert await _dispatch(dp, "📊 Баланс") == "menu"
+        assert calls == [child]
+
+    async def test_failed_filter_falls_back_to_walk(self):
+        """If extra filters reject, the regular walk picks the next handler."""
+        router = Router()
+        router.message.register(
+            _handler("admin_only"), F.text == "📊 Баланс", AsyncMock(return_value=False)
+        )
+        router.message.register(_handler("menu"), F.text == "📊 Баланс")
+        dp, index = _build(router)
+
+        assert _target(index, "📊 Баланс") == "admin_only"
+        assert await _dispatch(dp, "📊 Баланс") == "menu"
@@ -0,0 +1,179 @@
+"""
+Tests for shared ARIA tool quotas.
+
+Covers:
+- Per-tool limits shared between processes
+- Weighted hourly budget
+- Sliding window over the previous bucket
+- In-process fallback without Redis
+- Shared client: script called by SHA, no client per check
+- Usage report
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.aria_security import rate_limiter  # noqa: E402
+from app.services.aria_security.rate_limiter import (  # noqa: E402
+    HOUR,
+    ToolRateLimiter,
+    set_rate_limiter_redis,
+)
+
+
+# 15 minutes into an hour bucket: 75% of the previous hour still counts
+NOW = 1_000 * HOUR + 900
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def clock():
+    with patch(
+        "app.services.aria_security.rate_limiter.time.time", return_value=NOW
+    ) as mock_time:
+        yield mock_time
+
+
+class TestToolQuotas:
+    """Test quota checks."""
+
+    async def test_tool_limit_shared(self, redis, clock):
+        """Calls through one process count against the other."""
+        first = ToolRateLimiter(redis_client=redis)
+        second = ToolRateLimiter(redis_client=redis)
+        first._limits["emergency_full_stop"] = 2
+
+        assert (await first.consume(1, "emergency_full_stop"))[0]
+        assert (await second.consume(1, "emergency_full_stop"))[0]
+        allowed, message = await first.consume(1, "emergency_full_stop")
+
+        assert not allowed
+        assert message == "❌ Превышен лимит операций 'emergency_full_stop' (2/час)"
+        # Other admins and tools are not affected
+        assert (await first.consume(2, "emergency_full_stop"))[0]
+        assert (await first.consume(1, "get_platform_health"))[0]
+
+    async def test_weighted_budget(self, redis, clock):
+        """Expensive tools exhaust the hourly budget before their own limit."""
+        limiter = ToolRateLimiter(redis_client=redis)
+
+        with patch(
+            "app.services.aria_security.rate_limiter.ARIA_TOOL_HOURLY_BUDGET", 50
+        ):
+            for _ in range(2):
+                assert (await limiter.consume(1, "broadcast_to_group"))[0]
+            allowed, message = await limiter.consume(1, "broadcast_to_group")
+            assert not allowed
+            assert message == "❌ Превышен бюджет операций ARIA (50 ед./час)"
+
+            # Ten cheap reads still fit
+            for _ in range(10):
+                assert (await limiter.consume(1, "get_user_profile"))[0]
+            assert not (await limiter.consume(1, "get_user_profile"))[0]
+
+    async def test_previous_bucket_weighted(self, redis, clock):
+        """Usage just before the hour boundary still counts partly."""
+        limiter = ToolRateLimiter(redis_client=redis)
+        limiter._limits["block_admin"] = 4
+
+        clock.return_value = NOW - HOUR
+        for _ in range(4):
+            assert (await limiter.consume(1, "block_admin"))[0]
+
+        # 4 * 0.75 = 3 of 4 still in the window
+        clock.return_value = NOW
+        assert (await limiter.consume(1, "block_admin"))[0]
+        assert not (await limiter.consume(1, "block_admin"))[0]
+
+    async def test_rejected_call_not_recorded(self, redis, clock):
+        """A call over one limit consumes none of the others."""
+        limiter = ToolRateLimiter(redis_client=redis)
+        limiter._limits["grant_bonus"] = 1
+
+        await limiter.consume(1, "grant_bonus")
+        await limiter.consume(1, "grant_bonus")
+
+        usage = await limiter.get_usage(1)
+        assert usage["hourly"]["used"] == 5
+        assert usage["tools"]["grant_bonus"]["calls"] == 1
+
+    async def test_local_fallback(self, clock):
+        """Without Redis the limits are kept in process."""
+        limiter = ToolRateLimiter()
+        limiter._limits["block_admin"] = 1
+
+        with patch(
+            "app.utils.redis_utils.get_redis_client",
+            side_effect=ConnectionError("down"),
+        ):
+            assert (await limiter.consume(1, "block_admin"))[0]
+            assert not (await limiter.consume(1, "block_admin"))[0]
+
+            usage = await limiter.get_usage(1)
+
+        assert usage["daily"]["used"] == 10
+        assert usage["tools"]["block_admin"]["calls"] == 1
+
+
+class TestSharedClient:
+    """Test use of the bot's shared Redis client."""
+
+    async def test_script_called_by_sha(self, redis, clock):
+        """The quota script is sent once, then called with EVALSHA."""
+        limiter = ToolRateLimiter(redis_client=redis)
+        redis.eval = AsyncMock(side_effect=AssertionError("full script sent"))
+        evalsha = MagicMock(wraps=redis.evalsha)
+        script_load = MagicMock(wraps=redis.script_load)
+        redis.evalsha, redis.script_load = evalsha, script_load
+
+        for _ in range(3):
+            assert (await limiter.consume(1, "grant_bonus"))[0]
+
+        # The first call finds no script, loads it once and retries
+        script_load.assert_called_once()
+        assert evalsha.call_count == 4
+        assert (await limiter.get_usage(1))["tools"]["grant_bonus"]["calls"] == 3
+
+    async def test_singleton_uses_shared_client(self, redis, clock):
+        """No client is created per check once the bot shares its client."""
+        with patch.object(rate_limiter, "_rate_limiter", None):
+            set_rate_limiter_redis(redis)
+            with patch(
+                "app.utils.redis_utils.get_redis_client",
+                side_effect=AssertionError("client created per check"),
+            ):
+                assert (await rate_limiter.get_rate_limiter().consume(1, "grant_bonus"))[0]
+
+        assert await redis.keys(f"{rate_limiter.QUOTA_KEY_PREFIX}1:*")
+
+
+class TestUsageReport:
+    """Test the admin-visible report."""
+
+    async def test_report(self, redis, clock):
+        """Budgets and today's calls per tool are reported."""
+        limiter = ToolRateLimiter(redis_client=redis)
+        await limiter.consume(1, "grant_bonus")
+        for _ in range(3):
+            await limiter.consume(1, "get_user_profile")
+
+        usage = await limiter.get_usage(1)
+
+        assert usage["hourly"]["used"] == 8
+        assert usage["daily"]["used"] == 8
+        assert list(usage["tools"]) == ["get_user_profile", "grant_bonus"]
+        assert usage["tools"]["grant_bonus"] == {
+            "calls": 1, "cost": 5, "hourly_limit": 100,
+        }
+        assert "За час: *8/" in usage["message"]
+        assert (await limiter.get_usage(2))["hourly"]["used"] == 0
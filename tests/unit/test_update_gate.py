@@ -0,0 +1,225 @@
+"""
+Tests for the single round-trip update gate middleware.
+
+Covers:
+- Rate limit, button cooldown and session verdicts of the Lua script
+- One script call per update
+- Authorization flow exemptions
+- Throttled PLEX balance warning
+- In-memory fallback without Redis
+"""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from bot.middlewares.update_gate import (  # noqa: E402
+    PLEX_CHECK_KEY_PREFIX,
+    SESSION_KEY_PREFIX,
+    SESSION_TTL,
+    UpdateGateMiddleware,
+)
+
+
+USER_ID = 42
+TG_USER = User(id=USER_ID, is_bot=False, first_name="Test")
+
+
+def _message_update(text: str) -> Update:
+    return Update(
+        update_id=1,
+        message=Message(
+            message_id=1,
+            date=datetime.now(UTC),
+            chat=Chat(id=USER_ID, type="private"),
+            from_user=TG_USER,
+            text=text,
+        ),
+    )
+
+
+def _callback_update(data: str) -> Update:
+    return Update(
+        update_id=1,
+        callback_query=CallbackQuery(
+            id="1", from_user=TG_USER, chat_instance="1", data=data
+        ),
+    )
+
+
+async def _run(gate: UpdateGateMiddleware, update: Update, **data) -> bool:
+    """Pass update through the gate; True if the handler was called."""
+    handler = AsyncMock(return_value="handled")
+    data.setdefault("event_from_user", TG_USER)
+    await gate(handler, update, data)
+    return handler.await_count == 1
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def session_redis(redis):
+    """Redis with an active Pay-to-Use session."""
+    await redis.setex(f"{SESSION_KEY_PREFIX}{USER_ID}", 60, "1")
+    return redis
+
+
+class TestUpdateGateRedis:
+    """Verdicts of the gate script."""
+
+    async def test_single_round_trip(self, session_redis):
+        """Every update costs exactly one Redis command."""
+        gate = UpdateGateMiddleware(redis_client=session_redis)
+        # Load script so the count below has no NOSCRIPT retries
+        await _run(gate, _message_update("warmup"))
+
+        with patch.object(
+            session_redis,
+            "execute_command",
+            AsyncMock(wraps=session_redis.execute_command),
+        ) as command:
+            assert await _run(gate, _message_update("📊 Баланс"))
+            assert await _run(gate, _callback_update("menu"))
+
+        assert [call.args[0] for call in command.await_args_list] == [
+            "EVALSHA",
+            "EVALSHA",
+        ]
+
+    async def test_rate_limit(self, session_redis):
+        """Updates over the limit are dropped."""
+        gate = UpdateGateMiddleware(
+            redis_client=session_redis, user_limit=3, user_window=60
+        )
+
+        results = [await _run(gate, _message_update("hi")) for _ in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert await session_redis.ttl(f"ratelimit:user:{USER_ID}") > 0
+
+    async def test_button_cooldown(self, session_redis):
+        """Repeated click of the same button is answered and dropped."""
+        gate = UpdateGateMiddleware(redis_client=session_redis)
+
+        with patch.object(CallbackQuery, "answer", AsyncMock()) as answer:
+            assert await _run(gate, _callback_update("withdraw_all"))
+            assert not await _run(gate, _callback_update("withdraw_all"))
+            assert await _run(gate, _callback_update("menu"))
+
+        answer.assert_awaited_once_with("⏳ Подождите немного", show_alert=False)
+        pttl = await session_redis.pttl(f"button_cooldown:{USER_ID}:withdraw_all")
+        assert 0 < pttl <= 2000
+
+    async def test_session_sliding_ttl(self, redis):
+        """Active session TTL is extended on every update."""
+        key = f"{SESSION_KEY_PREFIX}{USER_ID}"
+        await redis.setex(key, 5, "1")
+        gate = UpdateGateMiddleware(redis_client=redis)
+
+        assert await _run(gate, _message_update("hi"))
+        assert await redis.ttl(key) == SESSION_TTL
+
+    async def test_no_session(self, redis):
+        """Without session the update is dropped and the user is notified."""
+        gate = UpdateGateMiddleware(redis_client=redis)
+        state = AsyncMock()
+        state.get_state.return_value = None
+
+        with patch.object(Message, "answer", AsyncMock()) as answer:
+            assert not await _run(gate, _message_update("hi"), state=state)
+
+        state.clear.assert_awaited_once()
+        assert "Сессия истекла" in answer.await_args.args[0]
+
+    async def test_auth_flow_exempt(self, redis):
+        """/start, auth buttons and auth callbacks skip the session check."""
+        gate = UpdateGateMiddleware(redis_client=redis)
+
+        assert await _run(gate, _message_update("/start"))
+        assert await _run(gate, _message_update("✅ Я оплатил"))
+        assert await _run(gate, _callback_update("check_payment"))
+
+    async def test_auth_state_exempt(self, redis):
+        """Users in auth FSM states pass without session."""
+        from bot.states.auth import AuthStates
+
+        gate = UpdateGateMiddleware(redis_client=redis)
+        state = AsyncMock()
+        state.get_state.return_value = AuthStates.waiting_for_wallet.state
+
+        assert await _run(gate, _message_update("0xabc"), state=state)
+        state.clear.assert_not_awaited()
+
+    async def test_plex_check_throttled(self, session_redis):
+        """PLEX balance check runs at most once per interval."""
+        gate = UpdateGateMiddleware(redis_client=session_redis)
+
+        with patch.object(
+            gate, "_check_plex_balance", AsyncMock()
+        ) as check:
+            assert await _run(gate, _message_update("a"))
+            assert await _run(gate, _message_update("b"))
+
+        check.assert_awaited_once()
+        assert await session_redis.ttl(f"{PLEX_CHECK_KEY_PREFIX}{USER_ID}") > 0
+
+    async def test_plex_warning_sent(self, session_redis):
+        """The due PLEX check looks up the user itself (before Auth)."""
+        gate = UpdateGateMiddleware(redis_client=session_redis)
+        session_maker = MagicMock()
+        user_repo = MagicMock(
+            get_by_telegram_id=AsyncMock(return_value=SimpleNamespace(id=7))
+        )
+        plex_service = MagicMock(
+            get_insufficient_plex_message=AsyncMock(return_value="low PLEX")
+        )
+
+        with (
+            patch("app.config.database.async_session_maker", session_maker),
+            patch(
+                "app.repositories.user_repository.UserRepository",
+                return_value=user_repo,
+            ),
+            patch(
+                "app.services.plex_payment_service.PlexPaymentService",
+                return_value=plex_service,
+            ),
+            patch.object(Message, "answer", AsyncMock()) as answer,
+        ):
+            assert await _run(gate, _message_update("a"))
+
+        user_repo.get_by_telegram_id.assert_awaited_once_with(USER_ID)
+        plex_service.get_insufficient_plex_message.assert_awaited_once_with(7)
+        answer.assert_awaited_once_with("low PLEX")
+
+
+class TestUpdateGateFallback:
+    """Behaviour without a working Redis."""
+
+    async def test_in_memory_rate_limit(self):
+        """Without Redis only the in-memory rate limit applies."""
+        gate = UpdateGateMiddleware(redis_client=None, user_limit=2)
+
+        results = [await _run(gate, _message_update("hi")) for _ in range(3)]
+
+        assert results == [True, True, False]
+
+    async def test_redis_error_fails_open(self, session_redis):
+        """Redis errors fall back to the in-memory rate limit."""
+        gate = UpdateGateMiddleware(redis_client=session_redis, user_limit=1)
+        gate._script = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await _run(gate, _message_update("hi"))
+        assert not await _run(gate, _message_update("hi"))
@@ -0,0 +1,77 @@
+"""
+Tests for the unified user search query.
+
+Covers:
+- Numeric terms match telegram_id (ranked first) and user ID
+- Short terms skip trigram matching
+- Wallet prefix/suffix and shortened "0x12...ab" forms
+- LIKE wildcards in usernames are escaped
+"""
+
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.user_repository import UserRepository
+
+
+def _compiled(mock_session) -> tuple[str, dict]:
+    stmt = mock_session.execute.await_args.args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+async def _search(mock_session, query: str, **kwargs) -> tuple[str, dict]:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = result
+    await UserRepository(mock_session).search(query, **kwargs)
+    return _compiled(mock_session)
+
+
+class TestUserSearchQuery:
+    """One ranked query per search."""
+
+    async def test_numeric_term_matches_ids_and_text(self, mock_session):
+        """Digits match telegram_id, user ID and text columns."""
+        sql, params = await _search(mock_session, "123456")
+
+        assert mock_session.execute.await_count == 1
+        assert "users.telegram_id = " in sql
+        assert "users.id = " in sql
+        assert "similarity" in sql
+        assert 123456 in params.values()
+        assert "%123456%" in params.values()
+
+    async def test_short_term_matches_ids_only(self, mock_session):
+        """Terms shorter than a trigram never reach ILIKE."""
+        sql, _ = await _search(mock_session, "42")
+
+        assert "ILIKE" not in sql
+        assert "users.telegram_id = " in sql
+
+    async def test_short_text_term_returns_nothing(self, mock_session):
+        """Non-numeric short terms cannot match anything."""
+        result = await UserRepository(mock_session).search("ab")
+
+        assert result == []
+        mock_session.execute.assert_not_awaited()
+
+    async def test_shortened_wallet(self, mock_session):
+        """A shortened wallet matches by prefix and suffix."""
+        _, params = await _search(mock_session, "0x1234ab...cdef99")
+
+        assert "0x1234ab%cdef99" in params.values()
+
+    async def test_wallet_prefix_and_suffix(self, mock_session):
+        """A wallet fragment matches either end of the address."""
+        _, params = await _search(mock_session, "0xABCD")
+
+        assert {"0xABCD%", "%0xABCD"} <= set(params.values())
+
+    async def test_underscore_escaped(self, mock_session):
+        """Usernames with "_" are not treated as wildcards."""
+        _, params = await _search(mock_session, "@john_doe", exact=True)
+
+        assert "john\\_doe" in params.values()
+        assert not any("%" in str(v) for v in params.values())
@@ -0,0 +1,181 @@
+"""
+Tests for cached wallet snapshots.
+
+Covers:
+- Balance snapshots per block bucket with single-flight fetches
+- Incremental token history with reorg margin
+- Degradation on RPC failures
+"""
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.config.constants import WALLET_HISTORY_REORG_DEPTH  # noqa: E402
+from app.config.operational_constants import MAX_BLOCKS_HISTORY_SCAN  # noqa: E402
+from app.services.wallet_info_service import WalletInfoService  # noqa: E402
+
+
+WALLET = "0x" + "ab" * 20
+WALLET_TOPIC = "0x" + WALLET[2:].zfill(64)
+OTHER_TOPIC = "0x" + "11" * 32
+
+
+def _log(block: int, index: int, incoming: bool) -> dict:
+    return {
+        "transactionHash": f"0x{block:032x}{index:032x}",
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "topics": [
+            WalletInfoService.TRANSFER_TOPIC,
+            OTHER_TOPIC if incoming else WALLET_TOPIC,
+            WALLET_TOPIC if incoming else OTHER_TOPIC,
+        ],
+        "data": hex(10**18),
+    }
+
+
+class FakeChain:
+    """JSON-RPC stub with a movable head and transfer logs."""
+
+    def __init__(self, head: int) -> None:
+        self.head = head
+        self.logs: list[tuple[dict, bool]] = []
+        self.get_logs_ranges: list[tuple[int, int]] = []
+        self.fail_logs = False
+
+    async def rpc(self, method: str, params: list):
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        if self.fail_logs:
+            return None
+        query = params[0]
+        start, end = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+        self.get_logs_ranges.append((start, end))
+        incoming = query["topics"][2] is not None
+        return [
+            log
+            for log, is_in in self.logs
+            if is_in == incoming and start <= int(log["blockNumber"], 16) <= end
+        ]
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def chain():
+    return FakeChain(head=1_000_000)
+
+
+@pytest.fixture
+def service_factory(redis, chain):
+    def factory() -> WalletInfoService:
+        service = WalletInfoService(redis_client=redis)
+        service._rpc_call = chain.rpc
+        return service
+
+    return factory
+
+
+@pytest.fixture
+def blockchain():
+    service = MagicMock()
+    service.get_native_balance = AsyncMock(return_value=Decimal("0.5"))
+    service.get_usdt_balance = AsyncMock(return_value=Decimal("100"))
+    service.get_plex_balance = AsyncMock(return_value=Decimal("5000"))
+    with patch(
+        "app.services.wallet_info_service.get_blockchain_service",
+        return_value=service,
+    ):
+        yield service
+
+
+class TestBalanceSnapshots:
+    """Balances are fetched once per wallet and block bucket."""
+
+    async def test_concurrent_requests_share_fetch(
+        self, service_factory, blockchain
+    ):
+        """Spammed button presses cost one set of balance RPCs."""
+        results = await asyncio.gather(
+            *(service_factory().get_wallet_balances(WALLET) for _ in range(5))
+        )
+        again = await service_factory().get_wallet_balances(WALLET)
+
+        assert blockchain.get_usdt_balance.await_count == 1
+        assert {r.usdt_balance for r in [*results, again]} == {Decimal("100")}
+        assert again.last_updated == results[0].last_updated
+
+    async def test_new_bucket_refetches(
+        self, service_factory, blockchain, chain, redis
+    ):
+        """A new block bucket gets a fresh snapshot."""
+        await service_factory().get_wallet_balances(WALLET)
+        chain.head += 100
+        await redis.delete("wallet_snapshot:head")
+
+        await service_factory().get_wallet_balances(WALLET)
+
+        assert blockchain.get_usdt_balance.await_count == 2
+
+    async def test_partial_failure_not_cached(self, service_factory, blockchain):
+        """Snapshots with a failed balance are shown but not stored."""
+        blockchain.get_plex_balance.side_effect = TimeoutError("rpc")
+
+        first = await service_factory().get_wallet_balances(WALLET)
+        await service_factory().get_wallet_balances(WALLET)
+
+        assert first.plex_balance == Decimal("0")
+        assert blockchain.get_usdt_balance.await_count == 2
+
+
+class TestTransferHistory:
+    """History is extended from the last cached block."""
+
+    async def test_incremental_extension(self, service_factory, chain, redis):
+        """Second view only scans new blocks plus the reorg margin."""
+        chain.logs = [
+            (_log(990_000, 0, True), True),
+            (_log(995_000, 1, False), False),
+        ]
+        first = await service_factory().get_usdt_transactions(WALLET)
+        assert chain.get_logs_ranges == [
+            (1_000_000 - MAX_BLOCKS_HISTORY_SCAN, 1_000_000)
+        ] * 2
+
+        chain.head = 1_000_050
+        chain.logs.append((_log(1_000_040, 0, True), True))
+        chain.get_logs_ranges.clear()
+        await redis.delete("wallet_snapshot:head")
+
+        second = await service_factory().get_usdt_transactions(WALLET)
+
+        start = 1_000_000 - WALLET_HISTORY_REORG_DEPTH + 1
+        assert chain.get_logs_ranges == [(start, 1_000_050)] * 2
+        assert [tx.block_number for tx in first] == [995_000, 990_000]
+        assert [tx.block_number for tx in second] == [1_000_040, 995_000, 990_000]
+        assert second[0].direction == "in"
+        assert second[0].value == Decimal("1")
+
+    async def test_rpc_failure_serves_cached(self, service_factory, chain, redis):
+        """Failed log queries keep the cached history."""
+        chain.logs = [(_log(999_000, 0, True), True)]
+        await service_factory().get_usdt_transactions(WALLET)
+
+        chain.head = 1_000_100
+        chain.fail_logs = True
+        await redis.delete("wallet_snapshot:head")
+
+        txs = await service_factory().get_usdt_transactions(WALLET)
+
+        assert [tx.block_number for tx in txs] == [999_000]